@@ -1,29 +1,66 @@
 import time
 from pathlib import Path
 import json
+import hashlib
 import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import streamlit as st
 
+from src.clean_store import TextFile, latest_snapshot, read_latest, read_text
+from src.query import VacancyQuery
+from src.skill_index import BITS_COLUMN, SkillIndex
+# impor berat lain (huggingface_hub, src.category, src.rollup) dimuat saat dibutuhkan
+
 # ================== CONFIG ==================
 st.set_page_config(page_title="Peluang Magang — Fokus Persaingan", layout="wide")
 
 REPO_ID  = "Azahrul/magang-intel-data"
 PREF_FILE = "vacancies_scored.parquet"
 FALLBACK_FILE = "vacancies.parquet"
+TEXT_FILE = "vacancies_text.parquet"   # deskripsi/alamat per posting (score.py), dibaca saat dibuka
 
 LOCAL_CANDIDATES = [
     Path("data/clean/vacancies_scored.parquet"),
-    Path("data/clean/vacancies.parquet"),
+    Path("data/clean/vacancies"),          # dataset snapshot (prepare.py) → hanya snapshot terbaru
+    Path("data/clean/vacancies.parquet"),  # format lama (file tunggal)
+]
+LOCAL_TEXT = Path("data/clean") / TEXT_FILE
+LOCAL_ROLLUP = Path("data/clean/rollup")  # cube agregat (src/rollup.py) dari file scored yang sama
+
+# Kolom yang dipakai dashboard (filter, tabel, grafik, urutan, skill); sisanya tidak dibaca
+APP_COLUMNS = [
+    "id_posisi", "posisi", "kategori_posisi", "nama_perusahaan", "nama_provinsi",
+    "jumlah_kuota", "jumlah_terdaftar", "competition_ratio", "priority_score",
+    "ratio_order", "priority_rank", BITS_COLUMN, "skills_extracted",
 ]
 
 # Hard guard to avoid blowing memory on Spaces
 MAX_RENDER_ROWS = 20000  # feel free to raise on local
+CHART_CACHE_ENTRIES = 64  # spesifikasi grafik per kombinasi filter (LRU)
 
 # ================== HELPERS ==================
+def _has_local_data(path: Path) -> bool:
+    return latest_snapshot(path) is not None if path.is_dir() else path.exists()
+
+@st.cache_resource(max_entries=4)
+def _parquet_file(path: str, mtime_ns: int) -> pq.ParquetFile:
+    """Handle Parquet (memory-map) dibuka sekali per file/versi; footer/skema tidak dibaca ulang."""
+    return pq.ParquetFile(path, memory_map=True)
+
+def _app_columns(names: list[str]) -> list[str]:
+    cols = [c for c in APP_COLUMNS if c in names]
+    if BITS_COLUMN in cols:  # bitset skill sudah ada → list skill tidak perlu dibaca
+        cols.remove("skills_extracted")
+    return cols
+
 def _read_parquet_safely(path: str | Path) -> pd.DataFrame:
+    if Path(path).is_dir():
+        part = next(Path(path, f"snapshot={latest_snapshot(path)}").glob("*.parquet"))
+        return read_latest(path, columns=_app_columns(pq.read_schema(part).names), legacy_file=None)
     try:
-        return pd.read_parquet(path)
+        pf = _parquet_file(str(path), Path(path).stat().st_mtime_ns)
+        return pf.read(columns=_app_columns(pf.schema_arrow.names)).to_pandas()
     except Exception:
         return pd.read_parquet(path, engine="fastparquet")
 
@@ -46,24 +83,6 @@ def to_list_of_str(x):
         return [s.lower()]
     return []
 
-def simplify_role(title: str) -> str:
-    if not isinstance(title, str):
-        return "Other"
-    t = title.lower()
-    if ("data" in t) or ("analyst" in t) or ("analytics" in t):
-        return "Data & Analytics"
-    if ("admin" in t) or ("operator" in t) or ("pengadministrasi" in t):
-        return "Administration"
-    if ("marketing" in t) or ("brand" in t) or ("customer" in t) or ("sales" in t):
-        return "Marketing & Sales"
-    if ("design" in t) or ("video" in t) or ("creative" in t) or ("grafis" in t):
-        return "Creative"
-    if ("perawat" in t) or ("ners" in t) or ("kesehatan" in t):
-        return "Health"
-    if ("bkkbn" in t) or ("kementerian" in t) or ("direktorat" in t):
-        return "Public Sector"
-    return "Other"
-
 def _ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
     for col in ["posisi", "nama_perusahaan", "nama_provinsi"]:
         if col not in df.columns:
@@ -83,21 +102,57 @@ def _ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
         )
 
     if "kategori_posisi" not in df.columns:
-        df["kategori_posisi"] = df["posisi"].apply(simplify_role)
+        from src.category import categorize
+        df["kategori_posisi"] = categorize(df["posisi"])
 
-    if "skills_norm" not in df.columns:
-        if "skills_extracted" in df.columns:
-            df["skills_norm"] = df["skills_extracted"].apply(to_list_of_str)
-        else:
-            df["skills_norm"] = [[] for _ in range(len(df))]
+    # file lama: skills_extracted berupa string JSON → list (sekali saat load; indeks skill dari sini)
+    if "skills_extracted" in df.columns and pd.api.types.infer_dtype(df["skills_extracted"], skipna=True) == "string":
+        df["skills_extracted"] = df["skills_extracted"].apply(to_list_of_str)
 
     return df
 
+def _filter_key(*parts) -> str:
+    """Hash state filter (+ versi data) → kunci cache grafik."""
+    return hashlib.sha1(json.dumps(parts, default=str, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def _barh_spec(series: pd.Series, title: str, xlabel: str, ylabel: str) -> dict:
+    """Spesifikasi Vega-Lite bar horizontal (data tertanam, nilai terbesar di atas) untuk
+    st.vega_lite_chart: dirender di browser, tanpa figure matplotlib di server."""
+    return {
+        "title": title,
+        "height": 320,
+        "data": {"values": [{"label": str(k), "value": float(v)} for k, v in series.items()]},
+        "mark": {"type": "bar", "tooltip": True},
+        "encoding": {
+            "y": {"field": "label", "type": "nominal", "sort": "-x", "title": ylabel},
+            "x": {"field": "value", "type": "quantitative", "title": xlabel},
+        },
+    }
+
+def _orderings(df: pd.DataFrame) -> dict:
+    """Permutasi baris per mode urut, dihitung sekali saat load.
+    Kolom dari score.py (ratio_order, priority_rank) dipakai langsung; tanpa itu dihitung di sini."""
+    out = {}
+    if "ratio_order" in df.columns:
+        out["ratio"] = np.argsort(df["ratio_order"].to_numpy())
+    else:
+        ratio = df["competition_ratio"].to_numpy(float)
+        quota = np.nan_to_num(df["jumlah_kuota"].to_numpy(float))
+        out["ratio"] = np.lexsort((-quota, np.where(np.isnan(ratio), np.inf, ratio)))
+    if "priority_rank" in df.columns:
+        out["priority"] = np.argsort(df["priority_rank"].to_numpy())
+    return out
+
 # ================== DATA LOADER ==================
-@st.cache_data(ttl=15*60, max_entries=4, show_spinner="Updating data...")
-def load_live() -> pd.DataFrame:
+@st.cache_resource(ttl=15*60, max_entries=4, show_spinner="Updating data...")
+def load_live() -> tuple[pd.DataFrame, dict]:
+    """(DataFrame, indeks) — indeks (urutan, skill, query engine) disimpan terpisah dari
+    df.attrs karena attrs di-deepcopy pandas pada setiap filter.
+    cache_resource: satu salinan dibagi semua sesi (cache_data meng-unpickle salinan baru
+    tiap rerun); df tidak pernah diubah setelah load."""
     for p in LOCAL_CANDIDATES:
-        if p.exists():
+        if _has_local_data(p):
+            source = p
             base_df = _read_parquet_safely(p)
             break
     else:
@@ -107,20 +162,90 @@ def load_live() -> pd.DataFrame:
                 local_path = hf_hub_download(repo_id=REPO_ID, filename=PREF_FILE)
             except Exception:
                 local_path = hf_hub_download(repo_id=REPO_ID, filename=FALLBACK_FILE)
+            source = local_path
             base_df = _read_parquet_safely(local_path)
         except Exception as e:
             st.error(f"Gagal memuat data dari HF Datasets: {e}")
-            return pd.DataFrame()
-
-    base_df = _ensure_columns(base_df)
+            return pd.DataFrame(), {}
+
+    base_df = _ensure_columns(base_df).reset_index(drop=True)
+    indexes = {
+        "orderings": _orderings(base_df),
+        "skills": SkillIndex.for_frame(base_df, source),  # bitset dari score.py atau dibangun dari list
+    }
+    base_df = base_df.drop(columns=[BITS_COLUMN], errors="ignore")
+    # kolom filter → category + mask/indeks trigram; widget berikutnya tanpa copy/scan frame
+    indexes["query"] = VacancyQuery(base_df, indexes["orderings"], indexes["skills"])
+    indexes["source"] = str(source)
+    indexes["rollup"] = _rollup_for(base_df, source)
     base_df.attrs["last_updated_ts"] = time.time()
-    return base_df
+    return base_df, indexes
+
+def _rollup_for(df: pd.DataFrame, source):
+    """Cube lokal (src.rollup.Rollup) hanya dipakai bila dibangun dari data yang sama
+    (jumlah baris + pendaftar); None → KPI/grafik dari baris."""
+    if Path(source) != LOCAL_CANDIDATES[0] or not LOCAL_ROLLUP.exists():
+        return None
+    try:
+        from src.rollup import Rollup
+        cube = Rollup.load(LOCAL_ROLLUP)
+    except Exception:
+        return None
+    if cube is None or cube.total_rows != len(df):
+        return None
+    return cube if int(cube.sum_terdaftar.sum()) == int(df["jumlah_terdaftar"].fillna(0).sum()) else None
+
+@st.cache_resource(ttl=15*60, show_spinner=False)
+def _text_file(source: str) -> TextFile | None:
+    """Sumber deskripsi: vacancies_text.parquet lokal / HF (diunduh saat pertama dibutuhkan),
+    atau file data itu sendiri bila masih memuat deskripsi (format lama)."""
+    if LOCAL_TEXT.exists():
+        return TextFile(LOCAL_TEXT)
+    if Path(source).is_dir():
+        return None  # dataset clean → read_text (load_description)
+    try:
+        from huggingface_hub import hf_hub_download
+        return TextFile(hf_hub_download(repo_id=REPO_ID, filename=TEXT_FILE))
+    except Exception:
+        pass
+    tf = TextFile(source)
+    return tf if "deskripsi_posisi" in tf.columns else None
+
+@st.cache_data(ttl=15*60, max_entries=256, show_spinner=False)
+def load_description(source: str, id_posisi: str) -> dict | None:
+    """Deskripsi + alamat satu posting (hanya saat baris dibuka)."""
+    tf = _text_file(source)
+    if tf is not None:
+        return tf.get(id_posisi)
+    for p in LOCAL_CANDIDATES:  # tanpa file teks → dataset clean lokal
+        if p.is_dir() and _has_local_data(p):
+            rows = read_text(p, [id_posisi]).to_dict("records")
+            return rows[0] if rows else None
+    return None
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def chart_specs(filter_key: str, _agg, _sel: np.ndarray) -> tuple[dict, dict]:
+    """Dua grafik untuk satu kombinasi filter (LRU per filter_key). _agg (cube / query engine)
+    dan _sel (mask) tidak di-hash: isinya sudah terwakili filter_key."""
+    prov = _agg.top_provinces_by_companies(_sel, 10)
+    titles = _agg.top_titles_by_applicants(_sel, 10)
+    return (
+        _barh_spec(prov, "Perusahaan unik per provinsi", "Jumlah perusahaan", "Provinsi"),
+        _barh_spec(titles, "Total pendaftar per posisi", "Jumlah pendaftar", "Posisi"),
+    )
 
 # ================== UI ==================
-df = load_live()
+df, indexes = load_live()
+if df.empty:
+    st.stop()
+skill_ix = indexes["skills"]
+engine = indexes["query"]
 
 if st.button("🔄 Refresh now"):
     load_live.clear()
+    _text_file.clear()
+    load_description.clear()
+    chart_specs.clear()
     st.rerun()
 
 ts = df.attrs.get("last_updated_ts")
@@ -134,10 +259,10 @@ st.caption("Semakin kecil rasio **(Pendaftar/Kuota)**, semakin besar peluang.")
 with st.sidebar:
     st.header("⚙️ Filter")
 
-    provinsi_opts = ["(Semua)"] + sorted([p for p in df["nama_provinsi"].dropna().unique().tolist() if p])
+    provinsi_opts = ["(Semua)"] + engine.options("nama_provinsi")
     prov_choice = st.selectbox("Provinsi", provinsi_opts, index=0)
 
-    kategori_opts = ["(Semua)"] + sorted(df["kategori_posisi"].dropna().unique().tolist())
+    kategori_opts = ["(Semua)"] + engine.options("kategori_posisi")
     kat_choice = st.selectbox("Kategori posisi", kategori_opts, index=0)
 
     keyword = st.text_input("Keyword judul posisi (opsional)", value="")
@@ -145,11 +270,18 @@ with st.sidebar:
     skills_csv = st.text_input("Skill saya (pisahkan koma, opsional)",
                                value="excel, sql, python")
 
+    must_skills = st.multiselect("Wajib punya skill (opsional)", options=skill_ix.vocab)
+
     max_ratio = st.slider(
         "Batas rasio maksimum (pelamar/kuota) → peluang makin baik jika makin kecil",
         min_value=0.0, max_value=50.0, value=10.0, step=0.5
     )
 
+    sort_opts = {"Kecocokan skill → rasio kecil → kuota besar": "ratio"}
+    if "priority" in indexes["orderings"]:
+        sort_opts["Priority score (bobot di params.yaml)"] = "priority"
+    sort_choice = sort_opts[st.selectbox("Urutan hasil", list(sort_opts), index=0)]
+
     # <<< CHANGED: kontrol jumlah hasil >>>
     top_choice = st.selectbox(
         "Jumlah hasil yang ditampilkan",
@@ -161,59 +293,75 @@ with st.sidebar:
 
 # -------- Filtering --------
 want_skills = [s.strip().lower() for s in skills_csv.split(",") if s.strip()]
-q = df.copy()
-
-if prov_choice != "(Semua)":
-    q = q[q["nama_provinsi"] == prov_choice]
-
-if kat_choice != "(Semua)":
-    q = q[q["kategori_posisi"] == kat_choice]
-
-if keyword.strip():
-    q = q[q["posisi"].astype(str).str.contains(keyword.strip(), case=False, na=False)]
-
-q = q[q["competition_ratio"].notna()]
-q = q[q["competition_ratio"] <= max_ratio]
-
-if want_skills:
-    q = q.assign(match_count=q["skills_norm"].apply(lambda lst: sum(1 for s in lst if s in want_skills)))
-else:
-    q = q.assign(match_count=0)
-
-q = q.sort_values(by=["match_count", "competition_ratio", "jumlah_kuota"],
-                  ascending=[False, True, False])
+limit = MAX_RENDER_ROWS if top_choice == "Semua" else int(top_choice)
+res = engine.run(
+    province=None if prov_choice == "(Semua)" else prov_choice,
+    category=None if kat_choice == "(Semua)" else kat_choice,
+    keyword=keyword,
+    max_ratio=max_ratio,
+    must_skills=must_skills,
+    want_skills=want_skills,
+    sort=sort_choice,
+    limit=limit,
+)
+# KPI + grafik dari cube bila filter sejajar dimensinya; keyword / skill wajib → dari baris
+cube, cells = indexes.get("rollup"), None
+if cube is not None and not keyword.strip() and not must_skills:
+    cells = cube.cells(
+        province=None if prov_choice == "(Semua)" else prov_choice,
+        category=None if kat_choice == "(Semua)" else kat_choice,
+        max_ratio=max_ratio,
+    )
+agg, sel = (cube, cells) if cells is not None else (engine, res.mask)
+ratio_median, ratio_mean = agg.ratio_stats(sel)
 
 # -------- KPI --------
 colA, colB, colC, colD = st.columns(4)
 with colA:
-    st.metric("Total lowongan (setelah filter)", f"{len(q):,}")
+    st.metric("Total lowongan (setelah filter)", f"{res.count:,}")
 with colB:
-    st.metric("Median rasio", f"{q['competition_ratio'].median(skipna=True):.2f}" if len(q) else "—")
+    st.metric("Median rasio", f"{ratio_median:.2f}" if res.count else "—")
 with colC:
-    st.metric("Rata-rata rasio", f"{q['competition_ratio'].mean(skipna=True):.2f}" if len(q) else "—")
+    st.metric("Rata-rata rasio", f"{ratio_mean:.2f}" if res.count else "—")
 with colD:
-    st.metric("Perusahaan unik", f"{q['nama_perusahaan'].nunique():,}" if len(q) else "—")
+    st.metric("Perusahaan unik", f"{agg.unique_count('nama_perusahaan', sel):,}" if res.count else "—")
+if agg is cube:
+    st.caption("KPI & grafik dari rollup: perusahaan unik ≈ (HyperLogLog).")
 
 st.divider()
 
 # -------- Tabel hasil --------
-st.subheader("Hasil (urut: kecocokan skill → rasio kecil → kuota besar)")
+if sort_choice == "priority":
+    st.subheader("Hasil (urut: priority score)")
+else:
+    st.subheader("Hasil (urut: kecocokan skill → rasio kecil → kuota besar)")
 cols_show = [
     "posisi", "kategori_posisi", "nama_perusahaan", "nama_provinsi",
-    "jumlah_kuota", "jumlah_terdaftar", "competition_ratio", "match_count"
+    "jumlah_kuota", "jumlah_terdaftar", "competition_ratio", "match_count", "priority_score"
 ]
-present = [c for c in cols_show if c in q.columns]
-
-# <<< CHANGED: logic "Semua" + safety cap >>>
-if top_choice == "Semua":
-    q_show = q[present].head(MAX_RENDER_ROWS)
-    if len(q) > MAX_RENDER_ROWS:
-        st.info(f"Menampilkan {MAX_RENDER_ROWS:,} baris pertama (dibatasi untuk performa).")
+present = [c for c in cols_show if c in df.columns or c == "match_count"]
+
+# hanya top-N baris yang disalin dari df
+q_show = df.iloc[res.order].assign(match_count=res.match_count[res.order])[present]
+if top_choice == "Semua" and res.count > MAX_RENDER_ROWS:
+    st.info(f"Menampilkan {MAX_RENDER_ROWS:,} baris pertama (dibatasi untuk performa).")
+
+event = st.dataframe(q_show, use_container_width=True, on_select="rerun", selection_mode="single-row")
+
+# Deskripsi lengkap dibaca per posting saat baris dipilih (tidak ikut dimuat di awal)
+picked = event.selection.rows if event is not None else []
+if picked and "id_posisi" in df.columns:
+    row = df.iloc[res.order[picked[0]]]
+    with st.expander(f"📄 {row['posisi']} — {row['nama_perusahaan']}", expanded=True):
+        text = load_description(indexes["source"], str(row["id_posisi"]))
+        if text and text.get("deskripsi_posisi"):
+            st.markdown(text["deskripsi_posisi"])
+            if text.get("alamat_perusahaan"):
+                st.caption(f"📍 {text['alamat_perusahaan']}")
+        else:
+            st.info("Deskripsi tidak tersedia untuk posting ini.")
 else:
-    n = int(top_choice)
-    q_show = q[present].head(n)
-
-st.dataframe(q_show, use_container_width=True)
+    st.caption("Pilih satu baris untuk melihat deskripsi lengkap posting.")
 
 # Download CSV
 csv_bytes = q_show.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
@@ -222,37 +370,25 @@ st.download_button("⬇️ Download CSV", data=csv_bytes, file_name="peluang_mag
 st.divider()
 
 # -------- Charts --------
-import matplotlib.pyplot as plt
+# grafik native (Vega-Lite) per kombinasi filter; rerun lain (pilih baris, download) = cache hit
+charts = (None, None)
+if res.count:
+    chart_key = _filter_key(
+        indexes["source"], df.attrs.get("last_updated_ts"), agg is cube, prov_choice, kat_choice,
+        keyword.strip().lower(), max_ratio, sorted(must_skills),
+    )
+    charts = chart_specs(chart_key, agg, sel)
 
 left, right = st.columns(2)
-
-with left:
-    st.markdown("### Provinsi dengan perusahaan terbanyak (Top 10, setelah filter)")
-    if len(q):
-        series = q.groupby("nama_provinsi")["nama_perusahaan"].nunique().sort_values(ascending=False).head(10)
-        fig, ax = plt.subplots(figsize=(6, 4))
-        series.sort_values(ascending=True).plot(kind="barh", ax=ax)
-        ax.set_title("Perusahaan unik per provinsi")
-        ax.set_xlabel("Jumlah perusahaan")
-        ax.set_ylabel("Provinsi")
-        plt.tight_layout()
-        st.pyplot(fig)
-    else:
-        st.info("Tidak ada data untuk ditampilkan.")
-
-with right:
-    st.markdown("### Posisi dengan pendaftar terbanyak (Top 10, setelah filter)")
-    if len(q):
-        series = q.groupby("posisi")["jumlah_terdaftar"].sum().sort_values(ascending=False).head(10)
-        fig, ax = plt.subplots(figsize=(6, 4))
-        series.sort_values(ascending=True).plot(kind="barh", ax=ax)
-        ax.set_title("Total pendaftar per posisi")
-        ax.set_xlabel("Jumlah pendaftar")
-        ax.set_ylabel("Posisi")
-        plt.tight_layout()
-        st.pyplot(fig)
-    else:
-        st.info("Tidak ada data untuk ditampilkan.")
+headings = ("### Provinsi dengan perusahaan terbanyak (Top 10, setelah filter)",
+            "### Posisi dengan pendaftar terbanyak (Top 10, setelah filter)")
+for col, heading, spec in zip((left, right), headings, charts):
+    with col:
+        st.markdown(heading)
+        if spec is not None:
+            st.vega_lite_chart(spec=spec, use_container_width=True)
+        else:
+            st.info("Tidak ada data untuk ditampilkan.")
 
 st.divider()
 
@@ -269,6 +405,10 @@ with st.expander("ℹ️ Catatan metode"):
 2) `competition_ratio` (kecil lebih baik)
 3) `jumlah_kuota` (besar lebih baik)
 
+**Priority score** (opsional, dari `src/score.py`): rata-rata berbobot rasio persaingan,
+`skills_score`, sisa hari ke deadline, kuota, dan kebaruan posting (0–1, besar lebih baik).
+Bobot diatur di `config/params.yaml` → `score.priority_weights`.
+
 **Tips**:
 - Set *Batas rasio maksimum* ke **≤ 2.0** untuk fokus peluang tinggi.
 - Pakai keyword judul posisi (mis. `data`, `marketing`, `perawat`).
@@ -0,0 +1,108 @@
+# benchmarks/bench_app_charts.py
+"""
+Biaya grafik per rerun app.py (dua grafik top-10 setelah filter):
+  - lama : plt.subplots + barh + savefig PNG (yang dilakukan st.pyplot) tiap rerun,
+           figure tidak pernah ditutup → jumlah figure terbuka terus bertambah
+  - baru : spesifikasi Vega-Lite (dirender di browser) dari app._barh_spec, di-cache per
+           hash state filter (LRU); rerun tanpa ganti filter = lookup cache
+Jalur lama hanya diukur bila matplotlib terpasang. Lolos jika spesifikasi memuat data
+grafik yang sama (urut nilai turun) dan hit cache mengembalikan objek yang sama.
+
+Jalankan:
+  python -m benchmarks.bench_app_charts [--rows 30000] [--reruns 20]
+"""
+import io, sys, time, json, hashlib, argparse
+from collections import OrderedDict
+
+import numpy as np
+
+from benchmarks.bench_query import synthetic
+from src.query import VacancyQuery
+
+FILTERS = [dict(max_ratio=10.0), dict(province="prov3", max_ratio=10.0), dict(category="kat1", max_ratio=2.0)]
+
+# sama dengan app._filter_key / app._barh_spec (app.py tidak bisa di-import tanpa streamlit)
+def filter_key(*parts) -> str:
+    return hashlib.sha1(json.dumps(parts, default=str, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def barh_spec(series, title: str, xlabel: str, ylabel: str) -> dict:
+    return {
+        "title": title,
+        "height": 320,
+        "data": {"values": [{"label": str(k), "value": float(v)} for k, v in series.items()]},
+        "mark": {"type": "bar", "tooltip": True},
+        "encoding": {
+            "y": {"field": "label", "type": "nominal", "sort": "-x", "title": ylabel},
+            "x": {"field": "value", "type": "quantitative", "title": xlabel},
+        },
+    }
+
+def new_path(q: VacancyQuery, mask: np.ndarray) -> tuple[dict, dict]:
+    return (barh_spec(q.top_provinces_by_companies(mask, 10), "Perusahaan unik per provinsi",
+                      "Jumlah perusahaan", "Provinsi"),
+            barh_spec(q.top_titles_by_applicants(mask, 10), "Total pendaftar per posisi",
+                      "Jumlah pendaftar", "Posisi"))
+
+def old_path(plt, q: VacancyQuery, mask: np.ndarray) -> int:
+    """Render dua figure seperti app lama (tanpa close); return byte PNG."""
+    size = 0
+    for series in (q.top_provinces_by_companies(mask, 10), q.top_titles_by_applicants(mask, 10)):
+        fig, ax = plt.subplots(figsize=(6, 4))
+        series.sort_values(ascending=True).plot(kind="barh", ax=ax)
+        plt.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png")
+        size += buf.tell()
+    return size
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=30000)
+    ap.add_argument("--reruns", type=int, default=20, help="rerun per filter (mis. pilih baris, download)")
+    args = ap.parse_args()
+
+    q = VacancyQuery(synthetic(args.rows), {"ratio": np.arange(args.rows)})
+    masks = [q.run(**f).mask for f in FILTERS]
+    n = len(FILTERS) * args.reruns
+
+    cache, misses = OrderedDict(), 0
+    t0 = time.perf_counter()
+    for f, mask in zip(FILTERS, masks):
+        for _ in range(args.reruns):
+            key = filter_key("src", 0, False, f)
+            if key not in cache:
+                misses += 1
+                cache[key] = new_path(q, mask)
+            cache.move_to_end(key)
+    t_new = (time.perf_counter() - t0) / n
+
+    ok = True
+    for f, mask in zip(FILTERS, masks):
+        prov, titles = cache[filter_key("src", 0, False, f)]
+        for spec, series in ((prov, q.top_provinces_by_companies(mask, 10)),
+                             (titles, q.top_titles_by_applicants(mask, 10))):
+            vals = [v["value"] for v in spec["data"]["values"]]
+            ok &= vals == series.astype(float).tolist() and vals == sorted(vals, reverse=True)
+    ok &= cache[filter_key("src", 0, False, FILTERS[0])] is cache[filter_key("src", 0, False, FILTERS[0])]
+
+    print(f"\n{args.rows:,} baris | {len(FILTERS)} filter × {args.reruns} rerun")
+    print(f"  baru : {t_new * 1e3:8.3f} ms/rerun ({misses} miss, figure server 0, "
+          f"spesifikasi {sum(len(json.dumps(s)) for v in cache.values() for s in v) / len(cache) / 1e3:.1f} kB)")
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("  lama : [WARN] matplotlib tidak terpasang, jalur lama dilewati")
+    else:
+        t0 = time.perf_counter()
+        png = sum(old_path(plt, q, mask) for mask in masks for _ in range(args.reruns))
+        t_old = (time.perf_counter() - t0) / n
+        print(f"  lama : {t_old * 1e3:8.3f} ms/rerun, {len(plt.get_fignums())} figure terbuka, "
+              f"PNG {png / n / 1e3:.0f} kB/rerun")
+        plt.close("all")
+    print("[OK] data grafik identik, cache hit" if ok else "[FAIL] data grafik berbeda")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
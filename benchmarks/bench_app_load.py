@@ -0,0 +1,109 @@
+# benchmarks/bench_app_load.py
+"""
+Cold start app.py (load_live) pada file scored sintetis:
+  - lama : pd.read_parquet semua kolom (termasuk deskripsi, alamat, logo) lalu
+           cache_data = pickle + unpickle salinan tiap rerun
+  - baru : ParquetFile (memory-map, handle di-cache) + proyeksi APP_COLUMNS;
+           cache_resource = objek dibagi antar sesi (tanpa salinan per rerun)
+Deskripsi: TextFile.get per posting (file teks urut id_posisi, row group kecil).
+Lolos jika kolom hasil proyeksi identik dengan versi lama dan deskripsi dari
+TextFile sama dengan baris file lama.
+
+Jalankan:
+  python -m benchmarks.bench_app_load [--rows 30000 300000]
+"""
+import sys, time, pickle, argparse, tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from benchmarks.bench_query import synthetic
+from benchmarks.bench_schema_memory import frame_memory
+from src.clean_store import TextFile, write_text_file
+from src.score import write_scored
+from src.skill_index import BITS_COLUMN, SkillIndex
+
+# sama dengan app.APP_COLUMNS (app.py tidak bisa di-import tanpa streamlit)
+APP_COLUMNS = [
+    "id_posisi", "posisi", "kategori_posisi", "nama_perusahaan", "nama_provinsi",
+    "jumlah_kuota", "jumlah_terdaftar", "competition_ratio", "priority_score",
+    "ratio_order", "priority_rank", BITS_COLUMN,
+]
+FILLER = ("Membantu tim dalam menyusun laporan, mengolah data, berkoordinasi dengan unit kerja, "
+          "serta mendukung kegiatan operasional harian sesuai arahan pembimbing. ").split()
+
+def make_files(n: int, tmp: Path) -> tuple[Path, Path, Path, pd.DataFrame]:
+    """(file lama: semua kolom, file scored baru, file teks, frame sumber)."""
+    rng = np.random.default_rng(2)
+    df = synthetic(n)
+    df["id_posisi"] = [f"{i:08x}-{rng.integers(1 << 30):08x}" for i in range(n)]
+    df["deskripsi_posisi"] = [" ".join(rng.choice(FILLER, size=k)) for k in rng.integers(80, 300, n)]
+    df["alamat_perusahaan"] = [f"Jl. Contoh No. {i % 997}, Kelurahan {i % 89}, Kota {i % 41}" for i in range(n)]
+    df["logo"] = [f"https://maganghub.kemnaker.go.id/be/v1/storage/uploads/logo/2025/11/{i % 5000:032x}.jpg"
+                  for i in range(n)]
+    skills = SkillIndex.from_lists(df["skills_extracted"])
+    p_old, p_new, p_text = tmp / "old.parquet", tmp / "scored.parquet", tmp / "text.parquet"
+    write_scored(df, p_old, {"k": 0}, skills)
+    write_scored(df.drop(columns=["deskripsi_posisi", "alamat_perusahaan"]), p_new, {"k": 0}, skills)
+    write_text_file(df, p_text)
+    return p_old, p_new, p_text, df
+
+def bench(n: int, lookups: int) -> bool:
+    with tempfile.TemporaryDirectory() as tmp:
+        p_old, p_new, p_text, src = make_files(n, Path(tmp))
+
+        t0 = time.perf_counter()
+        old = pd.read_parquet(p_old)
+        t_old_read = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        old = pickle.loads(pickle.dumps(old))  # cache_data: salinan baru tiap rerun
+        t_old_rerun = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        pf = pq.ParquetFile(p_new, memory_map=True)
+        new = pf.read(columns=[c for c in APP_COLUMNS if c in pf.schema_arrow.names]).to_pandas()
+        t_new_read = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        tf = TextFile(p_text)
+        t_open = time.perf_counter() - t0
+        rng = np.random.default_rng(3)
+        picks = rng.choice(src["id_posisi"].to_numpy(), size=lookups)
+        t0 = time.perf_counter()
+        got = [tf.get(i) for i in picks]
+        t_get = (time.perf_counter() - t0) / lookups
+        t0 = time.perf_counter()
+        pd.read_parquet(p_old, columns=["id_posisi", "deskripsi_posisi"])  # tanpa file teks: baca kolom penuh
+        t_full_col = time.perf_counter() - t0
+
+        ok = all(new[c].equals(old[c]) for c in new.columns)
+        by_id = src.set_index("id_posisi")
+        ok &= all(g is not None and g["deskripsi_posisi"] == by_id.at[i, "deskripsi_posisi"]
+                  and g["alamat_perusahaan"] == by_id.at[i, "alamat_perusahaan"] for g, i in zip(got, picks))
+        ok &= tf.get("tidak-ada") is None
+        sizes = (p_old.stat().st_size, p_new.stat().st_size, p_text.stat().st_size)
+
+    m_old, m_new = frame_memory(old).sum(), frame_memory(new).sum()
+    print(f"\n{n:,} baris | file {sizes[0] / 1e6:.1f} MB → scored {sizes[1] / 1e6:.1f} MB + teks {sizes[2] / 1e6:.1f} MB")
+    print(f"  cold start (baca file)   : {t_old_read * 1e3:8.1f} ms → {t_new_read * 1e3:7.1f} ms")
+    print(f"  per rerun (salinan cache): {t_old_rerun * 1e3:8.1f} ms → {0:7.1f} ms (cache_resource)")
+    print(f"  memori DataFrame         : {m_old / 1e6:8.1f} MB → {m_new / 1e6:7.1f} MB "
+          f"({len(old.columns)} → {len(new.columns)} kolom)")
+    print(f"  deskripsi 1 posting      : {t_full_col * 1e3:8.1f} ms (kolom penuh) → {t_get * 1e3:7.2f} ms "
+          f"(TextFile, buka handle {t_open * 1e3:.1f} ms sekali)")
+    return ok
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[30000, 300000])
+    ap.add_argument("--lookups", type=int, default=50, help="jumlah deskripsi yang dibuka")
+    args = ap.parse_args()
+
+    ok = all([bench(n, args.lookups) for n in args.rows])
+    print("[OK] kolom + deskripsi identik" if ok else "[FAIL] hasil berbeda")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+# benchmarks/bench_category.py
+"""
+Kesepakatan + throughput kategori posisi (config/categories.yaml):
+  - vektor  : CategoryMatcher.classify (satu regex trie, judul unik)
+  - skalar  : CategoryMatcher.classify_one per baris (semantik category.ts)
+  - lama    : salinan enrichCategory category.ts sebelum aturan dipindah ke yaml
+  - web     : category.ts sungguhan via node + typescript (web/node_modules, `cd web && npm ci`);
+              [FAIL] jika node / typescript tidak tersedia
+Juga dicek: web/src/utils/category_rules.json sama dengan hasil --emit-bundle.
+
+Lolos jika semua keluaran identik untuk judul run sampel (+ kasus sulit),
+diulang sampai >= 30k baris.
+
+Jalankan:
+  python -m benchmarks.bench_category [data/raw/run_xxx] [--rows 30000]
+"""
+import sys, json, time, shutil, argparse, subprocess
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.category import BUNDLE_PATH, get_matcher
+from src.prepare import iter_raw_items
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+CATEGORY_TS = ROOT / "web" / "src" / "utils" / "category.ts"
+
+# ---------- salinan category.ts lama (referensi) ----------
+LEGACY_RULES = [
+    ("Mobile Development", ["android", "ios", "mobile", "flutter", "react native", "kotlin", "swift"]),
+    ("Web & Software Dev", ["frontend", "backend", "full stack", "web", "software", "website", "programmer", "developer", "application"]),
+    ("UI/UX Design", ["ui/ux", "product design", "user interface", "experience", "figma"]),
+    ("Data & AI", ["data", "analyst", "science", "ai", "machine learning", "statistics", "statistik", "big data"]),
+    ("Network & Security", ["network", "security", "cyber", "infra", "sysadmin", "devops", "cloud", "jaringan", "server"]),
+    ("IT Support & Infra", ["it support", "helpdesk", "teknisi komputer", "pranata komputer", "information technology", "teknik informatika"]),
+    ("Creative Design & Multimedia", ["graphic", "desain grafis", "illustrator", "video", "motion", "editor", "animator", "multimedia", "visual", "art director"]),
+    ("Content & Social Media", ["social media", "content", "copywrit", "creative", "sosial media", "kampanye", "journalist", "reporter"]),
+    ("Marketing, Branding & PR", ["marketing", "market", "seo", "brand", "digital", "pemasaran", "iklan", "advertising", "humas", "public relation", "hubungan masyarakat", "pranata humas"]),
+    ("Sales & BizDev", ["sales", "business dev", "account", "penjualan", "bisnis", "niaga", "commercial"]),
+    ("Finance & Accounting", ["finance", "account", "tax", "pajak", "audit", "akuntansi", "keuangan", "fiskal", "perbankan"]),
+    ("Human Resources", ["hr", "human", "recruit", "talent", "people", "sumber daya", "personalia", "training", "diklat"]),
+    ("Public Sector & Administration", ["pembina", "penelaah", "pengelola", "pranata", "analis kebijakan", "fungsional", "arsip", "pustaka", "perencana", "pemerintahan", "protokol", "ajudan"]),
+    ("General Admin & Support", ["admin", "sekretaris", "data entry", "general affair", "operasional kantor", "clerk", "receptionist", "front office", "frontliner", "duta layanan"]),
+    ("Engineering & Construction", ["teknisi", "engineer", "mekanik", "listrik", "electro", "mesin", "civil", "sipil", "drafter", "architecture", "arsitek", "konstruksi", "planologi", "lingkungan"]),
+    ("Quality Control & Assurance", ["quality", "qc", "qa", "penguji"]),
+    ("Health & Medical", ["dokter", "medis", "perawat", "ners", "bidan", "farmasi", "apoteker", "gizi", "kesehatan", "laboratorium", "psikolog", "terapis", "radiografer", "sanitarian"]),
+    ("Science & Research", ["research", "peneliti", "enumerator", "surveyor", "laboran", "biologi", "kimia", "fisika"]),
+    ("Operations & Logistics", ["operas", "logistik", "warehouse", "supply", "gudang", "pengadaan", "inventaris", "purchasing", "procurement", "ppic"]),
+    ("Hospitality & Tourism", ["hotel", "cook", "chef", "kitchen", "barista", "waiter", "room", "housekeeping", "pariwisata", "tour"]),
+    ("Legal", ["hukum", "legal", "law", "advokasi", "perundang"]),
+    ("Education & Training", ["guru", "pengajar", "instruktur", "tutor", "kurikulum", "pendidikan", "dosen"]),
+]
+
+def legacy_enrich(pos, current):
+    if not pos:
+        return "Lainnya"
+    p = pos.lower()
+    for cat, kws in LEGACY_RULES:
+        if any(k in p for k in kws):
+            return cat
+    if current and current not in ("Lainnya", "Other", ""):
+        return current
+    return "Lainnya"
+
+# teks sulit: keyword bertumpuk/awalan, huruf besar, newline, kosong
+EDGE_CASES = [
+    ("Data Entry Operator", "Other"),
+    ("PRANATA HUMAS Ahli", ""),
+    ("Teknisi Komputer", None),
+    ("data\nentry", "Lainnya"),
+    ("Juru Masak", "Hospitality"),
+    ("Penata Taman", "Pertamanan"),
+    ("", "Pertamanan"),
+]
+
+# category.ts ditranspilasi typescript → CommonJS lalu dijalankan (require json bundle relatif)
+NODE_RUNNER = r"""
+const fs = require('fs'), path = require('path'), Module = require('module');
+const [tsFile, webDir] = process.argv.slice(1);  // node -e: argv[1..] = argumen
+const ts = require(require.resolve('typescript', { paths: [webDir, ...(process.env.NODE_PATH || '').split(path.delimiter).filter(Boolean)] }));
+const out = ts.transpileModule(fs.readFileSync(tsFile, 'utf8'), {
+  compilerOptions: { module: ts.ModuleKind.CommonJS, esModuleInterop: true, target: ts.ScriptTarget.ES2017 },
+}).outputText;
+const m = new Module(tsFile, module);
+m.filename = tsFile;
+m.paths = Module._nodeModulePaths(path.dirname(tsFile));
+m._compile(out, tsFile);
+const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+process.stdout.write(JSON.stringify(input.map(([p, c]) => m.exports.enrichCategory(p, c))));
+"""
+
+def run_web(pairs: list) -> list:
+    """Jalankan category.ts sungguhan. Gagal keras (RuntimeError) bila node / typescript tidak ada:
+    cek ini tidak boleh diam-diam dilewati (tests/test_category.py, CI)."""
+    if shutil.which("node") is None:
+        raise RuntimeError("node tidak ditemukan → cek category.ts tidak bisa dijalankan")
+    proc = subprocess.run(
+        ["node", "-e", NODE_RUNNER, str(CATEGORY_TS), str(ROOT / "web")],
+        input=json.dumps(pairs), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        if "Cannot find module 'typescript'" in proc.stderr:
+            raise RuntimeError("typescript belum terpasang → jalankan: cd web && npm ci")
+        raise RuntimeError(proc.stderr)
+    return json.loads(proc.stdout)
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("run_dir", nargs="?", default=str(SAMPLE_RUN))
+    ap.add_argument("--rows", type=int, default=30000)
+    args = ap.parse_args()
+
+    m = get_matcher()
+    items = [(x.get("posisi"), x.get("kategori_posisi")) for x in iter_raw_items(Path(args.run_dir))]
+    base = items + EDGE_CASES
+    pairs = (base * (args.rows // len(base) + 1))[: max(args.rows, len(base))]
+    titles = pd.Series([p for p, _ in pairs], dtype=object)
+    current = pd.Series([c for _, c in pairs], dtype=object)
+
+    results, timings = {}, {}
+    for name, fn in (
+        ("lama", lambda: [legacy_enrich(p, c) for p, c in pairs]),
+        ("skalar", lambda: [m.classify_one(p, c) for p, c in pairs]),
+        ("vektor", lambda: m.classify(titles, current).tolist()),
+    ):
+        fn()  # pemanasan (kompilasi regex, cache)
+        t0 = time.perf_counter()
+        results[name] = fn()
+        timings[name] = time.perf_counter() - t0
+    try:
+        web = run_web(base)
+    except RuntimeError as e:
+        print(f"[FAIL] category.ts: {e}")
+        return 1
+    results["web"] = (web * (len(pairs) // len(base) + 1))[: len(pairs)]
+
+    ok = True
+    ref = np.array(results["lama"], dtype=object)
+    for name, res in results.items():
+        diff = np.flatnonzero(np.array(res, dtype=object) != ref)
+        for i in diff[:5]:
+            print(f"[FAIL] {name} #{i} {pairs[i]!r}: {res[i]!r} != {ref[i]!r}")
+        ok &= not len(diff)
+
+    fresh = BUNDLE_PATH.exists() and json.loads(BUNDLE_PATH.read_text(encoding="utf-8")) == m.bundle()
+    if not fresh:
+        print(f"[FAIL] {BUNDLE_PATH.name} basi → python -m src.category --emit-bundle")
+    ok &= fresh
+
+    print(f"\n{'path':<7} {'ms':>8} {'baris/s':>10}")
+    for name, t in timings.items():
+        print(f"{name:<7} {t * 1e3:>8.1f} {len(pairs) / t:>10.0f}")
+    print(f"{titles.nunique()} judul unik | speedup vs skalar {timings['skalar'] / timings['vektor']:.1f}x")
+    checked = ", ".join(results) + ", bundle"
+    print(f"[OK] {len(pairs)} baris identik ({checked})" if ok else "[FAIL] keluaran berbeda")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
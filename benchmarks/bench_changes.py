@@ -0,0 +1,123 @@
+# benchmarks/bench_changes.py
+"""
+Deteksi perubahan record (src/changes.py) pada salinan repo sementara:
+
+  run A : run RAW sampel (mode full) → snapshot awal + data/state/records.parquet
+  run B : run A dengan perubahan yang diketahui — N_NEW posting baru, N_DROP posting hilang,
+          jumlah_terdaftar / deskripsi_posisi diubah pada sebagian posting, dan N_DUP item
+          diulang di halaman lain (pergeseran halaman saat crawl)
+
+  - inkremental : prepare run B dengan indeks → hanya new + updated yang diproses
+  - rebuild     : prepare run B tanpa indeks (semua baris diproses ulang)
+
+Mencetak ringkasan perubahan yang terdeteksi + waktu prepare inkremental vs rebuild.
+Ketepatan ringkasan dan kesamaan snapshot inkremental/rebuild diuji di tests/test_changes.py
+(memakai helper modul ini).
+
+Jalankan:
+  python -m benchmarks.bench_changes
+"""
+import ast, sys, json, time, random, shutil, tempfile, subprocess
+from pathlib import Path
+
+from src.clean_store import read_latest
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+RUN_A = "run_20251201_000000_changes0"
+RUN_B = "run_20251202_000000_changes1"
+N_NEW, N_DROP, N_COUNTS, N_DESC, N_DUP = 150, 300, 400, 60, 40
+
+def load_items(run_dir: Path) -> list[dict]:
+    items = []
+    for p in sorted(run_dir.glob("page_*.json")):
+        items.extend(json.loads(p.read_text(encoding="utf-8")).get("data") or [])
+    return items
+
+def write_run(root: Path, run_id: str, items: list[dict], started_at: str) -> None:
+    run_dir = root / "data" / "raw" / run_id
+    run_dir.mkdir(parents=True)
+    for k in range(0, len(items), 100):
+        page = {"data": items[k:k + 100]}
+        (run_dir / f"page_{k // 100 + 1:05d}.json").write_text(json.dumps(page), encoding="utf-8")
+    meta = {"run_id": run_id, "started_at": started_at, "mode": "full", "status": "complete"}
+    (run_dir / "run_meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+def make_root(dst: Path, items: list[dict]) -> Path:
+    for rel in ["src", "config"]:
+        shutil.copytree(ROOT / rel, dst / rel, ignore=shutil.ignore_patterns("__pycache__"))
+    write_run(dst, RUN_A, items, "2025-12-01T00:00:00+00:00")
+    return dst
+
+def mutate(items: list[dict], rng: random.Random) -> tuple[list[dict], dict]:
+    """Run B + ringkasan perubahan yang seharusnya terdeteksi."""
+    unique = list({it["id_posisi"]: it for it in items}.values())
+    ids = [it["id_posisi"] for it in unique]
+    dropped = set(rng.sample(ids, N_DROP))
+    rest = [i for i in ids if i not in dropped]
+    counts = set(rng.sample(rest, N_COUNTS))
+    desc = set(rng.sample(sorted(set(rest) - counts), N_DESC))
+    out, seen = [], set()
+    for it in items:
+        rid = it["id_posisi"]
+        if rid in dropped or rid in seen:
+            continue  # duplikat run A juga dibuang, N_DUP di bawah jadi satu-satunya duplikat
+        seen.add(rid)
+        it = json.loads(json.dumps(it))
+        if rid in counts:
+            it["jumlah_terdaftar"] = (it.get("jumlah_terdaftar") or 0) + 1
+        if rid in desc:
+            it["deskripsi_posisi"] = (it.get("deskripsi_posisi") or "") + "\nMenguasai Python dan SQL."
+        out.append(it)
+    fresh = [{**json.loads(json.dumps(rng.choice(unique))), "id_posisi": f"baru-{k:05d}"} for k in range(N_NEW)]
+    out = fresh + out
+    out[1000:1000] = out[3000:3000 + N_DUP]
+    expected = {"records": len(out), "duplicates": N_DUP, "new": N_NEW, "updated": N_COUNTS + N_DESC,
+                "unchanged": len(rest) - N_COUNTS - N_DESC, "removed": N_DROP,
+                "updated_fields": {"jumlah_terdaftar": N_COUNTS, "deskripsi_posisi": N_DESC}}
+    return out, expected
+
+def prepare(root: Path) -> float:
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "-m", "src.prepare"], cwd=root, capture_output=True, text=True)
+    if out.returncode != 0:
+        print(out.stdout[-2000:], out.stderr[-2000:])
+        raise SystemExit(f"[FAIL] prepare di {root} → exit {out.returncode}")
+    return time.perf_counter() - t0
+
+def change_entry(root: Path, run_id: str) -> dict:
+    lines = (root / "logs" / f"{run_id}.log").read_text(encoding="utf-8").splitlines()
+    return [e for e in map(ast.literal_eval, lines) if e.get("stage") == "changes"][-1]
+
+def snapshot(root: Path):
+    df = read_latest(root / "data" / "clean" / "vacancies", with_text=True)
+    return df.sort_values("id_posisi", kind="stable").reset_index(drop=True)
+
+def main() -> int:
+    rng = random.Random(25)
+    items = load_items(SAMPLE_RUN)
+    items_b, expected = mutate(items, rng)
+    with tempfile.TemporaryDirectory() as td:
+        inc = make_root(Path(td) / "inkremental", items)
+        t_a = prepare(inc)
+        full = Path(td) / "rebuild"
+        shutil.copytree(inc, full)
+        (full / "data" / "state" / "records.parquet").unlink()
+        for root in (inc, full):
+            write_run(root, RUN_B, items_b, "2025-12-02T00:00:00+00:00")
+        t_inc = prepare(inc)
+        t_full = prepare(full)
+        got = change_entry(inc, RUN_B)
+        a, b = snapshot(inc), snapshot(full)
+
+    print(f"\nrun A: {len(items):,} item | run B: {expected['records']:,} item")
+    print(f"  terdeteksi : {got['new']} baru, {got['updated']} diperbarui {got['updated_fields']}, "
+          f"{got['unchanged']} tetap, {got['removed']} hilang, {got['duplicates']} duplikat")
+    print(f"  diharapkan : {expected['new']} baru, {expected['updated']} diperbarui {expected['updated_fields']}, "
+          f"{expected['unchanged']} tetap, {expected['removed']} hilang, {expected['duplicates']} duplikat")
+    print(f"  prepare B  : inkremental {t_inc:.2f}s vs rebuild {t_full:.2f}s (run A {t_a:.2f}s)"
+          f" | {len(a):,} vs {len(b):,} baris")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
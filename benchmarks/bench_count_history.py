@@ -0,0 +1,102 @@
+# benchmarks/bench_count_history.py
+"""
+Riwayat counts sintetis: N run (12 jam sekali) × M posting aktif.
+
+Tiap run: ~60% posting dapat pendaftar baru (Poisson), ~1% kuota berubah,
+~2% posting pensiun dan diganti posting baru. Diukur:
+  - ukuran data/state/counts (keyframe + diff + kamus id) vs snapshot penuh
+    naif (id_posisi string + ts + int64 per run, parquet default; diekstrapolasi)
+  - waktu append per run
+  - waktu velocity() (jendela 7 hari) di akhir riwayat
+Lolos jika laju dari velocity() sama dengan hitungan langsung dari data sintetis.
+
+Jalankan:
+  python -m benchmarks.bench_count_history [--runs 700] [--postings 30000]
+"""
+import sys, time, uuid, argparse, tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.count_history import append_counts, velocity
+
+def dir_bytes(d: Path) -> int:
+    return sum(p.stat().st_size for p in d.iterdir() if p.is_file())
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=700)
+    ap.add_argument("--postings", type=int, default=30000)
+    ap.add_argument("--naive-sample", type=int, default=5, help="run yang ditulis naif untuk ekstrapolasi")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(42)
+    t0_run = pd.Timestamp("2025-01-01T00:00:00Z")
+    ids = np.array([str(uuid.UUID(int=int(x))) for x in rng.integers(0, 2**63, args.postings)], dtype=object)
+    terdaftar = rng.poisson(20, args.postings).astype("int64")
+    kuota = rng.integers(1, 10, args.postings).astype("int64")
+    history = []  # (run_ts, DataFrame) untuk referensi laju
+
+    append_s, naive_bytes = [], 0
+    with tempfile.TemporaryDirectory() as td:
+        hist_dir, naive_dir = Path(td) / "counts", Path(td) / "naive"
+        naive_dir.mkdir()
+        for r in range(args.runs):
+            if r:
+                terdaftar = terdaftar + rng.poisson(2, len(ids)) * (rng.random(len(ids)) < 0.6)
+                bump = rng.random(len(ids)) < 0.01
+                kuota = np.where(bump, kuota + 1, kuota)
+                retire = rng.random(len(ids)) < 0.02
+                n_new = int(retire.sum())
+                ids = ids.copy()
+                ids[retire] = [str(uuid.UUID(int=int(x))) for x in rng.integers(0, 2**63, n_new)]
+                terdaftar = np.where(retire, 0, terdaftar)
+            run_ts = t0_run + pd.Timedelta(hours=12 * r)
+            run_id = f"run_{run_ts:%Y%m%d_%H%M%S}_bench"
+            df = pd.DataFrame({"id_posisi": ids, "jumlah_terdaftar": terdaftar, "jumlah_kuota": kuota})
+
+            t0 = time.perf_counter()
+            append_counts(run_id, run_ts, df, hist_dir)
+            append_s.append(time.perf_counter() - t0)
+
+            if r < args.naive_sample:
+                naive = df.assign(ts=run_ts)
+                p = naive_dir / f"{run_id}.parquet"
+                pq.write_table(pa.Table.from_pandas(naive, preserve_index=False), p)
+                naive_bytes += p.stat().st_size
+            if r >= args.runs - 15:
+                history.append((run_ts, df))
+            if (r + 1) % 100 == 0:
+                print(f"[INFO] {r + 1} run | append rata-rata {np.mean(append_s[-100:]) * 1e3:.1f} ms")
+
+        t0 = time.perf_counter()
+        vel = velocity(hist_dir, 7.0)
+        query_s = time.perf_counter() - t0
+        size = dir_bytes(hist_dir)
+        n_files = len(list(hist_dir.iterdir()))
+
+    # referensi: jendela 7 hari = 14 run terakhir; basis = run awal jendela (posting lama)
+    now_ts, now_df = history[-1]
+    start_ts, start_df = next((t, d) for t, d in history if t >= now_ts - pd.Timedelta(days=7))
+    ref = now_df.set_index("id_posisi")["jumlah_terdaftar"]
+    base = start_df.drop_duplicates("id_posisi").set_index("id_posisi")["jumlah_terdaftar"]
+    common = ref.index.intersection(base.index)
+    expected = (ref[common] - base[common]) / ((now_ts - start_ts).total_seconds() / 86400)
+    got = vel["applicants_per_day"].reindex(common)
+    ok = bool(np.allclose(got.to_numpy(float), expected.to_numpy(float)))
+
+    naive_total = naive_bytes / min(args.naive_sample, args.runs) * args.runs
+    print(f"\n{args.runs} run × {args.postings} posting")
+    print(f"  riwayat counts : {size / 1e6:8.1f} MB ({n_files} file)")
+    print(f"  snapshot naif  : {naive_total / 1e6:8.1f} MB (ekstrapolasi {args.naive_sample} run)")
+    print(f"  rasio          : {naive_total / size:8.1f}x lebih kecil")
+    print(f"  append per run : median {np.median(append_s) * 1e3:.1f} ms, maks {max(append_s) * 1e3:.1f} ms")
+    print(f"  velocity()     : {query_s * 1e3:.1f} ms ({len(vel)} posting)")
+    print("[OK] laju sesuai referensi" if ok else "[FAIL] laju berbeda dari referensi")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
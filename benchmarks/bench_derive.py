@@ -0,0 +1,62 @@
+# benchmarks/bench_derive.py
+"""
+Timing tahap turunan prepare (tanpa ekstraksi skill):
+  - lama : apply per baris (compute_competition_ratio, compute_days_to_deadline,
+           safe_parse_json_field)
+  - baru : add_derived_columns + parse_json_column (per kolom)
+
+Kesetaraan hasil kedua versi diuji di tests/test_prepare_derive.py.
+
+Jalankan:
+  python -m benchmarks.bench_derive [data/raw/run_xxx]
+"""
+import sys, time
+from pathlib import Path
+import pandas as pd
+
+from src.prepare import (add_derived_columns, compute_competition_ratio, compute_days_to_deadline,
+                         flatten_vacancy, load_all_raw_json, parse_json_column,
+                         safe_parse_json_field, today_ts)
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+
+def legacy_derive(df: pd.DataFrame, today: pd.Timestamp) -> pd.DataFrame:
+    df["program_studi"] = df["program_studi_raw"].apply(safe_parse_json_field)
+    df["jenjang"] = df["jenjang_raw"].apply(safe_parse_json_field)
+    df["competition_ratio"] = df.apply(
+        lambda x: compute_competition_ratio(x["jumlah_terdaftar"], x["jumlah_kuota"]), axis=1
+    )
+    # skema clean menyimpan float (NaN untuk tanggal kosong)
+    df["days_to_deadline"] = df["tanggal_pendaftaran_akhir"].apply(
+        lambda v: compute_days_to_deadline(v, today)
+    ).astype(float)
+    return df
+
+def vector_derive(df: pd.DataFrame, today: pd.Timestamp) -> pd.DataFrame:
+    df["program_studi"] = parse_json_column(df["program_studi_raw"])
+    df["jenjang"] = parse_json_column(df["jenjang_raw"])
+    return add_derived_columns(df, today)
+
+def main() -> int:
+    run_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else SAMPLE_RUN
+    base = pd.DataFrame([flatten_vacancy(x) for x in load_all_raw_json(run_dir)])
+    today = today_ts()
+
+    timings = {}
+    for name, fn in (("apply per baris", legacy_derive), ("per kolom", vector_derive)):
+        best = float("inf")
+        for _ in range(3):
+            df = base.copy()
+            t0 = time.perf_counter()
+            fn(df, today)
+            best = min(best, time.perf_counter() - t0)
+        timings[name] = best
+
+    t_old, t_new = timings["apply per baris"], timings["per kolom"]
+    print(f"\n{len(base)} baris | apply per baris {t_old * 1e3:.1f} ms | per kolom {t_new * 1e3:.1f} ms "
+          f"| {t_old / t_new:.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
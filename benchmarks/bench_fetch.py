@@ -0,0 +1,140 @@
+# benchmarks/bench_fetch.py
+"""
+Fetcher terhadap server lokal src/mock_api.py (item run sampel, bentuk respons API asli),
+tanpa jaringan:
+
+  1. skala  : concurrency 1/2/4/8, latensi tetap, rate limit server SERVER_RPS
+  2. retry  : injeksi 429/5xx acak (ERROR_RATE, Retry-After 0) → semua halaman tetap masuk
+  3. rekam  : fetch --record dari server ber-error, server dimatikan, lalu --replay
+
+Lolos jika:
+  - halaman/detik naik seiring concurrency (sampai batas max_rps)
+  - laju request terukur di server tidak pernah melebihi max_rps (+1 burst)
+  - tidak ada 429 pada uji skala (limiter bersama menahan semua worker)
+  - run dengan error injeksi dan run replay lengkap dan isi RAW-nya identik dengan run bersih
+
+Jalankan:
+  python -m benchmarks.bench_fetch
+"""
+import sys, time, tempfile
+from pathlib import Path
+
+from src.fetch import RunManifest, run_fetch
+from src.mock_api import MockAPI, ReplayData
+from src.raw_store import iter_raw_pages
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+PAGES = 40
+LIMIT = 10
+LATENCY_S = 0.2
+SERVER_RPS = 20
+MAX_RPS = 15
+LEVELS = [1, 2, 4, 8]
+ERROR_RATE = 0.2
+
+def peak_rps(hits: list[float]) -> int:
+    """Jumlah request maksimum di jendela geser 1 detik."""
+    hits = sorted(hits)
+    best, j = 0, 0
+    for i, t in enumerate(hits):
+        while t - hits[j] >= 1.0:
+            j += 1
+        best = max(best, i - j + 1)
+    return best
+
+def make_cfg(url: str, tmp: Path, concurrency: int, max_rps: float = MAX_RPS, **run) -> dict:
+    return {
+        "project": {"timezone": "Asia/Jakarta"},
+        "source": {
+            "url": url,
+            "params": {"page": 1, "limit": LIMIT},
+            "headers": {"Accept": "application/json"},
+        },
+        "run": {
+            "timeout_s": 10, "max_retries": 5, "retry_backoff_s": 1,
+            "respect_rate_limit": True, "concurrency": concurrency, "max_rps": max_rps, **run,
+        },
+        "output": {"raw_dir": str(tmp / "raw"), "logs_dir": str(tmp / "logs"),
+                   "state_dir": str(tmp / "state"), "raw_format": "jsonl.gz"},
+    }
+
+def fetch(cfg: dict) -> tuple[float, Path]:
+    t0 = time.monotonic()
+    run_dir = run_fetch(cfg)
+    return time.monotonic() - t0, run_dir
+
+def pages_of(run_dir: Path) -> dict:
+    return {p: payload["data"] for p, payload in iter_raw_pages(run_dir)}
+
+def main() -> int:
+    data = ReplayData(SAMPLE_RUN, max_items=PAGES * LIMIT)
+    ok = True
+    with tempfile.TemporaryDirectory() as td:
+        tmp = Path(td)
+
+        # 1. skala
+        server = MockAPI(data, latency_s=LATENCY_S, rps=SERVER_RPS).start()
+        results = {}
+        for c in LEVELS:
+            server.stats.reset()
+            elapsed, run_dir = fetch(make_cfg(server.url, tmp, c))
+            n_pages = sum(1 for _ in iter_raw_pages(run_dir))
+            results[c] = {"pages": n_pages, "elapsed_s": round(elapsed, 3),
+                          "pages_per_s": round(n_pages / elapsed, 2),
+                          "peak_rps": peak_rps(server.stats.hits), "http_429": server.stats.status[429]}
+        clean = pages_of(run_dir)
+        server.shutdown()
+        server.server_close()
+
+        # 2. retry: 429/5xx acak, Retry-After 0 supaya cepat
+        # max_retries longgar: error acak bisa beruntun pada satu halaman
+        server = MockAPI(data, latency_s=0.01, error_rate=ERROR_RATE, retry_after_s=0).start()
+        t_err, run_err = fetch(make_cfg(server.url, tmp, 4, max_rps=100, retry_backoff_s=0, max_retries=10))
+        err_status = dict(server.stats.status)
+
+        # 3. rekam dari server ber-error, lalu putar ulang tanpa server
+        server.stats.reset()
+        cassette = tmp / "cassette"
+        t_rec, run_rec = fetch(make_cfg(server.url, tmp, 4, max_rps=100, retry_backoff_s=0, max_retries=10,
+                                        transport="record", cassette_dir=str(cassette)))
+        n_recorded = server.stats.snapshot()["requests"]
+        server.shutdown()
+        server.server_close()
+        t_rep, run_rep = fetch(make_cfg("http://127.0.0.1:9/tidak-ada", tmp, 4, max_rps=1000, retry_backoff_s=0,
+                                        transport="replay", cassette_dir=str(cassette)))
+        differs = [name for name, run_dir in (("retry", run_err), ("rekam", run_rec), ("replay", run_rep))
+                   if RunManifest.load(run_dir).meta.get("status") != "complete" or pages_of(run_dir) != clean]
+
+    print(f"\n1. skala (latensi {LATENCY_S}s, server {SERVER_RPS} rps, max_rps {MAX_RPS}, {PAGES} halaman)")
+    print(f"{'conc':>6} {'pages':>5} {'elapsed':>8} {'pages/s':>8} {'peak_rps':>8} {'429':>4}")
+    for c, r in results.items():
+        print(f"{c:>6} {r['pages']:>5} {r['elapsed_s']:>8} {r['pages_per_s']:>8} {r['peak_rps']:>8} {r['http_429']:>4}")
+    print(f"2. retry  : {t_err:.2f}s | status server {err_status}")
+    print(f"3. rekam  : {t_rec:.2f}s ({n_recorded} respons) | replay {t_rep:.2f}s "
+          f"({PAGES / t_rep if t_rep > 0 else 0:.0f} halaman/s, tanpa jaringan)")
+
+    if results[4]["pages_per_s"] < 2 * results[1]["pages_per_s"]:
+        print("[FAIL] pages/s tidak naik dengan concurrency")
+        ok = False
+    for c, r in results.items():
+        if r["pages"] != PAGES:
+            print(f"[FAIL] concurrency={c}: {r['pages']}/{PAGES} halaman")
+            ok = False
+        if r["peak_rps"] > MAX_RPS + 1:
+            print(f"[FAIL] concurrency={c}: peak {r['peak_rps']} rps > max_rps {MAX_RPS}")
+            ok = False
+        if r["http_429"]:
+            print(f"[FAIL] concurrency={c}: {r['http_429']} respons 429")
+            ok = False
+    if sum(v for k, v in err_status.items() if k != 200) == 0:
+        print("[FAIL] injeksi error tidak menghasilkan respons error")
+        ok = False
+    for name in differs:
+        print(f"[FAIL] {name}: run tidak lengkap / isi RAW berbeda dengan run bersih")
+        ok = False
+    print("[OK] skala naik, rate limit terjaga, retry + replay identik" if ok else "[FAIL]")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# benchmarks/bench_metrics.py
+"""
+Biaya instrumentasi src/metrics.py:
+  - overhead satu span kosong (with / decorator) dibanding blok tanpa span
+  - span di titik terpadat pipeline (raw.parse per halaman, prepare.* per chunk) terhadap
+    waktu kerja yang diukurnya
+Lolos jika agregat benar di bawah banyak thread (calls / rows persis = jumlah span) dan
+overhead per span < 1% dari kerja per halaman RAW (json.loads satu halaman sampel).
+
+Jalankan:
+  python -m benchmarks.bench_metrics [--spans 200000] [--threads 8]
+"""
+import sys, json, time, argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.metrics import Recorder, span
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+
+def per_call_us(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--spans", type=int, default=200_000)
+    ap.add_argument("--threads", type=int, default=8)
+    args = ap.parse_args()
+    rec = Recorder()
+
+    def bare():
+        pass
+
+    def with_span():
+        with span("x", rec, rows=1):
+            pass
+
+    @span("y", rec)
+    def decorated():
+        pass
+
+    base = per_call_us(bare, args.spans)
+    t_with = per_call_us(with_span, args.spans) - base
+    t_deco = per_call_us(decorated, args.spans) - base
+
+    # kerja nyata terkecil yang dibungkus span: parse satu halaman RAW
+    page = next(iter(sorted(SAMPLE_RUN.glob("page_*.json"))), None)
+    text = page.read_text(encoding="utf-8") if page else json.dumps({"data": [{"k": "v" * 50}] * 100})
+    t_page = per_call_us(lambda: json.loads(text), 200)
+
+    # agregat dari banyak thread
+    rec.reset()
+    per_thread = args.spans // args.threads
+    with ThreadPoolExecutor(args.threads) as pool:
+        list(pool.map(lambda _: [with_span() for _ in range(per_thread)], range(args.threads)))
+    got = rec.summary()["x"]
+    exact = got["calls"] == got["rows"] == per_thread * args.threads
+
+    share = t_with / t_page * 100
+    print(f"\nspan kosong : with {t_with:.2f} µs | decorator {t_deco:.2f} µs (di atas panggilan biasa {base:.2f} µs)")
+    print(f"parse 1 halaman RAW: {t_page:,.0f} µs → overhead span {share:.3f}%")
+    print(f"{args.threads} thread × {per_thread:,} span: calls={got['calls']:,} rows={got['rows']:,}")
+    ok = exact and share < 1.0
+    print("[OK] agregat thread-safe, overhead < 1%" if ok else "[FAIL] agregat salah / overhead terlalu besar")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
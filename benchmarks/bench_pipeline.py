@@ -0,0 +1,110 @@
+# benchmarks/bench_pipeline.py
+"""
+Pipeline setelah fetch, pada salinan repo sementara (src/, config/, web/scripts/) dengan
+run RAW sampel diperbesar (halaman sampel diulang N kali, id_posisi dibuat unik):
+  - lama : workflow lama = 4 proses (python -m src.prepare, src.score, src.rollup,
+           web/scripts/convert_data.py); tiap proses impor ulang pandas/pyarrow dan
+           membaca ulang Parquet tahap sebelumnya
+  - baru : python -m src.pipeline prepare score rollup web (satu proses, handoff Arrow
+           in-memory), lalu dijalankan sekali lagi tanpa perubahan (semua tahap dilewati)
+Lolos jika file scored, rollup, output/tables dan bundle web identik isinya dengan jalur
+lama, dan run kedua melewati semua tahap.
+
+Jalankan:
+  python -m benchmarks.bench_pipeline [--scale 20]
+"""
+import ast, sys, json, time, shutil, argparse, tempfile, subprocess
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+RUN_ID = "run_20251201_000000_bench000"
+COPY = ["src", "config", "web/scripts", "web/src/utils/category_rules.json"]
+
+def make_root(dst: Path, scale: int) -> Path:
+    """Salinan repo minimal + satu run RAW (format json lama) berisi sampel × scale."""
+    for rel in COPY:
+        src = ROOT / rel
+        (dst / rel).parent.mkdir(parents=True, exist_ok=True)
+        if src.is_dir():
+            shutil.copytree(src, dst / rel, ignore=shutil.ignore_patterns("__pycache__"))
+        else:
+            shutil.copy2(src, dst / rel)
+    run_dir = dst / "data" / "raw" / RUN_ID
+    run_dir.mkdir(parents=True)
+    pages = [json.loads(p.read_text(encoding="utf-8")) for p in sorted(SAMPLE_RUN.glob("page_*.json"))]
+    n = 0
+    for k in range(scale):
+        for page in pages:
+            n += 1
+            items = [{**it, "id_posisi": f"{it['id_posisi']}-{k:03d}"} for it in page.get("data") or []]
+            (run_dir / f"page_{n:05d}.json").write_text(json.dumps({**page, "data": items}), encoding="utf-8")
+    meta = {"run_id": RUN_ID, "started_at": "2025-12-01T00:00:00+00:00", "mode": "full", "status": "complete"}
+    (run_dir / "run_meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    return dst
+
+def run(cmd: list[str], cwd: Path) -> float:
+    t0 = time.perf_counter()
+    out = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+    if out.returncode != 0:
+        print(out.stdout[-2000:], out.stderr[-2000:])
+        raise SystemExit(f"[FAIL] {' '.join(cmd)} → exit {out.returncode}")
+    return time.perf_counter() - t0
+
+def outputs(root: Path) -> dict:
+    """Isi output yang dibandingkan (tabel Parquet sebagai Arrow, file lain sebagai byte)."""
+    got = {}
+    for rel in ["data/clean/vacancies_scored.parquet", "data/clean/vacancies_text.parquet",
+                *(f"data/clean/rollup/{p.name}" for p in sorted((root / "data/clean/rollup").glob("*.parquet")))]:
+        got[rel] = pq.read_table(root / rel)
+    for base in ["output/tables", "web/public/data"]:
+        for p in sorted((root / base).rglob("*")):
+            if p.is_file():
+                got[p.relative_to(root).as_posix()] = p.read_bytes()
+    return got
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scale", type=int, default=20, help="salinan halaman sampel (600 baris per salinan)")
+    args = ap.parse_args()
+    py = sys.executable
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_root = make_root(Path(tmp) / "old", args.scale)
+        new_root = make_root(Path(tmp) / "new", args.scale)
+
+        steps = {
+            "prepare": [py, "-m", "src.prepare"],
+            "score": [py, "-m", "src.score"],
+            "rollup": [py, "-m", "src.rollup"],
+            "convert_data": [py, "web/scripts/convert_data.py"],
+        }
+        t_old = {name: run(cmd, old_root) for name, cmd in steps.items()}
+        t_new = run([py, "-m", "src.pipeline", "prepare", "score", "rollup", "web"], new_root)
+        report = json.loads((new_root / "data/state/pipeline.json").read_text(encoding="utf-8"))
+        t_skip = run([py, "-m", "src.pipeline", "prepare", "score", "rollup", "web"], new_root)
+        log = (new_root / "logs" / f"{RUN_ID}.log").read_text(encoding="utf-8").splitlines()
+        skipped = all(r["status"] == "skip" for r in ast.literal_eval(log[-1])["timings"].values())
+
+        old, new = outputs(old_root), outputs(new_root)
+        diff = sorted(k for k in old.keys() | new.keys()
+                      if k not in old or k not in new or not (old[k].equals(new[k]) if hasattr(old[k], "equals")
+                                                              else old[k] == new[k]))
+        rows = old["data/clean/vacancies_scored.parquet"].num_rows
+
+    print(f"\n{rows:,} baris (sampel × {args.scale})")
+    print(f"  lama : {sum(t_old.values()):7.2f} s  ("
+          + ", ".join(f"{k} {v:.2f}" for k, v in t_old.items()) + ")")
+    print(f"  baru : {t_new:7.2f} s  (" + ", ".join(f"{k} {v['seconds']:.2f}" for k, v in report.items())
+          + " di dalam proses)")
+    print(f"  ulang: {t_skip:7.2f} s  (tanpa perubahan, semua tahap dilewati: {skipped})")
+    for k in diff:
+        print(f"  [FAIL] berbeda: {k}")
+    ok = not diff and skipped
+    print("[OK] output pipeline identik dengan 4 proses lama" if ok else "[FAIL] hasil berbeda")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
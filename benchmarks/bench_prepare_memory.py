@@ -0,0 +1,94 @@
+# benchmarks/bench_prepare_memory.py
+"""
+Memori puncak prepare: versi lama (semua item → list → DataFrame → to_parquet)
+vs pipeline streaming (chunk → row group ParquetWriter), pada run sampel yang
+di-commit dan salinan 'diperbesar' (halaman yang sama diulang N kali).
+
+Tiap varian jalan di subprocess terpisah supaya peak RSS (ru_maxrss) tidak
+tercampur; --tracemalloc menambah puncak alokasi Python (jauh lebih lambat),
+pool memori pyarrow diukur terpisah.
+
+Jalankan:
+  python -m benchmarks.bench_prepare_memory [--scales 1,3] [--chunk-rows 5000] [--tracemalloc]
+"""
+import sys, json, time, argparse, resource, subprocess, tempfile, tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+
+def make_scaled_run(src: Path, dst: Path, scale: int) -> Path:
+    """Run palsu berisi halaman sampel diulang `scale` kali (symlink, tanpa salin data)."""
+    dst.mkdir(parents=True, exist_ok=True)
+    pages = sorted(src.glob("page_*.json"))
+    n = 0
+    for _ in range(scale):
+        for p in pages:
+            n += 1
+            (dst / f"page_{n:05d}.json").symlink_to(p.resolve())
+    return dst
+
+def worker(variant: str, run_dir: Path, out_path: Path, chunk_rows: int, trace: bool) -> dict:
+    import pyarrow as pa
+    from src.prepare import (SKILLS_PATH, build_frame, iter_chunks, iter_raw_items,
+                             load_all_raw_json, write_clean)
+    from src.enrich_skills import load_skills_config
+
+    skills_cfg = load_skills_config(SKILLS_PATH)
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    if variant == "materialize":
+        df = build_frame(load_all_raw_json(run_dir), skills_cfg)
+        df.to_parquet(out_path, index=False)
+        n_rows = len(df)
+    else:
+        chunks = (build_frame(c, skills_cfg) for c in iter_chunks(iter_raw_items(run_dir), chunk_rows))
+        n_rows = write_clean(chunks, out_path)
+    elapsed = time.perf_counter() - t0
+    py_peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    tracemalloc.stop()
+    return {
+        "rows": n_rows,
+        "elapsed_s": round(elapsed, 2),
+        "tracemalloc_peak_mb": round(py_peak / 1e6, 1) if trace else None,
+        "arrow_peak_mb": round(pa.default_memory_pool().max_memory() / 1e6, 1),
+        "rss_peak_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3, 1),
+    }
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scales", default="1,3")
+    ap.add_argument("--chunk-rows", type=int, default=5000)
+    ap.add_argument("--tracemalloc", action="store_true")
+    ap.add_argument("--worker", nargs=3, metavar=("VARIANT", "RUN_DIR", "OUT"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        variant, run_dir, out = args.worker
+        print(json.dumps(worker(variant, Path(run_dir), Path(out), args.chunk_rows, args.tracemalloc)))
+        return 0
+
+    results = []
+    with tempfile.TemporaryDirectory() as td:
+        td = Path(td)
+        for scale in [int(s) for s in args.scales.split(",")]:
+            run_dir = make_scaled_run(SAMPLE_RUN, td / f"run_x{scale}", scale)
+            for variant in ("materialize", "streaming"):
+                cmd = [sys.executable, "-m", "benchmarks.bench_prepare_memory",
+                       "--chunk-rows", str(args.chunk_rows),
+                       *(["--tracemalloc"] if args.tracemalloc else []),
+                       "--worker", variant, str(run_dir), str(td / f"{variant}_x{scale}.parquet")]
+                out = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, check=True)
+                res = json.loads(out.stdout.strip().splitlines()[-1])
+                results.append({"scale": scale, "variant": variant, **res})
+                print(f"[INFO] x{scale} {variant}: {res}")
+
+    print(f"\n{'scale':>5} {'variant':<12} {'rows':>7} {'time s':>7} {'py peak MB':>10} {'arrow MB':>9} {'RSS MB':>8}")
+    for r in results:
+        print(f"{r['scale']:>5} {r['variant']:<12} {r['rows']:>7} {r['elapsed_s']:>7} "
+              f"{str(r['tracemalloc_peak_mb'] or '-'):>10} {r['arrow_peak_mb']:>9} {r['rss_peak_mb']:>8}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+# benchmarks/bench_query.py
+"""
+Jalur filter dashboard (src/query.py) pada data sintetis, untuk kombinasi filter umum:
+  - lama : df.copy() → rantai mask boolean → str.contains pada posisi → sort_values,
+           KPI + grafik via groupby frame hasil
+  - baru : VacancyQuery.run (mask kategorikal di-cache, indeks trigram judul,
+           potong permutasi top-N) + KPI/grafik dari array
+Lolos jika jumlah baris, mask, urutan top-N (nilai kunci urut), KPI dan data
+grafik identik dengan jalur lama.
+
+Jalankan:
+  python -m benchmarks.bench_query [--rows 30000 300000]
+"""
+import sys, time, argparse
+
+import numpy as np
+import pandas as pd
+
+from src.query import VacancyQuery
+from src.score import SCORE_DEFAULTS, add_rank_columns, priority_score
+from src.skill_index import SkillIndex
+
+WORDS = ["staff", "admin", "data", "analyst", "marketing", "digital", "keuangan", "akuntansi",
+         "perawat", "guru", "teknisi", "it", "support", "sales", "human", "resources", "desain",
+         "grafis", "konten", "kreator", "operator", "produksi", "gudang", "logistik", "legal",
+         "customer", "service", "programmer", "web", "mobile", "engineer", "quality", "control"]
+SKILLS = ["excel", "sql", "python", "komunikasi", "canva", "photoshop", "akuntansi", "bahasa inggris",
+          "microsoft office", "seo", "figma", "autocad", "tableau", "java", "kepemimpinan"]
+
+COMBOS = {
+    "default (rasio ≤10, skill, top 300)": dict(max_ratio=10.0, want_skills=["excel", "sql", "python"], limit=300),
+    "provinsi + keyword 'data'": dict(province="prov3", keyword="data", max_ratio=10.0, want_skills=["excel"], limit=300),
+    "kategori + keyword 'admin' + rasio ≤2": dict(category="kat1", keyword="Admin", max_ratio=2.0, limit=100),
+    "wajib skill + urut priority": dict(must_skills=["sql"], max_ratio=50.0, sort="priority", limit=1000),
+    "keyword pendek 'it'": dict(keyword="it", max_ratio=10.0, limit=300),
+    "keyword frasa 'customer serv'": dict(keyword="customer serv", max_ratio=20.0, limit=50),
+    "semua filter, tanpa hasil": dict(province="prov0", category="kat0", keyword="zzz", max_ratio=1.0, limit=300),
+}
+
+def synthetic(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n_titles = max(50, n // 3)
+    vocab = np.array(WORDS)
+    titles = [" ".join(w).title() for w in
+              (rng.choice(vocab, size=rng.integers(1, 5), replace=False) for _ in range(n_titles))]
+    quota = rng.integers(0, 30, n)
+    applicants = rng.poisson(8, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(quota > 0, applicants / np.where(quota > 0, quota, 1), np.nan)
+    weights = 1.0 / np.arange(1, len(SKILLS) + 1)
+    skills = [sorted(set(rng.choice(SKILLS, size=k, p=weights / weights.sum()))) for k in rng.poisson(1.5, n)]
+    df = pd.DataFrame({
+        "posisi": rng.choice(np.array(titles + [None], dtype=object), n),
+        "kategori_posisi": rng.choice([f"kat{i}" for i in range(22)], n),
+        "nama_perusahaan": rng.choice([f"PT {i}" for i in range(max(10, n // 10))] + [None], n),
+        "nama_provinsi": rng.choice([f"prov{i}" for i in range(38)] + [None], n),
+        "jumlah_kuota": quota,
+        "jumlah_terdaftar": applicants.astype(float),
+        "competition_ratio": ratio,
+        "days_to_deadline": rng.integers(-5, 60, n).astype(float),
+        "skills_score": np.round(rng.random(n) * (rng.random(n) < 0.3), 4),
+        "skills_extracted": skills,
+        "first_seen": pd.Timestamp("2025-11-12", tz="UTC") - pd.to_timedelta(rng.integers(0, 30, n), unit="D"),
+        "last_seen": pd.Timestamp("2025-11-12", tz="UTC"),
+    })
+    df["priority_score"] = priority_score(df, SCORE_DEFAULTS)
+    return add_rank_columns(df)
+
+def old_path(df: pd.DataFrame, ix: SkillIndex, province=None, category=None, keyword="", max_ratio=None,
+             must_skills=(), want_skills=(), sort="ratio", limit=None) -> dict:
+    """Rantai filter app.py sebelum query engine (dengan skill bitset yang sudah ada)."""
+    q = df.copy()
+    if province is not None:
+        q = q[q["nama_provinsi"] == province]
+    if category is not None:
+        q = q[q["kategori_posisi"] == category]
+    if keyword.strip():
+        q = q[q["posisi"].astype(str).str.contains(keyword.strip(), case=False, na=False, regex=False)]
+    q = q[q["competition_ratio"].notna()]
+    if max_ratio is not None:
+        q = q[q["competition_ratio"] <= max_ratio]
+    if must_skills:
+        q = q[ix.must_have(must_skills)[q.index.to_numpy()]]
+    match_all = ix.match_count(want_skills) if want_skills else np.zeros(len(df), dtype=np.int64)
+    q = q.assign(match_count=match_all[q.index.to_numpy()])
+    if sort == "priority":
+        q = q.sort_values("priority_rank")
+    else:
+        q = q.sort_values(["match_count", "competition_ratio", "jumlah_kuota"],
+                          ascending=[False, True, False], kind="stable")
+    return {
+        "mask": df.index.isin(q.index),
+        "top": q.head(limit),
+        "median": q["competition_ratio"].median(), "mean": q["competition_ratio"].mean(),
+        "companies": q["nama_perusahaan"].nunique(),
+        "chart_prov": q.groupby("nama_provinsi")["nama_perusahaan"].nunique().sort_values(ascending=False).head(10),
+        "chart_pos": q.groupby("posisi")["jumlah_terdaftar"].sum().sort_values(ascending=False).head(10),
+    }
+
+def new_path(df: pd.DataFrame, engine: VacancyQuery, **kw) -> dict:
+    res = engine.run(**kw)
+    median, mean = engine.ratio_stats(res.mask)
+    return {
+        "mask": res.mask,
+        "top": df.iloc[res.order].assign(match_count=res.match_count[res.order]),
+        "median": median, "mean": mean,
+        "companies": engine.unique_count("nama_perusahaan", res.mask),
+        "chart_prov": engine.top_provinces_by_companies(res.mask, 10),
+        "chart_pos": engine.top_titles_by_applicants(res.mask, 10),
+    }
+
+def same(a: dict, b: dict, sort: str) -> bool:
+    keys = ["priority_rank"] if sort == "priority" else ["match_count", "competition_ratio", "jumlah_kuota"]
+    ok = bool((a["mask"] == b["mask"]).all())
+    ok &= a["top"][keys].to_numpy().tolist() == b["top"][keys].to_numpy().tolist()
+    ok &= bool(np.allclose([a["median"], a["mean"]], [b["median"], b["mean"]], equal_nan=True))
+    ok &= a["companies"] == b["companies"]
+    # nilai grafik identik; label bisa beda hanya bila nilainya seri
+    for c in ("chart_prov", "chart_pos"):
+        ok &= np.allclose(a[c].to_numpy(float), b[c].to_numpy(float))
+    return ok
+
+def bench(n: int, repeat: int) -> bool:
+    t0 = time.perf_counter()
+    df = synthetic(n)
+    gen_s = time.perf_counter() - t0
+    ix = SkillIndex.from_lists(df["skills_extracted"])
+    orderings = {"ratio": np.argsort(df["ratio_order"].to_numpy()),
+                 "priority": np.argsort(df["priority_rank"].to_numpy())}
+    base = df.copy()  # salinan object-dtype untuk jalur lama (engine mengubah kolom ke category)
+
+    t0 = time.perf_counter()
+    engine = VacancyQuery(df, orderings, ix)
+    build_s = time.perf_counter() - t0
+
+    print(f"\n{n:,} baris, {len(engine.titles):,} judul unik (data sintetis {gen_s:.1f} s)")
+    print(f"  bangun engine (sekali per load) : {build_s * 1e3:8.1f} ms")
+    ok, tot_old, tot_new = True, 0.0, 0.0
+    for name, kw in COMBOS.items():
+        t_old = t_new = 0.0
+        for i in range(repeat):
+            t0 = time.perf_counter()
+            a = old_path(base, ix, **kw)
+            t_old += time.perf_counter() - t0
+            if i == 0:
+                engine._keyword_cache.clear()  # iterasi pertama: keyword belum ter-cache
+            t0 = time.perf_counter()
+            b = new_path(df, engine, **kw)
+            t_new += time.perf_counter() - t0
+        good = same(a, b, kw.get("sort", "ratio"))
+        ok &= good
+        tot_old += t_old / repeat
+        tot_new += t_new / repeat
+        print(f"  {name:<38}: {t_old / repeat * 1e3:8.2f} ms → {t_new / repeat * 1e3:7.2f} ms"
+              f"  ({int(b['mask'].sum()):,} baris){'' if good else '  [FAIL]'}")
+    print(f"  {'total per rerun':<38}: {tot_old * 1e3:8.2f} ms → {tot_new * 1e3:7.2f} ms")
+    return ok
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[30000, 300000])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    ok = all([bench(n, args.repeat) for n in args.rows])
+    print("[OK] hasil identik dengan jalur lama" if ok else "[FAIL] hasil berbeda")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# benchmarks/bench_raw_storage.py
+"""
+Bandingkan layout RAW lama (page_*.json) vs pages.jsonl.zst / pages.jsonl.gz
+pada run sampel yang di-commit:
+  - byte di disk
+  - waktu + ukuran zip artefak (seperti langkah "Archive RAW" di workflow)
+  - waktu load lewat prepare.load_all_raw_json
+
+Jalankan:
+  python -m benchmarks.bench_raw_storage [data/raw/run_xxx]
+"""
+import sys, time, tempfile, zipfile
+from pathlib import Path
+
+from src.prepare import load_all_raw_json
+from src.raw_store import convert_run, raw_size_bytes
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+
+def zip_dir(src: Path, dst_base: Path, compress: bool) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    out = dst_base.with_suffix(".zip")
+    mode = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    with zipfile.ZipFile(out, "w", compression=mode) as zf:
+        for p in sorted(src.iterdir()):
+            zf.write(p, p.name)
+    return time.perf_counter() - t0, out.stat().st_size
+
+def timed_load(run_dir: Path) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    items = load_all_raw_json(run_dir)
+    return time.perf_counter() - t0, len(items)
+
+def main() -> int:
+    src = Path(sys.argv[1]) if len(sys.argv) > 1 else SAMPLE_RUN
+    rows = []
+    with tempfile.TemporaryDirectory() as td:
+        td = Path(td)
+        layouts = {"json (lama)": src}
+        for fmt in ("jsonl.zst", "jsonl.gz"):
+            t0 = time.perf_counter()
+            layouts[fmt] = convert_run(src, td / fmt.replace(".", "_"), fmt)
+            print(f"[INFO] konversi {fmt}: {time.perf_counter() - t0:.2f}s")
+
+        for name, run_dir in layouts.items():
+            # run lama: zip deflate (perilaku workflow); format baru sudah terkompresi → stored
+            zip_s, zip_bytes = zip_dir(run_dir, td / f"zip_{name.split()[0]}", compress=name.startswith("json ("))
+            load_s, n_items = timed_load(run_dir)
+            rows.append((name, raw_size_bytes(run_dir), zip_s, zip_bytes, load_s, n_items))
+
+    base = rows[0]
+    print(f"\n{'layout':<12} {'disk MB':>9} {'x':>6} {'zip s':>7} {'zip MB':>8} {'load s':>7} {'items':>7}")
+    for name, disk, zip_s, zip_b, load_s, n in rows:
+        print(f"{name:<12} {disk / 1e6:>9.2f} {base[1] / disk:>6.1f} {zip_s:>7.2f} "
+              f"{zip_b / 1e6:>8.2f} {load_s:>7.2f} {n:>7}")
+    ok = all(r[5] == base[5] for r in rows)
+    print("[OK] jumlah item identik" if ok else "[FAIL] jumlah item berbeda")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
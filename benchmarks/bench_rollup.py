@@ -0,0 +1,108 @@
+# benchmarks/bench_rollup.py
+"""
+KPI + grafik dashboard dari rollup (src/rollup.py) vs dari baris (VacancyQuery) pada
+data sintetis, untuk kombinasi filter yang sejajar dimensi cube (provinsi, kategori,
+batas rasio di tepi bucket):
+  - baris : mask → median/mean rasio, perusahaan unik, top provinsi (perusahaan unik),
+            top posisi (pendaftar) dari array per baris
+  - cube  : mask sel → jumlah per sel, register HLL di-max, centroid t-digest digabung
+Lolos jika jumlah lowongan, mean rasio, dan top posisi identik; median t-digest dan
+perusahaan unik HLL dalam batas galat (--median-tol, --hll-tol).
+
+Jalankan:
+  python -m benchmarks.bench_rollup [--rows 30000 300000]
+"""
+import sys, time, argparse, tempfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_query import synthetic
+from src.query import VacancyQuery
+from src.rollup import Rollup, build_rollup, write_rollup
+
+COMBOS = {
+    "default (rasio ≤10)": dict(max_ratio=10.0),
+    "tanpa batas rasio": dict(),
+    "provinsi + rasio ≤2": dict(province="prov3", max_ratio=2.0),
+    "kategori + rasio ≤5": dict(category="kat1", max_ratio=5.0),
+    "provinsi + kategori": dict(province="prov7", category="kat4", max_ratio=10.0),
+}
+
+def from_rows(q: VacancyQuery, mask: np.ndarray) -> dict:
+    median, mean = q.ratio_stats(mask)
+    return {"count": int(mask.sum()), "median": median, "mean": mean,
+            "unique": q.unique_count("nama_perusahaan", mask),
+            "prov": q.top_provinces_by_companies(mask, 10),
+            "titles": q.top_titles_by_applicants(mask, 10)}
+
+def from_cube(cube: Rollup, cells: np.ndarray) -> dict:
+    median, mean = cube.ratio_stats(cells)
+    return {"count": cube.count(cells), "median": median, "mean": mean,
+            "unique": cube.unique_count("nama_perusahaan", cells),
+            "prov": cube.top_provinces_by_companies(cells, 10),
+            "titles": cube.top_titles_by_applicants(cells, 10)}
+
+def bench(n: int, repeat: int, median_tol: float, hll_tol: float) -> bool:
+    df = synthetic(n)
+    q = VacancyQuery(df.copy(), {"ratio": np.arange(n)})
+    t0 = time.perf_counter()
+    tables = build_rollup(df)
+    t_build = time.perf_counter() - t0
+    with tempfile.TemporaryDirectory() as tmp:
+        write_rollup(tables, Path(tmp))
+        size = sum(p.stat().st_size for p in Path(tmp).glob("*.parquet"))
+        t0 = time.perf_counter()
+        cube = Rollup(tmp)
+        t_load = time.perf_counter() - t0
+
+    print(f"\n{n:,} baris → {tables['cells'].num_rows:,} sel, {tables['posisi'].num_rows:,} sel×posisi | "
+          f"build {t_build:.2f} s, file {size / 1e6:.2f} MB, load {t_load * 1e3:.0f} ms")
+    print(f"  {'filter':<24}{'baris ms':>10}{'cube ms':>10}{'median Δ':>10}{'unik Δ':>9}")
+    ok = True
+    for name, kw in COMBOS.items():
+        mask = q.run(**kw).mask
+        cells = cube.cells(**kw)
+        if cells is None:
+            print(f"  {name:<24} [FAIL] cube tidak bisa menjawab")
+            ok = False
+            continue
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            exact = from_rows(q, mask)
+        t_rows = (time.perf_counter() - t0) / repeat
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            approx = from_cube(cube, cells)
+        t_cube = (time.perf_counter() - t0) / repeat
+
+        d_median = abs(approx["median"] - exact["median"]) / max(abs(exact["median"]), 1e-9)
+        d_unique = abs(approx["unique"] - exact["unique"]) / max(exact["unique"], 1)
+        # top provinsi: nilai ke-i dibandingkan (urutan antar provinsi dengan nilai mirip boleh beda)
+        d_prov = max((abs(a - e) / e for a, e in zip(approx["prov"].tolist(), exact["prov"].tolist())), default=0)
+        good = (approx["count"] == exact["count"] and np.isclose(approx["mean"], exact["mean"])
+                and approx["titles"].tolist() == exact["titles"].astype("int64").tolist()
+                and d_median <= median_tol and d_unique <= hll_tol and d_prov <= 2 * hll_tol)
+        ok &= bool(good)
+        print(f"  {name:<24}{t_rows * 1e3:10.2f}{t_cube * 1e3:10.2f}{d_median:10.2%}{d_unique:9.2%}"
+              + ("" if good else "  [FAIL]"))
+
+    mask = q.run(max_ratio=3.3).mask
+    ok &= cube.cells(max_ratio=3.3) is None  # batas di tengah bucket → jatuh ke baris
+    ok &= cube.cells(max_ratio=1e9, with_empty_ratio=True).sum() == cube.n_cells
+    return ok and mask.any()
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[30000, 300000])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--median-tol", type=float, default=0.01, help="galat relatif median (t-digest)")
+    ap.add_argument("--hll-tol", type=float, default=0.05, help="galat relatif perusahaan unik (HLL)")
+    args = ap.parse_args()
+
+    ok = all([bench(n, args.repeat, args.median_tol, args.hll_tol) for n in args.rows])
+    print("[OK] cube = baris (median/unik dalam toleransi)" if ok else "[FAIL] hasil berbeda")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# benchmarks/bench_schema_memory.py
+"""
+Memori DataFrame hasil load dataset clean: skema lama (string object, list dict
+prodi, tanggal string, int64) vs skema ringkas src/schema.py (dictionary →
+category, timestamp, int32, key lookup prodi/jenjang, teks berat tidak ikut dimuat).
+
+Data: run RAW sampel yang di-commit, diulang --scale kali (id_posisi dibuat unik).
+Memori diukur "dalam": isi list/dict/ndarray per sel ikut dihitung (memory_usage
+deep=True pandas tidak menelusuri objek bersarang). Lolos jika isi kolom identik
+setelah di-decode dan memori skema ringkas lebih kecil.
+
+Jalankan:
+  python -m benchmarks.bench_schema_memory [--scale 10]
+"""
+import sys, time, argparse, tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.enrich_skills import load_skills_config
+from src.prepare import SKILLS_PATH, add_derived_columns, build_frame, flatten_vacancy, parse_json_column
+from src.raw_store import iter_raw_pages
+from src.schema import CLEAN_SCHEMA, TEXT_COLUMNS, Lookups, core_columns
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+
+# CLEAN_SCHEMA sebelum skema ringkas (acuan "sebelum")
+LEGACY_SCHEMA = pa.schema([
+    ("id_posisi", pa.string()), ("posisi", pa.string()), ("deskripsi_posisi", pa.string()),
+    ("jumlah_kuota", pa.int64()), ("jumlah_terdaftar", pa.int64()), ("status_posisi", pa.string()),
+    ("nama_perusahaan", pa.string()), ("nama_provinsi", pa.string()), ("nama_kabupaten", pa.string()),
+    ("alamat_perusahaan", pa.string()), ("logo", pa.string()), ("government_agency_name", pa.string()),
+    ("sub_government_agency_name", pa.string()), ("tanggal_pendaftaran_awal", pa.string()),
+    ("tanggal_pendaftaran_akhir", pa.string()), ("tanggal_mulai", pa.string()), ("tanggal_selesai", pa.string()),
+    ("program_studi", pa.list_(pa.struct([("id", pa.string()), ("title", pa.string())]))),
+    ("jenjang", pa.list_(pa.string())), ("competition_ratio", pa.float64()), ("days_to_deadline", pa.float64()),
+    ("skills_extracted", pa.list_(pa.string())), ("skills_score", pa.float64()), ("is_data_related", pa.bool_()),
+])
+
+def deep_bytes(v) -> int:
+    """Ukuran objek Python termasuk isi list/dict/ndarray (tanpa dedup, seperti deep=True)."""
+    if isinstance(v, np.ndarray):
+        if v.dtype == object:
+            return sys.getsizeof(v) + sum(deep_bytes(x) for x in v.tolist())
+        return sys.getsizeof(v) + (0 if v.base is None else v.nbytes)
+    if isinstance(v, (list, tuple)):
+        return sys.getsizeof(v) + sum(deep_bytes(x) for x in v)
+    if isinstance(v, dict):
+        return sys.getsizeof(v) + sum(deep_bytes(k) + deep_bytes(x) for k, x in v.items())
+    return sys.getsizeof(v)
+
+def frame_memory(df: pd.DataFrame) -> pd.Series:
+    """Byte per kolom; kolom object ditelusuri sampai objek bersarang."""
+    out = df.memory_usage(deep=True, index=False)
+    for col in df.columns:
+        if df[col].dtype == object:
+            out[col] = 8 * len(df) + sum(deep_bytes(v) for v in df[col].tolist())
+    return out
+
+def build(scale: int, lookups: Lookups) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """(frame format lama, frame skema ringkas) dari run sampel, diulang `scale` kali."""
+    items = [x for _, js in iter_raw_pages(SAMPLE_RUN) for x in js.get("data") or []]
+    new = build_frame(items, load_skills_config(SKILLS_PATH), lookups=lookups)
+    old = pd.DataFrame([flatten_vacancy(x) for x in items])
+    old["program_studi"] = parse_json_column(old.pop("program_studi_raw"))
+    old["jenjang"] = parse_json_column(old.pop("jenjang_raw"))
+    old = add_derived_columns(old)
+    for col in ("skills_extracted", "skills_score", "is_data_related"):
+        old[col] = new[col]
+
+    def repeat(df: pd.DataFrame) -> pd.DataFrame:
+        parts = [df.assign(id_posisi=df["id_posisi"] + f"-{i}") for i in range(scale)]
+        return pd.concat(parts, ignore_index=True)
+    return repeat(old), repeat(new)
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scale", type=int, default=10, help="ulang run sampel N kali")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lookups = Lookups(tmp)  # tabel lookup sementara (tidak disimpan)
+        old, new = build(args.scale, lookups)
+        p_old, p_new = Path(tmp) / "old.parquet", Path(tmp) / "new.parquet"
+        pq.write_table(pa.Table.from_pandas(old, schema=LEGACY_SCHEMA, preserve_index=False), p_old)
+        pq.write_table(pa.Table.from_pandas(new, schema=CLEAN_SCHEMA, preserve_index=False), p_new)
+
+        t0 = time.perf_counter()
+        before = pd.read_parquet(p_old)  # app lama: semua kolom
+        t_before = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        after = pd.read_parquet(p_new, columns=core_columns(CLEAN_SCHEMA.names))
+        t_after = time.perf_counter() - t0
+        text = pd.read_parquet(p_new, columns=["id_posisi", *TEXT_COLUMNS])
+        sizes = (p_old.stat().st_size, p_new.stat().st_size)
+
+    m_before, m_after, m_text = frame_memory(before), frame_memory(after), frame_memory(text)
+    print(f"\n{len(before):,} baris (run sampel × {args.scale})")
+    print(f"  {'kolom':<28}{'sebelum':>12}{'sesudah':>12}")
+    names = list(dict.fromkeys(list(m_before.index) + list(m_after.index)))
+    for col in sorted(names, key=lambda c: -m_before.get(c, m_after.get(c, 0))):
+        b = m_before.get(col)
+        a = m_after.get(col)
+        fmt = lambda v: f"{v / 1e6:10.2f} MB" if v is not None else f"{'(lazy)' if col in TEXT_COLUMNS else '-':>13}"
+        print(f"  {col:<28}{fmt(b)}{fmt(a)}")
+    print(f"  {'TOTAL DataFrame':<28}{m_before.sum() / 1e6:10.2f} MB{m_after.sum() / 1e6:10.2f} MB"
+          f"  ({m_after.sum() / m_before.sum():.1%})")
+    print(f"  grup teks (dimuat bila perlu): {m_text.sum() / 1e6:.2f} MB")
+    print(f"  file parquet: {sizes[0] / 1e6:.2f} MB → {sizes[1] / 1e6:.2f} MB | "
+          f"read_parquet {t_before * 1e3:.0f} ms → {t_after * 1e3:.0f} ms")
+
+    # isi identik: decode key lookup + tanggal + kategori lalu bandingkan dengan format lama
+    ok = True
+    dec = lookups.decode(new.copy())
+    for col in ("program_studi", "jenjang"):
+        ok &= dec[col].tolist() == [list(v) for v in old[col]]
+    ok &= bool((after["jumlah_terdaftar"].to_numpy() == before["jumlah_terdaftar"].to_numpy()).all())
+    for col in ("posisi", "nama_provinsi", "nama_perusahaan", "nama_kabupaten", "status_posisi"):
+        ok &= after[col].astype(object).fillna("").tolist() == before[col].fillna("").tolist()
+    akhir = pd.to_datetime(before["tanggal_pendaftaran_akhir"], format="ISO8601").dt.tz_localize("Asia/Jakarta")
+    got = after["tanggal_pendaftaran_akhir"]
+    ok &= bool(((got == akhir) | (got.isna() & akhir.isna())).all())
+    ok &= bool(np.allclose(after["days_to_deadline"], before["days_to_deadline"], equal_nan=True))
+    smaller = m_after.sum() < m_before.sum()
+    print("[OK] isi identik" + (", memori lebih kecil" if smaller else "") if ok else "[FAIL] isi berbeda")
+    if ok and not smaller:
+        print("[FAIL] memori tidak turun")
+    return 0 if ok and smaller else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
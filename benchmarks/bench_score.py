@@ -0,0 +1,92 @@
+# benchmarks/bench_score.py
+"""
+Priority score + urutan siap pakai (src/score.py) pada data sintetis:
+  - stage   : priority_score + add_rank_columns + topk_index untuk N baris
+  - app     : urutan hasil per interaksi; sort_values 3 kunci (lama) vs potong
+              permutasi ratio_order + stable sort match_count (baru)
+Lolos jika urutan app identik dengan sort_values dan baris top-K per grup
+sama dengan sort ulang per grup.
+
+Jalankan:
+  python -m benchmarks.bench_score [--rows 30000]
+"""
+import sys, time, argparse
+
+import numpy as np
+import pandas as pd
+
+from src.score import SCORE_DEFAULTS, add_rank_columns, priority_score, topk_index
+
+def synthetic(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    quota = rng.integers(0, 30, n)
+    applicants = rng.poisson(8, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(quota > 0, applicants / np.where(quota > 0, quota, 1), np.nan)
+    seen = pd.Timestamp("2025-11-12", tz="UTC") - pd.to_timedelta(rng.integers(0, 30, n), unit="D")
+    return pd.DataFrame({
+        "id_posisi": [f"id{i}" for i in range(n)],
+        "kategori_posisi": rng.choice([f"kat{i}" for i in range(22)], n),
+        "nama_provinsi": rng.choice([f"prov{i}" for i in range(38)] + [None], n),
+        "jumlah_kuota": quota,
+        "jumlah_terdaftar": applicants,
+        "competition_ratio": ratio,
+        "days_to_deadline": rng.integers(-5, 60, n).astype(float),
+        "skills_score": np.round(rng.random(n) * (rng.random(n) < 0.3), 4),
+        "first_seen": seen,
+        "last_seen": pd.Timestamp("2025-11-12", tz="UTC"),
+        "match_count": rng.integers(0, 4, n),
+    })
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=30000)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    df = synthetic(args.rows)
+    t0 = time.perf_counter()
+    df["priority_score"] = priority_score(df, SCORE_DEFAULTS)
+    df = add_rank_columns(df)
+    topk = topk_index(df, SCORE_DEFAULTS["top_k"])
+    stage_s = time.perf_counter() - t0
+
+    # interaksi app: filter acak lalu urutkan
+    rng = np.random.default_rng(1)
+    perm = np.argsort(df["ratio_order"].to_numpy())
+    ok, t_old, t_new = True, 0.0, 0.0
+    for _ in range(args.repeat):
+        q = df[(df["competition_ratio"] <= rng.uniform(1, 10)) & (df["kategori_posisi"] != rng.choice(df["kategori_posisi"]))]
+        t0 = time.perf_counter()
+        ref = q.sort_values(["match_count", "competition_ratio", "jumlah_kuota"],
+                            ascending=[False, True, False], kind="stable")
+        t_old += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        selected = np.zeros(len(df), dtype=bool)
+        selected[q.index.to_numpy()] = True
+        order = perm[selected[perm]]
+        match_all = np.zeros(len(df), dtype=np.int64)
+        match_all[q.index.to_numpy()] = q["match_count"].to_numpy()
+        order = order[np.argsort(-match_all[order], kind="stable")]
+        t_new += time.perf_counter() - t0
+
+        keys = ["match_count", "competition_ratio", "jumlah_kuota"]
+        ok &= bool((ref[keys].to_numpy() == q.loc[order, keys].to_numpy()).all())
+
+    for col in ("kategori_posisi", "nama_provinsi"):
+        for g, pos in topk[col].items():
+            expect = df[df[col] == g].sort_values("priority_rank").index[: topk["k"]].tolist()
+            if pos != expect:
+                print(f"[FAIL] top-K {col}={g}")
+                ok = False
+
+    print(f"\n{args.rows} baris")
+    print(f"  stage skor+rank+topK : {stage_s * 1e3:8.1f} ms")
+    print(f"  app urut (lama)      : {t_old / args.repeat * 1e3:8.2f} ms/interaksi (sort_values)")
+    print(f"  app urut (baru)      : {t_new / args.repeat * 1e3:8.2f} ms/interaksi (permutasi)")
+    print("[OK] urutan identik" if ok else "[FAIL] urutan berbeda")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
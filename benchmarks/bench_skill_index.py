@@ -0,0 +1,71 @@
+# benchmarks/bench_skill_index.py
+"""
+Pencocokan "skill saya" di app (src/skill_index.py) pada data sintetis:
+  - lama : lambda per baris atas skills_norm (list) tiap rerun
+  - baru : popcount bitset (match_count) + irisan inverted index (wajib punya skill)
+Lolos jika match_count dan mask "wajib punya" identik dengan versi lama dan
+tiap perubahan filter di bawah 10 ms.
+
+Jalankan:
+  python -m benchmarks.bench_skill_index [--rows 30000] [--vocab 40]
+"""
+import sys, time, argparse
+
+import numpy as np
+
+from src.skill_index import SkillIndex
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=30000)
+    ap.add_argument("--vocab", type=int, default=40, help="jumlah skill unik (>64 → bitset multi-word)")
+    ap.add_argument("--repeat", type=int, default=50)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    vocab = [f"skill_{i:03d}" for i in range(args.vocab)]
+    # distribusi miring (mirip data asli): kebanyakan posting 0–3 skill
+    weights = 1.0 / np.arange(1, args.vocab + 1)
+    weights /= weights.sum()
+    lists = [sorted(set(rng.choice(vocab, size=k, p=weights))) for k in rng.poisson(1.5, args.rows)]
+
+    t0 = time.perf_counter()
+    ix = SkillIndex.from_lists(lists)
+    build_s = time.perf_counter() - t0
+    roundtrip = SkillIndex.from_column(ix.to_arrow(), ix.vocab)
+
+    ok = bool((roundtrip.bits == ix.bits).all())
+    t_old = t_new = t_old_must = t_new_must = 0.0
+    for _ in range(args.repeat):
+        want = list(rng.choice(vocab, size=rng.integers(1, 6), replace=False)) + ["tidak_ada"]
+        must = list(rng.choice(vocab[:8], size=rng.integers(1, 3), replace=False))
+
+        t0 = time.perf_counter()
+        old = np.array([sum(1 for s in lst if s in want) for lst in lists])
+        t_old += time.perf_counter() - t0
+        t0 = time.perf_counter()
+        new = ix.match_count(want)
+        t_new += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        old_must = np.array([set(must) <= set(lst) for lst in lists])
+        t_old_must += time.perf_counter() - t0
+        t0 = time.perf_counter()
+        new_must = ix.must_have(must)
+        t_new_must += time.perf_counter() - t0
+
+        ok &= bool((old == new).all() and (old_must == new_must).all())
+
+    per = lambda t: t / args.repeat * 1e3
+    fast = per(t_new) < 10 and per(t_new_must) < 10
+    print(f"\n{args.rows} baris, {len(ix.vocab)} skill ({ix.n_words * 8} byte/baris)")
+    print(f"  bangun indeks     : {build_s * 1e3:8.1f} ms (sekali per load)")
+    print(f"  match_count       : {per(t_old):8.2f} ms → {per(t_new):6.3f} ms")
+    print(f"  wajib punya skill : {per(t_old_must):8.2f} ms → {per(t_new_must):6.3f} ms")
+    print("[OK] identik" + (" dan < 10 ms" if fast else "") if ok else "[FAIL] hasil berbeda")
+    if ok and not fast:
+        print("[FAIL] perubahan filter ≥ 10 ms")
+    return 0 if ok and fast else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
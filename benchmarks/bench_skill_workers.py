@@ -0,0 +1,56 @@
+# benchmarks/bench_skill_workers.py
+"""
+Ekstraksi skill serial vs SkillExtractor multiprocess (ProcessPoolExecutor).
+
+Posting diambil dari run sampel (diulang --scale kali), diproses per chunk
+seperti prepare (--chunk-rows). Lolos jika hasil tiap jumlah worker identik
+dengan serial (urutan baris ikut dibandingkan).
+
+Jalankan:
+  python -m benchmarks.bench_skill_workers [--workers 1,2,4,8] [--scale 1] [--chunk-rows 5000]
+"""
+import os, sys, time, argparse
+from pathlib import Path
+
+from src.enrich_skills import SkillExtractor
+from src.prepare import SKILLS_PATH, iter_chunks, iter_raw_items
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+
+def run(posts: list, workers: int, chunk_rows: int) -> tuple[float, list, list]:
+    skills, scores = [], []
+    with SkillExtractor(SKILLS_PATH, workers) as ex:
+        t0 = time.perf_counter()
+        for chunk in iter_chunks(posts, chunk_rows):
+            s, sc = ex([t for t, _ in chunk], [d for _, d in chunk])
+            skills.extend(s)
+            scores.extend(sc)
+        elapsed = time.perf_counter() - t0
+    return elapsed, skills, scores
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", default="1,2,4,8")
+    ap.add_argument("--scale", type=int, default=1)
+    ap.add_argument("--chunk-rows", type=int, default=5000)
+    args = ap.parse_args()
+
+    posts = [(x.get("posisi"), x.get("deskripsi_posisi")) for x in iter_raw_items(SAMPLE_RUN)] * args.scale
+    print(f"[INFO] {len(posts)} posting, {os.cpu_count()} CPU")
+
+    base = None
+    ok = True
+    print(f"\n{'workers':>7} {'detik':>7} {'posting/s':>10} {'speedup':>8} {'identik':>8}")
+    for w in [int(x) for x in args.workers.split(",")]:
+        elapsed, skills, scores = run(posts, w, args.chunk_rows)
+        if base is None:
+            base = (elapsed, skills, scores)
+        same = skills == base[1] and scores == base[2]
+        ok &= same
+        print(f"{w:>7} {elapsed:>7.2f} {len(posts) / elapsed:>10.0f} {base[0] / elapsed:>7.1f}x {str(same):>8}")
+    print("[OK] semua mode identik dengan serial" if ok else "[FAIL] hasil berbeda dari serial")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# benchmarks/bench_skills.py
+"""
+Parity + throughput ekstraksi skill:
+  - lama : regex di-compile per frasa per panggilan, satu re.sub per alias,
+           tiap term dipindai dua kali (frasa + token)
+  - baru : SkillMatcher (dikompilasi sekali per skills.yaml, satu pemindaian)
+
+Lolos jika output extract_from_title_and_desc identik (termasuk urutan
+by_category dan counts) untuk semua lowongan di run sampel.
+
+Jalankan:
+  python -m benchmarks.bench_skills [data/raw/run_xxx]
+"""
+import re, sys, json, time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from src.enrich_skills import compute_skills_score, extract_from_title_and_desc, load_skills_config
+from src.prepare import SKILLS_PATH, iter_raw_items
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+
+# ---------- salinan implementasi lama (referensi) ----------
+def legacy_normalize(text: str, cfg: dict) -> str:
+    if not text:
+        return ""
+    text = text.strip()
+    if cfg.get("normalize", {}).get("lowercase", True):
+        text = text.lower()
+    for src, dst in (cfg.get("aliases") or {}).items():
+        text = re.sub(rf"\b{re.escape(src.lower())}\b", dst.lower(), text)
+    if cfg.get("normalize", {}).get("strip_punctuation", True):
+        text = re.sub(r"[^\w\s\./\-+#]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+def legacy_extract(text: str, cfg: dict) -> dict:
+    text_norm = legacy_normalize(text or "", cfg)
+    token_boundary = cfg.get("normalize", {}).get("token_boundary_regex", r"\b")
+    found_by_cat = defaultdict(list)
+    counts = Counter()
+    if cfg.get("extraction", {}).get("prefer_phrase_match", True):
+        for cat, spec in (cfg.get("skills") or {}).items():
+            for phrase in spec.get("terms", []):
+                pat = re.compile(rf"{token_boundary}{re.escape(phrase)}{token_boundary}", re.I)
+                if pat.search(text_norm):
+                    found_by_cat[cat].append(phrase)
+                    counts[phrase] += 1
+    for cat, compiled_list in cfg.get("_compiled_regex", {}).items():
+        for rx in compiled_list:
+            for m in rx.finditer(text_norm):
+                val = m.group(0).lower().strip()
+                if val:
+                    found_by_cat[cat].append(val)
+                    counts[val] += 1
+    tokens = set(re.findall(r"\b[\w\+#/.:-]{2,}\b", text_norm))
+    stop = set(cfg.get("stopwords") or [])
+    for cat, spec in (cfg.get("skills") or {}).items():
+        for term in spec.get("terms", []):
+            if " " in term:
+                continue
+            if term in tokens and term not in stop:
+                found_by_cat[cat].append(term)
+                counts[term] += 1
+    for cat in list(found_by_cat.keys()):
+        found_by_cat[cat] = sorted(set(found_by_cat[cat]), key=lambda x: (len(x), x))
+    all_skills = sorted(set([s for v in found_by_cat.values() for s in v]))
+    return {
+        "skills_extracted": all_skills[: cfg.get("extraction", {}).get("max_skills_per_post", 30)],
+        "by_category": dict(found_by_cat),
+        "counts": dict(counts),
+    }
+
+def legacy_title_desc(title: str, desc: str, cfg: dict) -> dict:
+    res = legacy_extract(" ".join([title or "", desc or ""]), cfg)
+    res["skills_score"] = compute_skills_score(res["by_category"], cfg)
+    return res
+
+# teks sulit: alias bertumpuk, prefiks term, tanda baca, token gabungan
+EDGE_CASES = [
+    ("PowerBI/MS Excel", "python/sql, t-sql; R & r-studio; power bi.powerbi"),
+    ("Data Warehouse", "data warehouse-nya; kualitas data.kualitas data; ETL/ELT"),
+    ("", "SNI-TKDN: mapping+segmentasi #reporting ... problem  solving"),
+    (None, None),
+]
+
+def main() -> int:
+    run_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else SAMPLE_RUN
+    cfg = load_skills_config(SKILLS_PATH)
+    posts = [(x.get("posisi"), x.get("deskripsi_posisi")) for x in iter_raw_items(run_dir)] + EDGE_CASES
+
+    results, timings = {}, {}
+    for name, fn in (("lama", legacy_title_desc), ("terkompilasi", extract_from_title_and_desc)):
+        t0 = time.perf_counter()
+        results[name] = [fn(t, d, cfg) for t, d in posts]
+        timings[name] = time.perf_counter() - t0
+
+    # json.dumps tanpa sort_keys → urutan key dict ikut dibandingkan
+    diff = [i for i, (a, b) in enumerate(zip(results["lama"], results["terkompilasi"]))
+            if json.dumps(a) != json.dumps(b)]
+    for i in diff[:5]:
+        print(f"[FAIL] #{i} {posts[i][0]!r}\n  lama: {results['lama'][i]}\n  baru: {results['terkompilasi'][i]}")
+
+    print(f"\n{'path':<13} {'detik':>7} {'posting/s':>10}")
+    for name, t in timings.items():
+        print(f"{name:<13} {t:>7.2f} {len(posts) / t:>10.0f}")
+    print(f"speedup {timings['lama'] / timings['terkompilasi']:.1f}x")
+    print(f"[OK] {len(posts)} posting identik" if not diff else f"[FAIL] {len(diff)} posting berbeda")
+    return 0 if not diff else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# benchmarks/bench_web_bundle.py
+"""
+Payload frontend dari web/scripts/convert_data.py pada data sintetis (kolom teks panjang
+seperti deskripsi/alamat/logo ikut):
+  - lama : satu data.json, semua kolom, indent=2 → halaman utama DAN laporan mengunduh +
+           JSON.parse seluruhnya
+  - baru : src/web_bundle.py → list.json (kolom tabel saja), facets.json (agregat laporan),
+           detail/<nnn>.json (dibuka per posting), JSON ringkas + .gz/.br
+Ukuran mentah/gzip/brotli dan waktu parse (Python json.loads; node JSON.parse bila node ada).
+Lolos jika kolom list sama dengan data.json lama dan facets.json sama dengan hitungan
+laporan/page.tsx lama atas data.json (dijalankan di node; tanpa node dihitung ulang di
+Python). Rasio ∞ (kuota 0) di klien lama ditulis 0 di facets (JSON tidak punya Infinity).
+
+Jalankan:
+  python -m benchmarks.bench_web_bundle [--rows 30000 100000]
+"""
+import sys, gzip, json, time, shutil, argparse, tempfile, subprocess
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.bench_app_load import FILLER
+from benchmarks.bench_query import synthetic
+from src.category import categorize
+from src.web_bundle import BROTLI_LEVEL, LIST_FIELDS, FALLBACK_CATEGORY, facets, shard_of, write_data_bundle
+
+# hitungan klien lama (laporan/page.tsx), dijalankan node atas data.json lama
+LAPORAN_JS = r"""
+const data = JSON.parse(require('fs').readFileSync(process.argv[1], 'utf8'));
+const ratio = (a, q) => { const r = a / q || 0; return isFinite(r) ? r : 0; };
+const totalQuota = data.reduce((s, v) => s + v.jumlah_kuota, 0);
+const totalApplicants = data.reduce((s, v) => s + v.jumlah_terdaftar, 0);
+const prov = new Map(), comp = new Map(), cats = new Map();
+for (const v of data) {
+  if (!prov.has(v.nama_provinsi)) prov.set(v.nama_provinsi, { companies: new Set(), positions: 0, quota: 0, applicants: 0 });
+  const p = prov.get(v.nama_provinsi);
+  p.companies.add(v.nama_perusahaan); p.positions += 1; p.quota += v.jumlah_kuota; p.applicants += v.jumlah_terdaftar;
+  if (!comp.has(v.nama_perusahaan)) comp.set(v.nama_perusahaan, { positions: 0, quota: 0, applicants: 0 });
+  const c = comp.get(v.nama_perusahaan);
+  c.positions += 1; c.quota += v.jumlah_kuota; c.applicants += v.jumlah_terdaftar;
+  const cat = v.kategori_posisi || 'Lainnya';
+  cats.set(cat, (cats.get(cat) || 0) + 1);
+}
+console.log(JSON.stringify({
+  national: { totalPositions: data.length, totalCompanies: new Set(data.map(v => v.nama_perusahaan)).size,
+              totalQuota, totalApplicants, avgCompetition: ratio(totalApplicants, totalQuota) },
+  provinces: [...prov].map(([province, s]) => ({ province, companies: s.companies.size, positions: s.positions,
+              quota: s.quota, applicants: s.applicants, competition: ratio(s.applicants, s.quota) })),
+  topCompanies: [...comp].map(([company, s]) => ({ company, ...s, competition: ratio(s.applicants, s.quota) }))
+              .sort((a, b) => b.positions - a.positions).slice(0, 10),
+  categories: [...cats].map(([name, value]) => ({ name, value })).sort((a, b) => b.value - a.value),
+}));
+"""
+
+PARSE_JS = r"""
+const fs = require('fs');
+for (const p of process.argv.slice(1)) {
+  const text = fs.readFileSync(p, 'utf8');
+  const t0 = process.hrtime.bigint();
+  for (let i = 0; i < 5; i++) JSON.parse(text);
+  console.log(Number(process.hrtime.bigint() - t0) / 5e6);
+}
+"""
+
+def make_frame(n: int) -> pd.DataFrame:
+    """Frame seperti di convert_data.py sebelum ekspor (tanggal sudah string ISO)."""
+    rng = np.random.default_rng(4)
+    df = synthetic(n).drop(columns=["priority_score", "ratio_order", "priority_rank"], errors="ignore")
+    df.insert(0, "id_posisi", [f"{rng.integers(1 << 32):08x}-{i:04x}-4{i % 4096:03x}" for i in range(n)])
+    df["kategori_posisi"] = categorize(df["posisi"], df["kategori_posisi"])
+    df["deskripsi_posisi"] = [" ".join(rng.choice(FILLER, size=k)) for k in rng.integers(80, 300, n)]
+    df["alamat_perusahaan"] = [f"Jl. Contoh No. {i % 997}, Kelurahan {i % 89}, Kota {i % 41}" for i in range(n)]
+    df["logo"] = [f"https://maganghub.kemnaker.go.id/be/v1/storage/uploads/logo/2025/11/{i % 5000:032x}.jpg"
+                  for i in range(n)]
+    df["jenjang"] = [["Sarjana", "Diploma"][: 1 + i % 2] for i in range(n)]
+    for col in ("first_seen", "last_seen"):
+        df[col] = df[col].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return df
+
+def old_json(df: pd.DataFrame) -> bytes:
+    """Ekspor lama convert_data.py: fillna(""), semua kolom, indent=2."""
+    data = df.fillna("").to_dict(orient="records")
+
+    def convert(obj):
+        if isinstance(obj, dict):
+            return {k: convert(v) for k, v in obj.items()}
+        if isinstance(obj, (list, np.ndarray)):
+            return [convert(i) for i in obj]
+        return obj.item() if hasattr(obj, "item") else obj
+
+    return json.dumps(convert(data), ensure_ascii=False, indent=2).encode("utf-8")
+
+def sizes(data: bytes) -> tuple[int, int, int]:
+    return (len(data), len(gzip.compress(data, compresslevel=9)),
+            len(pa.Codec("brotli", compression_level=BROTLI_LEVEL).compress(data, asbytes=True)))
+
+def parse_ms(data: bytes, repeat: int = 5) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        json.loads(data)
+    return (time.perf_counter() - t0) / repeat * 1e3
+
+def old_facets_py(old: list[dict]) -> dict:
+    """Sama dengan LAPORAN_JS (tanpa node)."""
+    df = pd.DataFrame(old)
+    df["kategori_posisi"] = df["kategori_posisi"].replace("", FALLBACK_CATEGORY)
+    return facets(df)
+
+def same(a, b) -> bool:
+    if isinstance(a, dict):
+        return isinstance(b, dict) and a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return isinstance(b, list) and len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) or isinstance(b, float):
+        return bool(np.isclose(a, b, rtol=1e-12))
+    return a == b
+
+def bench(n: int, node: str | None) -> bool:
+    df = make_frame(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        old = old_json(df)
+        (tmp / "data.json").write_bytes(old)
+        t0 = time.perf_counter()
+        manifest = write_data_bundle(df, tmp / "data")
+        t_write = time.perf_counter() - t0
+        lst = (tmp / "data" / "list.json").read_bytes()
+        fac = (tmp / "data" / "facets.json").read_bytes()
+        probe = str(df["id_posisi"].iloc[n // 2])
+        shard_path = tmp / "data" / "detail" / f"{shard_of(probe, manifest['shards']):03d}.json"
+        shard = shard_path.read_bytes()
+
+        files = {"data.json (lama)": old, "list.json": lst, "facets.json": fac, "1 shard detail": shard}
+        node_ms = {}
+        if node:
+            paths = [tmp / "data.json", tmp / "data" / "list.json", tmp / "data" / "facets.json", shard_path]
+            out = subprocess.run([node, "-e", PARSE_JS, *map(str, paths)], capture_output=True, text=True, check=True)
+            node_ms = dict(zip(files, map(float, out.stdout.split())))
+            out = subprocess.run([node, "-e", LAPORAN_JS, str(tmp / "data.json")],
+                                 capture_output=True, text=True, check=True)
+            expected = json.loads(out.stdout)
+        old_rows = json.loads(old)
+        if not node:
+            expected = old_facets_py(old_rows)
+
+        got_list, got_facets = json.loads(lst), json.loads(fac)
+        got_detail = json.loads(shard)[probe]
+
+    ok = len(got_list) == len(old_rows) == manifest["rows"]
+    for o, g in zip(old_rows, got_list):
+        want = {k: o[k] for k in LIST_FIELDS if k in o}
+        want["competition_ratio"] = None if o["competition_ratio"] == "" else round(o["competition_ratio"], 4)
+        want["skills_norm"] = [str(s).lower() for s in o["skills_extracted"]]
+        ok &= same(want, g)
+    ok &= same(expected, got_facets)
+    ok &= got_detail["deskripsi_posisi"] == df.set_index("id_posisi").at[probe, "deskripsi_posisi"]
+
+    print(f"\n{n:,} baris | tulis bundle {t_write:.2f} s ({manifest['shards']} shard detail, "
+          f"total detail {manifest['detail_bytes'] / 1e6:.1f} MB)")
+    print(f"  {'file':<18}{'mentah kB':>11}{'gzip kB':>10}{'br kB':>9}{'parse py ms':>13}{'parse node ms':>15}")
+    for name, data in files.items():
+        raw, gz, br = sizes(data)
+        js = f"{node_ms[name]:15.1f}" if name in node_ms else f"{'-':>15}"
+        print(f"  {name:<18}{raw / 1e3:11.1f}{gz / 1e3:10.1f}{br / 1e3:9.1f}{parse_ms(data):13.1f}{js}")
+    return bool(ok)
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[30000, 100000])
+    args = ap.parse_args()
+
+    node = shutil.which("node")
+    if not node:
+        print("[WARN] node tidak ditemukan: parse JS dilewati, facets dibandingkan dengan hitungan Python")
+    ok = all([bench(n, node) for n in args.rows])
+    print("[OK] list + facets identik dengan data.json lama" if ok else "[FAIL] hasil berbeda")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
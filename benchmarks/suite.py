@@ -0,0 +1,274 @@
+# benchmarks/suite.py
+"""
+Suite benchmark berulang (gaya asv) untuk jalur panas, pada run RAW sampel yang di-commit
+dan salinan sintetisnya (halaman sampel di-clone + diganggu: id unik, jumlah pendaftar /
+kuota digeser, judul diberi kata tambahan, kalimat deskripsi diputar) × skala:
+
+  flatten  : prepare.flatten_vacancy per item RAW (streaming per chunk)
+  skills   : enrich_skills.extract_batch (judul + deskripsi)
+  score    : score.safe_competition_ratio + rank_frame (rank, bucket, priority, urutan)
+  app      : VacancyQuery (indeks saat load) + jalur filter/urut app.py untuk kombinasi umum
+  convert  : web_bundle.export_frame + write_data_bundle (isi convert_data.py / tahap web)
+
+Tiap kasus diulang --repeat kali (kasus cepat: sampai ±2 detik terukur) dengan input segar
+(persiapan tidak diukur); dicatat min / median detik, rows/detik (dari median) dan peak RSS
+proses. Hasil ditulis ke benchmarks/results/<waktu>.json lalu dibandingkan dengan
+benchmarks/baseline.json per kasus@skala memakai waktu terbaik (lebih stabil dari median
+untuk kasus < 1 detik): lebih lambat dari --tolerance → [FAIL], exit 1.
+--save-baseline menulis hasil run ini sebagai baseline baru. Angka baseline bergantung
+mesin; peringatan dicetak bila mesin/versi berbeda dengan saat baseline dibuat.
+
+convert butuh kolom teks penuh di memori (±3 kB/baris): dibatasi skala ≤ 10 kecuali
+--no-cap. Skala 100 untuk kasus lain butuh ±3.5 GB RAM (2,95 juta baris).
+
+Jalankan:
+  python -m benchmarks.suite                              # skala 1 dan 10, semua kasus
+  python -m benchmarks.suite --scales 100 --cases flatten skills score app
+  python -m benchmarks.suite --save-baseline
+"""
+import gc, os, sys, json, time, argparse, platform, subprocess, tempfile
+from pathlib import Path
+from statistics import median
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.category import categorize
+from src.enrich_skills import extract_batch, load_skills_config
+from src.metrics import peak_rss_mb, stamp
+from src.prepare import SKILLS_PATH, build_frame, flatten_vacancy, iter_chunks, iter_raw_items, stamp_seen
+from src.query import VacancyQuery
+from src.schema import Lookups, core_columns
+from src.score import SCORE_DEFAULTS, rank_frame, safe_competition_ratio
+from src.skill_index import SkillIndex
+from src.web_bundle import export_frame, write_data_bundle
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+BASELINE_PATH = ROOT / "benchmarks" / "baseline.json"
+RUN_TS = pd.Timestamp("2025-11-11T18:04:53Z")
+CHUNK_ROWS = 5000
+MIN_SAMPLE_S, MAX_REPEAT = 2.0, 30
+TITLE_WORDS = ["Senior", "Junior", "Staf", "Magang", "Asisten", "Koordinator"]
+
+# kombinasi filter app (nilai nyata diisi dari data: provinsi / kategori terbanyak)
+APP_COMBOS = [
+    dict(max_ratio=10.0, want_skills=["excel", "sql", "python"], limit=300),
+    dict(province="@prov", keyword="data", max_ratio=10.0, want_skills=["excel"], limit=300),
+    dict(category="@kat", keyword="Admin", max_ratio=2.0, limit=100),
+    dict(must_skills=["sql"], max_ratio=50.0, sort="priority", limit=1000),
+    dict(keyword="it", max_ratio=10.0, limit=300),
+    dict(province="@prov", category="@kat", keyword="zzz", max_ratio=1.0, limit=300),
+]
+
+# ---------- data sintetis ----------
+def perturb_item(item: dict, k: int, rng: np.random.Generator) -> dict:
+    """Salinan ke-k satu item RAW (k=0 → item asli apa adanya)."""
+    if k == 0:
+        return item
+    out = dict(item)
+    out["id_posisi"] = f"{item.get('id_posisi')}-{k:03d}"
+    out["jumlah_terdaftar"] = max(0, int(item.get("jumlah_terdaftar") or 0) + int(rng.integers(-3, 12)))
+    out["jumlah_kuota"] = max(0, int(item.get("jumlah_kuota") or 0) + int(rng.integers(-1, 2)))
+    if item.get("posisi") and rng.random() < 0.3:
+        out["posisi"] = f"{TITLE_WORDS[k % len(TITLE_WORDS)]} {item['posisi']}"
+    desc = item.get("deskripsi_posisi")
+    if desc and rng.random() < 0.5:
+        parts = desc.split(". ")
+        r = k % len(parts)
+        out["deskripsi_posisi"] = ". ".join(parts[r:] + parts[:r])
+    return out
+
+def iter_items(items: list[dict], scale: int, seed: int = 0):
+    """Item sampel × scale (salinan 0 = run asli), deterministik per seed."""
+    rng = np.random.default_rng(seed)
+    for k in range(scale):
+        for it in items:
+            yield perturb_item(it, k, rng)
+
+def clone_frame(df: pd.DataFrame, scale: int, seed: int = 0) -> pd.DataFrame:
+    """Frame snapshot × scale: id unik, jumlah pendaftar/kuota digeser (salinan 0 = asli)."""
+    rng = np.random.default_rng(seed)
+    parts = []
+    for k in range(scale):
+        part = df.copy()
+        if k:
+            part["id_posisi"] = part["id_posisi"].astype(str) + f"-{k:03d}"
+            part["jumlah_terdaftar"] = (part["jumlah_terdaftar"] + rng.integers(-3, 12, len(part))).clip(lower=0)
+            part["jumlah_kuota"] = (part["jumlah_kuota"] + rng.integers(-1, 2, len(part))).clip(lower=0)
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+class Context:
+    """Data dasar dari run sampel, dibangun sekali: item RAW + snapshot clean (dengan teks)."""
+    def __init__(self, run_dir: Path, tmp: Path):
+        self.tmp = tmp
+        self.items = list(iter_raw_items(run_dir))
+        self.skills_cfg = load_skills_config(SKILLS_PATH)
+        self.lookups = Lookups(tmp / "lookups")
+        frames = [build_frame(chunk, self.skills_cfg, lookups=self.lookups)
+                  for chunk in iter_chunks(iter(self.items), CHUNK_ROWS)]
+        self.snapshot = stamp_seen(pd.concat(frames, ignore_index=True), {}, RUN_TS)
+        self.core = self.snapshot[core_columns(self.snapshot.columns)].copy()
+        self.core["kategori_posisi"] = categorize(self.core["posisi"])  # seperti score.main (tidak diukur)
+
+# ---------- kasus ----------
+def case_flatten(ctx: Context, scale: int) -> tuple[float, int]:
+    seconds, rows = 0.0, 0
+    for chunk in iter_chunks(iter_items(ctx.items, scale), CHUNK_ROWS):
+        t0 = time.perf_counter()
+        flat = [flatten_vacancy(x) for x in chunk]
+        seconds += time.perf_counter() - t0
+        rows += len(flat)
+    return seconds, rows
+
+def case_skills(ctx: Context, scale: int) -> tuple[float, int]:
+    seconds, rows = 0.0, 0
+    for chunk in iter_chunks(iter_items(ctx.items, scale), CHUNK_ROWS):
+        titles = [x.get("posisi") for x in chunk]
+        descs = [x.get("deskripsi_posisi") for x in chunk]
+        t0 = time.perf_counter()
+        extract_batch(titles, descs, ctx.skills_cfg)
+        seconds += time.perf_counter() - t0
+        rows += len(chunk)
+    return seconds, rows
+
+def case_score(ctx: Context, scale: int) -> tuple[float, int]:
+    df = clone_frame(ctx.core, scale)
+    t0 = time.perf_counter()
+    df["competition_ratio"] = safe_competition_ratio(df)
+    rank_frame(df, SCORE_DEFAULTS)
+    return time.perf_counter() - t0, len(df)
+
+def scored_frame(ctx: Context, scale: int) -> pd.DataFrame:
+    df = clone_frame(ctx.core, scale)
+    df["competition_ratio"] = safe_competition_ratio(df)
+    return rank_frame(df, SCORE_DEFAULTS)
+
+def case_app(ctx: Context, scale: int) -> tuple[float, int]:
+    """Load (urutan + indeks skill + VacancyQuery) + satu putaran kombinasi filter (cache dingin)."""
+    df = scored_frame(ctx, scale)
+    prov = df["nama_provinsi"].astype(str).mode().iat[0]
+    kat = df["kategori_posisi"].astype(str).mode().iat[0]
+    t0 = time.perf_counter()
+    orderings = {"ratio": np.argsort(df["ratio_order"].to_numpy()),
+                 "priority": np.argsort(df["priority_rank"].to_numpy())}
+    engine = VacancyQuery(df, orderings, SkillIndex.from_lists(df["skills_extracted"]))
+    for combo in APP_COMBOS:
+        kw = {k: {"@prov": prov, "@kat": kat}.get(v, v) if isinstance(v, str) else v for k, v in combo.items()}
+        engine.run(**kw)
+    return time.perf_counter() - t0, len(df)
+
+def case_convert(ctx: Context, scale: int) -> tuple[float, int]:
+    df = clone_frame(ctx.snapshot, scale)
+    out_dir = ctx.tmp / "web"
+    t0 = time.perf_counter()
+    write_data_bundle(export_frame(df, ctx.lookups), out_dir)
+    return time.perf_counter() - t0, len(df)
+
+CASES = {"flatten": case_flatten, "skills": case_skills, "score": case_score,
+         "app": case_app, "convert": case_convert}
+MAX_SCALE = {"convert": 10}
+
+# ---------- harness ----------
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"python": platform.python_version(), "pandas": pd.__version__, "pyarrow": pa.__version__,
+            "machine": platform.machine(), "system": platform.system(), "cpus": os.cpu_count(),
+            "commit": commit}
+
+def run_case(name: str, ctx: Context, scale: int, repeat: int) -> dict:
+    """Minimal `repeat` kali; kasus cepat diulang sampai total waktu terukur ≥ MIN_SAMPLE_S."""
+    times, rows = [], 0
+    while len(times) < repeat or (sum(times) < MIN_SAMPLE_S and len(times) < MAX_REPEAT):
+        gc.collect()
+        seconds, rows = CASES[name](ctx, scale)
+        times.append(seconds)
+    med = median(times)
+    return {"rows": rows, "seconds": [round(t, 4) for t in times], "min_s": round(min(times), 4),
+            "median_s": round(med, 4), "rows_per_s": round(rows / med, 1) if med > 0 else None,
+            "rss_peak_mb": peak_rss_mb()}
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Key kasus@skala yang lebih lambat dari baseline × (1 + tolerance); cetak tabel perbandingan."""
+    slower = []
+    print(f"\n  {'kasus':<16}{'baris':>11}{'min s':>11}{'baseline s':>12}{'rasio':>8}")
+    for key, r in results.items():
+        base = (baseline.get("results") or {}).get(key)
+        if base is None:
+            print(f"  {key:<16}{r['rows']:>11,}{r['min_s']:>11.3f}{'-':>12}{'-':>8}  (baru)")
+            continue
+        ratio = r["min_s"] / base["min_s"] if base["min_s"] else float("inf")
+        flag = "  [FAIL] lebih lambat" if ratio > 1 + tolerance else ("  lebih cepat" if ratio < 1 - tolerance else "")
+        if r["rows"] != base["rows"]:
+            flag += f"  (baris baseline {base['rows']:,})"
+        print(f"  {key:<16}{r['rows']:>11,}{r['min_s']:>11.3f}{base['min_s']:>12.3f}{ratio:>8.2f}{flag}")
+        if ratio > 1 + tolerance:
+            slower.append(key)
+    return slower
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Suite benchmark jalur panas (skala data sintetis)")
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    ap.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--run", type=Path, default=SAMPLE_RUN, help="run RAW dasar (default: sampel di repo)")
+    ap.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    ap.add_argument("--tolerance", type=float, default=0.25, help="batas lebih lambat relatif baseline")
+    ap.add_argument("--save-baseline", action="store_true", help="simpan hasil sebagai baseline")
+    ap.add_argument("--no-cap", action="store_true", help="abaikan batas skala per kasus (convert ≤ 10)")
+    ap.add_argument("--out", type=Path, default=None, help="file hasil JSON (default benchmarks/results/<waktu>.json)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        ctx = Context(args.run, Path(tmp))
+        print(f"[INFO] Data dasar: {len(ctx.items):,} item dari {args.run.name} ({time.perf_counter() - t0:.1f}s)")
+        results = {}
+        for scale in args.scales:
+            for name in args.cases:
+                if not args.no_cap and scale > MAX_SCALE.get(name, scale):
+                    print(f"[INFO] {name}@{scale}x dilewati (batas skala {MAX_SCALE[name]}, --no-cap)")
+                    continue
+                key = f"{name}@{scale}x"
+                results[key] = r = run_case(name, ctx, scale, args.repeat)
+                print(f"[INFO] {key:<14} {r['rows']:>10,} baris | median {r['median_s']:.3f}s "
+                      f"(min {r['min_s']:.3f}) | {r['rows_per_s'] or 0:,.0f} baris/s | RSS {r['rss_peak_mb']} MB")
+
+    doc = {"written_at": stamp(), "env": environment(), "argv": sys.argv[1:],
+           "results": results}
+    out = args.out or RESULTS_DIR / f"{doc['written_at']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    print(f"[DONE] Hasil: {out}")
+
+    if args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        doc["results"] = {**(baseline.get("results") or {}), **results}  # skala lain di baseline dipertahankan
+        args.baseline.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        print(f"[DONE] Baseline diperbarui: {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"[WARN] Baseline {args.baseline} belum ada (--save-baseline untuk membuat)")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    env, base_env = doc["env"], baseline.get("env") or {}
+    diff = [k for k in ("python", "pandas", "pyarrow", "machine", "cpus") if env.get(k) != base_env.get(k)]
+    if diff:
+        print(f"[WARN] Lingkungan berbeda dari baseline ({', '.join(diff)}): bandingkan dengan hati-hati")
+    slower = compare(results, baseline, args.tolerance)
+    if slower:
+        print(f"[FAIL] {len(slower)} kasus lebih lambat > {args.tolerance:.0%} dari baseline: {', '.join(slower)}")
+        return 1
+    print(f"[OK] tidak ada kasus yang lebih lambat > {args.tolerance:.0%} dari baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# src/category.py
+"""
+Kategori posisi dari judul lowongan. Satu sumber aturan: config/categories.yaml.
+
+Aturan dicek berurutan. Kategori = aturan pertama yang salah satu keyword-nya
+muncul sebagai substring judul (lowercase). Jika tidak ada yang cocok, dipakai
+kategori lama (jika ada dan bukan generik), selain itu fallback ("Lainnya").
+Judul kosong → fallback.
+
+Semua keyword dikompilasi sekali menjadi satu regex trie (awalan bersama
+difaktorkan) dalam lookahead, jadi tiap posisi teks menghasilkan keyword
+terpanjang yang mulai di sana. Prioritas aturan per keyword sudah mencakup
+keyword lain yang merupakan awalannya. Judul unik digabung menjadi satu
+string dan dipindai sekali. Aturan per judul = minimum prioritas dari semua
+kecocokannya (np.minimum.at).
+
+Web memakai aturan yang sama lewat bundle JSON (category.ts):
+  python -m src.category --emit-bundle
+"""
+import re, json, argparse
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+RULES_PATH = ROOT / "config" / "categories.yaml"
+BUNDLE_PATH = ROOT / "web" / "src" / "utils" / "category_rules.json"
+
+def load_rules(path: str | Path = RULES_PATH) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        rules = yaml.safe_load(f) or {}
+    for r in rules.get("rules") or []:
+        if not r.get("category") or not r.get("keywords"):
+            raise ValueError(f"Aturan kategori tidak lengkap di {path}: {r}")
+    return rules
+
+class CategoryMatcher:
+    """Aturan categories.yaml yang dikompilasi sekali."""
+    def __init__(self, rules: dict):
+        self.fallback = rules.get("fallback", "Lainnya")
+        self.generic = {"", self.fallback, *(rules.get("generic") or [])}
+        self.categories = [r["category"] for r in rules.get("rules") or []]
+        self.keywords = [[str(k).lower() for k in r["keywords"]] for r in rules.get("rules") or []]
+        # prioritas per keyword: aturan pertama yang memuatnya / memuat awalannya
+        first = {}
+        for rule, kws in enumerate(self.keywords):
+            for k in kws:
+                first.setdefault(k, rule)
+        self.priority = {k: min(r for p, r in first.items() if k.startswith(p)) for k in first}
+        self.regex = re.compile(f"(?=({_trie_pattern(list(first))}))") if first else None
+        self._labels = np.array(self.categories + [self.fallback], dtype=object)
+
+    def classify_one(self, title, current=None) -> str:
+        """Versi skalar (referensi; semantik sama dengan category.ts)."""
+        if not isinstance(title, str) or not title:
+            return self.fallback
+        t = title.lower()
+        for cat, kws in zip(self.categories, self.keywords):
+            if any(k in t for k in kws):
+                return cat
+        if isinstance(current, str) and current not in self.generic:
+            return current
+        return self.fallback
+
+    def classify(self, titles, current=None) -> pd.Series:
+        """Kategori untuk banyak judul sekaligus (index mengikuti `titles` jika Series)."""
+        titles = titles if isinstance(titles, pd.Series) else pd.Series(titles, dtype=object)
+        codes, uniq = pd.factorize(titles, use_na_sentinel=True)
+        low = pd.Series(uniq, dtype=object).str.lower()
+        n_rules = len(self.categories)
+        rule = np.full(len(low), n_rules)
+        valid = (low.str.len() > 0).to_numpy()
+        if self.regex is not None and valid.any():
+            # satu string untuk semua judul unik, dipisah '\n' (keyword tidak memuat
+            # '\n'/'\0', jadi tidak ada kecocokan lintas judul)
+            texts = low[valid].str.replace("\n", "\0", regex=False)
+            lens = texts.str.len().to_numpy()
+            starts = np.concatenate([[0], np.cumsum(lens + 1)[:-1]])
+            hits = [(m.start(), m.group(1)) for m in self.regex.finditer("\n".join(texts))]
+            best = np.full(len(texts), n_rules)
+            if hits:
+                pos, kws = zip(*hits)
+                title_idx = np.searchsorted(starts, pos, side="right") - 1
+                np.minimum.at(best, title_idx, np.fromiter((self.priority[k] for k in kws), int, len(kws)))
+            rule[valid] = best
+        rule = np.append(rule, n_rules)  # kode -1 (NaN) → fallback
+        idx = rule[codes]
+        out = self._labels[idx]
+
+        if current is not None:
+            cur = pd.Series(np.asarray(current, dtype=object), dtype=object)
+            valid_title = np.append(valid, False)[codes]
+            # .str.len() NaN untuk non-string
+            specific = (cur.str.len().notna() & ~cur.isin(self.generic)).to_numpy()
+            keep = (idx == n_rules) & valid_title & specific
+            out = np.where(keep, cur.to_numpy(), out)
+        return pd.Series(out, index=titles.index, dtype=object)
+
+    def bundle(self) -> dict:
+        """Aturan dalam bentuk JSON untuk web (category.ts)."""
+        return {
+            "schema_version": 1,
+            "fallback": self.fallback,
+            "generic": sorted(self.generic - {""}),
+            "rules": [{"category": c, "keywords": k} for c, k in zip(self.categories, self.keywords)],
+        }
+
+def _trie_pattern(words: list[str]) -> str:
+    """Alternasi keyword sebagai trie regex; cabang greedy → keyword terpanjang di tiap posisi."""
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        if "" in node:
+            return "(?:" + "|".join(alts) + ")?"
+        return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+    return emit(trie)
+
+@lru_cache(maxsize=4)
+def _matcher(path: str, mtime: float) -> CategoryMatcher:
+    return CategoryMatcher(load_rules(path))
+
+def get_matcher(path: str | Path = RULES_PATH) -> CategoryMatcher:
+    """Matcher ter-cache per file aturan (dikompilasi ulang bila file berubah)."""
+    path = Path(path)
+    return _matcher(str(path), path.stat().st_mtime)
+
+def categorize(titles, current=None, rules_path: str | Path = RULES_PATH) -> pd.Series:
+    return get_matcher(rules_path).classify(titles, current)
+
+def write_bundle(path: str | Path = BUNDLE_PATH, rules_path: str | Path = RULES_PATH) -> bool:
+    """Tulis bundle JSON; return True jika isinya berubah."""
+    path = Path(path)
+    text = json.dumps(get_matcher(rules_path).bundle(), ensure_ascii=False, indent=2) + "\n"
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+def main():
+    ap = argparse.ArgumentParser(description="Kategori posisi dari config/categories.yaml")
+    ap.add_argument("--rules", default=str(RULES_PATH))
+    ap.add_argument("--emit-bundle", action="store_true", help="tulis bundle JSON untuk web")
+    ap.add_argument("--bundle", default=str(BUNDLE_PATH), help="path bundle JSON")
+    ap.add_argument("titles", nargs="*", help="judul untuk dicoba")
+    args = ap.parse_args()
+
+    if args.emit_bundle:
+        changed = write_bundle(args.bundle, args.rules)
+        print(f"[DONE] Bundle {'ditulis' if changed else 'sudah terbaru'}: {args.bundle}")
+    for title, cat in zip(args.titles, categorize(args.titles, rules_path=args.rules)):
+        print(f"{cat:<32} {title}")
+
+if __name__ == "__main__":
+    main()
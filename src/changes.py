@@ -0,0 +1,213 @@
+# src/changes.py
+"""
+Deteksi perubahan per record antar run (Parquet side table, pola sama dengan skill_cache).
+
+data/state/records.parquet:
+  id_posisi | record_hash | <satu kolom uint64 per field>
+  - field       : kolom hasil flatten_vacancy (yang dipakai prepare); nilai dinormalisasi
+                  (string JSON jenjang/program_studi → JSON kanonik, angka bulat → int) lalu di-hash
+  - record_hash : blake2b seluruh field ternormalisasi → posting identik dikenali tanpa
+                  membandingkan field satu per satu (0 = diperbarui mode counts, dihitung ulang)
+  - metadata    : INDEX_VERSION, snapshot tempat indeks terakhir disimpan, fingerprint build
+                  (kode prepare + skills.yaml)
+
+Per run (ChangeTracker.classify per chunk):
+  1. dedup id_posisi — halaman bergeser saat crawl (created_at DESC) → posting sama muncul
+     dua kali; kemunculan pertama dipakai, sisanya dihitung sebagai duplikat
+  2. klasifikasi terhadap indeks: new | updated (+ field yang berubah) | unchanged;
+     removed = id di indeks yang tidak terlihat lagi (hanya untuk sweep lengkap);
+     mode counts (hanya sebagian field): id yang tidak ada di indeks = skipped, bukan new
+     (tidak ada isi lengkap untuk ditambahkan ke snapshot)
+prepare hanya mem-flatten / mengekstrak skill baris new + updated; baris unchanged dibawa dari
+snapshot sebelumnya. Itu hanya aman bila snapshot sebelumnya = snapshot indeks dan fingerprint
+build sama (`reuse`); selain itu semua baris diproses ulang (klasifikasi tetap dilaporkan).
+"""
+import os, json, math, hashlib, functools
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+INDEX_VERSION = 1  # naikkan bila normalisasi / hash field berubah → indeks dibuang
+
+def build_fingerprint(paths: Iterable[str | Path]) -> str:
+    """Fingerprint isi file yang menentukan bentuk baris snapshot (kode prepare, skills.yaml)."""
+    h = hashlib.sha256(f"v{INDEX_VERSION}\n".encode())
+    for p in paths:
+        h.update(Path(p).read_bytes())
+    return h.hexdigest()[:16]
+
+@functools.lru_cache(maxsize=1 << 14)
+def _canonical_json(text: str) -> bytes:
+    # jenjang / program_studi: string JSON yang sangat berulang antar posting → cukup sekali per nilai
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return b"s" + text.encode("utf-8")
+    return b"j" + json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def canonical(value) -> bytes:
+    """Bentuk byte ternormalisasi satu nilai field (tipe ikut dibedakan: "1" ≠ 1)."""
+    if value is None:
+        return b"jnull"
+    if isinstance(value, str):
+        return _canonical_json(value) if value[:1] in ("[", "{") else b"s" + value.encode("utf-8")
+    if isinstance(value, float) and math.isfinite(value) and value.is_integer():
+        value = int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return b"j%d" % value
+    return b"j" + json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def digest(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+def record_hash(parts: list[bytes]) -> int:
+    """Hash isi satu record = blake2b atas semua field ternormalisasi (urut, dipisah \\x1e)."""
+    return digest(b"\x1e".join(parts))
+
+class ChangeTracker:
+    """Indeks id_posisi → (record_hash, hash per field), dimuat dari / disimpan ke satu file
+    Parquet, + status posting run ini."""
+    def __init__(self, path: str | Path, fields: list[str], flatten: Callable[[dict], dict],
+                 build: str, snapshot: Optional[str]):
+        self.path = Path(path)
+        self.fields = list(fields)
+        self.flatten = flatten
+        self.build = build
+        self._entries: dict[str, tuple[int, tuple]] = {}
+        self._pending: dict[str, tuple[int, tuple]] = {}
+        self.reuse = False
+        self.records = 0
+        self.duplicates = 0
+        self.seen: set = set()
+        self.new: set = set()
+        self.updated: dict[str, list[str]] = {}
+        self.unchanged: set = set()
+        self.skipped: set = set()
+        self._load(snapshot)
+
+    def _load(self, snapshot: Optional[str]) -> None:
+        if not self.path.exists():
+            print(f"[INFO] Indeks record kosong ({self.path.name} belum ada) → semua posting dianggap baru")
+            return
+        try:
+            pf = pq.ParquetFile(self.path)
+            meta = pf.schema_arrow.metadata or {}
+            if (meta.get(b"index_version", b"").decode() != str(INDEX_VERSION)
+                    or pf.schema_arrow.names[2:] != self.fields):
+                print("[INFO] Format indeks record berubah → indeks di-reset")
+                return
+            t = pf.read()
+        except Exception as e:
+            print(f"[WARN] Gagal baca indeks record ({e}) → mulai dari kosong")
+            return
+        ids = t.column("id_posisi").to_pylist()
+        hashes = t.column("record_hash").to_pylist()
+        fields = zip(*(t.column(f).to_pylist() for f in self.fields))
+        self._entries = {i: (rh, fh) for i, rh, fh in zip(ids, hashes, fields) if i is not None}
+        same_snapshot = snapshot is not None and meta.get(b"snapshot", b"").decode() == snapshot
+        same_build = meta.get(b"build", b"").decode() == self.build
+        self.reuse = same_snapshot and same_build
+        why = ""
+        if not self.reuse:
+            why = " | snapshot berbeda" if not same_snapshot else " | kode/skills berubah"
+            why += " → semua posting diproses ulang"
+        print(f"[INFO] Indeks record dimuat: {len(self._entries)} posting{why}")
+
+    def classify(self, items: list[dict], fields: Optional[list[str]] = None) -> list[dict]:
+        """Dedup + klasifikasi satu chunk item RAW. Return item yang perlu diproses
+        (new + updated; semua bila indeks tidak bisa dipakai ulang).
+        fields → hanya field itu yang dibandingkan (mode counts: item hanya berisi kuota/pendaftar);
+        posting yang belum ada di indeks tidak ditambahkan, dicatat sebagai skipped."""
+        cols = self.fields if fields is None else list(fields)
+        pos = [self.fields.index(f) for f in cols]
+        todo = []
+        for item in items:
+            self.records += 1
+            rid = item.get("id_posisi")
+            if rid is not None:
+                if rid in self.seen:
+                    self.duplicates += 1
+                    continue
+                self.seen.add(rid)
+            row = self.flatten(item)
+            parts = [canonical(row.get(f)) for f in cols]
+            old = self._entries.get(rid) if rid is not None else None
+            if fields is None:
+                rh = record_hash(parts)
+                if old is not None and old[0] == rh:
+                    changed = []  # jalur cepat: isi record identik
+                else:
+                    fh = tuple(digest(p) for p in parts)
+                    changed = None if old is None else [f for f, a, b in zip(cols, old[1], fh) if a != b]
+                    if rid is not None:
+                        self._pending[rid] = (rh, fh)
+            else:
+                if old is None:
+                    self.skipped.add(rid)
+                    continue
+                fh = [digest(p) for p in parts]
+                changed = [f for f, k, v in zip(cols, pos, fh) if old[1][k] != v]
+                if changed:
+                    merged = list(old[1])
+                    for k, v in zip(pos, fh):
+                        merged[k] = v
+                    self._pending[rid] = (0, tuple(merged))  # record_hash 0 = dihitung ulang run berikutnya
+
+            if changed is None:
+                self.new.add(rid)
+            elif changed:
+                self.updated[rid] = changed
+            else:
+                self.unchanged.add(rid)
+                if self.reuse:
+                    continue
+            todo.append(item)
+        return todo
+
+    def removed(self) -> set:
+        """Id di indeks yang tidak terlihat run ini (bermakna hanya untuk sweep lengkap)."""
+        return self._entries.keys() - self.seen
+
+    def summary(self, complete_sweep: bool) -> dict:
+        fields: dict[str, int] = {}
+        for changed in self.updated.values():
+            for f in changed:
+                fields[f] = fields.get(f, 0) + 1
+        return {
+            "records": self.records,
+            "duplicates": self.duplicates,
+            "new": len(self.new),
+            "updated": len(self.updated),
+            "unchanged": len(self.unchanged),
+            "skipped": len(self.skipped),
+            "removed": len(self.removed()) if complete_sweep else None,
+            "updated_fields": dict(sorted(fields.items(), key=lambda kv: -kv[1])),
+            "reuse": self.reuse,
+        }
+
+    def save(self, snapshot: str, keep_ids: set) -> int:
+        """Tulis atomik (.tmp → rename). Indeks = posting yang ada di snapshot yang baru ditulis."""
+        entries = {**self._entries, **self._pending}
+        rows = [(i, e) for i, e in entries.items() if i in keep_ids]
+        schema = pa.schema(
+            [("id_posisi", pa.string()), ("record_hash", pa.uint64())] + [(f, pa.uint64()) for f in self.fields],
+            metadata={"index_version": str(INDEX_VERSION), "snapshot": snapshot, "build": self.build},
+        )
+        arrays = [pa.array([i for i, _ in rows], pa.string()), pa.array([e[0] for _, e in rows], pa.uint64())]
+        arrays += [pa.array([e[1][k] for _, e in rows], pa.uint64()) for k in range(len(self.fields))]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        pq.write_table(pa.Table.from_arrays(arrays, schema=schema), tmp)
+        os.replace(tmp, self.path)
+        return len(rows)
+
+def format_summary(s: dict) -> str:
+    """Satu baris ringkasan untuk log konsol."""
+    fields = ", ".join(f"{f} {n}" for f, n in list(s["updated_fields"].items())[:5])
+    removed = "-" if s["removed"] is None else s["removed"]
+    skipped = f", {s['skipped']} tak dikenal (dilewati)" if s.get("skipped") else ""
+    return (f"{s['new']} baru, {s['updated']} diperbarui" + (f" ({fields})" if fields else "")
+            + f", {s['unchanged']} tetap, {removed} hilang{skipped}"
+            + f" | {s['duplicates']} duplikat dari {s['records']} record")
@@ -0,0 +1,217 @@
+# src/clean_store.py
+"""
+Dataset clean terpartisi per snapshot (satu snapshot = satu run RAW).
+
+  data/clean/vacancies/
+    snapshot=run_20251112_.../part-0.parquet   ← snapshot terbaru: semua posting aktif
+    snapshot=run_20251111_.../part-0.parquet   ← posting yang terakhir terlihat di run itu
+    ...
+
+Tiap baris membawa first_seen / last_seen (UTC). Upsert per run (by id_posisi):
+  - snapshot baru = baris run ini (+ baris snapshot sebelumnya yang dibawa, mis. mode delta)
+  - partisi snapshot sebelumnya ditulis ulang hanya berisi baris yang tidak dibawa
+    (riwayat); kosong → partisi dihapus
+  - partisi yang lebih lama tidak disentuh, jadi biaya tulis ≈ ukuran set aktif
+
+Pembaca cukup read_latest(): filter `snapshot == terbaru` memangkas partisi lain
+(predicate pushdown) sebelum file dibuka. Kolom teks berat (schema.TEXT_COLUMNS)
+tidak ikut dibaca kecuali diminta; read_text() memuatnya per id_posisi, dan
+write_text_file() menyalinnya ke data/clean/vacancies_text.parquet (urut id_posisi,
+row group kecil) supaya app bisa membaca deskripsi satu posting lewat TextFile.
+Partisi riwayat mempertahankan skema saat ditulis, jadi snapshot terbaru dibaca
+dengan skemanya sendiri. File lama data/clean/vacancies.parquet tetap dibaca
+sebagai fallback sampai dataset pertama kali ditulis.
+"""
+import os, shutil
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.metrics import count, span
+from src.schema import TEXT_COLUMNS, core_columns
+
+ROOT = Path(__file__).resolve().parents[1]
+DATASET_DIR = ROOT / "data" / "clean" / "vacancies"
+LEGACY_FILE = ROOT / "data" / "clean" / "vacancies.parquet"
+TEXT_FILE = ROOT / "data" / "clean" / "vacancies_text.parquet"
+TEXT_ROW_GROUP_ROWS = 512  # deskripsi satu posting = baca satu row group (~0.5–1 MB)
+PARTITION_KEY = "snapshot"
+SEEN_FIELDS = [
+    pa.field("first_seen", pa.timestamp("us", tz="UTC")),
+    pa.field("last_seen", pa.timestamp("us", tz="UTC")),
+]
+
+def snapshot_dirs(dataset_dir: Path = DATASET_DIR) -> list[Path]:
+    """Partisi snapshot urut waktu (run_id diawali timestamp, jadi urut nama = urut waktu)."""
+    dataset_dir = Path(dataset_dir)
+    if not dataset_dir.exists():
+        return []
+    return sorted(p for p in dataset_dir.glob(f"{PARTITION_KEY}=*") if p.is_dir())
+
+def latest_snapshot(dataset_dir: Path = DATASET_DIR) -> Optional[str]:
+    dirs = snapshot_dirs(dataset_dir)
+    return dirs[-1].name.split("=", 1)[1] if dirs else None
+
+def _dataset(dataset_dir: Path, schema: Optional[pa.Schema] = None) -> ds.Dataset:
+    part = ds.partitioning(pa.schema([(PARTITION_KEY, pa.string())]), flavor="hive")
+    return ds.dataset(dataset_dir, format="parquet", partitioning=part, schema=schema)
+
+def _snapshot_table(dataset_dir: Path, snap: str, columns: Optional[list[str]],
+                    with_text: bool, filter=None) -> pa.Table:
+    files = sorted((Path(dataset_dir) / f"{PARTITION_KEY}={snap}").glob("*.parquet"))
+    schema = pq.read_schema(files[0])
+    if columns is None:
+        columns = core_columns(schema.names, with_text)
+    # skema partisi terbaru (bukan skema partisi riwayat tertua yang ditemukan discovery)
+    schema = pa.schema(list(schema) + [pa.field(PARTITION_KEY, pa.string())])
+    snap_filter = ds.field(PARTITION_KEY) == snap
+    return _dataset(dataset_dir, schema).to_table(
+        columns=columns, filter=snap_filter if filter is None else snap_filter & filter)
+
+def read_latest(dataset_dir: Path = DATASET_DIR, columns: Optional[list[str]] = None,
+                legacy_file: Optional[Path] = LEGACY_FILE, with_text: bool = False) -> pd.DataFrame:
+    """Snapshot terbaru sebagai DataFrame (hanya partisi terbaru yang dibaca).
+    columns None → semua kolom kecuali TEXT_COLUMNS (with_text=True → ikut dibaca)."""
+    snap = latest_snapshot(dataset_dir)
+    if snap is None:
+        if legacy_file is not None and Path(legacy_file).exists():
+            if columns is None:
+                columns = core_columns(pq.read_schema(legacy_file).names, with_text)
+            return pd.read_parquet(legacy_file, columns=columns)
+        raise FileNotFoundError(f"Dataset clean tidak ditemukan: {dataset_dir}")
+    table = _snapshot_table(dataset_dir, snap, columns, with_text)
+    if PARTITION_KEY in table.column_names and (columns is None or PARTITION_KEY not in columns):
+        table = table.drop([PARTITION_KEY])
+    return table.to_pandas()
+
+def read_text(dataset_dir: Path = DATASET_DIR, ids: Optional[Iterable[str]] = None,
+              legacy_file: Optional[Path] = None) -> pd.DataFrame:
+    """Grup kolom teks (id_posisi + TEXT_COLUMNS) snapshot terbaru; ids → hanya posting itu."""
+    columns = ["id_posisi", *TEXT_COLUMNS]
+    snap = latest_snapshot(dataset_dir)
+    if snap is None:
+        if legacy_file is not None and Path(legacy_file).exists():
+            filters = [("id_posisi", "in", list(ids))] if ids is not None else None
+            return pd.read_parquet(legacy_file, columns=columns, filters=filters)
+        raise FileNotFoundError(f"Dataset clean tidak ditemukan: {dataset_dir}")
+    flt = ds.field("id_posisi").isin(list(ids)) if ids is not None else None
+    return _snapshot_table(dataset_dir, snap, columns, True, flt).to_pandas()
+
+def write_text_file(df: pd.DataFrame, path: Path = TEXT_FILE) -> int:
+    """Tulis grup teks urut id_posisi dengan row group kecil: statistik min/max id_posisi
+    per row group membuat pencarian satu posting hanya membaca satu row group."""
+    df = df[["id_posisi", *TEXT_COLUMNS]].dropna(subset=["id_posisi"])
+    df = df.drop_duplicates("id_posisi").sort_values("id_posisi", kind="stable")
+    tmp = Path(path).with_name("_" + Path(path).name + ".tmp")
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp,
+                   row_group_size=TEXT_ROW_GROUP_ROWS, compression="zstd")
+    os.replace(tmp, path)
+    return len(df)
+
+class TextFile:
+    """Handle (memory-map) file berisi id_posisi + kolom teks untuk baca per posting.
+    Footer dan statistik row group dibaca sekali; get() hanya membuka row group yang
+    rentang id_posisi-nya memuat id (file urut → tepat satu; file tak urut tetap benar)."""
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.pf = pq.ParquetFile(self.path, memory_map=True)
+        names = self.pf.schema_arrow.names
+        self.columns = ["id_posisi", *[c for c in TEXT_COLUMNS if c in names]]
+        col = names.index("id_posisi")
+        meta = self.pf.metadata
+        self.bounds = []
+        for i in range(meta.num_row_groups):
+            stats = meta.row_group(i).column(col).statistics
+            has = stats is not None and stats.has_min_max
+            self.bounds.append((stats.min, stats.max) if has else (None, None))
+
+    def get(self, id_posisi: str) -> Optional[dict]:
+        """{kolom teks: nilai} untuk satu posting (None jika tidak ada)."""
+        for i, (lo, hi) in enumerate(self.bounds):
+            if lo is not None and not (lo <= id_posisi <= hi):
+                continue
+            t = self.pf.read_row_group(i, columns=self.columns)
+            hit = pc.equal(t.column("id_posisi"), id_posisi)
+            rows = t.filter(hit).to_pylist()
+            if rows:
+                return rows[0]
+        return None
+
+def iter_snapshot(dataset_dir: Path, snapshot: str, batch_rows: int,
+                  columns: Optional[list[str]] = None) -> Iterator[pd.DataFrame]:
+    """Baca satu partisi snapshot per batch (memori = satu batch)."""
+    for path in sorted((Path(dataset_dir) / f"{PARTITION_KEY}={snapshot}").glob("*.parquet")):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=columns):
+            yield batch.to_pandas()
+
+def first_seen_index(dataset_dir: Path = DATASET_DIR) -> dict:
+    """id_posisi → first_seen paling awal di seluruh riwayat (hanya 2 kolom yang dibaca)."""
+    if not snapshot_dirs(dataset_dir):
+        return {}
+    t = _dataset(dataset_dir).to_table(columns=["id_posisi", "first_seen"])
+    df = t.to_pandas().dropna(subset=["id_posisi"])
+    return df.groupby("id_posisi")["first_seen"].min().to_dict()
+
+def _write_file(frames: Iterable[pd.DataFrame], path: Path, schema: pa.Schema,
+                sink: Optional[list] = None) -> int:
+    n_rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for df in frames:
+            with span("clean.write", rows=len(df)) as sp:
+                table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+                writer.write_table(table)
+                sp.add(bytes_in=table.nbytes)
+            if sink is not None:
+                sink.append(table)
+            n_rows += len(df)
+    count("clean.write", bytes_out=path.stat().st_size)
+    return n_rows
+
+def write_snapshot(frames: Iterable[pd.DataFrame], dataset_dir: Path, snapshot: str,
+                   schema: pa.Schema, sink: Optional[list] = None) -> int:
+    """Tulis partisi snapshot baru (streaming per frame) lalu pasang dengan rename.
+    Folder sementara berawalan '_' sehingga diabaikan pembaca dataset.
+    sink (list) → tiap tabel Arrow yang ditulis ikut ditampung (handoff in-memory pipeline)."""
+    dataset_dir = Path(dataset_dir)
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+    tmp = dataset_dir / f"_tmp-{snapshot}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    n_rows = _write_file(frames, tmp / "part-0.parquet", schema, sink)
+    final = dataset_dir / f"{PARTITION_KEY}={snapshot}"
+    if final.exists():  # prepare diulang untuk run yang sama → ganti partisinya
+        old = dataset_dir / f"_old-{snapshot}"
+        shutil.rmtree(old, ignore_errors=True)
+        os.replace(final, old)
+        os.replace(tmp, final)
+        shutil.rmtree(old)
+    else:
+        os.replace(tmp, final)
+    return n_rows
+
+def retire_rows(dataset_dir: Path, snapshot: str, carried_ids: set, schema: Optional[pa.Schema],
+                batch_rows: int) -> int:
+    """Tulis ulang partisi snapshot lama: buang baris yang sudah dibawa ke snapshot baru.
+    schema None → skema file partisi itu sendiri (partisi format lama tetap format lama).
+    Return jumlah baris riwayat yang tersisa (0 → partisi dihapus)."""
+    part_dir = Path(dataset_dir) / f"{PARTITION_KEY}={snapshot}"
+    files = sorted(part_dir.glob("*.parquet"))
+    schema = schema if schema is not None else pq.read_schema(files[0]).remove_metadata()
+    frames = (
+        df[~df["id_posisi"].isin(carried_ids)]
+        for df in iter_snapshot(dataset_dir, snapshot, batch_rows)
+    )
+    tmp = part_dir / "_part-0.parquet.tmp"
+    n_rows = _write_file(frames, tmp, schema)
+    if n_rows == 0:
+        shutil.rmtree(part_dir)
+        return 0
+    for f in files:
+        f.unlink()
+    os.replace(tmp, part_dir / "part-0.parquet")
+    return n_rows
@@ -0,0 +1,161 @@
+# src/count_history.py
+"""
+Riwayat jumlah_terdaftar / jumlah_kuota per run (append-only, ringkas).
+
+  data/state/counts/
+    ids.parquet                     ← kamus id_posisi → key int32 (hanya bertambah)
+    <run_id>.key.parquet            ← keyframe: semua posting aktif di run itu
+    <run_id>.diff.parquet           ← hanya posting yang baru / berubah sejak record terakhirnya
+
+Tiap file run: key (int32, urut) | ts (UTC) | terdaftar (int32) | kuota (int32).
+Kolom int ditulis DELTA_BINARY_PACKED + zstd, id_posisi tidak diulang per run
+(kamus global). Keyframe ditulis tiap KEYFRAME_EVERY run, jadi membaca
+jendela waktu cukup dari keyframe terakhir sebelum awal jendela.
+"""
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ROOT = Path(__file__).resolve().parents[1]
+HISTORY_DIR = ROOT / "data" / "state" / "counts"
+KEYFRAME_EVERY = 14  # 12 jam sekali → satu keyframe per minggu
+RUN_SCHEMA = pa.schema([
+    ("key", pa.int32()),
+    ("ts", pa.timestamp("us", tz="UTC")),
+    ("terdaftar", pa.int32()),
+    ("kuota", pa.int32()),
+])
+_ENCODING = {"key": "DELTA_BINARY_PACKED", "terdaftar": "DELTA_BINARY_PACKED", "kuota": "DELTA_BINARY_PACKED"}
+
+def _write(table: pa.Table, path: Path, **kwargs) -> None:
+    tmp = path.with_name("_" + path.name + ".tmp")
+    pq.write_table(table, tmp, compression="zstd", **kwargs)
+    os.replace(tmp, path)
+
+def load_ids(history_dir: Path = HISTORY_DIR) -> np.ndarray:
+    """Array id_posisi; indeks = key."""
+    p = Path(history_dir) / "ids.parquet"
+    if not p.exists():
+        return np.array([], dtype=object)
+    return pq.read_table(p).column("id_posisi").to_numpy(zero_copy_only=False)
+
+def run_files(history_dir: Path = HISTORY_DIR) -> list[tuple[str, str, Path]]:
+    """[(run_id, "key"|"diff", path)] urut run (run_id diawali timestamp)."""
+    out = []
+    for p in Path(history_dir).glob("run_*.parquet"):
+        run_id, kind = p.name[: -len(".parquet")].rsplit(".", 1)
+        out.append((run_id, kind, p))
+    return sorted(out)
+
+def _files_since(files: list[tuple[str, str, Path]], since: Optional[pd.Timestamp]) -> list[Path]:
+    """File dari keyframe terakhir yang ts-nya ≤ since (atau keyframe terakhir) sampai terbaru."""
+    keys = [i for i, (_, kind, _) in enumerate(files) if kind == "key"]
+    if not keys:
+        return [p for _, _, p in files]
+    start = keys[-1]
+    if since is not None:
+        for i in reversed(keys):
+            start = i
+            if _file_ts(files[i][2]) <= since:
+                break
+    return [p for _, _, p in files[start:]]
+
+def _file_ts(path: Path) -> pd.Timestamp:
+    return pd.Timestamp(int(pq.ParquetFile(path).metadata.metadata[b"run_ts_us"]), unit="us", tz="UTC")
+
+def read_counts(history_dir: Path = HISTORY_DIR, since: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """Record (key, ts, terdaftar, kuota) urut ts; mencakup state pada `since` (via keyframe)."""
+    paths = _files_since(run_files(history_dir), since)
+    if not paths:
+        return pd.DataFrame({f.name: pd.Series(dtype=f.type.to_pandas_dtype()) for f in RUN_SCHEMA})
+    df = pa.concat_tables([pq.read_table(p) for p in paths]).to_pandas()
+    return df.sort_values(["ts", "key"], kind="stable").reset_index(drop=True)
+
+def latest_state(history_dir: Path = HISTORY_DIR) -> pd.DataFrame:
+    """Nilai terakhir per key (keyframe terakhir + diff sesudahnya)."""
+    h = read_counts(history_dir)
+    return h.groupby("key", sort=True)[["terdaftar", "kuota"]].last()
+
+def append_counts(run_id: str, run_ts: pd.Timestamp, df: pd.DataFrame,
+                  history_dir: Path = HISTORY_DIR, keyframe_every: int = KEYFRAME_EVERY) -> dict:
+    """Catat counts satu run. df: id_posisi, jumlah_terdaftar, jumlah_kuota (duplikat id → baris pertama).
+    Run yang sama dicatat ulang → file run itu diganti."""
+    history_dir = Path(history_dir)
+    history_dir.mkdir(parents=True, exist_ok=True)
+    for _, _, p in [f for f in run_files(history_dir) if f[0] == run_id]:
+        p.unlink()
+
+    cur = df[["id_posisi", "jumlah_terdaftar", "jumlah_kuota"]].dropna(subset=["id_posisi"])
+    cur = cur.drop_duplicates("id_posisi", keep="first")
+
+    ids = load_ids(history_dir)
+    index = pd.Index(ids)
+    keys = index.get_indexer(cur["id_posisi"])
+    new = keys < 0
+    if new.any():
+        new_ids = cur["id_posisi"].to_numpy()[new]
+        keys[new] = np.arange(len(ids), len(ids) + len(new_ids))
+        ids = np.concatenate([ids, new_ids])
+        _write(pa.table({"id_posisi": pa.array(ids, type=pa.string())}), history_dir / "ids.parquet")
+
+    terdaftar = pd.to_numeric(cur["jumlah_terdaftar"], errors="coerce").fillna(-1).to_numpy("int32")
+    kuota = pd.to_numeric(cur["jumlah_kuota"], errors="coerce").fillna(-1).to_numpy("int32")
+    order = np.argsort(keys, kind="stable")
+    keys, terdaftar, kuota = keys[order].astype("int32"), terdaftar[order], kuota[order]
+
+    files = run_files(history_dir)
+    since_key = next((n for n, f in enumerate(reversed(files)) if f[1] == "key"), None)
+    keyframe = since_key is None or since_key + 1 >= keyframe_every
+    if not keyframe:
+        prev = latest_state(history_dir).reindex(keys)
+        changed = (prev["terdaftar"].to_numpy() != terdaftar) | (prev["kuota"].to_numpy() != kuota)
+        keys, terdaftar, kuota = keys[changed], terdaftar[changed], kuota[changed]
+
+    ts_us = int(run_ts.tz_convert("UTC").value // 1000)
+    table = pa.table({
+        "key": pa.array(keys, type=pa.int32()),
+        "ts": pa.array(np.full(len(keys), ts_us, dtype="int64"), type=RUN_SCHEMA.field("ts").type),
+        "terdaftar": pa.array(terdaftar, type=pa.int32()),
+        "kuota": pa.array(kuota, type=pa.int32()),
+    }, schema=RUN_SCHEMA.with_metadata({"run_ts_us": str(ts_us)}))
+    kind = "key" if keyframe else "diff"
+    path = history_dir / f"{run_id}.{kind}.parquet"
+    _write(table, path, use_dictionary=["ts"], column_encoding=_ENCODING)
+    return {"file": path.name, "rows": len(keys), "postings": len(cur), "bytes": path.stat().st_size}
+
+def velocity(history_dir: Path = HISTORY_DIR, window_days: float = 7.0) -> pd.DataFrame:
+    """Pendaftar per hari per posting dalam jendela `window_days` terakhir (relatif ke run terbaru).
+
+    Basis = nilai pada awal jendela (record terakhir ≤ awal jendela), atau record pertama
+    bila posting baru muncul di dalam jendela. Kurang dari 1 record selisih waktu → NaN.
+    Return: index id_posisi, kolom applicants_per_day, velocity_days.
+    """
+    files = run_files(history_dir)
+    if not files:
+        return pd.DataFrame(columns=["applicants_per_day", "velocity_days"], dtype=float)
+    now = _file_ts(files[-1][2])
+    start = now - pd.Timedelta(days=window_days)
+    h = read_counts(history_dir, since=start)
+    h = h[h["terdaftar"] >= 0]
+
+    last = h.groupby("key")["terdaftar"].last()
+    before = h[h["ts"] <= start].groupby("key")["terdaftar"].last()
+    after = h[h["ts"] > start].groupby("key")[["ts", "terdaftar"]].first()
+
+    base_val = before.reindex(last.index)
+    base_ts = pd.Series(start, index=last.index)
+    missing = base_val.isna()
+    base_val[missing] = after["terdaftar"].reindex(last.index)[missing]
+    base_ts[missing] = after["ts"].reindex(last.index)[missing]
+
+    days = (now - base_ts).dt.total_seconds() / 86400.0
+    rate = (last - base_val) / days.where(days > 0)
+    ids = load_ids(history_dir)
+    out = pd.DataFrame({"applicants_per_day": rate.to_numpy(float), "velocity_days": days.to_numpy(float)},
+                       index=pd.Index(ids[last.index.to_numpy()], name="id_posisi"))
+    return out
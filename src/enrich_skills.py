@@ -1,4 +1,5 @@
-import re, json
+import os, re, json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import defaultdict, Counter
 import yaml
@@ -15,25 +16,145 @@ def load_skills_config(path: str | Path) -> dict:
     # Siapkan frasa terms yang sudah di-lower untuk pencocokan frasa
     for cat, spec in cfg.get("skills", {}).items():
         spec["terms"] = [t.lower() for t in spec.get("terms", [])]
+    cfg["_matcher"] = SkillMatcher(cfg)
     return cfg
 
+# ---------- Matcher terkompilasi ----------
+def _overlaps(a: str, b: str) -> bool:
+    """True jika a dan b bisa saling menempel/tumpang-tindih di teks."""
+    if a in b or b in a:
+        return True
+    n = min(len(a), len(b))
+    return any(a.endswith(b[:k]) or b.endswith(a[:k]) for k in range(1, n))
+
+class SkillMatcher:
+    """Semua alias + terms satu skills.yaml dikompilasi sekali.
+
+    - alias: satu regex gabungan (satu re.sub); alias yang saling tumpang-tindih
+      tetap diganti berurutan seperti sebelumnya supaya hasilnya sama persis.
+    - terms kata biasa ("sql", "power bi"): satu findall `\w+` jadi indeks kata;
+      `\bterm\b` untuk term satu kata setara dengan term ada di indeks, frasa
+      multi-kata hanya diverifikasi (pola terkompilasi) bila semua katanya ada.
+    - terms lain (simbol, boundary khusus, teks tidak di-lowercase): satu regex
+      lookahead gabungan `(?=B(t1|t2|...)B)`, terpanjang dulu; term yang
+      merupakan prefiks term yang cocok dicek langsung di posisi yang sama.
+    """
+    def __init__(self, cfg: dict):
+        norm = cfg.get("normalize", {})
+        self.lowercase = norm.get("lowercase", True)
+        self.strip_punctuation = norm.get("strip_punctuation", True)
+        self.prefer_phrase = cfg.get("extraction", {}).get("prefer_phrase_match", True)
+        self.max_skills = cfg.get("extraction", {}).get("max_skills_per_post", 30)
+        self.regex = cfg.get("_compiled_regex", {})
+        tb = norm.get("token_boundary_regex", r"\b")
+
+        aliases = [(src.lower(), dst.lower()) for src, dst in (cfg.get("aliases") or {}).items()]
+        independent = len({s for s, _ in aliases}) == len(aliases) and not any(
+            _overlaps(aliases[i][0], aliases[j][0]) or _overlaps(aliases[j][0], aliases[i][1])
+            for i in range(len(aliases)) for j in range(i + 1, len(aliases))
+        )
+        if aliases and independent:
+            alts = "|".join(re.escape(s) for s, _ in sorted(aliases, key=lambda a: -len(a[0])))
+            amap = dict(aliases)
+            rx = re.compile(rf"\b(?:{alts})\b")
+            self._alias_steps = [(tuple(amap), rx, lambda m: amap[m.group(0)])]
+        else:
+            self._alias_steps = [((s,), re.compile(rf"\b{re.escape(s)}\b"), lambda m, d=d: d) for s, d in aliases]
+
+        # (kategori, term) sesuai urutan yaml → urutan by_category/counts sama dengan versi lama
+        self.pairs = [(cat, t) for cat, spec in (cfg.get("skills") or {}).items() for t in spec.get("terms", [])]
+        stop = set(cfg.get("stopwords") or [])
+        # token regex lama butuh ≥2 karakter → term 1 huruf ("r") tidak pernah cocok sebagai token
+        self.token_terms = {t for _, t in self.pairs if " " not in t and len(t) >= 2 and t not in stop}
+
+        self._keys: dict[str, list[str]] = {}  # casefold → term (pencarian re.I)
+        for _, t in self.pairs:
+            terms = self._keys.setdefault(t.lower(), [])
+            if t not in terms:
+                terms.append(t)
+        self._single = {k: re.compile(rf"{tb}{re.escape(k)}{tb}", re.I) for k in self._keys}
+
+        # dengan boundary \b, token utuh selalu juga cocok sebagai frasa
+        self.tokens_within_phrases = self.prefer_phrase and tb == r"\b"
+        use_index = tb == r"\b" and self.lowercase
+        plain = [k for k in self._keys if use_index and _PLAIN_TERM_RX.fullmatch(k)]
+        self._words = {k for k in plain if " " not in k}
+        self._phrases = {k: set(k.split(" ")) for k in plain if " " in k}
+        rest = sorted((k for k in self._keys if k not in self._words and k not in self._phrases),
+                      key=lambda k: (-len(k), k))
+        self._rest_rx = (
+            re.compile(rf"(?={tb}({'|'.join(re.escape(k) for k in rest)}){tb})", re.I) if rest else None
+        )
+        self._prefixes = {k: [q for q in rest if q != k and k.startswith(q)] for k in rest}
+
+    def normalize(self, text: str) -> str:
+        if not text:
+            return ""
+        text = text.strip()
+        if self.lowercase:
+            text = text.lower()
+        for srcs, rx, repl in self._alias_steps:
+            # cek substring (C, murah) dulu; regex hanya jalan kalau aliasnya memang ada
+            if any(src in text for src in srcs):
+                text = rx.sub(repl, text)
+        if self.strip_punctuation:
+            text = _PUNCT_RX.sub(" ", text)
+        # str.split() memakai definisi whitespace yang sama dengan \s
+        return " ".join(text.split())
+
+    def find_terms(self, text_norm: str) -> set[str]:
+        """Semua term yang muncul sebagai frasa utuh (`\bterm\b`)."""
+        keys = set()
+        if self._words or self._phrases:
+            if self.strip_punctuation:
+                # sisa karakter non-kata hanya ./-+# → ganti spasi lalu split = semua run \w+
+                words = set(text_norm.translate(_SYMBOLS_TO_SPACE).split())
+            else:
+                words = set(_WORD_RX.findall(text_norm))
+            keys = self._words & words
+            for k, parts in self._phrases.items():
+                if parts <= words and self._single[k].search(text_norm):
+                    keys.add(k)
+        if self._rest_rx is not None:
+            for m in self._rest_rx.finditer(text_norm):
+                k = m.group(1).lower()
+                keys.add(k)
+                for q in self._prefixes[k]:
+                    if q not in keys and self._single[q].match(text_norm, m.start()):
+                        keys.add(q)
+        return {t for k in keys for t in self._keys[k]}
+
+    def token_hits(self, text_norm: str, candidates: set[str]) -> set[str]:
+        """Kandidat term satu kata yang juga muncul sebagai token `\b[\w+#/.:-]{2,}\b`."""
+        if not candidates:
+            return set()
+        if not self.strip_punctuation:
+            return candidates & set(_TOKEN_RX.findall(text_norm))
+        # setelah normalisasi tiap potongan spasi hanya berisi \w dan ./-+#, sehingga
+        # token = potongan tanpa simbol di tepi; umumnya term sudah ketemu sebagai potongan polos
+        chunks = set(text_norm.split(" "))
+        found = candidates & chunks
+        if len(found) < len(candidates):
+            found |= candidates & {c.strip(_SYMBOLS) for c in chunks}
+        return found
+
+_PLAIN_TERM_RX = re.compile(r"\w+(?: \w+)*")
+_WORD_RX = re.compile(r"\w+")
+_PUNCT_RX = re.compile(r"[^\w\s\./\-+#]")
+_SYMBOLS = "./-+#"
+_SYMBOLS_TO_SPACE = str.maketrans(_SYMBOLS, " " * len(_SYMBOLS))
+_TOKEN_RX = re.compile(r"\b[\w\+#/.:-]{2,}\b")
+
+def get_matcher(cfg: dict) -> SkillMatcher:
+    """Matcher dari cfg (dibuat sekali lalu disimpan di cfg jika belum lewat load_skills_config)."""
+    m = cfg.get("_matcher")
+    if m is None:
+        m = cfg["_matcher"] = SkillMatcher(cfg)
+    return m
+
 # ---------- Normalisasi dasar ----------
 def _normalize_text(text: str, cfg: dict) -> str:
-    if not text:
-        return ""
-    text = text.strip()
-    if cfg.get("normalize", {}).get("lowercase", True):
-        text = text.lower()
-    # mapping alias (frasa → canonical)
-    for src, dst in (cfg.get("aliases") or {}).items():
-        # ganti sebagai frasa utuh dengan batas kata
-        text = re.sub(rf"\b{re.escape(src.lower())}\b", dst.lower(), text)
-    if cfg.get("normalize", {}).get("strip_punctuation", True):
-        # sisakan huruf/angka/spasi + beberapa simbol umum BI tools
-        text = re.sub(r"[^\w\s\./\-+#]", " ", text)
-    # rapikan spasi
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    return get_matcher(cfg).normalize(text)
 
 # ---------- Ekstraksi ----------
 def extract_skills(text: str, cfg: dict) -> dict:
@@ -45,24 +166,21 @@ def extract_skills(text: str, cfg: dict) -> dict:
         "counts": {"excel": 3, ...}  # jika muncul berulang
       }
     """
-    text_norm = _normalize_text(text or "", cfg)
-    token_boundary = cfg.get("normalize", {}).get("token_boundary_regex", r"\b")
+    matcher = get_matcher(cfg)
+    text_norm = matcher.normalize(text or "")
 
     found_by_cat = defaultdict(list)
     counts = Counter()
 
-    # 1) Frasa 'terms' (prioritas frasa utuh)
-    if cfg.get("extraction", {}).get("prefer_phrase_match", True):
-        for cat, spec in (cfg.get("skills") or {}).items():
-            for phrase in spec.get("terms", []):
-                # cari frasa utuh
-                pat = re.compile(rf"{token_boundary}{re.escape(phrase)}{token_boundary}", re.I)
-                if pat.search(text_norm):
-                    found_by_cat[cat].append(phrase)
-                    counts[phrase] += 1
+    # 1) Frasa 'terms' (prioritas frasa utuh) — satu pemindaian untuk semua term
+    hits = matcher.find_terms(text_norm) if matcher.prefer_phrase else set()
+    for cat, phrase in matcher.pairs:
+        if phrase in hits:
+            found_by_cat[cat].append(phrase)
+            counts[phrase] += 1
 
     # 2) Regex khusus per kategori
-    for cat, compiled_list in cfg.get("_compiled_regex", {}).items():
+    for cat, compiled_list in matcher.regex.items():
         for rx in compiled_list:
             for m in rx.finditer(text_norm):
                 val = m.group(0).lower().strip()
@@ -72,13 +190,13 @@ def extract_skills(text: str, cfg: dict) -> dict:
 
     # 3) (Opsional) Token-based simple match untuk single-word terms
     #    Hanya untuk terms 1 kata agar tidak kebanyakan false positive.
-    tokens = set(re.findall(r"\b[\w\+#/.:-]{2,}\b", text_norm))
-    stop = set(cfg.get("stopwords") or [])
-    for cat, spec in (cfg.get("skills") or {}).items():
-        for term in spec.get("terms", []):
-            if " " in term:  # sudah ditangani frasa
-                continue
-            if term in tokens and term not in stop:
+    #    Token utuh selalu juga cocok sebagai frasa, jadi kandidatnya cukup term
+    #    yang sudah ketemu di langkah 1 (hanya memengaruhi counts).
+    candidates = matcher.token_terms & hits if matcher.tokens_within_phrases else matcher.token_terms
+    token_hits = matcher.token_hits(text_norm, candidates)
+    if token_hits:
+        for cat, term in matcher.pairs:
+            if term in token_hits:
                 found_by_cat[cat].append(term)
                 counts[term] += 1
 
@@ -91,7 +209,7 @@ def extract_skills(text: str, cfg: dict) -> dict:
     all_skills = sorted(set([s for v in found_by_cat.values() for s in v]))
 
     return {
-        "skills_extracted": all_skills[: cfg.get("extraction", {}).get("max_skills_per_post", 30)],
+        "skills_extracted": all_skills[: matcher.max_skills],
         "by_category": dict(found_by_cat),
         "counts": dict(counts),
     }
@@ -123,6 +241,78 @@ def extract_from_title_and_desc(title: str, desc: str, cfg: dict) -> dict:
     res["skills_score"] = compute_skills_score(res["by_category"], cfg)
     return res
 
+# ---------- Batch kolumnar (serial / multiprocess) ----------
+def extract_batch(titles: list, descs: list, cfg: dict) -> tuple[list[list[str]], list[float]]:
+    """Ekstraksi banyak posting sekaligus; hasil per kolom (skills_extracted, skills_score)."""
+    skills, scores = [], []
+    for title, desc in zip(titles, descs):
+        res = extract_from_title_and_desc(title, desc, cfg)
+        skills.append(res["skills_extracted"])
+        scores.append(res["skills_score"])
+    return skills, scores
+
+_WORKER_CFG: dict | None = None
+
+def _init_worker(skills_path: str) -> None:
+    # sekali per proses worker: parse yaml + kompilasi matcher
+    global _WORKER_CFG
+    _WORKER_CFG = load_skills_config(skills_path)
+
+def _worker_batch(titles: list, descs: list) -> tuple[list[list[str]], list[float]]:
+    return extract_batch(titles, descs, _WORKER_CFG)
+
+class SkillExtractor:
+    """Ekstraksi skill per chunk, serial (workers=1) atau di-shard ke ProcessPoolExecutor.
+
+    Shard berupa potongan baris berurutan dan hasilnya digabung sesuai urutan
+    shard, jadi output identik dengan mode serial. `submit()` langsung mengirim
+    pekerjaan; pemanggil bisa mengerjakan hal lain lalu memanggil fungsi yang
+    dikembalikan untuk mengambil hasil.
+    """
+    MIN_SHARD_ROWS = 250
+
+    def __init__(self, skills_path: str | Path, workers: int = 1, cfg: dict | None = None):
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.cfg = cfg if cfg is not None else load_skills_config(skills_path)
+        self._pool = None
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(str(skills_path),)
+            )
+
+    def __enter__(self) -> "SkillExtractor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def submit(self, titles: list, descs: list):
+        if self._pool is None or len(titles) < 2 * self.MIN_SHARD_ROWS:
+            return lambda: extract_batch(titles, descs, self.cfg)
+        n_shards = min(self.workers, len(titles) // self.MIN_SHARD_ROWS)
+        bounds = [len(titles) * i // n_shards for i in range(n_shards + 1)]
+        futures = [
+            self._pool.submit(_worker_batch, titles[a:b], descs[a:b])
+            for a, b in zip(bounds, bounds[1:])
+        ]
+
+        def collect() -> tuple[list[list[str]], list[float]]:
+            skills, scores = [], []
+            for fut in futures:
+                s, sc = fut.result()
+                skills.extend(s)
+                scores.extend(sc)
+            return skills, scores
+        return collect
+
+    def __call__(self, titles: list, descs: list) -> tuple[list[list[str]], list[float]]:
+        return self.submit(titles, descs)()
+
 # ---------- Contoh pakai ----------
 if __name__ == "__main__":
     cfg = load_skills_config("config/skills.yaml")
@@ -1,11 +1,19 @@
 # src/fetch.py
-import os, sys, time, json, math, uuid, datetime as dt
+import os, sys, time, json, gzip, math, uuid, hashlib, threading, datetime as dt
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any, Dict, Tuple, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 import yaml
 from datetime import datetime, timezone
 
+if __package__ in (None, ""):  # dijalankan sebagai `python src/fetch.py`
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.metrics import span
+from src.raw_store import RawSink, recover_run, resolve_format
+
 ROOT = Path(__file__).resolve().parents[1]
 CONFIG_PATH = ROOT / "config" / "params.yaml"
 
@@ -26,6 +34,170 @@ def now_ts(tzname: str = "Asia/Jakarta") -> str:
     except Exception:
         return dt.datetime.now().strftime("%Y%m%d_%H%M%S")
 
+# ---------- Rate limit & koneksi bersama ----------
+class RateLimiter:
+    """Token bucket yang dibagi semua worker.
+
+    - max_rps  : laju rata-rata maksimum (request/detik) untuk SELURUH pool
+    - burst    : kapasitas bucket (default 1 → tidak ada lonjakan)
+    - pause()  : tahan semua worker sampai waktu tertentu (Retry-After / kuota habis)
+    """
+    def __init__(self, max_rps: float, burst: int = 1):
+        self.rate = float(max_rps) if max_rps and max_rps > 0 else 0.0
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.pause_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.pause_until:
+                    wait_s = self.pause_until - now
+                elif self.rate <= 0:
+                    return
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait_s = (1 - self.tokens) / self.rate
+            time.sleep(wait_s)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self.pause_until = max(self.pause_until, time.monotonic() + seconds)
+            # bucket dikosongkan agar setelah jeda tidak langsung burst
+            self.tokens = 0.0
+            self.updated = max(self.updated, self.pause_until)
+
+    def observe(self, resp: requests.Response, min_wait_s: int) -> None:
+        """Baca x-ratelimit-remaining; jika habis, jeda seluruh pool."""
+        raw = resp.headers.get("x-ratelimit-remaining")
+        if raw is None:
+            return  # server tidak mengirim budget → cukup token bucket
+        try:
+            remaining = int(raw)
+        except ValueError:
+            return
+        if remaining <= 1:
+            ra = resp.headers.get("Retry-After")
+            wait_s = int(ra) if ra and ra.isdigit() else min_wait_s
+            print(f"[RL] remaining={remaining} → sleep {wait_s}s (semua worker)")
+            self.pause(wait_s)
+
+# ---------- transport record / replay ----------
+TRANSPORTS = ("live", "record", "replay")
+CASSETTE_FILE = "cassette.jsonl.gz"
+
+class Cassette:
+    """Rekaman respons API: satu baris JSON per respons (status, header, body) di
+    <dir>/cassette.jsonl.gz, dikunci oleh parameter query (URL host diabaikan, jadi rekaman
+    API asli bisa diputar ulang di mana saja). Respons berulang untuk kunci yang sama
+    (mis. 429 lalu 200 saat retry) diputar ulang dengan urutan yang sama."""
+    def __init__(self, path: Path):
+        self.dir = Path(path)
+        self.path = self.dir / CASSETTE_FILE
+        self._lock = threading.Lock()
+        self._tapes: Dict[str, list] = {}
+        self._pos: Dict[str, int] = {}
+
+    @staticmethod
+    def key(params: Dict[str, Any]) -> str:
+        raw = json.dumps({k: str(v) for k, v in (params or {}).items()}, sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+    def record(self, params: Dict[str, Any], r: requests.Response) -> None:
+        entry = {"key": self.key(params), "params": params, "status": r.status_code,
+                 "headers": dict(r.headers), "body": r.content.decode("utf-8", errors="replace")}
+        entry["headers"].pop("Content-Encoding", None)  # body disimpan sudah didekode
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as f:  # anggota gzip baru per respons (aman bila proses mati)
+                f.write(gzip.compress(line, mtime=0))
+
+    def load(self) -> "Cassette":
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette tidak ditemukan: {self.path} (rekam dulu dengan --record)")
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._tapes.setdefault(entry["key"], []).append(entry)
+        return self
+
+    def play(self, url: str, params: Dict[str, Any]) -> requests.Response:
+        key = self.key(params)
+        with self._lock:
+            tape = self._tapes.get(key)
+            if not tape:
+                raise RuntimeError(f"Cassette tidak punya respons untuk {params}")
+            i = self._pos.get(key, 0)
+            self._pos[key] = i + 1
+            entry = tape[min(i, len(tape) - 1)]  # habis → respons terakhir diulang
+        r = requests.Response()
+        r.status_code = entry["status"]
+        r.headers = CaseInsensitiveDict(entry["headers"])
+        r._content = entry["body"].encode("utf-8")
+        r.encoding = "utf-8"
+        r.url = requests.Request("GET", url, params=params).prepare().url
+        return r
+
+class RecordingSession:
+    """requests.Session biasa + setiap respons ditulis ke cassette."""
+    def __init__(self, session: requests.Session, cassette: Cassette):
+        self.session = session
+        self.cassette = cassette
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        r = self.session.get(url, params=params, **kwargs)
+        self.cassette.record(params or {}, r)
+        return r
+
+class ReplaySession:
+    """Pengganti requests.Session yang menjawab dari cassette (tanpa jaringan)."""
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        return self.cassette.play(url, params or {})
+
+class SessionPool:
+    """Satu requests.Session (keep-alive) per thread worker, dipakai ulang antar halaman.
+    transport "record" membungkusnya dengan RecordingSession; "replay" memakai satu
+    ReplaySession bersama (cassette di `cassette_dir`)."""
+    def __init__(self, headers: Dict[str, str], pool_size: int = 1, transport: str = "live",
+                 cassette_dir: Optional[Path] = None):
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Transport tidak dikenal: {transport} (pilih: {', '.join(TRANSPORTS)})")
+        if transport != "live" and cassette_dir is None:
+            raise ValueError(f"transport={transport} butuh run.cassette_dir / --record DIR / --replay DIR")
+        self.headers = headers
+        self.pool_size = max(1, int(pool_size))
+        self.transport = transport
+        self.cassette = Cassette(cassette_dir) if cassette_dir is not None else None
+        self._replay = ReplaySession(self.cassette.load()) if transport == "replay" else None
+        self._local = threading.local()
+
+    def get(self):
+        if self._replay is not None:
+            return self._replay
+        s = getattr(self._local, "session", None)
+        if s is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            s.headers.update(self.headers)
+            if self.transport == "record":
+                s = RecordingSession(s, self.cassette)
+            self._local.session = s
+        return s
+
 def request_page(
     url: str,
     params: Dict[str, Any],
@@ -33,14 +205,28 @@ def request_page(
     timeout_s: int,
     max_retries: int,
     retry_backoff_s: int,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[RateLimiter] = None,
 ) -> Tuple[dict, requests.Response]:
-    """GET with simple retry incl. 429 + 5xx. Honors Retry-After if present."""
+    """GET with simple retry incl. 429 + 5xx. Honors Retry-After if present.
+
+    Jika `limiter` diberikan, tiap percobaan mengambil token dulu dan
+    Retry-After dari server menahan semua worker, bukan hanya thread ini.
+    """
+    http = session or requests
     attempt = 0
     while True:
-        r = requests.get(url, params=params, headers=headers, timeout=timeout_s)
+        if limiter is not None:
+            limiter.acquire()
+        with span("fetch.request") as sp:
+            r = http.get(url, params=params, headers=headers, timeout=timeout_s)
+            sp.add(bytes_in=len(r.content))
         if r.status_code == 200:
             try:
-                return r.json(), r
+                with span("fetch.parse", bytes_in=len(r.content)) as sp:
+                    data = r.json()
+                    sp.add(rows=len(data.get("data") or []) if isinstance(data, dict) else 0)
+                return data, r
             except Exception as e:
                 raise RuntimeError(f"Gagal parse JSON: {e}") from e
 
@@ -49,140 +235,458 @@ def request_page(
             attempt += 1
             ra = r.headers.get("Retry-After")
             wait_s = int(ra) if ra and ra.isdigit() else retry_backoff_s * attempt
+            if limiter is not None:
+                if r.status_code == 429 or ra:
+                    limiter.pause(wait_s)
+                    continue
             time.sleep(wait_s)
             continue
 
         # hard fail
         raise RuntimeError(f"Request gagal: HTTP {r.status_code} | {r.text[:300]}")
 
-def main():
-    cfg = load_config()
+MODES = ("full", "delta", "counts")
+COUNT_FIELDS = ("id_posisi", "jumlah_kuota", "jumlah_terdaftar")
+WATERMARK_FILE = "watermark.json"
+
+def slim_counts(data: dict, known: Optional[set] = None) -> dict:
+    """Mode counts: simpan hanya id + kuota + pendaftar per item. Item yang id-nya belum
+    dikenal (`known` = id watermark) disimpan utuh → prepare menambahkannya ke snapshot
+    (posting terbit telat / created_at mundur yang terlewat mode delta)."""
+    items = [
+        x if known is not None and x.get("id_posisi") is not None and x.get("id_posisi") not in known
+        else {k: x.get(k) for k in COUNT_FIELDS}
+        for x in (data.get("data") or [])
+    ]
+    return {"data": items, "meta": data.get("meta")}
+
+# ---------- Watermark (mode delta) ----------
+def load_watermark(state_dir: Path) -> Optional[dict]:
+    p = state_dir / WATERMARK_FILE
+    if not p.exists():
+        return None
+    with open(p, "r", encoding="utf-8") as f:
+        wm = json.load(f)
+    wm["ids"] = set(wm.get("ids") or [])
+    return wm
+
+def save_watermark(state_dir: Path, ids: set, newest_created_at: Optional[str], run_id: str) -> Path:
+    state_dir.mkdir(parents=True, exist_ok=True)
+    p = state_dir / WATERMARK_FILE
+    wm = {
+        "run_id": run_id,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "newest_created_at": newest_created_at,
+        "n_ids": len(ids),
+        "ids": sorted(i for i in ids if i),
+    }
+    with open(p, "w", encoding="utf-8") as f:
+        json.dump(wm, f, ensure_ascii=False)
+    return p
+
+def newest_created(items: list, current: Optional[str] = None) -> Optional[str]:
+    # format API "YYYY-MM-DD HH:MM:SS" → urutan string = urutan waktu
+    vals = [x.get("created_at") for x in items if x.get("created_at")]
+    if current:
+        vals.append(current)
+    return max(vals) if vals else None
+
+def page_is_known(items: list, wm: dict) -> bool:
+    """Halaman 'sudah dikenal' jika semua id_posisi-nya ada di watermark. Posting baru yang
+    created_at-nya lebih tua dari watermark (terbit telat / tanggal mundur) tetap dianggap baru;
+    created_at hanya dipakai untuk item tanpa id_posisi (lebih tua dari posting terbaru → dikenal)."""
+    newest = wm.get("newest_created_at")
+    for x in items:
+        rid = x.get("id_posisi")
+        if rid is not None:
+            if rid not in wm["ids"]:
+                return False
+            continue
+        ca = x.get("created_at")
+        if not (newest and ca and ca < newest):
+            return False
+    return True
+
+# ---------- Checkpoint run (run_meta.json) ----------
+class RunManifest:
+    """Checkpoint per run di run_meta.json.
+
+    Status tiap halaman: ok | failed | pending | skipped (delta, setelah halaman berhenti).
+    Ditulis ulang secara atomik setiap kali status halaman berubah, sehingga run yang
+    terputus tetap bisa dilanjutkan dengan --resume. Saat resume status "ok" tidak
+    dipercaya begitu saja: reconcile() menyusunnya ulang dari halaman yang benar-benar
+    terbaca di RAW (raw_store.recover_run).
+    """
+    def __init__(self, run_dir: Path, meta: dict):
+        self.run_dir = run_dir
+        self.path = run_dir / "run_meta.json"
+        self.meta = meta
+        self.meta.setdefault("pages", {})
+        self.meta.setdefault("errors", {})
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, run_dir: Path) -> "RunManifest":
+        p = run_dir / "run_meta.json"
+        if not p.exists():
+            raise FileNotFoundError(f"run_meta.json tidak ditemukan di {run_dir}")
+        with open(p, "r", encoding="utf-8") as f:
+            return cls(run_dir, json.load(f))
+
+    def _write(self) -> None:
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    def plan(self, pages: list, status: str = "pending") -> None:
+        with self._lock:
+            for p in pages:
+                if self.meta["pages"].get(str(p)) != "ok":
+                    self.meta["pages"][str(p)] = status
+            self._write()
+
+    def mark(self, page: int, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.meta["pages"][str(page)] = status
+            if error:
+                self.meta["errors"][str(page)] = error[:300]
+            else:
+                self.meta["errors"].pop(str(page), None)
+            self._write()
 
+    def reconcile(self, readable: set) -> tuple[list, list]:
+        """Status "ok" = tepat halaman yang terbaca di RAW; halaman lain (kecuali skipped) → pending.
+        Return (halaman "ok" yang ternyata hilang, halaman terbaca yang belum "ok")."""
+        with self._lock:
+            pages = self.meta["pages"]
+            lost = sorted(int(p) for p, s in pages.items() if s == "ok" and int(p) not in readable)
+            found = sorted(p for p in readable if pages.get(str(p)) != "ok")
+            for p, s in pages.items():
+                if int(p) not in readable and s != "skipped":
+                    pages[p] = "pending"
+            for p in readable:
+                pages[str(p)] = "ok"
+                self.meta["errors"].pop(str(p), None)
+            self._write()
+            return lost, found
+
+    def pages_with(self, *statuses: str) -> list:
+        return sorted(int(p) for p, s in self.meta["pages"].items() if s in statuses)
+
+    def finalize(self, **extra) -> dict:
+        with self._lock:
+            self.meta.update(extra)
+            missing = [int(p) for p, s in self.meta["pages"].items() if s in ("pending", "failed")]
+            self.meta["failed_pages"] = sorted(missing)
+            self.meta["status"] = "incomplete" if missing else "complete"
+            self.meta["finished_at"] = datetime.now(timezone.utc).isoformat()
+            self._write()
+            return self.meta
+
+def resolve_run_dir(raw_dir: Path, run_id: str) -> Path:
+    if run_id == "latest":
+        runs = sorted(p for p in raw_dir.glob("run_*") if p.is_dir())
+        if not runs:
+            raise FileNotFoundError(f"Tidak ada folder run_* di {raw_dir}")
+        return runs[-1]
+    run_dir = raw_dir / run_id
+    if not run_dir.is_dir():
+        raise FileNotFoundError(f"Run tidak ditemukan: {run_dir}")
+    return run_dir
+
+def run_fetch(cfg: dict, mode: Optional[str] = None, resume: Optional[str] = None) -> Path:
     url         = cfg["source"]["url"]
     base_params = cfg["source"].get("params", {}) or {}
     headers     = cfg["source"].get("headers", {}) or {}
 
-    timeout_s       = int(cfg.get("run", {}).get("timeout_s", 60))
-    max_retries     = int(cfg.get("run", {}).get("max_retries", 3))
-    retry_backoff_s = int(cfg.get("run", {}).get("retry_backoff_s", 5))
-    sleep_ms        = int(cfg.get("run", {}).get("sleep_ms", 200))
-    respect_rl      = bool(cfg.get("run", {}).get("respect_rate_limit", True))
-    pages_cfg       = cfg.get("run", {}).get("pages", None)  # None/0 => ALL pages
+    run_cfg         = cfg.get("run", {}) or {}
+    timeout_s       = int(run_cfg.get("timeout_s", 60))
+    max_retries     = int(run_cfg.get("max_retries", 3))
+    retry_backoff_s = int(run_cfg.get("retry_backoff_s", 5))
+    sleep_ms        = int(run_cfg.get("sleep_ms", 200))
+    respect_rl      = bool(run_cfg.get("respect_rate_limit", True))
+    pages_cfg       = run_cfg.get("pages", None)  # None/0 => ALL pages
+    concurrency     = max(1, int(run_cfg.get("concurrency", 1) or 1))
+    # max_rps kosong → turunkan dari sleep_ms (perilaku lama: 1 request per sleep_ms)
+    max_rps = run_cfg.get("max_rps")
+    if max_rps in (None, 0):
+        max_rps = 1000.0 / sleep_ms if sleep_ms > 0 else 0
+    max_rps = float(max_rps)
+    transport = run_cfg.get("transport") or "live"
+    cassette_dir = run_cfg.get("cassette_dir")
+    cassette_dir = ROOT / cassette_dir if cassette_dir else None
 
-    raw_dir  = ROOT / cfg["output"]["raw_dir"]
-    logs_dir = ROOT / cfg["output"]["logs_dir"]
+    raw_dir   = ROOT / cfg["output"]["raw_dir"]
+    logs_dir  = ROOT / cfg["output"]["logs_dir"]
+    state_dir = ROOT / cfg["output"].get("state_dir", "data/state")
     ensure_dirs(raw_dir, logs_dir)
 
-    run_id = f"run_{now_ts(cfg.get('project', {}).get('timezone', 'Asia/Jakarta'))}_{uuid.uuid4().hex[:8]}"
-    run_dir = raw_dir / run_id
-    run_dir.mkdir(parents=True, exist_ok=True)
+    if resume:
+        run_dir = resolve_run_dir(raw_dir, resume)
+        manifest = RunManifest.load(run_dir)
+        run_id = manifest.meta["run_id"]
+        mode = manifest.meta.get("mode", "full")
+        base_params = manifest.meta.get("params_base", base_params)
+        raw_format = manifest.meta.get("raw_format", "json")  # run lama: page_*.json
+        lost, found = manifest.reconcile(recover_run(run_dir))
+        if lost:
+            print(f"[WARN] {len(lost)} halaman berstatus ok tidak terbaca di RAW → diambil ulang: "
+                  f"{lost[:10]}{'...' if len(lost) > 10 else ''}")
+        if found:
+            print(f"[INFO] {len(found)} halaman sudah ada di RAW → ditandai ok")
+    else:
+        mode = mode or run_cfg.get("mode") or "full"
+        raw_format = resolve_format(cfg["output"].get("raw_format"))
+    if mode not in MODES:
+        raise ValueError(f"Mode tidak dikenal: {mode} (pilih: {', '.join(MODES)})")
+
+    wm = None
+    if mode == "delta" and not resume or mode == "counts":
+        wm = load_watermark(state_dir)
+        if wm is None and mode == "delta":
+            print("[WARN] Watermark belum ada → fallback ke mode full")
+            mode = "full"
+        elif wm is None:
+            print("[WARN] Watermark belum ada → posting baru di sweep counts tidak bisa dikenali")
+        else:
+            print(f"[INFO] Watermark: {len(wm['ids'])} id | newest_created_at={wm.get('newest_created_at')}")
 
     # start page / limit
     page  = int(base_params.get("page", 1))
     limit = int(base_params.get("limit", 100))
 
-    # fetch first page
-    params = dict(base_params, page=page, limit=limit)
-    data, resp = request_page(url, params, headers, timeout_s, max_retries, retry_backoff_s)
+    if not resume:
+        run_id = f"run_{now_ts(cfg.get('project', {}).get('timezone', 'Asia/Jakarta'))}_{uuid.uuid4().hex[:8]}"
+        run_dir = raw_dir / run_id
+        run_dir.mkdir(parents=True, exist_ok=True)
+        manifest = RunManifest(run_dir, {
+            "run_id": run_id,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "status": "running",
+            "url": url,
+            "params_base": base_params,
+            "headers": headers,
+            "mode": mode,
+            "raw_format": raw_format,
+            "first_page": page,
+            "limit": limit,
+            "notes": "RAW JSON per halaman (lihat raw_format). Lanjutkan normalisasi di src/prepare.py",
+        })
 
-    # Save page 1
-    with open(run_dir / f"page_{page:05d}.json", "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
+    limiter  = RateLimiter(max_rps)
+    sessions = SessionPool(headers, pool_size=concurrency, transport=transport, cassette_dir=cassette_dir)
+    if transport != "live":
+        print(f"[INFO] Transport {transport}: {sessions.cassette.path}")
+    min_rl_wait_s = max(5, retry_backoff_s)
+    # halaman ditandai "ok" di checkpoint setelah sink benar-benar menulisnya
+    sink = RawSink(run_dir, raw_format, on_written=lambda p: manifest.mark(p, "ok"))
 
-    raw_meta = data.get("meta") or {}
-    meta = raw_meta.get("pagination", raw_meta)
+    @span("fetch.page")
+    def fetch_one(page_no: int) -> Tuple[dict, requests.Response]:
+        params = dict(base_params, page=page_no, limit=limit)
+        try:
+            data, resp = request_page(
+                url, params, headers, timeout_s, max_retries, retry_backoff_s,
+                session=sessions.get(), limiter=limiter,
+            )
+            if respect_rl:
+                limiter.observe(resp, min_rl_wait_s)
+        except Exception as e:
+            manifest.mark(page_no, "failed", str(e))
+            raise
+        sink.write_page(page_no, slim_counts(data, wm["ids"] if wm else None) if mode == "counts" else data)
+        return data, resp
 
-    total     = int(meta.get("total") or 0)
-    last_page = int(meta.get("last_page") or 0)
-    per_page  = int(meta.get("per_page") or limit)
-    got_items  = len(data.get("data") or [])
-    print(f"[INFO] Page {page} OK | items={got_items} | total={total} | last_page={last_page} | per_page={per_page}")
+    seen_ids: set = set()
+    newest: Optional[str] = None
+    failed: Dict[int, str] = {}
+    fetched: list = []
+    stopped_at: Optional[int] = None
 
-    # Determine how many pages to pull:
-    # - If 'pages' in config is None or 0 => pull ALL until last_page (or until no items)
-    # - Else, pull up to 'pages' starting from current 'page'
-    pull_all = (pages_cfg in (None, 0, "all"))
-    target_last_page = last_page or math.ceil(total / per_page)
+    def collect(p: int, d: dict) -> list:
+        nonlocal newest
+        items = d.get("data") or []
+        fetched.append(p)
+        seen_ids.update(x.get("id_posisi") for x in items)
+        newest = newest_created(items, newest)
+        return items
 
-    # Loop next pages
-    current_page = page
-    while True:
-        if not pull_all and current_page >= target_last_page:
-            break
-        if pull_all and last_page and current_page >= last_page:
-            break
-
-        current_page += 1
-        params["page"] = current_page
-
-        # Optional: respect simple rate-limit budget from headers
-        if respect_rl:
-            remaining = int(resp.headers.get("x-ratelimit-remaining", "1") or "1")
-            if remaining <= 1:
-                ra = resp.headers.get("Retry-After")
-                wait_s = int(ra) if ra and ra.isdigit() else max(5, retry_backoff_s)
-                print(f"[RL] remaining={remaining} → sleep {wait_s}s")
-                time.sleep(wait_s)
-
-        # small sleep between calls
-        time.sleep(sleep_ms / 1000.0)
+    def fetch_batch(pool: ThreadPoolExecutor, batch: list) -> Dict[int, dict]:
+        out: Dict[int, dict] = {}
+        futures = {pool.submit(fetch_one, p): p for p in batch}
+        for fut in as_completed(futures):
+            p = futures[fut]
+            try:
+                out[p], _ = fut.result()
+            except Exception as e:
+                failed[p] = str(e)
+                print(f"[ERROR] page {p}: {e}")
+                continue
+            print(f"[INFO] Page {p} OK | items={len(out[p].get('data') or [])}")
+        return out
 
-        try:
-            data, resp = request_page(url, params, headers, timeout_s, max_retries, retry_backoff_s)
-        except Exception as e:
-            print(f"[ERROR] page {current_page}: {e}")
-            break
+    t0 = time.monotonic()
+    try:
+        if resume:
+            # Lanjutkan run: hanya halaman pending/failed, paralel
+            todo = manifest.pages_with("pending", "failed")
+            print(f"[INFO] Resume {run_id} | mode={mode} | {len(todo)} halaman tersisa | concurrency={concurrency}")
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fetch") as pool:
+                for p, d in fetch_batch(pool, todo).items():
+                    collect(p, d)
+        else:
+            # fetch first page (sinkron: butuh last_page sebelum membagi kerja)
+            manifest.plan([page])
+            try:
+                data, resp = fetch_one(page)
+            except Exception:
+                manifest.finalize()
+                raise
+            items = collect(page, data)
 
-        with open(run_dir / f"page_{current_page:05d}.json", "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False)
+            raw_meta = data.get("meta") or {}
+            meta = raw_meta.get("pagination", raw_meta)
 
-        items = len(data.get("data") or [])
-        raw_meta = data.get("meta") or {}
-        meta = raw_meta.get("pagination", raw_meta)
-        last_page = int(meta.get("last_page") or last_page)
-        print(f"[INFO] Page {current_page} OK | items={items}")
+            total     = int(meta.get("total") or 0)
+            last_page = int(meta.get("last_page") or 0)
+            per_page  = int(meta.get("per_page") or limit)
+            print(f"[INFO] Page {page} OK | items={len(items)} | total={total} | last_page={last_page} | per_page={per_page}")
 
-        if items == 0:
-            print("[INFO] No more items; stopping.")
-            break
+            # Determine how many pages to pull:
+            # - If 'pages' in config is None or 0 => pull ALL until last_page (or until no items)
+            # - Else, pull up to 'pages' starting from current 'page'
+            pull_all = (pages_cfg in (None, 0, "all"))
+            target_last_page = last_page or (math.ceil(total / per_page) if per_page else page)
+            remaining_pages = list(range(page + 1, target_last_page + 1))
+            manifest.meta.update(pull_all=pull_all, last_page=target_last_page, total_from_api=total)
+            manifest.plan(remaining_pages)
+            print(f"[INFO] mode={mode} | sisa maks {len(remaining_pages)} halaman | concurrency={concurrency} | max_rps={max_rps:g}")
 
-    # Write run metadata
-    run_meta = {
-        "run_id": run_id,
-        "started_at": datetime.now(timezone.utc).isoformat(),
-        "url": url,
-        "params_base": base_params,
-        "headers": headers,
-        "first_page": page,
-        "limit": limit,
-        "pull_all": pull_all,
-        "last_seen_page": current_page,
-        "total_from_api": total,
-        "notes": "RAW JSON disimpan per halaman. Lanjutkan normalisasi di src/prepare.py"
-    }
-    with open(run_dir / "run_meta.json", "w", encoding="utf-8") as f:
-        json.dump(run_meta, f, ensure_ascii=False, indent=2)
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fetch") as pool:
+                if mode == "delta":
+                    # Urutan created_at DESC → halaman baru ada di depan. Ambil per gelombang
+                    # `concurrency` halaman, berhenti di halaman pertama yang seluruhnya dikenal.
+                    if page_is_known(items, wm):
+                        stopped_at = page
+                    i = 0
+                    while stopped_at is None and i < len(remaining_pages):
+                        batch = remaining_pages[i:i + concurrency]
+                        i += concurrency
+                        results = fetch_batch(pool, batch)
+                        for p in batch:
+                            if p not in results:
+                                continue
+                            if page_is_known(collect(p, results[p]), wm):
+                                stopped_at = p
+                                break
+                    if stopped_at is not None:
+                        manifest.plan(manifest.pages_with("pending"), status="skipped")
+                    print(f"[INFO] Delta berhenti di page {stopped_at or '-'} (semua item sudah dikenal)")
+                else:
+                    for p, d in fetch_batch(pool, remaining_pages).items():
+                        collect(p, d)
+    finally:
+        sink.close()
+    elapsed = time.monotonic() - t0
+    n_done = len(fetched) - (0 if resume else 1)
+    if n_done:
+        print(f"[INFO] {n_done} halaman dalam {elapsed:.1f}s ({n_done / elapsed if elapsed > 0 else 0.0:.2f} halaman/detik)")
+
+    # Update watermark
+    seen_ids.discard(None)
+    prev_wm = wm or load_watermark(state_dir)
+    new_items = len(seen_ids - prev_wm["ids"]) if prev_wm else len(seen_ids)
+    if resume or mode == "delta":
+        # resume: watermark run ini sudah tersimpan sebagian → gabungkan
+        wm_ids = (prev_wm["ids"] if prev_wm else set()) | seen_ids
+        wm_newest = max(filter(None, [prev_wm and prev_wm.get("newest_created_at"), newest]), default=None)
+    elif mode == "counts":
+        # sweep lengkap → set id aktif terbaru; ada halaman gagal → gabungkan (id di halaman itu
+        # tetap dikenal). created_at tidak disimpan di mode counts
+        wm_ids = seen_ids if not failed else (prev_wm["ids"] if prev_wm else set()) | seen_ids
+        wm_newest = prev_wm.get("newest_created_at") if prev_wm else None
+    else:
+        wm_ids, wm_newest = seen_ids, newest
+    save_watermark(state_dir, wm_ids, wm_newest, run_id)
+
+    # Finalisasi checkpoint
+    ok_pages = manifest.pages_with("ok")
+    if resume:
+        new_items += manifest.meta.get("new_items") or 0
+        stopped_at = manifest.meta.get("stopped_at_page")
+    run_meta = manifest.finalize(
+        last_seen_page=max(ok_pages) if ok_pages else None,
+        stopped_at_page=stopped_at,
+        new_items=new_items,
+        concurrency=concurrency,
+        max_rps=max_rps,
+    )
 
     # Append to log file
     log_file = logs_dir / f"{run_id}.log"
-    with open(log_file, "w", encoding="utf-8") as f:
-        f.write(f"{run_meta}\n")
+    summary = {k: v for k, v in run_meta.items() if k not in ("pages", "errors")}
+    with open(log_file, "a" if resume else "w", encoding="utf-8") as f:
+        f.write(f"{summary}\n")
 
-    print(f"[DONE] Saved to {run_dir}")
+    if run_meta["status"] == "complete":
+        print(f"[DONE] Saved to {run_dir} | mode={mode} | item baru={new_items}")
+    else:
+        print(f"[WARN] Run belum lengkap: {len(run_meta['failed_pages'])} halaman gagal/pending "
+              f"→ lanjutkan dengan: python src/fetch.py --resume {run_id}")
+    return run_dir
+
+def main(argv: Optional[list] = None) -> int:
+    import argparse
+    ap = argparse.ArgumentParser(description="Ambil lowongan MagangHub ke data/raw/run_*/")
+    ap.add_argument("--mode", choices=MODES, default=None,
+                    help="full = semua halaman; delta = berhenti di halaman yang sudah dikenal; "
+                         "counts = sweep kuota/pendaftar saja (default: run.mode di params.yaml)")
+    ap.add_argument("--resume", metavar="RUN_ID", default=None,
+                    help="lanjutkan run yang belum lengkap (run_id atau 'latest'); "
+                         "hanya halaman pending/failed yang diambil ulang")
+    ap.add_argument("--url", default=None,
+                    help="ganti source.url (mis. server lokal python -m src.mock_api)")
+    tape = ap.add_mutually_exclusive_group()
+    tape.add_argument("--record", metavar="DIR", default=None,
+                      help="rekam semua respons API ke DIR/cassette.jsonl.gz")
+    tape.add_argument("--replay", metavar="DIR", default=None,
+                      help="jawab dari cassette DIR tanpa jaringan")
+    args = ap.parse_args(argv)
+
+    cfg = load_config()
+    if args.url:
+        cfg["source"]["url"] = args.url
+    if args.record or args.replay:
+        cfg.setdefault("run", {}).update(transport="record" if args.record else "replay",
+                                         cassette_dir=str(Path(args.record or args.replay).resolve()))
+    run_dir = run_fetch(cfg, mode=args.mode, resume=args.resume)
+    status = RunManifest.load(run_dir).meta.get("status")
+    return 0 if status == "complete" else 1
 
 if __name__ == "__main__":
     """
     Cara pakai:
-      python src/fetch.py
+      python src/fetch.py                 # mode dari config (default full)
+      python src/fetch.py --mode delta    # hanya posting baru sejak watermark
+      python src/fetch.py --mode counts   # refresh jumlah_kuota/jumlah_terdaftar (+ posting belum dikenal, utuh)
+      python src/fetch.py --resume latest # lanjutkan run terakhir yang belum lengkap
+      python src/fetch.py --record data/cassettes/x   # rekam respons API (cassette)
+      python src/fetch.py --replay data/cassettes/x   # putar ulang tanpa jaringan
+      python src/fetch.py --url http://127.0.0.1:8765/be/v1/api/list/vacancies-aktif  # src.mock_api
 
     Perilaku:
       - Baca config/params.yaml
+      - Page 1 diambil dulu untuk tahu last_page, sisanya diambil paralel
+        (run.concurrency worker) dengan satu token bucket bersama (run.max_rps)
       - Jika run.pages = null/0/"all" → ambil SEMUA halaman (sampai last_page dari API)
-      - Jika run.pages = N → ambil N halaman mulai dari page awal di params
       - RAW tiap halaman → data/raw/run_*/page_00001.json, dst.
+      - run_meta.json = checkpoint status tiap halaman (ok/failed/pending/skipped);
+        halaman gagal tidak menghentikan run. Exit code 1 jika run belum lengkap.
+      - Watermark (id_posisi yang sudah dilihat + created_at terbaru) → data/state/watermark.json
     """
     try:
-        main()
+        sys.exit(main())
     except KeyboardInterrupt:
         print("\n[INTERRUPTED]")
         sys.exit(130)
@@ -0,0 +1,189 @@
+# src/metrics.py
+"""
+Instrumentasi ringan untuk pipeline: span bernama (context manager / decorator) yang
+dijumlahkan per nama selama satu proses.
+
+  with span("prepare.flatten", rows=len(items)) as sp:
+      ...
+      sp.add(bytes_out=n)
+
+  @span("score.compute")
+  def f(...): ...
+
+Per nama dicatat: jumlah panggilan, wall time, CPU time (thread utama = CPU seluruh proses,
+termasuk thread pool; thread lain = CPU thread itu saja), peak RSS proses saat span selesai
+dan kenaikannya selama span, rows / bytes_in / bytes_out (+ penghitung lain lewat add()),
+rows/detik dihitung dari wall time. Span boleh bersarang (mis. "prepare" memuat
+"prepare.flatten"); nilai tiap nama berdiri sendiri, tidak dikurangi anak.
+
+write_metrics() menulis ringkasan JSON ke logs/ (dipanggil src/pipeline.py tiap run);
+profile() membungkus run dengan cProfile atau pyinstrument (opsional) untuk --profile.
+Worker ProcessPool (ekstraksi skill) tidak tercakup di span; CPU + peak RSS proses anak
+dicatat terpisah di bagian "process".
+"""
+import os, sys, json, time, threading, contextlib, datetime as dt
+from pathlib import Path
+from typing import Optional
+
+try:  # tidak ada di Windows → RSS dicatat None
+    import resource
+except ImportError:
+    resource = None
+
+ROOT = Path(__file__).resolve().parents[1]
+LOGS_DIR = ROOT / "logs"
+
+def peak_rss_mb(who: str = "self") -> Optional[float]:
+    """Peak RSS (MB) proses ini / seluruh proses anak yang sudah selesai."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    return round(usage.ru_maxrss / (1e6 if sys.platform == "darwin" else 1e3), 1)  # macOS: byte, Linux: KB
+
+def _cpu_time() -> float:
+    return time.process_time() if threading.current_thread() is threading.main_thread() else time.thread_time()
+
+class Recorder:
+    """Agregat span per nama (aman dipakai dari banyak thread)."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.spans: dict[str, dict] = {}
+        self.started = time.perf_counter()
+
+    def record(self, name: str, wall: float = 0.0, cpu: float = 0.0, rss: Optional[float] = None,
+               rss_growth: Optional[float] = None, calls: int = 1, **counts) -> None:
+        with self.lock:
+            s = self.spans.setdefault(name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0,
+                                             "rss_peak_mb": None, "rss_growth_mb": 0.0})
+            s["calls"] += calls
+            s["wall_s"] += wall
+            s["cpu_s"] += cpu
+            if rss is not None:
+                s["rss_peak_mb"] = max(s["rss_peak_mb"] or 0.0, rss)
+                s["rss_growth_mb"] += rss_growth or 0.0
+            for k, v in counts.items():
+                if v:
+                    s[k] = s.get(k, 0) + v
+
+    def summary(self) -> dict:
+        """{nama: metrik} + rows_per_s; urut nama."""
+        with self.lock:
+            out = {}
+            for name in sorted(self.spans):
+                s = dict(self.spans[name])
+                s["wall_s"], s["cpu_s"] = round(s["wall_s"], 4), round(s["cpu_s"], 4)
+                s["rss_growth_mb"] = round(s["rss_growth_mb"], 1)
+                if s.get("rows") and s["wall_s"] > 0:
+                    s["rows_per_s"] = round(s["rows"] / s["wall_s"], 1)
+                out[name] = s
+            return out
+
+    def reset(self) -> None:
+        with self.lock:
+            self.spans.clear()
+            self.started = time.perf_counter()
+
+RECORDER = Recorder()
+
+class span(contextlib.ContextDecorator):
+    """Ukur satu blok (with) atau satu fungsi (decorator) di bawah `name`."""
+    def __init__(self, name: str, recorder: Recorder = RECORDER, **counts):
+        self.name = name
+        self.recorder = recorder
+        self.counts = counts
+
+    def add(self, **counts) -> "span":
+        for k, v in counts.items():
+            self.counts[k] = self.counts.get(k, 0) + v
+        return self
+
+    def __enter__(self) -> "span":
+        self._rss0 = peak_rss_mb()
+        self._cpu0 = _cpu_time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        wall = time.perf_counter() - self._t0
+        cpu = _cpu_time() - self._cpu0
+        rss = peak_rss_mb()
+        growth = rss - self._rss0 if rss is not None else None
+        self.recorder.record(self.name, wall, cpu, rss, growth, **self.counts)
+        self.wall, self.cpu, self.rss = wall, cpu, rss  # hasil span terakhir (untuk laporan pemanggil)
+        return False
+
+    def _recreate_cm(self):
+        return span(self.name, self.recorder, **self.counts)  # decorator: objek baru per panggilan
+
+def count(name: str, recorder: Recorder = RECORDER, **counts) -> None:
+    """Tambah penghitung ke `name` tanpa mengukur waktu (mis. ukuran file setelah ditutup)."""
+    recorder.record(name, calls=0, **counts)
+
+def process_totals() -> dict:
+    t = os.times()
+    return {
+        "cpu_user_s": round(t.user, 3),
+        "cpu_system_s": round(t.system, 3),
+        "children_cpu_s": round(t.children_user + t.children_system, 3),
+        "rss_peak_mb": peak_rss_mb(),
+        "children_rss_peak_mb": peak_rss_mb("children"),
+    }
+
+def stamp() -> str:
+    """Penanda waktu UTC untuk nama file metrik / profil."""
+    return dt.datetime.now(dt.timezone.utc).strftime("%Y%m%d_%H%M%S")
+
+def write_metrics(run_id: Optional[str], extra: Optional[dict] = None, logs_dir: Path = LOGS_DIR,
+                  recorder: Recorder = RECORDER, when: Optional[str] = None) -> Path:
+    """logs/metrics_<waktu>[_<run_id>].json: semua span + total proses (+ extra, mis. status tahap)."""
+    logs_dir = Path(logs_dir)
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    when = when or stamp()
+    doc = {
+        "run_id": run_id,
+        "written_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "argv": sys.argv,
+        "python": sys.version.split()[0],
+        "wall_s": round(time.perf_counter() - recorder.started, 3),
+        "process": process_totals(),
+        **(extra or {}),
+        "spans": recorder.summary(),
+    }
+    path = logs_dir / f"metrics_{when}{'_' + run_id if run_id else ''}.json"
+    path.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+@contextlib.contextmanager
+def profile(kind: Optional[str], path_stem: Path):
+    """kind "cprofile" → <stem>.prof (pstats / snakeviz); "pyinstrument" → <stem>.html
+    (bila tidak terpasang, jatuh ke cProfile); None → tanpa profil. Yield path hasil (atau None)."""
+    result = {"path": None}
+    if kind is None:
+        yield result
+        return
+    path_stem = Path(path_stem)
+    path_stem.parent.mkdir(parents=True, exist_ok=True)
+    if kind == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("[WARN] pyinstrument tidak terpasang → cProfile")
+        else:
+            prof = Profiler()
+            prof.start()
+            try:
+                yield result
+            finally:
+                prof.stop()
+                result["path"] = path_stem.with_suffix(".html")
+                result["path"].write_text(prof.output_html(), encoding="utf-8")
+            return
+    import cProfile
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield result
+    finally:
+        prof.disable()
+        result["path"] = path_stem.with_suffix(".prof")
+        prof.dump_stats(result["path"])
@@ -0,0 +1,205 @@
+# src/mock_api.py
+"""
+Server pengganti API MagangHub untuk uji fetch tanpa jaringan: menyajikan item dari run RAW
+yang sudah direkam (data/raw/run_*, format apa pun) dengan bentuk respons asli
+({"data": [...], "meta": {"pagination": {...}}}), dipotong ulang sesuai ?page=&limit=.
+
+Perilaku yang bisa diatur:
+  - latensi per request (+ jitter acak)
+  - rate limit server: maks `rps` request per jendela 1 detik → header x-ratelimit-remaining,
+    429 + Retry-After bila dilanggar
+  - injeksi error acak: `error_rate` dari request dijawab salah satu `error_codes`
+    (default 429/500/502/503, dengan Retry-After)
+  - GET /__stats → hitungan request per status + waktu tiap request (JSON)
+
+Jalankan:
+  python -m src.mock_api                                   # run RAW terbaru, port 8765
+  python -m src.mock_api --run data/raw/run_xxx --latency 0.2 --rps 20 --error-rate 0.05
+lalu arahkan fetch ke sana:
+  python -m src.fetch --url http://127.0.0.1:8765/be/v1/api/list/vacancies-aktif
+"""
+import sys, json, time, random, argparse, threading, collections
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+if __package__ in (None, ""):  # dijalankan sebagai `python src/mock_api.py`
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.raw_store import iter_raw_pages
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_PORT = 8765
+ERROR_CODES = (429, 500, 502, 503)
+
+class ReplayData:
+    """Item satu run RAW (urut halaman; max_items → hanya N pertama) + potongan halaman ala API."""
+    def __init__(self, run_dir: Path, max_items: Optional[int] = None):
+        self.run_dir = Path(run_dir)
+        self.items: list = []
+        for _, payload in sorted(iter_raw_pages(self.run_dir), key=lambda p: p[0]):
+            self.items.extend(payload.get("data") or [])
+        if max_items is not None:
+            del self.items[max_items:]
+        if not self.items:
+            raise ValueError(f"Run {self.run_dir} tidak berisi item (mode counts / kosong?)")
+
+    def page(self, page: int, limit: int) -> dict:
+        limit = max(1, limit)
+        total = len(self.items)
+        last_page = max(1, -(-total // limit))
+        start = (page - 1) * limit
+        data = self.items[start:start + limit] if page >= 1 else []
+        return {
+            "data": data,
+            "meta": {"pagination": {
+                "current_page": page, "first_page_url": None, "from": start + 1 if data else None,
+                "last_page": last_page, "last_page_url": None, "links": None, "next_page_url": None,
+                "path": None, "per_page": limit, "prev_page_url": None,
+                "to": start + len(data) if data else None, "total": total,
+            }},
+        }
+
+class MockStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.window = collections.deque()  # waktu request yang diterima, jendela 1 detik
+        self.hits: list[float] = []        # semua request yang dijawab 200
+        self.status = collections.Counter()
+        self.pages = collections.Counter()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {"status": dict(self.status), "requests": sum(self.status.values()),
+                    "pages": len(self.pages), "hits": list(self.hits)}
+
+class MockAPI(ThreadingHTTPServer):
+    """ThreadingHTTPServer + konfigurasi simulasi; `stats` dibaca langsung oleh benchmark."""
+    daemon_threads = True
+
+    def __init__(self, data: ReplayData, host: str = "127.0.0.1", port: int = 0, latency_s: float = 0.0,
+                 jitter_s: float = 0.0, rps: Optional[float] = None, error_rate: float = 0.0,
+                 error_codes: tuple = ERROR_CODES, retry_after_s: int = 1, seed: Optional[int] = None):
+        super().__init__((host, port), _Handler)
+        self.data = data
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.rps = rps
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.retry_after_s = retry_after_s
+        self.rng = random.Random(seed)
+        self.stats = MockStats()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/be/v1/api/list/vacancies-aktif"
+
+    def start(self) -> "MockAPI":
+        """Layani di thread daemon (untuk benchmark / uji); hentikan dengan shutdown()."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def decide(self, page: int) -> tuple[int, Optional[int]]:
+        """(status, sisa kuota rate limit) untuk satu request."""
+        now = time.monotonic()
+        with self.stats.lock:
+            if self.rps:
+                while self.stats.window and now - self.stats.window[0] >= 1.0:
+                    self.stats.window.popleft()
+                if len(self.stats.window) >= self.rps:
+                    self.stats.status[429] += 1
+                    return 429, 0
+                self.stats.window.append(now)
+            remaining = max(0, int(self.rps) - len(self.stats.window)) if self.rps else None
+            status = 200
+            if self.error_rate and self.rng.random() < self.error_rate:
+                status = self.rng.choice(self.error_codes)
+            else:
+                self.stats.hits.append(now)
+                self.stats.pages[page] += 1
+            self.stats.status[status] += 1
+            return status, remaining
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive seperti API asli
+    server: MockAPI
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, payload, headers: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in headers.items():
+            self.send_header(k, str(v))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        srv = self.server
+        url = urlparse(self.path)
+        if url.path == "/__stats":
+            return self._send(200, srv.stats.snapshot(), {})
+        qs = parse_qs(url.query)
+        try:
+            page = int(qs.get("page", ["1"])[0])
+            limit = int(qs.get("limit", ["100"])[0])
+        except ValueError:
+            return self._send(422, {"message": "page/limit harus angka"}, {})
+
+        status, remaining = srv.decide(page)
+        delay = srv.latency_s + (srv.rng.uniform(0, srv.jitter_s) if srv.jitter_s else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        headers = {} if remaining is None else {"x-ratelimit-remaining": remaining}
+        if status == 200:
+            return self._send(200, srv.data.page(page, limit), headers)
+        headers["Retry-After"] = srv.retry_after_s
+        message = "Too Many Requests" if status == 429 else "Server Error"
+        return self._send(status, {"message": message}, headers)
+
+def main(argv: Optional[list] = None) -> int:
+    from src.prepare import latest_run_dir
+
+    ap = argparse.ArgumentParser(description="Server API MagangHub lokal dari run RAW rekaman")
+    ap.add_argument("--run", type=Path, default=None, help="folder run RAW (default: run terbaru)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--items", type=int, default=None, help="sajikan hanya N item pertama")
+    ap.add_argument("--latency", type=float, default=0.0, help="detik per request")
+    ap.add_argument("--jitter", type=float, default=0.0, help="tambahan latensi acak 0..jitter detik")
+    ap.add_argument("--rps", type=float, default=None, help="rate limit server (request/detik); kosong = tanpa")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="proporsi request dijawab error (0–1)")
+    ap.add_argument("--error-codes", type=int, nargs="+", default=list(ERROR_CODES))
+    ap.add_argument("--retry-after", type=int, default=1, help="nilai header Retry-After (detik)")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    run_dir = args.run or latest_run_dir()
+    if run_dir is None:
+        print("[ERROR] Tidak ada folder run_* di data/raw/")
+        return 1
+    data = ReplayData(run_dir, args.items)
+    server = MockAPI(data, args.host, args.port, args.latency, args.jitter, args.rps,
+                     args.error_rate, tuple(args.error_codes), args.retry_after, args.seed)
+    print(f"[INFO] {len(data.items)} item dari {Path(run_dir).name} → {server.url}")
+    print(f"[INFO] latensi {args.latency}s (+≤{args.jitter}s) | rps {args.rps or '-'} | "
+          f"error {args.error_rate:.0%} {args.error_codes} | statistik: /__stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[INTERRUPTED]")
+    finally:
+        server.server_close()
+        print(f"[DONE] {json.dumps(server.stats.snapshot()['status'])}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
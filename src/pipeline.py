@@ -0,0 +1,296 @@
+# src/pipeline.py
+"""
+Pipeline satu proses (DAG) menggantikan empat proses terpisah di workflow:
+
+  fetch → prepare → score → rollup
+                 ↘ web (bundle web/public/data/)
+
+  - Handoff in-memory: tabel Arrow snapshot yang ditulis prepare langsung dipakai score
+    dan web; frame scored langsung dipakai rollup (tanpa baca ulang Parquet dari disk).
+    Tahap yang dijalankan sendiri / hulunya dilewati membaca input dari disk.
+  - Lewati tahap yang inputnya tidak berubah: hash isi (blake2b) file input + kode tahap
+    dicatat di data/state/pipeline.json bersama hash output; tahap dijalankan ulang bila
+    salah satunya berubah atau --force. fetch selalu jalan (sumbernya API).
+  - Kegagalan tahap opsional (score, rollup) hanya peringatan; tahap turunannya diblokir.
+  - Waktu per tahap dicetak di akhir dan ditambahkan ke logs/<run_id>.log; metrik span
+    (wall/CPU/peak RSS/rows/bytes per tahap dan sub-langkah, src/metrics.py) ditulis ke
+    logs/metrics_<waktu>_<run_id>.json. --profile menambah dump cProfile / pyinstrument.
+
+Jalankan:
+  python -m src.pipeline                         # semua tahap
+  python -m src.pipeline --mode delta --workers 0
+  python -m src.pipeline score rollup            # tahap tertentu saja
+  python -m src.pipeline web --force             # abaikan hash
+  python -m src.pipeline prepare --profile cprofile
+"""
+import os, sys, json, time, hashlib, argparse, traceback
+from pathlib import Path
+from typing import Callable, Optional
+
+import pyarrow as pa
+
+if __package__ in (None, ""):  # dijalankan sebagai `python src/pipeline.py`
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.metrics import profile, span, stamp, write_metrics
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+CONFIG = ROOT / "config"
+STATE_PATH = ROOT / "data" / "state" / "pipeline.json"
+HASH_BLOCK = 1 << 20
+
+# ---------- hash isi ----------
+_digests: dict = {}
+
+def file_digest(path: Path) -> str:
+    """blake2b isi file; di-cache per (path, size, mtime) dalam satu proses."""
+    st = path.stat()
+    key = (str(path), st.st_size, st.st_mtime_ns)
+    if key not in _digests:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK), b""):
+                h.update(block)
+        _digests[key] = h.hexdigest()
+    return _digests[key]
+
+def _files(path: Path) -> list[Path]:
+    """File di bawah path (rekursif); nama berawalan '_' / '.' = sementara, dilewati."""
+    if path.is_file():
+        return [path]
+    if not path.exists():
+        return []
+    return sorted(f for f in path.rglob("*") if f.is_file()
+                  and not any(part.startswith(("_", ".")) for part in f.relative_to(path).parts))
+
+def fingerprint(paths: list[Path]) -> str:
+    """Hash gabungan isi file/folder (path relatif ikut di-hash; path hilang = kosong)."""
+    h = hashlib.blake2b(digest_size=16)
+    for p in map(Path, paths):
+        files = _files(p)
+        h.update(f"{p.relative_to(ROOT) if p.is_relative_to(ROOT) else p}:{len(files)}\n".encode("utf-8"))
+        for f in files:
+            h.update(f"{f.relative_to(p).as_posix() if f != p else ''}={file_digest(f)}\n".encode("utf-8"))
+    return h.hexdigest()
+
+def load_state(path: Path = STATE_PATH) -> dict:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+def save_state(state: dict, path: Path = STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name("_" + path.name + ".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+# ---------- tahap ----------
+class Stage:
+    """Satu simpul DAG. inputs/outputs: fungsi → daftar path (dievaluasi saat tahap akan jalan,
+    karena run RAW / snapshot terbaru baru diketahui setelah hulunya selesai)."""
+    def __init__(self, name: str, deps: tuple, run: Callable[[dict], int],
+                 inputs: Callable[[], list] = list, outputs: Callable[[], list] = list,
+                 code: tuple = (), optional: bool = False, always: bool = False):
+        self.name = name
+        self.deps = deps
+        self.run = run
+        self.inputs = inputs
+        self.outputs = outputs
+        self.code = [SRC / c for c in code]
+        self.optional = optional
+        self.always = always
+
+def _latest_run() -> Optional[Path]:
+    from src.prepare import latest_run_dir
+    return latest_run_dir()
+
+def _snapshot_dir() -> list[Path]:
+    from src.clean_store import DATASET_DIR, LEGACY_FILE, PARTITION_KEY, latest_snapshot
+    snap = latest_snapshot(DATASET_DIR)
+    return [DATASET_DIR / f"{PARTITION_KEY}={snap}" if snap else LEGACY_FILE]
+
+def run_fetch(ctx: dict) -> int:
+    from src.fetch import RunManifest, load_config, run_fetch as fetch
+
+    cfg = load_config()
+    run_dir = fetch(cfg, mode=ctx["mode"])
+    if RunManifest.load(run_dir).meta.get("status") != "complete":
+        # sama dengan workflow lama: dilanjutkan sekali (hanya halaman gagal/pending)
+        print("[WARN] Run belum lengkap → dilanjutkan sekali (--resume latest)")
+        run_dir = fetch(cfg, resume="latest")
+    return 0 if RunManifest.load(run_dir).meta.get("status") == "complete" else 1
+
+def run_prepare(ctx: dict) -> int:
+    from src import prepare
+
+    sink = []
+    argv = [] if ctx["workers"] is None else ["--workers", str(ctx["workers"])]
+    rc = prepare.main(argv, sink=sink)
+    if rc == 0 and sink:
+        ctx["snapshot"] = pa.concat_tables(sink)
+    return rc
+
+def run_score(ctx: dict) -> int:
+    from src import score
+    from src.schema import TEXT_COLUMNS, core_columns
+
+    snap = ctx.get("snapshot")
+    if snap is None:
+        ctx["scored"] = score.main()
+        return 0
+    df = snap.select(core_columns(snap.column_names)).to_pandas()
+    text = snap.select(["id_posisi", *TEXT_COLUMNS]).to_pandas()
+    ctx["scored"] = score.main(df, text)
+    return 0
+
+def run_rollup(ctx: dict) -> int:
+    from src import rollup
+    return rollup.run(scored=ctx.get("scored"))
+
+def run_web(ctx: dict) -> int:
+    from src.category import BUNDLE_PATH, write_bundle
+    from src.clean_store import DATASET_DIR, LEGACY_FILE, latest_snapshot, read_latest
+    from src.web_bundle import BUNDLE_DIR, export_frame, write_data_bundle
+
+    snap = ctx.get("snapshot")
+    df = snap.to_pandas() if snap is not None else read_latest(DATASET_DIR, with_text=True)
+    if write_bundle():
+        print(f"[INFO] Bundle aturan kategori diperbarui: {BUNDLE_PATH}")
+    with span("web.export", rows=len(df)):
+        df = export_frame(df)
+    manifest = write_data_bundle(df, source=latest_snapshot(DATASET_DIR) or LEGACY_FILE.name)
+    print(f"[DONE] Wrote: {BUNDLE_DIR} | rows={manifest['rows']} | versi {manifest['version']}")
+    return 0
+
+def _paths(*names: str) -> Callable[[], list]:
+    return lambda: [ROOT / n for n in names]
+
+STAGES = [
+    Stage("fetch", (), run_fetch, always=True),
+    Stage("prepare", ("fetch",), run_prepare,
+          inputs=lambda: [p for p in [_latest_run(), CONFIG / "params.yaml", CONFIG / "skills.yaml"] if p],
+          outputs=lambda: _snapshot_dir(),
+          code=("prepare.py", "enrich_skills.py", "schema.py", "clean_store.py", "raw_store.py", "changes.py")),
+    Stage("score", ("prepare",), run_score, optional=True,
+          inputs=lambda: [*_snapshot_dir(), ROOT / "data" / "state" / "counts",
+                          CONFIG / "params.yaml", CONFIG / "categories.yaml"],
+          outputs=_paths("data/clean/vacancies_scored.parquet", "data/clean/vacancies_text.parquet"),
+          code=("score.py", "category.py", "count_history.py", "skill_index.py")),
+    Stage("rollup", ("score",), run_rollup, optional=True,
+          inputs=_paths("data/clean/vacancies_scored.parquet", "config/params.yaml"),
+          outputs=_paths("data/clean/rollup", "output/tables"),
+          code=("rollup.py", "query.py")),
+    Stage("web", ("prepare",), run_web,
+          inputs=lambda: [*_snapshot_dir(), ROOT / "data" / "clean" / "lookups", CONFIG / "categories.yaml"],
+          outputs=_paths("web/public/data"),
+          code=("web_bundle.py", "category.py", "schema.py")),
+]
+STAGE_NAMES = [s.name for s in STAGES]
+
+# ---------- eksekusi ----------
+def run_pipeline(names: Optional[list[str]] = None, force: bool = False, mode: Optional[str] = None,
+                 workers: Optional[int] = None, state_path: Path = STATE_PATH) -> tuple[int, dict]:
+    """Jalankan tahap terpilih (urut DAG). Return (exit code, {tahap: {status, seconds, ...}})."""
+    selected = set(names or STAGE_NAMES)
+    state = load_state(state_path)
+    ctx = {"mode": mode, "workers": workers}
+    report, rc = {}, 0
+
+    for stage in STAGES:
+        if stage.name not in selected:
+            continue
+        blocked = [d for d in stage.deps if report.get(d, {}).get("status") in ("fail", "blocked")]
+        if blocked:
+            print(f"[WARN] {stage.name}: dilewati, tahap hulu gagal ({', '.join(blocked)})")
+            report[stage.name] = {"status": "blocked", "seconds": 0.0}
+            rc = rc or (0 if stage.optional else 1)
+            continue
+
+        t0 = time.perf_counter()
+        fp_in = None if stage.always else fingerprint([*stage.code, *stage.inputs()])
+        prev = state.get(stage.name) or {}
+        if (not force and fp_in is not None and prev.get("inputs") == fp_in
+                and prev.get("outputs") == fingerprint(stage.outputs())):
+            t_hash = time.perf_counter() - t0
+            print(f"[INFO] {stage.name}: input tidak berubah → dilewati (--force untuk menjalankan ulang)")
+            report[stage.name] = {"status": "skip", "seconds": 0.0, "hash_s": round(t_hash, 3)}
+            continue
+        t_hash = time.perf_counter() - t0
+
+        print(f"\n[INFO] ===== {stage.name} =====")
+        t0 = time.perf_counter()
+        sp = span(stage.name)
+        try:
+            with sp:
+                code = stage.run(ctx)
+        except Exception:
+            traceback.print_exc()
+            code = 1
+        seconds = time.perf_counter() - t0
+        usage = {"cpu_s": round(sp.cpu, 3), "rss_peak_mb": sp.rss}
+
+        if code == 0:
+            t1 = time.perf_counter()
+            if fp_in is not None:
+                state[stage.name] = {"inputs": fp_in, "outputs": fingerprint(stage.outputs()),
+                                     "seconds": round(seconds, 3)}
+                save_state(state, state_path)
+            t_hash += time.perf_counter() - t1
+            report[stage.name] = {"status": "ok", "seconds": round(seconds, 3), "hash_s": round(t_hash, 3), **usage}
+        else:
+            state.pop(stage.name, None)
+            save_state(state, state_path)
+            report[stage.name] = {"status": "fail", "seconds": round(seconds, 3), "exit": code, **usage}
+            tag = "[WARN]" if stage.optional else "[ERROR]"
+            print(f"{tag} {stage.name} gagal (exit {code})" + (" — tahap opsional" if stage.optional else ""))
+            rc = rc or (0 if stage.optional else 1)
+    return rc, report
+
+def print_report(report: dict) -> None:
+    total = sum(r["seconds"] + r.get("hash_s", 0.0) for r in report.values())
+    print("\n[INFO] Waktu per tahap:")
+    for name, r in report.items():
+        extra = f" (+hash {r['hash_s']:.2f}s)" if r.get("hash_s") else ""
+        usage = f" | CPU {r['cpu_s']:.2f}s, peak RSS {r['rss_peak_mb']:.0f} MB" if r.get("rss_peak_mb") else ""
+        print(f"  {name:<8} {r['status']:<8} {r['seconds']:8.2f}s{extra}{usage}")
+    print(f"  {'total':<8} {'':<8} {total:8.2f}s")
+
+def log_report(report: dict) -> None:
+    """Tambahkan ringkasan ke logs/<run_id>.log run RAW terbaru (log yang sama dengan fetch/prepare)."""
+    from src.prepare import append_run_log, load_config
+
+    run_dir = _latest_run()
+    if run_dir is not None:
+        append_run_log(load_config(), run_dir, {"stage": "pipeline", "timings": report})
+
+def main(argv: Optional[list] = None) -> int:
+    ap = argparse.ArgumentParser(description="Jalankan pipeline fetch → prepare → score → rollup / web dalam satu proses")
+    ap.add_argument("stages", nargs="*", metavar="STAGE",
+                    help=f"tahap yang dijalankan ({', '.join(STAGE_NAMES)}); default semua")
+    ap.add_argument("--force", action="store_true", help="jalankan walau input tidak berubah")
+    ap.add_argument("--mode", choices=("full", "delta", "counts"), default=None,
+                    help="mode fetch (default run.mode di params.yaml)")
+    ap.add_argument("--workers", type=int, default=None, help="worker ekstraksi skill prepare (0 = semua core)")
+    ap.add_argument("--profile", choices=("cprofile", "pyinstrument"), default=None,
+                    help="simpan profil run ke logs/ (.prof / .html)")
+    args = ap.parse_args(argv)
+    unknown = sorted(set(args.stages) - set(STAGE_NAMES))
+    if unknown:
+        ap.error(f"tahap tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(STAGE_NAMES)})")
+
+    when = stamp()
+    with profile(args.profile, ROOT / "logs" / f"profile_{when}") as prof:
+        rc, report = run_pipeline(args.stages or None, args.force, args.mode, args.workers)
+    print_report(report)
+    log_report(report)
+    run_dir = _latest_run()
+    extra = {"stages": report, "profile": prof["path"] and prof["path"].name}
+    path = write_metrics(run_dir.name if run_dir else None, extra, when=when)
+    print(f"[INFO] Metrik: {path}" + (f" | profil: {prof['path']}" if prof["path"] else ""))
+    return rc
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n[INTERRUPTED]")
+        sys.exit(130)
@@ -1,11 +1,28 @@
 # src/prepare.py
-import os, sys, json, math, datetime as dt
+import os, sys, json, math, time, warnings, itertools, datetime as dt
 from pathlib import Path
+from typing import Iterable, Iterator
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 import yaml
 
-from src.enrich_skills import load_skills_config, extract_from_title_and_desc
+try:  # parser JSON cepat (opsional); fallback ke json stdlib
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+from src.enrich_skills import SkillExtractor, extract_batch, load_skills_config
+from src.changes import ChangeTracker, build_fingerprint, format_summary
+from src.metrics import span
+from src.raw_store import iter_raw_pages
+from src.skill_cache import SkillCache, content_hash, skills_fingerprint
+from src.clean_store import (SEEN_FIELDS, first_seen_index, iter_snapshot, latest_snapshot,
+                              read_latest, retire_rows, write_snapshot)
+from src.count_history import append_counts
+from src.schema import CLEAN_SCHEMA, Lookups, conform
 
 ROOT = Path(__file__).resolve().parents[1]
 CONFIG_PATH = ROOT / "config" / "params.yaml"
@@ -13,6 +30,13 @@ SKILLS_PATH = ROOT / "config" / "skills.yaml"
 RAW_DIR = ROOT / "data" / "raw"
 CLEAN_DIR = ROOT / "data" / "clean"
 CLEAN_DIR.mkdir(parents=True, exist_ok=True)
+DEFAULT_CHUNK_ROWS = 5000
+TZ = "Asia/Jakarta"
+
+# Skema partisi snapshot di data/clean/vacancies/: kolom clean + first_seen/last_seen.
+# CLEAN_SCHEMA (src/schema.py) eksplisit: semua chunk/row group wajib seragam,
+# walau satu chunk kebetulan berisi kolom yang seluruhnya null.
+SNAPSHOT_SCHEMA = pa.schema(list(CLEAN_SCHEMA) + SEEN_FIELDS)
 
 def load_config():
     with open(CONFIG_PATH, "r", encoding="utf-8") as f:
@@ -53,21 +77,74 @@ def safe_parse_json_field(value):
     if isinstance(value, (list, dict)):
         return value
     try:
-        return json.loads(value)
+        return _json_loads(value)
     except Exception:
-        return []
+        try:
+            return json.loads(value)
+        except Exception:
+            return []
 
-def compute_days_to_deadline(tgl_akhir: str) -> float:
+def parse_json_column(s: pd.Series) -> pd.Series:
+    """safe_parse_json_field untuk satu kolom: tiap string unik cukup di-parse sekali
+    (program_studi/jenjang sangat berulang antar lowongan)."""
+    cache: dict = {}
+    out = []
+    for v in s.tolist():
+        if isinstance(v, str):
+            r = cache.get(v)
+            if r is None:
+                r = cache[v] = safe_parse_json_field(v)
+            out.append(r)
+        else:
+            out.append(safe_parse_json_field(v))
+    return pd.Series(out, index=s.index, dtype=object)
+
+def today_ts(tzname: str = TZ) -> pd.Timestamp:
+    return pd.Timestamp.now(tz=tzname).normalize()
+
+def compute_days_to_deadline(tgl_akhir: str, today: pd.Timestamp | None = None) -> float:
     if not tgl_akhir:
         return np.nan
     try:
         end = pd.to_datetime(tgl_akhir)
-        today = pd.Timestamp.now(tz="Asia/Jakarta").normalize()
+        if end.tzinfo is None:
+            end = end.tz_localize(TZ)  # jadwal API = waktu lokal WIB
+        today = today if today is not None else today_ts()
         delta = (end - today).days
         return delta
     except Exception:
         return np.nan
 
+def days_to_deadline_col(s: pd.Series, today: pd.Timestamp | None = None) -> pd.Series:
+    """Versi kolom compute_days_to_deadline: satu pd.to_datetime + satu 'today'."""
+    today = today if today is not None else today_ts()
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FutureWarning)
+            end = pd.to_datetime(s, errors="coerce", format="ISO8601")
+    except ValueError:
+        end = None
+    # offset zona waktu campuran (dtype object) atau string non-ISO → versi per baris, sekali per nilai unik
+    if end is None or not pd.api.types.is_datetime64_any_dtype(end) or (
+            end.isna() & s.notna() & (s.astype(str).str.len() > 0)).any():
+        cache = {v: compute_days_to_deadline(v, today) for v in set(s.dropna().tolist())}
+        return pd.Series([cache.get(v, np.nan) if v is not None else np.nan for v in s.tolist()],
+                         index=s.index, dtype=float)
+    if getattr(end.dt, "tz", None) is None:
+        end = end.dt.tz_localize(TZ)
+    return (end - today).dt.days.astype(float)
+
+def competition_ratio_col(terdaftar: pd.Series, kuota: pd.Series) -> pd.Series:
+    """Versi kolom compute_competition_ratio: pembagian kolom, kuota 0/kosong → NaN.
+    Pembulatan memakai round() bawaan agar identik bit-per-bit dengan versi per baris
+    (np.round sesekali berbeda di digit ke-4)."""
+    kuota = pd.to_numeric(kuota, errors="coerce")
+    terdaftar = pd.to_numeric(terdaftar, errors="coerce")
+    vals = (terdaftar / kuota.where(kuota != 0)).to_numpy(dtype=float, copy=True)
+    finite = np.isfinite(vals)
+    vals[finite] = [round(v, 4) for v in vals[finite].tolist()]
+    return pd.Series(vals, index=kuota.index)
+
 def compute_competition_ratio(terdaftar, kuota) -> float:
     try:
         if kuota in (0, None):
@@ -76,59 +153,159 @@ def compute_competition_ratio(terdaftar, kuota) -> float:
     except Exception:
         return np.nan
 
-def load_all_raw_json() -> list[dict]:
-    """Gabungkan semua data di data/raw/run_*/page_*.json"""
+COUNT_COLS = ["jumlah_kuota", "jumlah_terdaftar"]
+# field yang dibandingkan deteksi perubahan (src/changes.py) = semua hasil flatten_vacancy
+TRACKED_FIELDS = [k for k in flatten_vacancy({}) if k != "id_posisi"]
+# isi file ini menentukan bentuk baris snapshot; berubah → baris unchanged tidak dibawa, diproses ulang
+BUILD_FILES = ["prepare.py", "enrich_skills.py", "schema.py", "changes.py"]
+
+def latest_run_dir() -> Path | None:
+    runs = sorted(p for p in RAW_DIR.glob("run_*") if p.is_dir())
+    return runs[-1] if runs else None
+
+def load_run_meta(run_dir: Path) -> dict:
+    p = run_dir / "run_meta.json"
+    if not p.exists():
+        return {}
+    return json.loads(p.read_text(encoding="utf-8"))
+
+def check_run_complete(run_meta: dict, allow_incomplete: bool = False) -> bool:
+    """Tolak (atau peringatkan) run yang checkpoint-nya belum lengkap."""
+    status = run_meta.get("status")
+    if status is None or status == "complete":
+        return True  # run lama tanpa checkpoint dianggap lengkap
+    missing = run_meta.get("failed_pages") or sorted(
+        int(p) for p, s in (run_meta.get("pages") or {}).items() if s in ("pending", "failed")
+    )
+    run_id = run_meta.get("run_id")
+    msg = (f"Run {run_id} belum lengkap (status={status}, {len(missing)} halaman gagal/pending: "
+           f"{missing[:10]}{'...' if len(missing) > 10 else ''}). "
+           f"Lanjutkan dengan: python src/fetch.py --resume {run_id}")
+    if allow_incomplete:
+        print(f"[WARN] {msg} — tetap diproses (--allow-incomplete)")
+        return True
+    print(f"[ERROR] {msg}")
+    return False
+
+def load_all_raw_json(run_dir: Path | None = None) -> list[dict]:
+    """Gabungkan semua item RAW dari satu run (default: run terbaru).
+    Mendukung pages.jsonl.zst/.gz (streaming) maupun page_*.json lama."""
     all_items = []
-    runs = sorted(RAW_DIR.glob("run_*"))
-    if not runs:
+    latest_run = run_dir or latest_run_dir()
+    if latest_run is None:
         print("[WARN] Tidak ada folder run_* di data/raw/")
         return []
-    latest_run = runs[-1]
-    pages = sorted(latest_run.glob("page_*.json"))
-    print(f"[INFO] Membaca {len(pages)} halaman dari {latest_run.name}")
-
-    for p in pages:
-        try:
-            js = json.loads(p.read_text(encoding="utf-8"))
-            items = js.get("data") or []
-            all_items.extend(items)
-        except Exception as e:
-            print(f"[WARN] Gagal baca {p.name}: {e}")
-            continue
+    n_pages = 0
+    for _, js in iter_raw_pages(latest_run):
+        n_pages += 1
+        all_items.extend(js.get("data") or [])
+    print(f"[INFO] Membaca {n_pages} halaman dari {latest_run.name}")
     print(f"[INFO] Total items: {len(all_items)}")
     return all_items
 
-def main():
-    cfg = load_config()
-    skills_cfg = load_skills_config(SKILLS_PATH)
+def add_derived_columns(df: pd.DataFrame, today: pd.Timestamp | None = None) -> pd.DataFrame:
+    """Kolom turunan yang bergantung pada kuota/pendaftar/tanggal (dihitung ulang tiap run).
+    Seluruhnya per kolom (tanpa apply per baris)."""
+    df["competition_ratio"] = competition_ratio_col(df["jumlah_terdaftar"], df["jumlah_kuota"])
+    df["days_to_deadline"] = days_to_deadline_col(df["tanggal_pendaftaran_akhir"], today)
+    return df
 
-    data = load_all_raw_json()
-    if not data:
-        print("[ERROR] Tidak ada data untuk diproses.")
-        return
+def refresh_counts(frames: Iterable[pd.DataFrame], items: list[dict], run_ts: pd.Timestamp,
+                   prune: bool = True) -> Iterator[pd.DataFrame]:
+    """Mode counts: perbarui jumlah_kuota/jumlah_terdaftar snapshot sebelumnya (per batch)
+    tanpa flatten/ekstraksi skill ulang. Jika sweep lengkap (prune), posting yang sudah
+    tidak aktif di API tidak dibawa ke snapshot baru (tetap ada di riwayat)."""
+    counts = (
+        pd.DataFrame(items, columns=["id_posisi"] + COUNT_COLS)
+        .drop_duplicates("id_posisi", keep="first")
+        .set_index("id_posisi")
+    )
+    n_active = n_pruned = 0
+    for df in frames:
+        active = df["id_posisi"].isin(counts.index)
+        n_active += int(active.sum())
+        if prune:
+            n_pruned += int((~active).sum())
+            df = df[active].reset_index(drop=True)
+            active = active[active].reset_index(drop=True)
+        for col in COUNT_COLS:
+            fresh = df["id_posisi"].map(counts[col])
+            df[col] = fresh.where(fresh.notna(), df[col]).astype(df[col].dtype)
+        df["last_seen"] = df["last_seen"].where(~active, run_ts)
+        yield add_derived_columns(df)
+    if prune:
+        print(f"[INFO] Buang {n_pruned} posting yang sudah tidak aktif")
+    print(f"[INFO] Counts diperbarui: {n_active} posting cocok")
+    if len(counts) > n_active:
+        print(f"[WARN] {len(counts) - n_active} posting di sweep counts tidak ada di snapshot dan tidak "
+              f"tersimpan utuh (watermark ≠ snapshot) → tidak ditambahkan; jalankan mode full")
 
-    rows = [flatten_vacancy(x) for x in data]
-    df = pd.DataFrame(rows)
+def is_full_item(item: dict) -> bool:
+    """Item RAW mode counts yang disimpan utuh (id belum dikenal watermark), bukan hanya id + counts."""
+    return any(k not in ("id_posisi", *COUNT_COLS) for k in item)
 
-    df["program_studi"] = df["program_studi_raw"].apply(safe_parse_json_field)
-    df["jenjang"] = df["jenjang_raw"].apply(safe_parse_json_field)
-    df.drop(columns=["program_studi_raw", "jenjang_raw"], inplace=True)
+def iter_raw_items(run_dir: Path) -> Iterator[dict]:
+    """Stream item vacancy halaman demi halaman (tanpa menampung semua item)."""
+    n_pages = 0
+    for _, js in iter_raw_pages(run_dir):
+        n_pages += 1
+        yield from js.get("data") or []
+    print(f"[INFO] Membaca {n_pages} halaman dari {run_dir.name}")
 
-    df["competition_ratio"] = df.apply(
-        lambda x: compute_competition_ratio(x["jumlah_terdaftar"], x["jumlah_kuota"]), axis=1
-    )
-    df["days_to_deadline"] = df["tanggal_pendaftaran_akhir"].apply(compute_days_to_deadline)
-
-    print("[INFO] Ekstraksi skill dari judul + deskripsi...")
-    res = df.apply(
-        lambda x: extract_from_title_and_desc(
-            x.get("posisi"), x.get("deskripsi_posisi"), skills_cfg
-        ),
-        axis=1,
-    )
+def iter_chunks(items: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    it = iter(items)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def build_frame(items: list[dict], skills_cfg: dict,
+                extractor: SkillExtractor | None = None,
+                cache: SkillCache | None = None,
+                lookups: Lookups | None = None) -> pd.DataFrame:
+    """Flatten + kolom turunan + ekstraksi skill untuk satu chunk item RAW.
+    Dengan `extractor` multiprocess, skill diekstrak worker sementara kolom lain dihitung;
+    dengan `cache`, hanya posting baru/diedit yang diekstrak. Hasil sudah dalam bentuk
+    CLEAN_SCHEMA (`lookups` menerima prodi/jenjang baru; None → tabel lookup tidak disimpan)."""
+    with span("prepare.flatten", rows=len(items)):
+        rows = [flatten_vacancy(x) for x in items]
+        df = pd.DataFrame(rows)
+
+    titles, descs = df["posisi"].tolist(), df["deskripsi_posisi"].tolist()
+    if cache is not None:
+        ids = df["id_posisi"].tolist()
+        hashes = [content_hash(t, d) for t, d in zip(titles, descs)]
+        cached, todo = cache.lookup(ids, hashes)
+        titles, descs = [titles[k] for k in todo], [descs[k] for k in todo]
+    t0 = time.perf_counter()
+    # waktu "prepare.skills" = submit + menunggu hasil (ekstraksi di worker tumpang tindih dengan conform)
+    with span("prepare.skills", rows=len(titles), cached=len(df) - len(titles)):
+        if extractor is not None:
+            collect_skills = extractor.submit(titles, descs)
+        else:
+            collect_skills = lambda: extract_batch(titles, descs, skills_cfg)
+    submit_s = time.perf_counter() - t0
+
+    with span("prepare.conform", rows=len(df)):
+        df["program_studi"] = parse_json_column(df["program_studi_raw"])
+        df["jenjang"] = parse_json_column(df["jenjang_raw"])
+        df.drop(columns=["program_studi_raw", "jenjang_raw"], inplace=True)
+        df = conform(df, lookups if lookups is not None else Lookups())
 
-    df["skills_extracted"] = res.apply(lambda r: r.get("skills_extracted"))
-    df["skills_score"] = res.apply(lambda r: r.get("skills_score"))
+        df = add_derived_columns(df)
+
+    t0 = time.perf_counter()
+    with span("prepare.skills"):
+        skills, scores = collect_skills()
+    if cache is not None:
+        cache.put([ids[k] for k in todo], [hashes[k] for k in todo], skills, scores,
+                  submit_s + time.perf_counter() - t0)
+        fresh = dict(zip(todo, zip(skills, scores)))
+        merged = [cached[k] if k in cached else fresh[k] for k in range(len(df))]
+        skills, scores = [m[0] for m in merged], [m[1] for m in merged]
+    df["skills_extracted"] = pd.Series(skills, index=df.index, dtype=object)
+    df["skills_score"] = pd.Series(scores, index=df.index, dtype=float)
 
     # Flag relevansi data
     df["is_data_related"] = df["skills_extracted"].apply(
@@ -137,29 +314,261 @@ def main():
             if any(k in s for k in ["data", "analisis", "python", "sql", "excel", "power bi"])
         )
     )
+    return df
+
+def run_timestamp(run_meta: dict) -> pd.Timestamp:
+    """Waktu run (UTC) untuk first_seen/last_seen; run lama tanpa meta → sekarang."""
+    ts = pd.Timestamp(run_meta.get("started_at") or pd.Timestamp.now(tz="UTC"))
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return ts.floor("us")
+
+def stamp_seen(df: pd.DataFrame, first_seen: dict, run_ts: pd.Timestamp) -> pd.DataFrame:
+    """Baris yang terlihat di run ini: last_seen = run; first_seen dari riwayat bila id sudah dikenal."""
+    known = pd.to_datetime(df["id_posisi"].map(first_seen), utc=True)
+    df["first_seen"] = known.fillna(run_ts)
+    df["last_seen"] = pd.Series(run_ts, index=df.index)
+    return df
+
+def iter_previous(dataset_dir: Path, snapshot: str | None, legacy_path: Path,
+                  batch_rows: int) -> Iterator[pd.DataFrame]:
+    """Snapshot sebelumnya per batch; sebelum migrasi, file tunggal lama
+    (first_seen/last_seen diisi waktu modifikasi file)."""
+    if snapshot is not None:
+        yield from iter_snapshot(dataset_dir, snapshot, batch_rows)
+        return
+    if not legacy_path.exists():
+        return
+    mtime = pd.Timestamp(legacy_path.stat().st_mtime, unit="s", tz="UTC").floor("s")
+    for batch in pq.ParquetFile(legacy_path).iter_batches(batch_size=batch_rows):
+        df = batch.to_pandas()
+        df["first_seen"] = pd.Series(mtime, index=df.index)
+        df["last_seen"] = pd.Series(mtime, index=df.index)
+        yield df
+
+def carry_previous(frames: Iterable[pd.DataFrame], exclude_ids: set, seen_ids: set = frozenset(),
+                   run_ts: pd.Timestamp | None = None, only_seen: bool = False) -> Iterator[pd.DataFrame]:
+    """Baris snapshot sebelumnya yang id-nya tidak diproses ulang run ini (mode delta).
+    seen_ids = posting yang terlihat di run ini tapi isinya tidak berubah → last_seen = run_ts;
+    only_seen → hanya baris itu yang dibawa (mode full)."""
+    for df in frames:
+        seen = df["id_posisi"].isin(seen_ids)
+        keep = seen if only_seen else ~df["id_posisi"].isin(exclude_ids)
+        df, seen = df[keep].reset_index(drop=True), seen[keep].reset_index(drop=True)
+        if len(df):
+            if run_ts is not None:
+                df["last_seen"] = df["last_seen"].where(~seen, run_ts)
+            yield add_derived_columns(df)
+
+def write_clean(chunks: Iterable[pd.DataFrame], out_path: Path, schema: pa.Schema = CLEAN_SCHEMA) -> int:
+    """Tulis chunk sebagai row group Parquet satu per satu (memori = satu chunk).
+    Ditulis ke file .tmp lalu di-rename, jadi dataset lama tetap utuh bila gagal
+    (dan masih bisa dibaca oleh iter_previous selama penulisan)."""
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    n_rows = 0
+    with pq.ParquetWriter(tmp, schema) as writer:
+        for df in chunks:
+            writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+            n_rows += len(df)
+    os.replace(tmp, out_path)
+    return n_rows
+
+def append_run_log(cfg: dict, run_dir: Path, entry: dict) -> None:
+    """Tambah satu baris ringkasan ke logs/<run_id>.log (log yang sama dengan fetch)."""
+    logs_dir = ROOT / (cfg.get("output") or {}).get("logs_dir", "logs")
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    with open(logs_dir / f"{run_dir.name}.log", "a", encoding="utf-8") as f:
+        f.write(f"{entry}\n")
+
+def record_counts(cfg: dict, dataset_dir: Path, snapshot: str, run_ts: pd.Timestamp) -> None:
+    """Catat (id_posisi, run, terdaftar, kuota) snapshot terbaru ke riwayat counts."""
+    history_dir = ROOT / (cfg.get("output") or {}).get("state_dir", "data/state") / "counts"
+    df = read_latest(dataset_dir, columns=["id_posisi", "jumlah_terdaftar", "jumlah_kuota"], legacy_file=None)
+    st = append_counts(snapshot, run_ts, df, history_dir)
+    print(f"[INFO] Riwayat counts: {st['rows']}/{st['postings']} posting baru/berubah → "
+          f"{st['file']} ({st['bytes']:,} B)")
+
+def main(argv: list[str] | None = None, sink: list | None = None) -> int:
+    """sink (list) → tabel Arrow snapshot yang ditulis ikut ditampung (src/pipeline.py)."""
+    import argparse
+    ap = argparse.ArgumentParser(description="Upsert snapshot data/clean/vacancies/ dari run RAW terbaru")
+    ap.add_argument("--allow-incomplete", action="store_true",
+                    help="tetap proses run yang checkpoint-nya belum lengkap (hanya peringatan)")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="proses paralel untuk ekstraksi skill (1 = serial, 0 = semua core; "
+                         "default prepare.workers di params.yaml)")
+    ap.add_argument("--no-skill-cache", action="store_true",
+                    help="ekstrak ulang skill semua posting (abaikan data/state/skills_cache.parquet)")
+    args = ap.parse_args(argv)
+
+    cfg = load_config()
+    skills_cfg = load_skills_config(SKILLS_PATH)
+    dataset_dir = CLEAN_DIR / "vacancies"
+    legacy_path = CLEAN_DIR / "vacancies.parquet"
+    chunk_rows = int((cfg.get("prepare") or {}).get("chunk_rows") or DEFAULT_CHUNK_ROWS)
+    workers = args.workers if args.workers is not None else int((cfg.get("prepare") or {}).get("workers", 1))
+    use_cache = (cfg.get("prepare") or {}).get("skill_cache", True) and not args.no_skill_cache
+
+    run_dir = latest_run_dir()
+    run_meta = load_run_meta(run_dir) if run_dir else {}
+    mode = run_meta.get("mode", "full")
+    if not check_run_complete(run_meta, args.allow_incomplete):
+        return 1
+    if run_dir is None:
+        print("[WARN] Tidak ada folder run_* di data/raw/")
+        print("[ERROR] Tidak ada data untuk diproses.")
+        return 1
+
+    snapshot = run_dir.name
+    run_ts = run_timestamp(run_meta)
+    prev = latest_snapshot(dataset_dir)
+    rerun = prev == snapshot  # prepare diulang untuk run yang sama → partisinya diganti
+    if rerun:
+        print(f"[INFO] Snapshot {snapshot} sudah ada → ditulis ulang")
+    prev_rows = iter_previous(dataset_dir, prev, legacy_path, chunk_rows)
+    snapshot_ids: set = set()
+    lookups = Lookups()
+    state_dir = ROOT / (cfg.get("output") or {}).get("state_dir", "data/state")
+    build = build_fingerprint([ROOT / "src" / f for f in BUILD_FILES] + [SKILLS_PATH])
+    tracker = ChangeTracker(state_dir / "records.parquet", TRACKED_FIELDS, flatten_vacancy, build, prev)
+    complete_sweep = mode != "delta" and not run_meta.get("failed_pages")
+
+    def track(frames: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        for df in frames:
+            snapshot_ids.update(df["id_posisi"].dropna())
+            yield conform(df, lookups)  # baris snapshot format lama → skema ringkas
+
+    def finish(n_rows: int) -> None:
+        lookups.save()
+        # partisi snapshot sebelumnya hanya menyimpan baris yang tidak dibawa (riwayat),
+        # dengan skema file itu sendiri
+        if prev is not None and not rerun:
+            n_hist = retire_rows(dataset_dir, prev, snapshot_ids, None, chunk_rows)
+            print(f"[INFO] Snapshot {prev}: {n_hist} baris riwayat tersisa"
+                  + ("" if n_hist else " → partisi dihapus"))
+        print(f"[DONE] Snapshot {snapshot} → {dataset_dir} | {n_rows} baris")
+        record_counts(cfg, dataset_dir, snapshot, run_ts)
+        tracker.save(snapshot, snapshot_ids)
+        summary = tracker.summary(complete_sweep)
+        print(f"[INFO] Perubahan: {format_summary(summary)}")
+        append_run_log(cfg, run_dir, {"stage": "changes", "mode": mode, **summary})
+
+    if mode == "counts":
+        if prev is None and not legacy_path.exists():
+            print(f"[ERROR] {dataset_dir} belum ada; jalankan mode full dulu.")
+            return 1
+        items = load_all_raw_json(run_dir)
+        # posting yang belum ada di snapshot (fetch menyimpannya utuh) → flatten + skill, ditambahkan
+        known = set(read_latest(dataset_dir, columns=["id_posisi"], legacy_file=legacy_path)["id_posisi"])
+        fresh = [x for x in items if x.get("id_posisi") not in known and is_full_item(x)]
+        fresh_ids = {x["id_posisi"] for x in fresh}
+        tracker.classify(fresh)
+        items = [x for x in items if x.get("id_posisi") not in fresh_ids]
+        tracker.classify(items, COUNT_COLS)
+        frames = refresh_counts(prev_rows, items, run_ts, prune=not run_meta.get("failed_pages"))
+        if fresh:
+            df = build_frame(fresh, skills_cfg, lookups=lookups).drop_duplicates("id_posisi", ignore_index=True)
+            print(f"[INFO] {len(df)} posting baru dari sweep counts (belum ada di snapshot) → ditambahkan")
+            frames = itertools.chain(frames, [stamp_seen(df, first_seen_index(dataset_dir), run_ts)])
+        finish(write_snapshot(track(frames), dataset_dir, snapshot, SNAPSHOT_SCHEMA, sink))
+        return 0
+
+    # Ekstraksi skill: serial atau ProcessPoolExecutor (--workers); output identik
+    if workers != 1:
+        print(f"[INFO] Ekstraksi skill paralel: {workers or os.cpu_count()} worker")
+    cache = None
+    if use_cache:
+        cache = SkillCache(state_dir / "skills_cache.parquet", skills_fingerprint(SKILLS_PATH))
+    with SkillExtractor(SKILLS_PATH, workers, cfg=skills_cfg) as extractor:
+        # Pipeline streaming: halaman → chunk item → DataFrame chunk → row group Parquet
+        new_ids: set = set()
+        n_new = 0
+        first_seen = first_seen_index(dataset_dir)
+
+        def new_chunks() -> Iterator[pd.DataFrame]:
+            nonlocal n_new
+            print(f"[INFO] Flatten + ekstraksi skill per chunk {chunk_rows} baris...")
+            for i, items in enumerate(iter_chunks(iter_raw_items(run_dir), chunk_rows), start=1):
+                # hanya posting baru/berubah (duplikat id_posisi dibuang); sisanya dibawa dari snapshot
+                items = tracker.classify(items)
+                if not items:
+                    continue
+                df = stamp_seen(build_frame(items, skills_cfg, extractor, cache, lookups), first_seen, run_ts)
+                new_ids.update(df["id_posisi"].dropna())
+                n_new += len(df)
+                print(f"[INFO] Chunk {i}: {len(df)} baris (total {n_new})")
+                yield df
+
+        chunks = new_chunks()
+        first = next(chunks, None)
+        if first is None and tracker.records == 0:
+            print("[ERROR] Tidak ada data untuk diproses.")
+            return 1
+
+        stream = chunks if first is None else itertools.chain([first], chunks)
+        if mode == "delta":
+            # Mode delta: baris baru (upsert by id_posisi) + snapshot sebelumnya
+            stream = itertools.chain(stream, carry_previous(prev_rows, new_ids, tracker.unchanged, run_ts))
+        elif tracker.reuse:
+            # Mode full: posting yang isinya tidak berubah dibawa dari snapshot sebelumnya
+            stream = itertools.chain(stream, carry_previous(prev_rows, new_ids, tracker.unchanged, run_ts,
+                                                            only_seen=True))
+
+        # 5️⃣ Simpan hasil: partisi snapshot baru, lalu rapikan partisi sebelumnya
+        n_rows = write_snapshot(track(stream), dataset_dir, snapshot, SNAPSHOT_SCHEMA, sink)
+        if mode == "delta":
+            print(f"[INFO] Delta: {n_new} baris baru/diperbarui + {n_rows - n_new} baris lama")
+        elif tracker.reuse:
+            print(f"[INFO] Diproses {n_new} baris baru/berubah + {n_rows - n_new} baris tetap dari {prev}")
+        finish(n_rows)
 
-    # 5️⃣ Simpan hasil
-    out_path = CLEAN_DIR / "vacancies.parquet"
-    df.to_parquet(out_path, index=False)
-    print(f"[DONE] Disimpan ke {out_path} | {len(df)} baris")
+    if cache is not None:
+        # full: cache dipangkas ke posting run ini; delta: entri lama tetap dipakai
+        cache.keep(tracker.unchanged)
+        cache.save(prune=(mode == "full"))
+        stats = cache.stats()
+        saved = f"{stats['saved_s_est']:.2f}s" if stats["saved_s_est"] is not None else "-"
+        print(f"[INFO] Skill cache: hit {stats['hits']}/{stats['rows']} ({stats['hit_rate']:.1%}) | "
+              f"ekstraksi {stats['misses']} baris {stats['extract_s']:.2f}s | hemat ~{saved}")
+        append_run_log(cfg, run_dir, {"stage": "prepare", "skill_cache": stats})
 
     # 6️⃣ (opsional) quick summary
-    print(df[["id_posisi", "posisi", "nama_perusahaan", "competition_ratio", "days_to_deadline", "skills_score"]].head(5))
+    if first is not None:
+        print(first[["id_posisi", "posisi", "nama_perusahaan", "competition_ratio", "days_to_deadline", "skills_score"]].head(5))
+    return 0
 
 if __name__ == "__main__":
     """
     Jalankan:
       python src/prepare.py
+      python src/prepare.py --allow-incomplete   # proses run yang belum lengkap (dengan peringatan)
+      python src/prepare.py --workers 8          # ekstraksi skill paralel (0 = semua core)
 
     Langkah:
-      - Gabungkan semua JSON dari data/raw/run_*/
-      - Flatten field penting
-      - Hitung kolom turunan: competition_ratio, days_to_deadline
-      - Ekstrak skills + score
-      - Simpan ke data/clean/vacancies.parquet
+      - Gabungkan semua RAW dari data/raw/run_*/ (run terbaru; pages.jsonl.zst atau
+        page_*.json lama); run yang checkpoint-nya
+        belum lengkap ditolak (exit 1) kecuali --allow-incomplete
+      - Deteksi perubahan (src/changes.py, data/state/records.parquet): id_posisi duplikat
+        dalam satu run dibuang, tiap record di-hash lalu dibandingkan dengan snapshot
+        sebelumnya (new / updated + field / unchanged / removed → logs/<run_id>.log);
+        hanya new + updated yang di-flatten/diekstrak, baris unchanged dibawa dari snapshot
+      - Mode run dibaca dari run_meta.json:
+          full   → snapshot baru = semua baris run ini
+          delta  → baris baru digabung (upsert by id_posisi) ke snapshot sebelumnya
+          counts → hanya perbarui jumlah_kuota/jumlah_terdaftar + rasio snapshot sebelumnya;
+                   posting yang belum ada di snapshot (disimpan utuh oleh fetch) ditambahkan
+      - Streaming per chunk (prepare.chunk_rows): flatten field penting,
+        hitung kolom turunan (competition_ratio, days_to_deadline), ekstrak skills + score
+        (--workers N: ekstraksi skill di N proses, hasil identik dengan serial)
+      - Skill posting yang tidak berubah diambil dari data/state/skills_cache.parquet
+        (kunci id_posisi + hash posisi/deskripsi; reset bila skills.yaml berubah)
+      - Skema ringkas (src/schema.py): string berulang → dictionary, tanggal → timestamp,
+        prodi/jenjang → key ke data/clean/lookups/*.parquet; teks berat hanya dibaca bila diminta
+      - Tiap chunk ditulis sebagai row group ke partisi
+        data/clean/vacancies/snapshot=<run_id>/ (+ first_seen/last_seen per baris);
+        partisi snapshot sebelumnya hanya menyimpan baris yang tidak dibawa (riwayat)
     """
     try:
-        main()
+        sys.exit(main())
     except KeyboardInterrupt:
         print("\n[INTERRUPTED]")
         sys.exit(130)
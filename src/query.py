@@ -0,0 +1,198 @@
+# src/query.py
+"""
+Query engine kolumnar untuk dashboard (app.py). Dibangun sekali per load data:
+
+  - kolom filter (provinsi, kategori, perusahaan) → kode kategorikal int32;
+    mask per nilai di-cache (bool, tanpa menyalin DataFrame)
+  - judul posisi → indeks trigram atas judul unik (lowercase, CSR);
+    keyword = irisan daftar posting trigram lalu verifikasi substring pada kandidat
+  - urutan (ratio / priority) = permutasi yang sudah dihitung; hasil hanya top-N
+  - KPI dan agregat grafik dihitung dari array (bincount), bukan groupby frame
+
+Keyword dicocokkan sebagai substring literal, tidak peka huruf besar/kecil.
+"""
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.skill_index import SkillIndex
+
+CATEGORY_COLUMNS = ("nama_provinsi", "kategori_posisi", "nama_perusahaan")
+_KEYWORD_CACHE_SIZE = 32
+
+class QueryResult:
+    """Hasil satu query: mask baris, jumlah, top-N posisi baris terurut, match_count semua baris."""
+    def __init__(self, mask: np.ndarray, order: np.ndarray, match_count: np.ndarray):
+        self.mask = mask
+        self.order = order
+        self.match_count = match_count
+        self.count = int(np.count_nonzero(mask))
+
+class VacancyQuery:
+    def __init__(self, df: pd.DataFrame, orderings: dict, skills: Optional[SkillIndex] = None):
+        """df: RangeIndex (posisi baris = label). Kolom CATEGORY_COLUMNS diubah ke category in-place."""
+        self.n = len(df)
+        self.orderings = orderings
+        self.skills = skills
+        self.codes: dict[str, np.ndarray] = {}
+        self.categories: dict[str, list] = {}
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+                self.codes[col] = df[col].cat.codes.to_numpy()
+                self.categories[col] = df[col].cat.categories.tolist()
+        self._masks: dict[tuple, np.ndarray] = {}
+
+        self.ratio = pd.to_numeric(df["competition_ratio"], errors="coerce").to_numpy(float)
+        self.applicants = np.nan_to_num(pd.to_numeric(df["jumlah_terdaftar"], errors="coerce").to_numpy(float))
+        self._build_title_index(df["posisi"])
+
+    # ---------- indeks ----------
+    def _build_title_index(self, titles: pd.Series) -> None:
+        codes, uniq = pd.factorize(titles)
+        self.title_codes = codes
+        self.titles = uniq
+        self.titles_lower = [t.lower() if isinstance(t, str) else "" for t in uniq]
+        grams, owners = [], []
+        for tid, t in enumerate(self.titles_lower):
+            g = {t[i:i + 3] for i in range(len(t) - 2)}
+            grams.extend(g)
+            owners.extend([tid] * len(g))
+        gid, gram_uniq = pd.factorize(pd.Series(grams, dtype=object))
+        order = np.argsort(gid, kind="stable")  # stable → id judul per trigram tetap urut naik
+        self._gram_rows = np.asarray(owners, dtype=np.int32)[order]
+        self._gram_offsets = np.searchsorted(gid[order], np.arange(len(gram_uniq) + 1))
+        self._gram_lookup = {g: i for i, g in enumerate(gram_uniq)}
+        self._keyword_cache: dict[str, np.ndarray] = {}
+
+    def options(self, col: str) -> list:
+        """Nilai unik kolom kategorikal (urut) untuk selectbox."""
+        return sorted(c for c in self.categories.get(col, []) if c)
+
+    def value_mask(self, col: str, value) -> np.ndarray:
+        """Mask (read-only, di-cache) baris dengan col == value."""
+        key = (col, value)
+        m = self._masks.get(key)
+        if m is None:
+            cats = self.categories.get(col, [])
+            k = cats.index(value) if value in cats else -2  # -2: tidak ada baris
+            m = self.codes[col] == k
+            m.flags.writeable = False
+            self._masks[key] = m
+        return m
+
+    def keyword_mask(self, keyword: str) -> np.ndarray:
+        """Mask baris yang judulnya memuat keyword (substring, lowercase)."""
+        k = keyword.strip().lower()
+        m = self._keyword_cache.get(k)
+        if m is not None:
+            return m
+        if len(k) >= 3:
+            lists = []
+            for g in {k[i:i + 3] for i in range(len(k) - 2)}:
+                gi = self._gram_lookup.get(g)
+                if gi is None:
+                    lists = [np.array([], dtype=np.int32)]
+                    break
+                lists.append(self._gram_rows[self._gram_offsets[gi]:self._gram_offsets[gi + 1]])
+            lists.sort(key=len)
+            cand = lists[0]
+            for other in lists[1:]:
+                cand = np.intersect1d(cand, other, assume_unique=True)
+        else:
+            cand = range(len(self.titles_lower))
+        hit = np.zeros(len(self.titles_lower) + 1, dtype=bool)  # slot terakhir: judul NaN (kode -1)
+        hit[[t for t in cand if k in self.titles_lower[t]]] = True
+        m = hit[self.title_codes]
+        m.flags.writeable = False
+        if len(self._keyword_cache) >= _KEYWORD_CACHE_SIZE:
+            self._keyword_cache.pop(next(iter(self._keyword_cache)))
+        self._keyword_cache[k] = m
+        return m
+
+    # ---------- query ----------
+    def run(self, province=None, category=None, keyword: str = "", max_ratio: Optional[float] = None,
+            must_skills: Iterable[str] = (), want_skills: Iterable[str] = (), sort: str = "ratio",
+            limit: Optional[int] = None) -> QueryResult:
+        """Gabung filter (AND) dan ambil top-`limit` sesuai urutan `sort`.
+        sort="ratio": kecocokan skill → rasio kecil → kuota besar; "priority": priority_rank."""
+        mask = ~np.isnan(self.ratio)  # rasio wajib ada (NaN dibuang)
+        if max_ratio is not None:
+            np.logical_and(mask, self.ratio <= max_ratio, out=mask)
+        if province is not None:
+            np.logical_and(mask, self.value_mask("nama_provinsi", province), out=mask)
+        if category is not None:
+            np.logical_and(mask, self.value_mask("kategori_posisi", category), out=mask)
+        if keyword and keyword.strip():
+            np.logical_and(mask, self.keyword_mask(keyword), out=mask)
+        must_skills, want_skills = list(must_skills), list(want_skills)
+        if must_skills and self.skills is not None:
+            np.logical_and(mask, self.skills.must_have(must_skills), out=mask)
+
+        if want_skills and self.skills is not None:
+            match = self.skills.match_count(want_skills)
+        else:
+            match = np.zeros(self.n, dtype=np.int64)
+
+        perm = self.orderings[sort]
+        order = perm[mask[perm]]
+        if sort == "ratio" and want_skills:
+            order = _stable_desc_top(order, match[order], limit)
+        elif limit is not None:
+            order = order[:limit]
+        return QueryResult(mask, order, match)
+
+    # ---------- agregat ----------
+    def ratio_stats(self, mask: np.ndarray) -> tuple[float, float]:
+        """(median, mean) competition_ratio; NaN bila kosong (∞ ikut seperti pandas)."""
+        r = self.ratio[mask]
+        if not len(r):
+            return float("nan"), float("nan")
+        return float(np.median(r)), float(np.mean(r))
+
+    def unique_count(self, col: str, mask: np.ndarray) -> int:
+        c = self.codes[col][mask]
+        return int(np.count_nonzero(np.bincount(c[c >= 0], minlength=len(self.categories[col]))))
+
+    def top_provinces_by_companies(self, mask: np.ndarray, k: int = 10) -> pd.Series:
+        """Jumlah perusahaan unik per provinsi (k terbesar, urut turun)."""
+        prov, comp = self.codes["nama_provinsi"][mask], self.codes["nama_perusahaan"][mask]
+        ok = (prov >= 0) & (comp >= 0)
+        n_comp = max(1, len(self.categories["nama_perusahaan"]))
+        pairs = np.unique(prov[ok].astype(np.int64) * n_comp + comp[ok])
+        counts = np.bincount(pairs // n_comp, minlength=len(self.categories["nama_provinsi"]))
+        return _top_series(counts, counts > 0, self.categories["nama_provinsi"], k, "nama_provinsi")
+
+    def top_titles_by_applicants(self, mask: np.ndarray, k: int = 10) -> pd.Series:
+        """Total pendaftar per judul posisi (k terbesar, urut turun)."""
+        codes = self.title_codes[mask]
+        ok = codes >= 0
+        sums = np.bincount(codes[ok], weights=self.applicants[mask][ok], minlength=len(self.titles))
+        present = np.bincount(codes[ok], minlength=len(self.titles)) > 0
+        return _top_series(sums, present, self.titles, k, "posisi")
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_masks"], state["_keyword_cache"] = {}, {}  # cache tidak ikut di-pickle
+        return state
+
+def _stable_desc_top(order: np.ndarray, keys: np.ndarray, limit: Optional[int]) -> np.ndarray:
+    """Urutkan `order` menurut keys turun (stable). keys int kecil (match_count) → per level,
+    berhenti begitu `limit` terpenuhi."""
+    if limit is None:
+        return order[np.argsort(-keys, kind="stable")]
+    parts, need = [], limit
+    for level in range(int(keys.max(initial=0)), -1, -1):
+        part = order[keys == level][:need]
+        parts.append(part)
+        need -= len(part)
+        if need <= 0:
+            break
+    return np.concatenate(parts) if parts else order[:0]
+
+def _top_series(values: np.ndarray, present: np.ndarray, labels, k: int, name: str) -> pd.Series:
+    """k nilai terbesar (urut turun, seri stabil) di antara grup yang muncul."""
+    idx = np.flatnonzero(present)
+    idx = idx[np.argsort(-values[idx], kind="stable")][:k]
+    return pd.Series(values[idx], index=pd.Index([labels[i] for i in idx], name=name))
@@ -0,0 +1,296 @@
+# src/raw_store.py
+"""
+Penyimpanan RAW per run.
+
+Format:
+  - "jsonl.zst" (default) / "jsonl.gz":
+      data/raw/run_*/pages.jsonl.zst — satu baris JSON per halaman
+      {"page": N, "data": [...], "meta": {...}}, dikompresi per batch halaman (codec
+      pyarrow): tiap batch = satu frame zstd / member gzip lengkap yang di-fsync sebelum
+      halamannya ditandai "ok", jadi proses yang mati di tengah run hanya bisa kehilangan
+      frame terakhir yang belum selesai ditulis.
+      Urutan baris = urutan halaman selesai diambil (bukan nomor halaman); nomor halaman
+      ada di tiap baris. Append-only: run baru dan --resume menambah frame di file yang sama.
+  - "json": format lama, data/raw/run_*/page_00001.json per halaman.
+
+Pembaca (iter_raw_pages) mengenali kedua format, jadi run lama tetap bisa diproses.
+"""
+import os, json, sys, zlib, threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+
+from src.metrics import span
+
+RAW_FORMATS = ("jsonl.zst", "jsonl.gz", "json")
+_CODECS = {"jsonl.zst": "zstd", "jsonl.gz": "gzip"}
+READ_BLOCK = 1 << 20
+
+def compress_frame(data: bytes, codec: str) -> bytes:
+    """Satu frame zstd / member gzip lengkap (frame bersambung tetap dibaca sebagai satu aliran)."""
+    buf = pa.BufferOutputStream()
+    with pa.CompressedOutputStream(buf, codec) as out:
+        out.write(data)
+    return buf.getvalue().to_pybytes()
+
+def resolve_format(fmt: Optional[str]) -> str:
+    fmt = fmt or "jsonl.zst"
+    if fmt not in RAW_FORMATS:
+        raise ValueError(f"Format RAW tidak dikenal: {fmt} (pilih: {', '.join(RAW_FORMATS)})")
+    if fmt == "jsonl.zst" and not pa.Codec.is_available("zstd"):
+        print("[WARN] Codec zstd tidak tersedia di pyarrow → pakai jsonl.gz")
+        fmt = "jsonl.gz"
+    return fmt
+
+class RawSink:
+    """Writer RAW thread-safe untuk satu run.
+
+    Halaman ditulis begitu selesai, tanpa menunggu halaman sebelumnya (halaman yang
+    lambat / gagal tidak menahan RAM maupun checkpoint halaman lain). Group commit:
+    halaman yang datang selama satu thread menulis + fsync diantre dan ditulis thread
+    berikutnya sebagai satu frame. `on_written(page)` dipanggil setelah frame berisi
+    halaman itu selesai ditulis + di-fsync, yaitu setelah halaman bisa dibaca ulang dari
+    disk (dipakai untuk checkpoint "ok").
+    """
+    def __init__(self, run_dir: Path, fmt: Optional[str] = None,
+                 on_written: Optional[Callable[[int], None]] = None):
+        self.run_dir = Path(run_dir)
+        self.fmt = resolve_format(fmt)
+        self.on_written = on_written
+        self._lock = threading.Lock()        # antrean
+        self._write_lock = threading.Lock()  # file: satu penulis + fsync sekaligus
+        self._queue: List[Tuple[int, bytes]] = []
+        self._file = None
+        if self.fmt != "json":
+            self.path = self.run_dir / f"pages.{self.fmt}"
+            self._file = open(self.path, "ab")
+        else:
+            self.path = self.run_dir
+
+    def __enter__(self) -> "RawSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write_page(self, page: int, data: dict) -> None:
+        with span("raw.write", rows=len(data.get("data") or [])) as sp:
+            if self.fmt == "json":
+                with open(self.run_dir / f"page_{page:05d}.json", "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                    sp.add(bytes_out=f.tell())
+                if self.on_written:
+                    self.on_written(page)
+                return
+            line = json.dumps({"page": page, **data}, ensure_ascii=False).encode("utf-8") + b"\n"
+            sp.add(bytes_out=len(line))  # sebelum kompresi
+            self._offer(page, line)
+
+    def _offer(self, page: int, line: bytes) -> None:
+        with self._lock:
+            self._queue.append((page, line))
+        with self._write_lock:
+            self._flush_queue()
+
+    def _flush_queue(self) -> None:
+        with self._lock:
+            batch, self._queue = self._queue, []
+        if not batch:
+            return  # sudah ditulis thread lain dalam frame sebelumnya
+        # frame ditutup per batch: flush() aliran kompresi saja belum menulis apa pun ke disk
+        self._file.write(compress_frame(b"".join(line for _, line in batch), _CODECS[self.fmt]))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if self.on_written:
+            for p, _ in batch:
+                self.on_written(p)
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        with self._write_lock:
+            self._flush_queue()
+            self._file.close()
+            self._file = None
+
+def raw_files(run_dir: Path) -> List[Path]:
+    run_dir = Path(run_dir)
+    files = [run_dir / f"pages.{fmt}" for fmt in RAW_FORMATS if fmt != "json"]
+    return [p for p in files if p.exists()]
+
+def _zstd_complete_end(data: memoryview) -> int:
+    """Offset akhir frame zstd utuh terakhir (hanya header frame/blok yang dibaca, RFC 8878)."""
+    pos, end, n = 0, 0, len(data)
+    while pos + 4 <= n:
+        magic = int.from_bytes(data[pos:pos + 4], "little")
+        if magic & 0xFFFFFFF0 == 0x184D2A50:  # skippable frame
+            if pos + 8 > n:
+                break
+            pos += 8 + int.from_bytes(data[pos + 4:pos + 8], "little")
+        elif magic == 0xFD2FB528:
+            if pos + 5 > n:
+                break
+            fhd = data[pos + 4]
+            single = fhd >> 5 & 1
+            fcs = (1 if single else 0, 2, 4, 8)[fhd >> 6]
+            pos += 5 + (0 if single else 1) + (0, 1, 2, 4)[fhd & 3] + fcs
+            last = False
+            while not last and pos + 3 <= n:
+                head = int.from_bytes(data[pos:pos + 3], "little")
+                last, kind, size = head & 1, head >> 1 & 3, head >> 3
+                pos += 3 + (1 if kind == 1 else size)  # RLE: satu byte diulang
+            if not last:
+                break
+            pos += 4 if fhd >> 2 & 1 else 0  # checksum
+        else:
+            break
+        if pos > n:
+            break
+        end = pos
+    return end
+
+def _decompressed_chunks(path: Path, codec: str) -> Iterator[bytes]:
+    """Isi file terkompresi per potongan. pyarrow menolak seluruh aliran bila frame / member
+    terakhir terpotong, padahal frame sebelumnya utuh: gzip dibaca per member lewat zlib,
+    zstd hanya sampai frame utuh terakhir."""
+    if codec != "gzip":
+        with _mapped(path) as buf:
+            end = _zstd_end(buf)
+            stream = pa.CompressedInputStream(pa.BufferReader(buf[:end]), codec)
+            try:
+                while True:
+                    chunk = stream.read(READ_BLOCK)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                stream.close()
+            if end < buf.size:
+                raise ValueError("frame zstd terakhir terpotong")
+        return
+    for chunk, _ in _gzip_members(path):
+        yield chunk
+
+@contextmanager
+def _mapped(path: Path) -> Iterator[pa.Buffer]:
+    """Isi file lewat memory map (halaman dibaca OS sesuai kebutuhan, tanpa salinan di RAM)."""
+    if Path(path).stat().st_size == 0:
+        yield pa.py_buffer(b"")
+        return
+    with pa.memory_map(str(path)) as mm:
+        yield mm.read_buffer()
+
+def _zstd_end(buf: pa.Buffer) -> int:
+    with memoryview(buf) as view:
+        return _zstd_complete_end(view)
+
+def _gzip_members(path: Path) -> Iterator[Tuple[bytes, int]]:
+    """(isi satu member gzip utuh, offset akhir member di file); member terakhir terpotong → ValueError."""
+    with open(path, "rb") as f:
+        d, out, offset, end = zlib.decompressobj(wbits=31), [], 0, 0
+        while True:
+            data = f.read(READ_BLOCK)
+            if not data:
+                break
+            while data:
+                out.append(d.decompress(data))
+                if not d.eof:
+                    offset += len(data)
+                    break
+                offset += len(data) - len(d.unused_data)
+                end = offset
+                yield b"".join(out), end
+                data = d.unused_data
+                d, out = zlib.decompressobj(wbits=31), []
+        if offset > end:
+            raise ValueError("member gzip terakhir terpotong")
+
+def _complete_end(path: Path, codec: str) -> int:
+    """Offset akhir frame / member utuh terakhir di file RAW terkompresi."""
+    if codec != "gzip":
+        with _mapped(path) as buf:
+            return _zstd_end(buf)
+    end = 0
+    try:
+        for _, end in _gzip_members(path):
+            pass
+    except (OSError, ValueError, zlib.error):
+        pass
+    return end
+
+def _iter_lines(path: Path, codec: str) -> Iterator[bytes]:
+    """Baris JSON utuh satu file; sisa baris tanpa newline di akhir = tulisan terpotong."""
+    buf = b""
+    for chunk in _decompressed_chunks(path, codec):
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        yield from lines
+    if buf.strip():
+        raise ValueError("baris terakhir terpotong")
+
+def iter_raw_pages(run_dir: Path) -> Iterator[Tuple[int, dict]]:
+    """Stream (page, payload) dari satu run, satu halaman per iterasi (memori per halaman)."""
+    run_dir = Path(run_dir)
+    for path in raw_files(run_dir):
+        codec = _CODECS[path.name[len("pages."):]]
+        try:
+            for line in _iter_lines(path, codec):
+                if not line.strip():
+                    continue
+                with span("raw.parse", bytes_in=len(line)) as sp:
+                    obj = json.loads(line)
+                    sp.add(rows=len(obj.get("data") or []))
+                yield int(obj.pop("page")), obj
+        except (OSError, ValueError, zlib.error) as e:
+            # frame terakhir terpotong (proses mati di tengah tulis) → halaman sebelumnya tetap valid
+            print(f"[WARN] {path.name} terpotong: {e}")
+    for p in sorted(run_dir.glob("page_*.json")):
+        try:
+            with span("raw.parse", bytes_in=p.stat().st_size) as sp:
+                obj = json.loads(p.read_text(encoding="utf-8"))
+                sp.add(rows=len(obj.get("data") or []))
+            yield int(p.stem.split("_")[1]), obj
+        except Exception as e:
+            print(f"[WARN] Gagal baca {p.name}: {e}")
+
+def recover_run(run_dir: Path) -> set:
+    """Halaman yang benar-benar bisa dibaca dari RAW satu run (dasar checkpoint --resume).
+    Ekor file terkompresi yang terpotong (proses mati di tengah tulis) dibuang lebih dulu,
+    sehingga frame yang ditambahkan resume tidak tertinggal di belakang data rusak."""
+    for path in raw_files(run_dir):
+        end = _complete_end(path, _CODECS[path.name[len("pages."):]])
+        size = path.stat().st_size
+        if end < size:
+            print(f"[WARN] {path.name}: {size - end:,} B ekor terpotong dibuang")
+            os.truncate(path, end)
+    return {p for p, _ in iter_raw_pages(run_dir)}
+
+def raw_size_bytes(run_dir: Path) -> int:
+    return sum(p.stat().st_size for p in Path(run_dir).iterdir() if p.is_file())
+
+def convert_run(src_dir: Path, dst_dir: Path, fmt: str = "jsonl.zst") -> Path:
+    """Konversi run format lama (page_*.json) ke format terkompresi."""
+    src_dir, dst_dir = Path(src_dir), Path(dst_dir)
+    dst_dir.mkdir(parents=True, exist_ok=True)
+    with RawSink(dst_dir, fmt) as sink:
+        for p, data in iter_raw_pages(src_dir):
+            sink.write_page(p, data)
+    meta = src_dir / "run_meta.json"
+    if meta.exists():
+        (dst_dir / "run_meta.json").write_text(meta.read_text(encoding="utf-8"), encoding="utf-8")
+    return dst_dir
+
+if __name__ == "__main__":
+    """
+    Konversi run lama:
+      python -m src.raw_store data/raw/run_xxx [data/raw/run_xxx_zst] [jsonl.zst|jsonl.gz]
+    """
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(2)
+    src = Path(sys.argv[1])
+    dst = Path(sys.argv[2]) if len(sys.argv) > 2 else src.with_name(src.name + "_zst")
+    out = convert_run(src, dst, sys.argv[3] if len(sys.argv) > 3 else "jsonl.zst")
+    print(f"[DONE] {src} ({raw_size_bytes(src):,} B) → {out} ({raw_size_bytes(out):,} B)")
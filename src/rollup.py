@@ -0,0 +1,434 @@
+# src/rollup.py
+"""
+Rollup (cube) agregat dari vacancies_scored.parquet — tahap pipeline setelah score.
+Dibaca app.py (KPI + grafik) dan dipakai untuk ekspor output/tables.
+
+  data/clean/rollup/
+    cells.parquet    grain (nama_provinsi, kategori_posisi, bucket):
+                       n_lowongan, n_data_related, sum_kuota, sum_terdaftar,
+                       n_ratio / n_ratio_inf / sum_ratio / ratio_min / ratio_max,
+                       hll      register HyperLogLog nama_perusahaan (2^HLL_P byte),
+                       td_mean / td_weight  centroid t-digest competition_ratio terhingga
+    posisi.parquet   cell (baris cells) + posisi: n_lowongan, sum_terdaftar
+    skills.parquet   cell + skill: n_lowongan
+
+bucket = indeks competition_bucket (score.BUCKET_EDGES); -1 = rasio kosong (NaN).
+Semua ukuran bisa digabung antar sel: jumlah dijumlah, register HLL di-max,
+centroid t-digest disatukan. Filter provinsi / kategori / batas rasio dijawab dari
+cube selama batas rasio tidak membelah sel (ratio_min..ratio_max); keyword, skill
+wajib, atau batas di tengah sel tetap dihitung dari baris (query.VacancyQuery).
+
+Jalankan:
+  python -m src.rollup [--input data/clean/vacancies_scored.parquet] [--no-tables]
+"""
+import os, sys, json, hashlib, argparse
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import yaml
+
+if __package__ in (None, ""):  # dijalankan sebagai `python src/rollup.py`
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.metrics import span
+from src.query import _top_series
+from src.score import BUCKET_EDGES, BUCKET_LABELS, CONFIG_PATH, OUT_PARQUET
+
+ROOT = Path(__file__).resolve().parents[1]
+ROLLUP_DIR = ROOT / "data" / "clean" / "rollup"
+TABLES_DIR = ROOT / "output" / "tables"
+DIMS = ("nama_provinsi", "kategori_posisi")
+INPUT_COLUMNS = [*DIMS, "nama_perusahaan", "posisi", "jumlah_kuota", "jumlah_terdaftar",
+                 "competition_ratio", "is_data_related", "skills_extracted"]
+HLL_P = 10          # 1024 register/sel → galat relatif ±3.3% (hitungan kecil ≈ eksak, linear counting)
+TD_DELTA = 100      # kompresi t-digest: sel ≤ ~200 baris disimpan sebagai nilai asli
+TOP_SKILLS_N = 30
+ROLLUP_META_KEY = b"rollup"
+
+# ---------- HyperLogLog ----------
+def hll_positions(values, p: int = HLL_P) -> tuple[np.ndarray, np.ndarray]:
+    """(indeks register, rho) per nilai: hash 64-bit, p bit teratas = register,
+    rho = posisi bit 1 pertama di sisa bit."""
+    shift = 64 - p
+    idx = np.empty(len(values), dtype=np.int32)
+    rho = np.empty(len(values), dtype=np.uint8)
+    for i, v in enumerate(values):
+        h = int.from_bytes(hashlib.blake2b(str(v).encode("utf-8"), digest_size=8).digest(), "little")
+        idx[i] = h >> shift
+        rho[i] = shift - (h & ((1 << shift) - 1)).bit_length() + 1
+    return idx, rho
+
+def hll_estimate(registers: np.ndarray) -> np.ndarray:
+    """Kardinalitas per baris matriks register (sel × m); koreksi linear counting untuk
+    hitungan kecil (hash 64-bit → tanpa koreksi rentang besar)."""
+    reg = np.atleast_2d(registers)
+    m = reg.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.exp2(-reg.astype(float)).sum(axis=1)
+    zeros = (reg == 0).sum(axis=1)
+    linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+# ---------- t-digest ----------
+def td_compress(values: np.ndarray, delta: float = TD_DELTA) -> tuple[np.ndarray, np.ndarray]:
+    """Centroid (mean, weight) dari nilai terurut naik: centroid bertetangga digabung selama
+    bobotnya ≤ 4·N·q(1−q)/delta → ekor (q dekat 0/1) tetap nilai asli (min/max eksak)."""
+    n = len(values)
+    means, weights = [], []
+    cur_m, cur_w, done = None, 0, 0
+    for v in values.tolist():
+        if cur_w:
+            w = cur_w + 1
+            q = (done + w / 2) / n
+            if w <= 4 * n * q * (1 - q) / delta:
+                cur_m += (v - cur_m) / w
+                cur_w = w
+                continue
+            means.append(cur_m)
+            weights.append(cur_w)
+            done += cur_w
+        cur_m, cur_w = v, 1
+    if cur_w:
+        means.append(cur_m)
+        weights.append(cur_w)
+    return np.asarray(means, dtype=np.float64), np.asarray(weights, dtype=np.int32)
+
+def td_quantile(means: np.ndarray, weights: np.ndarray, q: float, n_inf: int = 0) -> float:
+    """Kuantil dari gabungan centroid (+ n_inf nilai ∞ di ekor atas). Centroid bobot 1
+    → sama dengan np.quantile/np.median (interpolasi linear antar rank tengah)."""
+    total = float(weights.sum()) + n_inf
+    if total == 0:
+        return float("nan")
+    order = np.argsort(means, kind="stable")
+    m, w = means[order], weights[order].astype(float)
+    centers = np.cumsum(w) - w / 2  # rank tengah tiap centroid (0-based + 0.5)
+    rank = q * total
+    if n_inf and (not len(m) or rank > centers[-1]):
+        return float("inf")
+    return float(np.interp(rank, centers, m))
+
+# ---------- build ----------
+def bucket_codes(ratio: np.ndarray) -> np.ndarray:
+    """Indeks competition_bucket (kanan inklusif seperti pd.cut); NaN → -1."""
+    b = np.searchsorted(np.asarray(BUCKET_EDGES[1:]), ratio, side="left").astype(np.int8)
+    b[np.isnan(ratio)] = -1
+    return b
+
+def _list_array(offsets: np.ndarray, values: np.ndarray) -> pa.Array:
+    return pa.ListArray.from_arrays(pa.array(offsets.astype(np.int32)), pa.array(values))
+
+def build_rollup(df: pd.DataFrame) -> dict[str, pa.Table]:
+    """{"cells", "posisi", "skills"} dari frame scored (kolom INPUT_COLUMNS yang ada)."""
+    ratio = pd.to_numeric(df["competition_ratio"], errors="coerce").to_numpy(float)
+    keys = pd.DataFrame({c: df[c] if c in df.columns else None for c in DIMS})
+    keys["bucket"] = bucket_codes(ratio)
+    g = keys.groupby(list(keys.columns), observed=True, dropna=False, sort=True)
+    cell = g.ngroup().to_numpy()
+    cells = g.size().reset_index(name="n_lowongan")
+    n_cells = len(cells)
+
+    def total(values) -> np.ndarray:
+        return np.bincount(cell, weights=values, minlength=n_cells)
+
+    def counts(col: str) -> np.ndarray:
+        return np.nan_to_num(pd.to_numeric(df[col], errors="coerce").to_numpy(float))
+
+    finite = np.isfinite(ratio)
+    flags = df["is_data_related"].fillna(False).to_numpy(bool) if "is_data_related" in df.columns else np.zeros(len(df), bool)
+    cells["n_lowongan"] = cells["n_lowongan"].astype("int32")
+    cells["n_data_related"] = total(flags).astype("int32")
+    cells["sum_kuota"] = total(counts("jumlah_kuota")).astype("int64")
+    cells["sum_terdaftar"] = total(counts("jumlah_terdaftar")).astype("int64")
+    cells["n_ratio"] = total(finite).astype("int32")
+    cells["n_ratio_inf"] = total(np.isposinf(ratio)).astype("int32")
+    cells["sum_ratio"] = total(np.where(finite, ratio, 0.0))
+
+    # HLL: satu hash per perusahaan unik, register sel = max rho atas pasangan (sel, perusahaan)
+    comp_codes, comp_uniq = pd.factorize(df["nama_perusahaan"])
+    reg_idx, reg_rho = hll_positions(comp_uniq)
+    pairs = np.unique(np.stack([cell, comp_codes])[:, comp_codes >= 0], axis=1)
+    registers = np.zeros((n_cells, 1 << HLL_P), dtype=np.uint8)
+    np.maximum.at(registers, (pairs[0], reg_idx[pairs[1]]), reg_rho[pairs[1]])
+
+    # t-digest per sel atas rasio terhingga (baris diurutkan sekali: sel, lalu rasio)
+    rows = np.flatnonzero(finite)
+    rows = rows[np.lexsort((ratio[rows], cell[rows]))]
+    bounds = np.searchsorted(cell[rows], np.arange(n_cells + 1))
+    td_m, td_w, td_off = [], [], [0]
+    for i in range(n_cells):
+        m, w = td_compress(ratio[rows[bounds[i]:bounds[i + 1]]])
+        td_m.append(m)
+        td_w.append(w)
+        td_off.append(td_off[-1] + len(m))
+    lo = np.full(n_cells, np.nan)
+    hi = np.full(n_cells, np.nan)
+    has = bounds[1:] > bounds[:-1]
+    lo[has] = ratio[rows[bounds[:-1][has]]]
+    hi[has] = ratio[rows[bounds[1:][has] - 1]]
+    cells["ratio_min"], cells["ratio_max"] = lo, hi
+
+    table = pa.Table.from_pandas(cells, preserve_index=False)
+    hll = pa.Array.from_buffers(pa.binary(1 << HLL_P), n_cells, [None, pa.py_buffer(registers.tobytes())])
+    table = table.append_column("hll", hll)
+    td_off = np.asarray(td_off)
+    table = table.append_column("td_mean", _list_array(td_off, np.concatenate(td_m)))
+    table = table.append_column("td_weight", _list_array(td_off, np.concatenate(td_w)))
+
+    out = {"cells": table}
+    applicants = counts("jumlah_terdaftar")
+    detail = pd.DataFrame({"cell": cell.astype("int32"), "posisi": df["posisi"], "terdaftar": applicants})
+    out["posisi"] = _detail_table(detail, "posisi", "terdaftar")
+    if "skills_extracted" in df.columns:
+        sk = pd.DataFrame({"cell": cell.astype("int32"), "skill": df["skills_extracted"]}).explode("skill")
+        sk = sk.dropna(subset=["skill"])
+        out["skills"] = _detail_table(sk.astype({"skill": "category"}), "skill")
+    return out
+
+def _detail_table(detail: pd.DataFrame, col: str, sum_col: Optional[str] = None) -> pa.Table:
+    """Grain sel + col: n_lowongan (+ sum_<sum_col>), col sebagai dictionary."""
+    g = detail.groupby(["cell", col], observed=True, sort=True)
+    agg = g.size().rename("n_lowongan").astype("int32").to_frame()
+    if sum_col is not None:
+        agg["sum_" + sum_col] = g[sum_col].sum().astype("int64")
+    agg = agg.reset_index()
+    agg[col] = agg[col].astype("category")
+    return pa.Table.from_pandas(agg, preserve_index=False)
+
+def write_rollup(tables: dict[str, pa.Table], out_dir: Path = ROLLUP_DIR, meta: Optional[dict] = None) -> None:
+    """Tulis tiap grain (atomik per file); metadata cells: parameter + label bucket."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    info = {"hll_p": HLL_P, "td_delta": TD_DELTA, "bucket_edges": [float(e) for e in BUCKET_EDGES],
+            "bucket_labels": BUCKET_LABELS, **(meta or {})}
+    for name, table in tables.items():
+        if name == "cells":
+            schema_meta = dict(table.schema.metadata or {})
+            schema_meta[ROLLUP_META_KEY] = json.dumps(info, ensure_ascii=False).encode("utf-8")
+            table = table.replace_schema_metadata(schema_meta)
+        path = out_dir / f"{name}.parquet"
+        tmp = path.with_name("_" + path.name + ".tmp")
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, path)
+    for stale in set(p.stem for p in out_dir.glob("*.parquet")) - set(tables):
+        (out_dir / f"{stale}.parquet").unlink()
+
+# ---------- baca / query ----------
+def _codes(col: pd.Series) -> tuple[np.ndarray, list]:
+    col = col.astype("category")
+    return col.cat.codes.to_numpy(), col.cat.categories.tolist()
+
+class Rollup:
+    """Cube di memori: ukuran per sel sebagai array, register HLL sebagai matriks (sel × m),
+    centroid t-digest sebagai CSR. Selektor = mask bool atas sel (lihat cells())."""
+    def __init__(self, rollup_dir: str | Path = ROLLUP_DIR):
+        rollup_dir = Path(rollup_dir)
+        t = pq.read_table(rollup_dir / "cells.parquet")
+        self.meta = json.loads((t.schema.metadata or {}).get(ROLLUP_META_KEY, b"{}"))
+        df = t.drop(["hll", "td_mean", "td_weight"]).to_pandas()
+        self.codes, self.categories = {}, {}
+        for col in DIMS:
+            self.codes[col], self.categories[col] = _codes(df[col])
+        self.bucket = df["bucket"].to_numpy()
+        for col in ("n_lowongan", "n_data_related", "sum_kuota", "sum_terdaftar",
+                    "n_ratio", "n_ratio_inf", "sum_ratio", "ratio_min", "ratio_max"):
+            setattr(self, col, df[col].to_numpy())
+        self.n_cells = len(df)
+        m = 1 << int(self.meta.get("hll_p", HLL_P))
+        hll = t.column("hll").combine_chunks()
+        self.hll = np.frombuffer(hll.buffers()[1], dtype=np.uint8)[hll.offset * m:][:self.n_cells * m].reshape(self.n_cells, m)
+        td = t.column("td_mean").combine_chunks()
+        self.td_offsets = td.offsets.to_numpy()
+        self.td_mean = td.values.to_numpy()
+        self.td_weight = t.column("td_weight").combine_chunks().values.to_numpy()
+        # centroid semua sel diurutkan sekali menurut mean → query cukup memilih (tanpa sort)
+        order = np.argsort(self.td_mean, kind="stable")
+        self.td_mean, self.td_weight = self.td_mean[order], self.td_weight[order]
+        self.td_cell = np.repeat(np.arange(self.n_cells), np.diff(self.td_offsets))[order]
+        self.details = {}
+        for name, col in (("posisi", "posisi"), ("skills", "skill")):
+            path = rollup_dir / f"{name}.parquet"
+            if path.exists():
+                d = pq.read_table(path).to_pandas()
+                codes, labels = _codes(d[col])
+                self.details[name] = (d["cell"].to_numpy(), codes, labels, d)
+
+    @classmethod
+    def load(cls, rollup_dir: str | Path = ROLLUP_DIR) -> Optional["Rollup"]:
+        return cls(rollup_dir) if (Path(rollup_dir) / "cells.parquet").exists() else None
+
+    @property
+    def total_rows(self) -> int:
+        return int(self.n_lowongan.sum())
+
+    def cells(self, province=None, category=None, max_ratio: Optional[float] = None,
+              with_empty_ratio: bool = False) -> Optional[np.ndarray]:
+        """Mask sel untuk filter (AND); None bila batas rasio membelah sel (jawab dari baris).
+        Seperti VacancyQuery.run: rasio kosong dibuang kecuali with_empty_ratio."""
+        mask = np.ones(self.n_cells, dtype=bool) if with_empty_ratio else self.bucket >= 0
+        for col, value in (("nama_provinsi", province), ("kategori_posisi", category)):
+            if value is not None:
+                cats = self.categories[col]
+                mask &= self.codes[col] == (cats.index(value) if value in cats else -2)
+        if max_ratio is not None:
+            hi = np.where(self.n_ratio_inf > 0, np.inf, self.ratio_max)
+            inside = hi <= max_ratio
+            outside = (self.n_ratio == 0) | (self.ratio_min > max_ratio)
+            split = mask & (self.bucket >= 0) & ~inside & ~outside
+            if split.any():
+                return None
+            mask &= inside | (self.bucket < 0)
+            if not with_empty_ratio:
+                mask &= self.bucket >= 0
+        return mask
+
+    def count(self, cells: np.ndarray) -> int:
+        return int(self.n_lowongan[cells].sum())
+
+    def ratio_stats(self, cells: np.ndarray) -> tuple[float, float]:
+        """(median, mean) competition_ratio — median dari t-digest gabungan, mean dari jumlah."""
+        n, n_inf = int(self.n_ratio[cells].sum()), int(self.n_ratio_inf[cells].sum())
+        if n + n_inf == 0:
+            return float("nan"), float("nan")
+        sel = cells[self.td_cell]
+        median = td_quantile(self.td_mean[sel], self.td_weight[sel], 0.5, n_inf)
+        mean = float("inf") if n_inf else float(self.sum_ratio[cells].sum() / n)
+        return median, mean
+
+    def unique_count(self, col: str, cells: np.ndarray) -> int:
+        """Perusahaan unik (≈, HyperLogLog); hanya nama_perusahaan yang punya register."""
+        if col != "nama_perusahaan":
+            raise KeyError(f"Rollup tidak menyimpan hitungan unik untuk {col}")
+        if not cells.any():
+            return 0
+        return int(round(hll_estimate(self.hll[cells].max(axis=0))[0]))
+
+    def top_provinces_by_companies(self, cells: np.ndarray, k: int = 10) -> pd.Series:
+        """Perusahaan unik (≈) per provinsi: register HLL di-max per provinsi
+        (sel urut provinsi dari groupby → tiap provinsi satu irisan berurutan)."""
+        prov = self.codes["nama_provinsi"]
+        n_prov = len(self.categories["nama_provinsi"])
+        idx = np.flatnonzero(cells & (prov >= 0))
+        counts = np.zeros(n_prov, dtype=np.int64)
+        present = np.zeros(n_prov, dtype=bool)
+        if len(idx):
+            p = prov[idx]
+            starts = np.flatnonzero(np.r_[True, p[1:] != p[:-1]])
+            hll = self.hll[idx]
+            registers = np.stack([hll[i:j].max(axis=0) for i, j in zip(starts, np.r_[starts[1:], len(idx)])])
+            counts[p[starts]] = np.rint(hll_estimate(registers)).astype(np.int64)
+            present[p[starts]] = True
+        return _top_series(counts, present, self.categories["nama_provinsi"], k, "nama_provinsi")
+
+    def top_titles_by_applicants(self, cells: np.ndarray, k: int = 10) -> pd.Series:
+        """Total pendaftar per judul posisi (eksak, dari grain posisi)."""
+        cell, codes, labels, d = self.details["posisi"]
+        return self._top_detail(cells, cell, codes, labels, d["sum_terdaftar"].to_numpy(), k, "posisi")
+
+    def top_skills(self, cells: np.ndarray, k: int = TOP_SKILLS_N) -> pd.Series:
+        cell, codes, labels, d = self.details["skills"]
+        return self._top_detail(cells, cell, codes, labels, d["n_lowongan"].to_numpy(), k, "skills_extracted")
+
+    @staticmethod
+    def _top_detail(cells, cell, codes, labels, values, k, name) -> pd.Series:
+        sel = cells[cell] & (codes >= 0)
+        sums = np.bincount(codes[sel], weights=values[sel], minlength=len(labels)).astype(np.int64)
+        present = np.bincount(codes[sel], minlength=len(labels)) > 0
+        return _top_series(sums, present, labels, k, name)
+
+# ---------- ekspor output/tables ----------
+def load_export_params(path: Path = CONFIG_PATH) -> dict:
+    params = {"tables_dir": str(TABLES_DIR), "top_n": 20}
+    if Path(path).exists():
+        with open(path, "r", encoding="utf-8") as f:
+            params.update((yaml.safe_load(f) or {}).get("export") or {})
+    return params
+
+def export_tables(cube: Rollup, scored_path: Path, out_dir: Path, top_n: int = 20,
+                  scored: Optional[pd.DataFrame] = None) -> list[Path]:
+    """Tabel agregat + kpi_summary.json dari cube; dua tabel per-lowongan (top peminat,
+    rasio terendah) dari file scored dengan kolom yang dibutuhkan saja
+    (scored = frame yang sama di memori → file tidak dibaca)."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    every = np.ones(cube.n_cells, dtype=bool)
+    written = []
+
+    def save(obj, name: str, **kwargs) -> None:
+        path = out_dir / name
+        obj.to_csv(path, encoding="utf-8-sig", **kwargs)
+        written.append(path)
+
+    save(cube.top_titles_by_applicants(every, top_n).rename("jumlah_terdaftar"),
+         "top_profesi_terpadat.csv", header=True)
+    provinces = cube.top_provinces_by_companies(every, cube.n_cells)
+    save(provinces.head(top_n).rename("nama_perusahaan"), "top_provinsi_banyak_perusahaan.csv", header=True)
+    if "skills" in cube.details:
+        save(cube.top_skills(every, TOP_SKILLS_N).rename("count"), "top_skills.csv", header=True)
+
+    cols = ["posisi", "nama_perusahaan", "nama_provinsi", "jumlah_kuota", "jumlah_terdaftar",
+            "competition_ratio", "days_to_deadline"]
+    if scored is not None:
+        rows = scored[[c for c in cols if c in scored.columns]]
+    else:
+        names = pq.read_schema(scored_path).names
+        rows = pd.read_parquet(scored_path, columns=[c for c in cols if c in names])
+    top = rows.sort_values("jumlah_terdaftar", ascending=False, kind="stable").head(top_n)
+    save(top[[c for c in cols[:6] if c in top.columns]], "top_lowongan_peminat_tertinggi.csv", index=False)
+    cand = rows[rows["competition_ratio"].notna() & (rows["jumlah_kuota"] > 0)]
+    low = cand.sort_values("competition_ratio", ascending=True, kind="stable").head(top_n)
+    save(low[[c for c in cols if c in low.columns]], "lowongan_peluang_besar.csv", index=False)
+
+    total = cube.total_rows
+    kpi = {
+        "total_lowongan": total,
+        "total_perusahaan_unik": cube.unique_count("nama_perusahaan", every),
+        "provinsi_teratas": {str(k): int(v) for k, v in provinces.head(3).items()},
+        "persen_data_related": float(cube.n_data_related.sum() / total * 100) if total else 0.0,
+    }
+    path = out_dir / "kpi_summary.json"
+    path.write_text(json.dumps(kpi, ensure_ascii=False, indent=2), encoding="utf-8")
+    written.append(path)
+    return written
+
+def run(scored_path: Path = OUT_PARQUET, out_dir: Path = ROLLUP_DIR, tables: bool = True,
+        scored: Optional[pd.DataFrame] = None) -> int:
+    """Bangun + tulis cube (dan output/tables); scored = frame scored di memori (src/pipeline.py)."""
+    if scored is None:
+        if not Path(scored_path).exists():
+            print(f"[ERROR] File scored tidak ditemukan: {scored_path} (jalankan src.score dulu)")
+            return 1
+        with span("rollup.read") as sp:
+            names = pq.read_schema(scored_path).names
+            df = pd.read_parquet(scored_path, columns=[c for c in INPUT_COLUMNS if c in names])
+            sp.add(rows=len(df))
+    else:
+        df = scored[[c for c in INPUT_COLUMNS if c in scored.columns]]
+    with span("rollup.build", rows=len(df)):
+        built = build_rollup(df)
+    with span("rollup.write", rows=sum(t.num_rows for t in built.values())):
+        write_rollup(built, out_dir, {"rows": len(df), "source": Path(scored_path).name})
+    sizes = ", ".join(f"{k} {t.num_rows}" for k, t in built.items())
+    print(f"[DONE] Wrote: {out_dir} | rows={len(df)} → sel: {sizes}")
+
+    if tables:
+        params = load_export_params()
+        tables_dir = Path(params["tables_dir"])
+        tables_dir = tables_dir if tables_dir.is_absolute() else ROOT / tables_dir
+        with span("rollup.tables"):
+            written = export_tables(Rollup(out_dir), scored_path, tables_dir, int(params["top_n"]), scored)
+        print(f"[DONE] {len(written)} tabel → {tables_dir}")
+    return 0
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Bangun rollup (cube) dari vacancies_scored.parquet")
+    ap.add_argument("--input", type=Path, default=OUT_PARQUET)
+    ap.add_argument("--out", type=Path, default=ROLLUP_DIR)
+    ap.add_argument("--no-tables", action="store_true", help="jangan tulis ulang output/tables")
+    args = ap.parse_args()
+    return run(args.input, args.out, not args.no_tables)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# src/schema.py
+"""
+Skema Arrow ringkas dataset clean (data/clean/vacancies/) — juga terbawa ke hasil score.
+
+  - string berulang (judul, provinsi, kabupaten, perusahaan, status, ...) → dictionary<int32, string>
+    (dibaca pandas sebagai category)
+  - tanggal jadwal → timestamp(us, Asia/Jakarta); jumlah_kuota / jumlah_terdaftar → int32
+  - program_studi / jenjang → list<int32> key ke tabel lookup global (hanya bertambah):
+      data/clean/lookups/program_studi.parquet   key | value (id prodi API) | title
+      data/clean/lookups/jenjang.parquet         key | value (nama jenjang) | title
+  - teks berat (TEXT_COLUMNS) = grup kolom terpisah: pembaca default hanya
+    memproyeksikan CORE_COLUMNS; teks dibaca saat dibutuhkan (clean_store.read_text)
+
+conform() mengubah frame format lama (string tanggal, list dict) ke bentuk ini,
+jadi snapshot lama tetap bisa dibawa ke snapshot baru.
+"""
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ROOT = Path(__file__).resolve().parents[1]
+LOOKUP_DIR = ROOT / "data" / "clean" / "lookups"
+TZ = "Asia/Jakarta"
+
+DICT = pa.dictionary(pa.int32(), pa.string())
+LOCAL_TS = pa.timestamp("us", tz=TZ)
+KEYS = pa.list_(pa.int32())
+
+CLEAN_SCHEMA = pa.schema([
+    ("id_posisi", pa.string()),
+    ("posisi", DICT),
+    ("deskripsi_posisi", pa.string()),
+    ("jumlah_kuota", pa.int32()),
+    ("jumlah_terdaftar", pa.int32()),
+    ("status_posisi", DICT),
+    ("nama_perusahaan", DICT),
+    ("nama_provinsi", DICT),
+    ("nama_kabupaten", DICT),
+    ("alamat_perusahaan", pa.string()),
+    ("logo", DICT),
+    ("government_agency_name", DICT),
+    ("sub_government_agency_name", DICT),
+    ("tanggal_pendaftaran_awal", LOCAL_TS),
+    ("tanggal_pendaftaran_akhir", LOCAL_TS),
+    ("tanggal_mulai", LOCAL_TS),
+    ("tanggal_selesai", LOCAL_TS),
+    ("program_studi_ids", KEYS),
+    ("jenjang_ids", KEYS),
+    ("competition_ratio", pa.float64()),
+    ("days_to_deadline", pa.float32()),
+    ("skills_extracted", pa.list_(pa.string())),
+    ("skills_score", pa.float64()),
+    ("is_data_related", pa.bool_()),
+])
+TEXT_COLUMNS = ("deskripsi_posisi", "alamat_perusahaan")
+CORE_COLUMNS = [f.name for f in CLEAN_SCHEMA if f.name not in TEXT_COLUMNS]
+DATE_COLUMNS = [f.name for f in CLEAN_SCHEMA if f.type == LOCAL_TS]
+LOOKUP_COLUMNS = {"program_studi": "program_studi_ids", "jenjang": "jenjang_ids"}
+LOOKUP_SCHEMA = pa.schema([("key", pa.int32()), ("value", pa.string()), ("title", pa.string())])
+
+def core_columns(names: list[str], with_text: bool = False) -> list[str]:
+    """Proyeksi default pembaca: semua kolom kecuali grup teks (kecuali with_text)."""
+    return list(names) if with_text else [c for c in names if c not in TEXT_COLUMNS]
+
+def local_timestamps(s: pd.Series) -> pd.Series:
+    """String jadwal API (waktu lokal WIB, tanpa zona) / datetime → datetime64[us, Asia/Jakarta]."""
+    if isinstance(s.dtype, pd.DatetimeTZDtype):
+        return s.dt.tz_convert(TZ)
+    ts = pd.to_datetime(s, errors="coerce", format="ISO8601")
+    if ts.dt.tz is None:
+        ts = ts.dt.tz_localize(TZ)
+    return ts.dt.tz_convert(TZ).astype(f"datetime64[us, {TZ}]")
+
+class LookupTable:
+    """Kamus value → key int32 (hanya bertambah; key lama tidak pernah berubah)."""
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.values: list[str] = []
+        self.titles: list[Optional[str]] = []
+        if self.path.exists():
+            t = pq.read_table(self.path)
+            self.values = t.column("value").to_pylist()
+            self.titles = t.column("title").to_pylist()
+        self.index = {v: k for k, v in enumerate(self.values)}
+        self.dirty = False
+
+    def key(self, value: str, title: Optional[str] = None) -> int:
+        k = self.index.get(value)
+        if k is None:
+            k = self.index[value] = len(self.values)
+            self.values.append(value)
+            self.titles.append(title)
+            self.dirty = True
+        elif title is not None and self.titles[k] != title:
+            self.titles[k] = title  # judul prodi diganti di API → pakai yang terbaru
+            self.dirty = True
+        return k
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.table({
+            "key": pa.array(np.arange(len(self.values), dtype="int32")),
+            "value": pa.array(self.values, type=pa.string()),
+            "title": pa.array(self.titles, type=pa.string()),
+        }, schema=LOOKUP_SCHEMA)
+        tmp = self.path.with_name("_" + self.path.name + ".tmp")
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+class Lookups:
+    """Tabel lookup program_studi + jenjang (encode saat prepare, decode untuk ekspor)."""
+    def __init__(self, lookup_dir: str | Path = LOOKUP_DIR):
+        self.program_studi = LookupTable(Path(lookup_dir) / "program_studi.parquet")
+        self.jenjang = LookupTable(Path(lookup_dir) / "jenjang.parquet")
+
+    def _prodi_keys(self, items) -> list[int]:
+        out = []
+        for it in items if items is not None else []:
+            if isinstance(it, dict) and it.get("id") is not None:
+                out.append(self.program_studi.key(str(it["id"]), it.get("title")))
+            elif isinstance(it, str) and it:
+                out.append(self.program_studi.key(it, it))
+        return out
+
+    def _jenjang_keys(self, items) -> list[int]:
+        return [self.jenjang.key(str(j), str(j)) for j in (items if items is not None else []) if j]
+
+    def encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        """program_studi / jenjang (list) → program_studi_ids / jenjang_ids (list key)."""
+        if "program_studi" in df.columns:
+            df["program_studi_ids"] = pd.Series([self._prodi_keys(v) for v in df["program_studi"]],
+                                                index=df.index, dtype=object)
+        if "jenjang" in df.columns:
+            df["jenjang_ids"] = pd.Series([self._jenjang_keys(v) for v in df["jenjang"]],
+                                          index=df.index, dtype=object)
+        return df.drop(columns=[c for c in LOOKUP_COLUMNS if c in df.columns])
+
+    def decode(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Kebalikan encode (untuk ekspor JSON): program_studi = [{id, title}], jenjang = [nama]."""
+        if "program_studi_ids" in df.columns:
+            t = self.program_studi
+            df["program_studi"] = [[{"id": t.values[k], "title": t.titles[k]} for k in keys]
+                                   if keys is not None else [] for keys in df["program_studi_ids"]]
+        if "jenjang_ids" in df.columns:
+            t = self.jenjang
+            df["jenjang"] = [[t.titles[k] for k in keys] if keys is not None else []
+                             for keys in df["jenjang_ids"]]
+        return df.drop(columns=[c for c in LOOKUP_COLUMNS.values() if c in df.columns])
+
+    def save(self) -> None:
+        self.program_studi.save()
+        self.jenjang.save()
+
+def conform(df: pd.DataFrame, lookups: Lookups) -> pd.DataFrame:
+    """Frame (baru atau dari snapshot format lama) → representasi CLEAN_SCHEMA."""
+    df = lookups.encode(df)
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = local_timestamps(df[col])
+    return df
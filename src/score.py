@@ -1,15 +1,49 @@
 # src/score.py
 from __future__ import annotations
 
-import os
+import os, sys, json
 from pathlib import Path
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import yaml
+
+if __package__ in (None, ""):  # dijalankan sebagai `python src/score.py`
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.category import categorize
+from src.clean_store import TEXT_FILE, read_latest, read_text, write_text_file
+from src.count_history import HISTORY_DIR, velocity
+from src.metrics import count, span
+from src.skill_index import BITS_COLUMN, SkillIndex
 
 ROOT = Path(__file__).resolve().parents[1]
+CONFIG_PATH = ROOT / "config" / "params.yaml"
 DATA_DIR = ROOT / "data" / "clean"
-IN_PARQUET = DATA_DIR / "vacancies.parquet"            # input dasar
+IN_DATASET = DATA_DIR / "vacancies"                    # input dasar: snapshot terbaru
+IN_LEGACY = DATA_DIR / "vacancies.parquet"             # format lama (file tunggal)
 OUT_PARQUET = DATA_DIR / "vacancies_scored.parquet"    # output enriched
+OUT_TEXT = TEXT_FILE                                   # grup teks (deskripsi on-demand di app)
+VELOCITY_WINDOW_DAYS = 7                               # jendela laju pendaftar (riwayat counts)
+SCORE_DEFAULTS = {
+    "priority_weights": {"competition": 0.40, "skills": 0.20, "deadline": 0.15, "quota": 0.15, "freshness": 0.10},
+    "deadline_horizon_days": 30,
+    "quota_cap": 20,
+    "freshness_half_life_days": 7,
+    "top_k": 100,
+}
+TOPK_GROUPS = {"kategori_posisi": "priority_rank_kategori", "nama_provinsi": "priority_rank_provinsi"}
+TOPK_META_KEY = b"topk_index"
+BUCKET_EDGES = [-np.inf, 0.5, 1.0, 2.0, 5.0, 10.0, np.inf]   # competition_bucket (kanan inklusif)
+BUCKET_LABELS = ["≤0.5", "0.5–1", "1–2", "2–5", "5–10", ">10/∞"]
+
+def load_score_params(path: Path = CONFIG_PATH) -> dict:
+    """Bagian `score:` params.yaml di atas SCORE_DEFAULTS."""
+    params = dict(SCORE_DEFAULTS)
+    if Path(path).exists():
+        with open(path, "r", encoding="utf-8") as f:
+            params.update((yaml.safe_load(f) or {}).get("score") or {})
+    return params
 
 def safe_competition_ratio(df: pd.DataFrame) -> pd.Series:
     """Hitung rasio persaingan = pendaftar/kuota secara aman:
@@ -26,38 +60,128 @@ def safe_competition_ratio(df: pd.DataFrame) -> pd.Series:
     ratio = ratio.replace([np.inf, -np.inf], np.inf)  # amankan infinities
     return ratio
 
-def build_category(title: str) -> str:
-    if not isinstance(title, str):
-        return "Other"
-    t = title.lower()
-    if ("data" in t) or ("analyst" in t) or ("analytics" in t):
-        return "Data & Analytics"
-    if ("admin" in t) or ("operator" in t) or ("pengadministrasi" in t):
-        return "Administration"
-    if ("marketing" in t) or ("brand" in t) or ("customer" in t) or ("sales" in t):
-        return "Marketing & Sales"
-    if ("design" in t) or ("video" in t) or ("creative" in t):
-        return "Creative"
-    if ("perawat" in t) or ("ners" in t) or ("kesehatan" in t):
-        return "Health"
-    if ("bkkbn" in t) or ("kementerian" in t) or ("direktorat" in t):
-        return "Public Sector"
-    return "Other"
-
-def main():
-    if not IN_PARQUET.exists():
-        raise FileNotFoundError(f"File input tidak ditemukan: {IN_PARQUET}")
-
-    df = pd.read_parquet(IN_PARQUET)
-    print(f"[INFO] Loaded {len(df)} rows")
+def add_velocity_columns(df: pd.DataFrame, vel: pd.DataFrame) -> pd.DataFrame:
+    """Tambah kolom dari riwayat counts (vektorisasi, tanpa loop per baris):
+       - applicants_per_day: laju pendaftar dalam jendela terakhir (NaN bila riwayat < 2 run)
+       - projected_ratio_at_deadline: (pendaftar + laju × sisa hari) / kuota;
+         laju negatif dianggap 0, deadline lewat → sisa 0 hari, kuota <=0 → ∞
+    """
+    rate = df["id_posisi"].map(vel["applicants_per_day"]) if len(vel) else pd.Series(np.nan, index=df.index)
+    df["applicants_per_day"] = rate.astype(float)
+
+    applicants = pd.to_numeric(df.get("jumlah_terdaftar"), errors="coerce").fillna(0)
+    quota = pd.to_numeric(df.get("jumlah_kuota"), errors="coerce")
+    days_left = pd.to_numeric(df.get("days_to_deadline"), errors="coerce").clip(lower=0)
+    projected = applicants + df["applicants_per_day"].clip(lower=0) * days_left
+    df["projected_ratio_at_deadline"] = (projected / quota.where(quota > 0, np.nan)).replace(
+        [np.inf, -np.inf], np.inf
+    )
+    return df
+
+def priority_components(df: pd.DataFrame, params: dict) -> dict[str, np.ndarray]:
+    """Komponen priority_score (array float 0–1, besar = lebih baik; data kosong → 0)."""
+    def num(col):
+        return pd.to_numeric(df[col], errors="coerce").to_numpy(float) if col in df.columns else np.full(len(df), np.nan)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = num("competition_ratio")
+        competition = np.where(np.isfinite(ratio) & (ratio >= 0), 1.0 / (1.0 + ratio), 0.0)
+
+        skills = np.clip(np.nan_to_num(num("skills_score")), 0.0, 1.0)
+
+        days = num("days_to_deadline")
+        deadline = np.clip(np.nan_to_num(days / float(params["deadline_horizon_days"])), 0.0, 1.0)
+
+        cap = float(params["quota_cap"])
+        quota = np.clip(np.nan_to_num(num("jumlah_kuota")), 0.0, cap)
+        quota = np.log1p(quota) / np.log1p(cap)
+
+        # umur posting: sejak first_seen (riwayat snapshot) atau tanggal_pendaftaran_awal
+        ref, seen = _reference_time(df), pd.Series(pd.NaT, index=df.index, dtype="datetime64[us, UTC]")
+        if "first_seen" in df.columns:
+            seen = pd.to_datetime(df["first_seen"], utc=True, errors="coerce")
+        if "tanggal_pendaftaran_awal" in df.columns:
+            opened = pd.to_datetime(df["tanggal_pendaftaran_awal"], errors="coerce")
+            opened = (opened.dt.tz_localize("Asia/Jakarta") if opened.dt.tz is None else opened).dt.tz_convert("UTC")
+            seen = seen.fillna(opened)
+        age_days = ((ref - seen).dt.total_seconds() / 86400.0).clip(lower=0).to_numpy(float)
+        freshness = np.nan_to_num(0.5 ** (age_days / float(params["freshness_half_life_days"])))
+
+    return {"competition": competition, "skills": skills, "deadline": deadline,
+            "quota": quota, "freshness": freshness}
+
+def _reference_time(df: pd.DataFrame) -> pd.Timestamp:
+    """Waktu snapshot (last_seen terbaru) → skor stabil bila score.py diulang; fallback sekarang."""
+    if "last_seen" in df.columns:
+        ts = pd.to_datetime(df["last_seen"], utc=True, errors="coerce").max()
+        if pd.notna(ts):
+            return ts
+    return pd.Timestamp.now(tz="UTC")
 
-    # Rasio persaingan aman
-    df["competition_ratio"] = safe_competition_ratio(df)
+def priority_score(df: pd.DataFrame, params: dict) -> np.ndarray:
+    """Rata-rata berbobot komponen (bobot ≤0 / tak dikenal diabaikan) → 0–1."""
+    comps = priority_components(df, params)
+    weights = {k: float(w) for k, w in (params.get("priority_weights") or {}).items() if k in comps and float(w or 0) > 0}
+    if not weights:
+        return np.zeros(len(df))
+    total = sum(weights.values())
+    return sum(comps[k] * (w / total) for k, w in weights.items())
 
-    # Kategori profesi sederhana (kalau belum ada)
-    if "kategori_posisi" not in df.columns:
-        df["kategori_posisi"] = df["posisi"].apply(build_category)
+def _ratio_quota_keys(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Kunci sort: rasio naik (NaN paling akhir), kuota turun."""
+    ratio = df["competition_ratio"].to_numpy(float)
+    quota = np.nan_to_num(pd.to_numeric(df["jumlah_kuota"], errors="coerce").to_numpy(float))
+    return np.where(np.isnan(ratio), np.inf, ratio), -quota
 
+def add_rank_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Urutkan baris menurut priority_score dan tambah kolom urutan siap pakai (int32, 1 = terbaik):
+       - priority_rank            : = posisi baris + 1 (file ditulis urut prioritas)
+       - ratio_order              : rasio kecil → kuota besar (urutan default app)
+       - priority_rank_kategori / _provinsi : peringkat prioritas di dalam grup (0 = tanpa grup)
+    Tie-break prioritas: rasio kecil, lalu kuota besar.
+    """
+    ratio, neg_quota = _ratio_quota_keys(df)
+    order = np.lexsort((neg_quota, ratio, -df["priority_score"].to_numpy(float)))
+    df = df.iloc[order].reset_index(drop=True)
+
+    n = np.arange(1, len(df) + 1, dtype="int32")
+    df["priority_rank"] = n
+    ratio_order = np.empty(len(df), dtype="int32")
+    ratio_order[np.lexsort(_ratio_quota_keys(df)[::-1])] = n
+    df["ratio_order"] = ratio_order
+
+    for col, rank_col in TOPK_GROUPS.items():
+        if col in df.columns:
+            rank = df.groupby(col, dropna=True, sort=False, observed=True).cumcount() + 1
+            df[rank_col] = rank.where(df[col].notna(), 0).astype("int32")
+    return df
+
+def topk_index(df: pd.DataFrame, k: int) -> dict:
+    """{kolom grup: {nilai: [posisi baris urut prioritas, ≤ k]}}; df sudah urut priority_rank."""
+    index = {"k": int(k)}
+    for col, rank_col in TOPK_GROUPS.items():
+        if rank_col in df.columns:
+            top = df.loc[(df[rank_col] >= 1) & (df[rank_col] <= k), [col]]
+            index[col] = {str(g): pos.tolist() for g, pos in top.groupby(col, sort=True, observed=True).groups.items()}
+    return index
+
+def read_topk_index(path: str | Path) -> dict:
+    """Indeks top-K dari metadata vacancies_scored.parquet ({} jika tidak ada)."""
+    meta = pq.read_schema(path).metadata or {}
+    return json.loads(meta[TOPK_META_KEY]) if TOPK_META_KEY in meta else {}
+
+def write_scored(df: pd.DataFrame, path: Path, topk: dict, skills: SkillIndex | None = None) -> None:
+    """Parquet + metadata: indeks top-K, dan (opsional) bitset skill + vocab-nya."""
+    table = pa.Table.from_pandas(df.drop(columns=[BITS_COLUMN], errors="ignore"), preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[TOPK_META_KEY] = json.dumps(topk, ensure_ascii=False).encode("utf-8")
+    if skills is not None:
+        table = table.append_column(BITS_COLUMN, skills.to_arrow())
+        meta.update(skills.metadata())
+    pq.write_table(table.replace_schema_metadata(meta), path)
+
+def rank_frame(df: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """rank + competition_bucket + priority_score + urutan siap pakai (competition_ratio sudah ada)."""
     # Ranking: lebih kecil rasio -> peringkat lebih baik
     # Gunakan na_option="bottom" supaya NaN ditempatkan di bawah (rank terbesar)
     # Hasil rank float -> konversi ke nullable Int64 agar aman dengan NA.
@@ -67,13 +191,63 @@ def main():
     df["rank"] = rank_series.astype("Int64")
 
     # Tambahan ringkas: bucket rasio (opsional, memudahkan filter di app)
-    cuts = [-np.inf, 0.5, 1.0, 2.0, 5.0, 10.0, np.inf]
-    labels = ["≤0.5", "0.5–1", "1–2", "2–5", "5–10", ">10/∞"]
-    df["competition_bucket"] = pd.cut(df["competition_ratio"], bins=cuts, labels=labels)
+    df["competition_bucket"] = pd.cut(df["competition_ratio"], bins=BUCKET_EDGES, labels=BUCKET_LABELS)
+
+    # Skor prioritas berbobot (config/params.yaml → score) + urutan siap pakai untuk app
+    df["priority_score"] = priority_score(df, params)
+    return add_rank_columns(df)
 
-    # Simpan
-    df.to_parquet(OUT_PARQUET, index=False)
+def main(df: pd.DataFrame | None = None, text: pd.DataFrame | None = None) -> pd.DataFrame:
+    """df / text dari src/pipeline.py (snapshot in-memory); None → dibaca dari dataset clean.
+    Return frame scored (urut priority_rank)."""
+    if df is None:
+        # hanya partisi snapshot terbaru yang dibaca (riwayat dilewati)
+        with span("score.read") as sp:
+            df = read_latest(IN_DATASET, legacy_file=IN_LEGACY)
+            sp.add(rows=len(df))
+    print(f"[INFO] Loaded {len(df)} rows")
+
+    with span("score.compute", rows=len(df)):
+        # Rasio persaingan aman
+        df["competition_ratio"] = safe_competition_ratio(df)
+
+        # Laju pendaftar + proyeksi rasio saat deadline (data/state/counts)
+        vel = velocity(HISTORY_DIR, VELOCITY_WINDOW_DAYS)
+        df = add_velocity_columns(df, vel)
+        print(f"[INFO] Laju pendaftar tersedia untuk {int(df['applicants_per_day'].notna().sum())} posting")
+
+        # Kategori profesi sederhana (kalau belum ada)
+        if "kategori_posisi" not in df.columns:
+            df["kategori_posisi"] = categorize(df["posisi"])
+
+        params = load_score_params()
+        df = rank_frame(df, params)
+        topk = topk_index(df, int(params["top_k"]))
+        print(f"[INFO] priority_score: bobot {params['priority_weights']} | top-{topk['k']} untuk "
+              f"{len(topk.get('kategori_posisi', {}))} kategori, {len(topk.get('nama_provinsi', {}))} provinsi")
+
+        # Bitset skill per baris (vocab di metadata) → match_count di app = popcount
+        skills = SkillIndex.from_lists(df["skills_extracted"]) if "skills_extracted" in df.columns else None
+        if skills is not None:
+            print(f"[INFO] Indeks skill: {len(skills.vocab)} skill, {skills.n_words * 8} byte/baris")
+
+    # Simpan (baris urut priority_rank; indeks top-K + vocab skill di metadata parquet)
+    with span("score.write", rows=len(df)):
+        write_scored(df, OUT_PARQUET, topk, skills)
+    count("score.write", bytes_out=OUT_PARQUET.stat().st_size)
     print(f"[DONE] Wrote: {OUT_PARQUET} | rows={len(df)}")
 
+    # Teks berat (deskripsi, alamat) terpisah: app membacanya per posting saat dibuka
+    try:
+        if text is None:
+            text = read_text(IN_DATASET, legacy_file=IN_LEGACY)
+        with span("score.write_text") as sp:
+            n_text = write_text_file(text, OUT_TEXT)
+            sp.add(rows=n_text, bytes_out=OUT_TEXT.stat().st_size)
+        print(f"[DONE] Wrote: {OUT_TEXT} | rows={n_text}")
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"[WARN] Grup teks tidak ditulis: {e}")
+    return df
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,120 @@
+# src/skill_cache.py
+"""
+Cache hasil ekstraksi skill antar run (Parquet side table).
+
+data/state/skills_cache.parquet:
+  id_posisi | content_hash | skills_extracted | skills_score
+  - content_hash   : blake2b(posisi + deskripsi_posisi)
+  - metadata file  : fingerprint skills.yaml (+ CACHE_VERSION); beda → cache dibuang
+
+Baris dianggap hit jika id_posisi ada dan content_hash sama; posting baru /
+diedit diekstrak ulang. Taksonomi (skills.yaml) berubah → semua invalid.
+"""
+import os, hashlib
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CACHE_VERSION = 1  # naikkan bila logika ekstraksi berubah tanpa mengubah skills.yaml
+CACHE_SCHEMA = pa.schema([
+    ("id_posisi", pa.string()),
+    ("content_hash", pa.string()),
+    ("skills_extracted", pa.list_(pa.string())),
+    ("skills_score", pa.float64()),
+])
+
+def skills_fingerprint(skills_path: str | Path) -> str:
+    h = hashlib.sha256(f"v{CACHE_VERSION}\n".encode())
+    h.update(Path(skills_path).read_bytes())
+    return h.hexdigest()[:16]
+
+def content_hash(title, desc) -> str:
+    text = f"{title or ''}\x1f{desc or ''}"
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
+class SkillCache:
+    """Cache in-memory (dict id_posisi → entri) yang dimuat/disimpan ke satu file Parquet."""
+    def __init__(self, path: str | Path, fingerprint: str):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self._entries: dict[str, tuple[str, list, float]] = {}
+        self._touched: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.extract_s = 0.0
+        self.sec_per_row = None  # biaya ekstraksi per baris (dari run ini / run sebelumnya)
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            print(f"[INFO] Skill cache kosong ({self.path.name} belum ada)")
+            return
+        try:
+            pf = pq.ParquetFile(self.path)
+            meta = pf.schema_arrow.metadata or {}
+            if meta.get(b"skills_fingerprint", b"").decode() != self.fingerprint:
+                print("[INFO] skills.yaml berubah → skill cache di-reset")
+                return
+            if b"sec_per_row" in meta:
+                self.sec_per_row = float(meta[b"sec_per_row"])
+            t = pf.read()
+        except Exception as e:
+            print(f"[WARN] Gagal baca skill cache ({e}) → mulai dari kosong")
+            return
+        cols = [t.column(c).to_pylist() for c in ("id_posisi", "content_hash", "skills_extracted", "skills_score")]
+        self._entries = {i: (h, s, sc) for i, h, s, sc in zip(*cols) if i is not None}
+        print(f"[INFO] Skill cache dimuat: {len(self._entries)} entri")
+
+    def lookup(self, ids: list, hashes: list[str]) -> tuple[dict[int, tuple[list, float]], list[int]]:
+        """Return ({posisi baris: (skills, score)} untuk hit, [posisi baris miss])."""
+        found, missing = {}, []
+        for pos, (i, h) in enumerate(zip(ids, hashes)):
+            e = self._entries.get(i) if i is not None else None
+            if e is not None and e[0] == h:
+                found[pos] = (e[1], e[2])
+                self._touched.add(i)
+            else:
+                missing.append(pos)
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def put(self, ids: list, hashes: list[str], skills: list, scores: list, elapsed_s: float) -> None:
+        for i, h, s, sc in zip(ids, hashes, skills, scores):
+            if i is not None:
+                self._entries[i] = (h, s, sc)
+                self._touched.add(i)
+        self.extract_s += elapsed_s
+
+    def keep(self, ids) -> None:
+        """Posting yang dibawa tanpa diproses ulang: entrinya tidak ikut dipangkas save(prune=True)."""
+        self._touched.update(i for i in ids if i in self._entries)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        per_row = self.extract_s / self.misses if self.misses else self.sec_per_row
+        return {
+            "rows": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "extract_s": round(self.extract_s, 3),
+            "saved_s_est": round(self.hits * per_row, 3) if per_row else None,
+        }
+
+    def save(self, prune: bool = False) -> None:
+        """Tulis atomik (.tmp → rename). prune=True: simpan hanya id yang dipakai run ini."""
+        rows = [(i, *e) for i, e in self._entries.items() if not prune or i in self._touched]
+        per_row = self.extract_s / self.misses if self.misses else self.sec_per_row
+        meta = {"skills_fingerprint": self.fingerprint}
+        if per_row:
+            meta["sec_per_row"] = f"{per_row:.6g}"
+        table = pa.Table.from_arrays(
+            [pa.array([r[k] for r in rows], type=f.type) for k, f in enumerate(CACHE_SCHEMA)],
+            schema=CACHE_SCHEMA.with_metadata(meta),
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        pq.write_table(table, tmp)
+        os.replace(tmp, self.path)
@@ -0,0 +1,150 @@
+# src/skill_index.py
+"""
+Indeks skill per posting untuk pencocokan "skill saya" di app.
+
+  - vocab    : skill unik (lowercase, urut alfabet); disimpan di metadata parquet
+  - bits     : matriks (n_baris, n_word) uint64; bit j baris i = posting i punya vocab[j]
+               → kolom `skills_bits` (fixed_size_binary) di vacancies_scored.parquet
+  - inverted : skill → posisi baris (CSR: offsets + rows), dibangun dari bits saat
+               pertama dipakai
+
+match_count("excel, sql, python") = popcount(bits & query) per baris;
+filter "wajib punya skill X" = irisan daftar posting dari inverted index.
+"""
+import json
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+VOCAB_META_KEY = b"skill_vocab"
+BITS_COLUMN = "skills_bits"
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+class SkillIndex:
+    """Bitset skill per baris + inverted index (posisi baris mengikuti frame sumbernya)."""
+    def __init__(self, vocab: list[str], bits: np.ndarray):
+        self.vocab = list(vocab)
+        self.bits = bits
+        self.lookup = {s: i for i, s in enumerate(self.vocab)}
+        self._offsets: Optional[np.ndarray] = None
+        self._rows: Optional[np.ndarray] = None
+
+    @property
+    def n_words(self) -> int:
+        return max(1, (len(self.vocab) + 63) // 64)
+
+    @classmethod
+    def from_lists(cls, skills: Iterable, vocab: Optional[list[str]] = None) -> "SkillIndex":
+        """Dari list skill per baris (list / ndarray / None). vocab None → dari data."""
+        s = pd.Series(list(skills), dtype=object)
+        n = len(s)
+        flat = s.explode().dropna()
+        flat = flat.astype(str).str.strip().str.lower()
+        flat = flat[flat != ""]
+        if vocab is None:
+            vocab = sorted(flat.unique().tolist()) if len(flat) else []
+        codes = pd.Index(vocab).get_indexer(flat.to_numpy()) if len(flat) else np.array([], dtype=np.int64)
+        rows = flat.index.to_numpy()[codes >= 0]
+        codes = codes[codes >= 0]
+        index = cls(vocab, np.zeros((n, max(1, (len(vocab) + 63) // 64)), dtype=np.uint64))
+        np.bitwise_or.at(index.bits, (rows, codes // 64), np.left_shift(np.uint64(1), (codes % 64).astype(np.uint64)))
+        return index
+
+    @classmethod
+    def from_column(cls, values, vocab: list[str]) -> "SkillIndex":
+        """Dari kolom skills_bits (pa.Array/ChunkedArray fixed_size_binary atau Series bytes)."""
+        n_words = max(1, (len(vocab) + 63) // 64)
+        if isinstance(values, (pa.Array, pa.ChunkedArray)):
+            arr = values.combine_chunks() if isinstance(values, pa.ChunkedArray) else values
+            buf = arr.buffers()[1]
+            data = np.frombuffer(buf, dtype=np.uint64, count=len(arr) * n_words,
+                                 offset=arr.offset * n_words * 8)
+        else:
+            data = np.frombuffer(b"".join(values), dtype=np.uint64)
+        return cls(vocab, data.reshape(-1, n_words).copy())
+
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame, source: Optional[str | Path] = None) -> "SkillIndex":
+        """Pakai skills_bits + vocab dari file sumber bila ada; selain itu bangun dari skills_extracted."""
+        vocab = read_vocab(source) if source is not None and Path(source).is_file() else None
+        if vocab is not None and BITS_COLUMN in df.columns:
+            return cls.from_column(df[BITS_COLUMN].to_numpy(), vocab)
+        skills = df["skills_extracted"] if "skills_extracted" in df.columns else [None] * len(df)
+        return cls.from_lists(skills)
+
+    def to_arrow(self) -> pa.Array:
+        width = self.n_words * 8
+        return pa.FixedSizeBinaryArray.from_buffers(
+            pa.binary(width), len(self.bits), [None, pa.py_buffer(np.ascontiguousarray(self.bits).tobytes())]
+        )
+
+    def metadata(self) -> dict:
+        return {VOCAB_META_KEY: json.dumps(self.vocab, ensure_ascii=False).encode("utf-8")}
+
+    def query(self, skills: Iterable[str]) -> np.ndarray:
+        """Bitmask (n_word,) untuk daftar skill; skill di luar vocab diabaikan."""
+        q = np.zeros(self.n_words, dtype=np.uint64)
+        for s in skills:
+            j = self.lookup.get(str(s).strip().lower())
+            if j is not None:
+                q[j // 64] |= np.uint64(1) << np.uint64(j % 64)
+        return q
+
+    def match_count(self, skills: Iterable[str]) -> np.ndarray:
+        """Jumlah skill query yang dimiliki tiap baris (popcount bits & query)."""
+        q = self.query(skills)
+        words = np.flatnonzero(q)
+        if not len(words):
+            return np.zeros(len(self.bits), dtype=np.int64)
+        hit = np.ascontiguousarray(self.bits[:, words] & q[words])
+        return _POPCOUNT8[hit.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+    def _build_inverted(self) -> None:
+        rows, counts = [], []
+        for j in range(len(self.vocab)):
+            r = np.flatnonzero((self.bits[:, j // 64] >> np.uint64(j % 64)) & np.uint64(1))
+            rows.append(r)
+            counts.append(len(r))
+        self._offsets = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+        self._rows = np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+
+    def postings(self, skill: str) -> np.ndarray:
+        """Posisi baris (urut naik) yang punya skill ini."""
+        j = self.lookup.get(str(skill).strip().lower())
+        if j is None:
+            return np.array([], dtype=np.int64)
+        if self._offsets is None:
+            self._build_inverted()
+        return self._rows[self._offsets[j]:self._offsets[j + 1]]
+
+    def must_have(self, skills: Iterable[str]) -> np.ndarray:
+        """Mask bool baris yang punya SEMUA skill (irisan inverted index, mulai dari yang terjarang)."""
+        lists = sorted((self.postings(s) for s in skills), key=len)
+        mask = np.zeros(len(self.bits), dtype=bool)
+        if not lists:
+            mask[:] = True
+            return mask
+        rows = lists[0]
+        for other in lists[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        mask[rows] = True
+        return mask
+
+    def __getstate__(self):
+        # inverted index dibangun ulang seperlunya (cache streamlit mem-pickle objek ini)
+        return {"vocab": self.vocab, "bits": self.bits}
+
+    def __setstate__(self, state):
+        self.__init__(state["vocab"], state["bits"])
+
+def read_vocab(path: str | Path) -> Optional[list[str]]:
+    """Vocab dari metadata parquet (None jika file tidak punya indeks skill)."""
+    try:
+        meta = pq.read_schema(path).metadata or {}
+    except Exception:
+        return None
+    return json.loads(meta[VOCAB_META_KEY]) if VOCAB_META_KEY in meta else None
@@ -0,0 +1,222 @@
+# src/web_bundle.py
+"""
+Bundle data statis untuk frontend (web/public/data/), ditulis web/scripts/convert_data.py:
+
+  manifest.json       versi (hash isi), jumlah baris, ukuran tiap file → klien cukup cek ini
+                      sebelum mengunduh ulang
+  list.json           daftar ringkas untuk tabel / filter / grafik (LIST_FIELDS saja)
+  facets.json         agregat siap pakai: statistik nasional, per provinsi, top perusahaan,
+                      distribusi kategori (halaman laporan tidak perlu list.json)
+  detail/<nnn>.json   kolom lain per id_posisi (deskripsi, alamat, jadwal, prodi, ...);
+                      shard = FNV-1a 32-bit(id_posisi) % shards (awalan id API tidak acak),
+                      jumlah shard = pangkat 2 ≈ baris / SHARD_ROWS (dicatat di manifest)
+
+JSON ditulis ringkas (tanpa spasi) + varian .gz dan .br (precompressed, untuk server
+statis gzip_static / brotli_static). Brotli memakai codec pyarrow (tanpa dependensi baru);
+file dikompresi paralel di thread pool.
+"""
+import os, gzip, json, hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.category import categorize
+from src.metrics import span
+from src.schema import Lookups
+
+ROOT = Path(__file__).resolve().parents[1]
+BUNDLE_DIR = ROOT / "web" / "public" / "data"
+LIST_FIELDS = ["id_posisi", "posisi", "nama_perusahaan", "nama_provinsi", "kategori_posisi",
+               "jumlah_kuota", "jumlah_terdaftar", "competition_ratio", "skills_norm"]
+RATIO_DECIMALS = 4
+SHARD_ROWS = 256  # target baris per file detail (~0.3 MB JSON, ~60 kB br)
+TOP_COMPANIES = 10
+FALLBACK_CATEGORY = "Lainnya"  # sama dengan laporan/page.tsx (kategori kosong)
+SEPARATORS = (",", ":")
+# level kompresi: gzip 9 / brotli 9 ~2.5x lebih lambat dari 6 / 7 untuk hasil hanya 2–6% lebih
+# kecil (tahap web = tahap terlama pipeline); brotli 11 butuh menit untuk detail 30k baris
+GZIP_LEVEL = 6
+BROTLI_LEVEL = 7
+COMPRESS_WORKERS = min(8, os.cpu_count() or 1)  # zlib / codec pyarrow melepas GIL
+
+def json_bytes(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=SEPARATORS, allow_nan=False).encode("utf-8")
+
+def _json_value(v):
+    """Nilai sel → tipe JSON (numpy → python, NaN/∞ → null, array → list)."""
+    if isinstance(v, np.ndarray):
+        return [_json_value(x) for x in v.tolist()]
+    if isinstance(v, (list, tuple)):
+        return [_json_value(x) for x in v]
+    if isinstance(v, dict):
+        return {k: _json_value(x) for k, x in v.items()}
+    if hasattr(v, "item"):
+        v = v.item()
+    if isinstance(v, float) and not np.isfinite(v):
+        return None
+    return v
+
+def _column_values(s: pd.Series) -> list:
+    """Satu kolom → list nilai JSON (per kolom: float/int/bool lewat tolist, sisanya per sel)."""
+    if s.dtype.kind == "f" and isinstance(s.dtype, np.dtype):
+        v = s.to_numpy()
+        finite = np.isfinite(v)
+        return v.tolist() if finite.all() else np.where(finite, v, None).tolist()
+    if s.dtype.kind in "iub" and not s.hasnans:
+        return s.to_numpy().tolist()
+    return [v if type(v) is str else _json_value(None if v is pd.NA or v is pd.NaT else v) for v in s.to_numpy(object)]
+
+def records(df: pd.DataFrame) -> list[dict]:
+    """DataFrame → list dict siap json.dumps (allow_nan=False)."""
+    cols = list(df.columns)
+    values = [_column_values(df[c]) for c in cols]
+    return [dict(zip(cols, row)) for row in zip(*values)]
+
+def list_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Kolom daftar: string kosong untuk teks hilang, rasio dibulatkan (NaN/∞ → null),
+    skills_norm = skills_extracted lowercase (dipakai match skill di klien)."""
+    out = pd.DataFrame(index=df.index)
+    for col in ("id_posisi", "posisi", "nama_perusahaan", "nama_provinsi", "kategori_posisi"):
+        out[col] = df[col].astype(object).where(df[col].notna(), "") if col in df.columns else ""
+    for col in ("jumlah_kuota", "jumlah_terdaftar"):
+        out[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+    out["competition_ratio"] = pd.to_numeric(df["competition_ratio"], errors="coerce").round(RATIO_DECIMALS)
+    skills = df["skills_extracted"] if "skills_extracted" in df.columns else pd.Series([[]] * len(df), index=df.index)
+    out["skills_norm"] = [[str(s).lower() for s in v] if v is not None and len(v) else [] for v in skills]
+    return out[LIST_FIELDS]
+
+def facets(lst: pd.DataFrame) -> dict:
+    """Agregat halaman laporan (sama dengan hitungan klien lama atas data.json)."""
+    quota, applicants = lst["jumlah_kuota"], lst["jumlah_terdaftar"]
+
+    def competition(a, q) -> float:
+        return float(a / q) if q else 0.0
+
+    prov = lst.groupby("nama_provinsi", sort=False).agg(
+        companies=("nama_perusahaan", "nunique"), positions=("id_posisi", "size"),
+        quota=("jumlah_kuota", "sum"), applicants=("jumlah_terdaftar", "sum"))
+    comp = lst.groupby("nama_perusahaan", sort=False).agg(
+        positions=("id_posisi", "size"), quota=("jumlah_kuota", "sum"), applicants=("jumlah_terdaftar", "sum"))
+    comp = comp.sort_values("positions", ascending=False, kind="stable").head(TOP_COMPANIES)
+    cats = lst["kategori_posisi"].replace("", FALLBACK_CATEGORY).value_counts(sort=False)
+    cats = cats.sort_values(ascending=False, kind="stable")
+    return {
+        "national": {
+            "totalPositions": int(len(lst)),
+            "totalCompanies": int(lst["nama_perusahaan"].nunique()),
+            "totalQuota": int(quota.sum()),
+            "totalApplicants": int(applicants.sum()),
+            "avgCompetition": competition(applicants.sum(), quota.sum()),
+        },
+        "provinces": [
+            {"province": k, "companies": int(r.companies), "positions": int(r.positions), "quota": int(r.quota),
+             "applicants": int(r.applicants), "competition": competition(r.applicants, r.quota)}
+            for k, r in prov.iterrows()
+        ],
+        "topCompanies": [
+            {"company": k, "positions": int(r.positions), "quota": int(r.quota), "applicants": int(r.applicants),
+             "competition": competition(r.applicants, r.quota)}
+            for k, r in comp.iterrows()
+        ],
+        "categories": [{"name": k, "value": int(v)} for k, v in cats.items()],
+    }
+
+def export_frame(df: pd.DataFrame, lookups: Optional[Lookups] = None) -> pd.DataFrame:
+    """Snapshot clean (skema ringkas, dengan kolom teks) → nilai JSON polos untuk bundle:
+    key lookup → program_studi [{id, title}] / jenjang [nama], kategori → string,
+    kategori diperkaya aturan bersama (sama dengan enrichCategory), tanggal → ISO UTC."""
+    df = (lookups or Lookups()).decode(df)
+    for col in df.select_dtypes(include=["category"]).columns:
+        df[col] = df[col].astype(object)
+    for col in ["posisi", "nama_perusahaan", "nama_provinsi"]:
+        if col not in df.columns:
+            df[col] = None
+    for col in ["jumlah_kuota", "jumlah_terdaftar"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0) if col in df.columns else 0
+    if "competition_ratio" not in df.columns:  # dataset lama; prepare selalu menulis rasio
+        q = df["jumlah_kuota"]
+        df["competition_ratio"] = (df["jumlah_terdaftar"] / q.where(q > 0)).fillna(0.0)
+    df["kategori_posisi"] = categorize(df["posisi"], df.get("kategori_posisi"))
+    for col in df.select_dtypes(include=["datetimetz", "datetime"]).columns:
+        df[col] = iso_utc(df[col])
+    return df
+
+def iso_utc(s: pd.Series) -> pd.Series:
+    """Timestamp → "YYYY-MM-DDTHH:MM:SSZ" (UTC), NaT → NaN; = dt.strftime, ~10x lebih cepat."""
+    if s.dt.tz is not None:
+        s = s.dt.tz_convert("UTC").dt.tz_localize(None)
+    text = np.char.add(np.datetime_as_string(s.to_numpy("datetime64[s]"), unit="s"), "Z")
+    return pd.Series(text, index=s.index, dtype=object).where(s.notna())
+
+def shard_count(rows: int) -> int:
+    return 1 << max(0, int(np.ceil(np.log2(max(rows, 1) / SHARD_ROWS))))
+
+def shard_of(id_posisi: str, shards: int) -> int:
+    """FNV-1a 32-bit atas byte UTF-8 id → indeks shard (sama dengan web/src/utils/data.ts)."""
+    h = 0x811C9DC5
+    for b in str(id_posisi).encode("utf-8"):
+        h = ((h ^ b) * 0x01000193) & 0xFFFFFFFF
+    return h % shards
+
+def write_payload(data: bytes, path: Path, variants: bool = True) -> dict[str, int]:
+    """Tulis file + .gz + .br (atomik per file); return {ekstensi: byte}."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    out = {"json": data}
+    if variants:
+        out["gz"] = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)  # mtime 0 → isi stabil antar run
+        out["br"] = pa.Codec("brotli", compression_level=BROTLI_LEVEL).compress(data, asbytes=True)
+    for ext, payload in out.items():
+        target = path if ext == "json" else path.with_name(f"{path.name}.{ext}")
+        tmp = target.with_name("_" + target.name + ".tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, target)
+    return {ext: len(payload) for ext, payload in out.items()}
+
+def write_data_bundle(df: pd.DataFrame, out_dir: Path = BUNDLE_DIR, variants: bool = True,
+                      source: Optional[str] = None) -> dict:
+    """Tulis list / facets / detail shard + manifest; return manifest."""
+    out_dir = Path(out_dir)
+    with span("web.serialize", rows=len(df)) as sp:
+        lst = list_frame(df)
+        detail_cols = ["id_posisi", *[c for c in df.columns if c not in LIST_FIELDS and c != "skills_norm"]]
+        detail = df[detail_cols]
+        n_shards = shard_count(len(detail))
+        shards = np.array([shard_of(i, n_shards) for i in detail["id_posisi"].astype(str)], dtype=np.int64)
+
+        payloads = {"list.json": json_bytes(records(lst)),
+                    "facets.json": json_bytes(facets(lst))}
+        for shard, part in detail.groupby(shards, sort=True):
+            rows = records(part.drop(columns=["id_posisi"]))
+            payloads[f"detail/{shard:03d}.json"] = json_bytes(dict(zip(part["id_posisi"].astype(str), rows)))
+        raw_bytes = sum(map(len, payloads.values()))
+        sp.add(bytes_out=raw_bytes)
+
+    digest = hashlib.sha1()
+    for name, data in payloads.items():
+        digest.update(name.encode("utf-8"))
+        digest.update(data)
+    with span("web.write", bytes_in=raw_bytes) as sp, ThreadPoolExecutor(COMPRESS_WORKERS) as pool:
+        written = pool.map(lambda item: write_payload(item[1], out_dir / item[0], variants), payloads.items())
+        sizes = dict(zip(payloads, written))
+        sp.add(bytes_out=sum(sum(s.values()) for s in sizes.values()))
+
+    # shard lama yang tidak ditulis ulang (id hilang) dihapus
+    for p in (out_dir / "detail").glob("*.json*"):
+        if "detail/" + p.name.split(".json", 1)[0] + ".json" not in payloads:
+            p.unlink()
+
+    manifest = {
+        "version": digest.hexdigest()[:16],
+        "source": source,
+        "rows": int(len(lst)),
+        "shards": n_shards,
+        "files": {name: s["json"] for name, s in sizes.items() if not name.startswith("detail/")},
+        "detail_bytes": sum(s["json"] for name, s in sizes.items() if name.startswith("detail/")),
+    }
+    write_payload(json_bytes(manifest), out_dir / "manifest.json", variants=False)
+    manifest["sizes"] = sizes
+    return manifest
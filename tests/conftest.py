@@ -0,0 +1,49 @@
+# tests/conftest.py
+"""
+Fixture bersama untuk tes: run RAW sampel (data/raw/run_20251111_...) yang juga dipakai
+benchmarks/bench_*.py. Tes yang membutuhkannya dilewati bila run sampel tidak ada.
+repo_copy + run_prepare: salinan src/ + config/ di tmp, prepare dijalankan sebagai proses
+terpisah di sana (data/ dan logs/ repo tidak tersentuh).
+"""
+import sys, shutil, subprocess
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:  # `pytest` dari root repo tanpa instalasi paket
+    sys.path.insert(0, str(ROOT))
+SAMPLE_RUN = ROOT / "data" / "raw" / "run_20251111_180453_c667d8cb"
+
+@pytest.fixture(scope="session")
+def sample_run() -> Path:
+    if not any(SAMPLE_RUN.glob("page_*.json")):
+        pytest.skip(f"run sampel tidak ada: {SAMPLE_RUN}")
+    return SAMPLE_RUN
+
+@pytest.fixture(scope="session")
+def sample_items(sample_run: Path) -> list[dict]:
+    """Semua item vacancy run sampel (urut halaman)."""
+    from src.prepare import iter_raw_items
+    return list(iter_raw_items(sample_run))
+
+@pytest.fixture(scope="session")
+def copy_repo():
+    def copy(root: Path) -> Path:
+        for rel in ["src", "config"]:
+            shutil.copytree(ROOT / rel, root / rel, ignore=shutil.ignore_patterns("__pycache__"))
+        return root
+    return copy
+
+@pytest.fixture
+def repo_copy(tmp_path: Path, copy_repo) -> Path:
+    return copy_repo(tmp_path / "repo")
+
+@pytest.fixture(scope="session")
+def run_prepare():
+    def run(root: Path, *args: str) -> str:
+        out = subprocess.run([sys.executable, "-m", "src.prepare", *args], cwd=root,
+                             capture_output=True, text=True)
+        assert out.returncode == 0, out.stdout[-3000:] + out.stderr[-3000:]
+        return out.stdout
+    return run
@@ -0,0 +1,39 @@
+# tests/test_category.py
+"""Kategori posisi: jalur vektor, skalar, salinan category.ts lama, dan category.ts sungguhan harus sepakat;
+bundle JSON web tidak boleh basi."""
+import json
+
+import pandas as pd
+import pytest
+
+from benchmarks.bench_category import EDGE_CASES, legacy_enrich, run_web
+from src.category import BUNDLE_PATH, get_matcher
+
+@pytest.fixture(scope="module")
+def pairs(sample_items) -> list:
+    """Pasangan (judul, kategori lama) unik dari run sampel + kasus sulit."""
+    seen = dict.fromkeys((x.get("posisi"), x.get("kategori_posisi")) for x in sample_items)
+    return list(seen) + EDGE_CASES
+
+def test_scalar_matches_legacy(pairs):
+    m = get_matcher()
+    assert [m.classify_one(p, c) for p, c in pairs] == [legacy_enrich(p, c) for p, c in pairs]
+
+def test_vector_matches_scalar(pairs):
+    m = get_matcher()
+    titles = pd.Series([p for p, _ in pairs], dtype=object)
+    current = pd.Series([c for _, c in pairs], dtype=object)
+    assert m.classify(titles, current).tolist() == [m.classify_one(p, c) for p, c in pairs]
+
+def test_bundle_is_fresh():
+    assert BUNDLE_PATH.exists(), f"{BUNDLE_PATH} tidak ada → python -m src.category --emit-bundle"
+    assert json.loads(BUNDLE_PATH.read_text(encoding="utf-8")) == get_matcher().bundle(), \
+        f"{BUNDLE_PATH.name} basi → python -m src.category --emit-bundle"
+
+def test_web_category_ts_matches_python(pairs):
+    try:
+        web = run_web(pairs)
+    except RuntimeError as e:
+        pytest.fail(f"category.ts tidak bisa dijalankan: {e}")
+    m = get_matcher()
+    assert web == [m.classify_one(p, c) for p, c in pairs]
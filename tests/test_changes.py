@@ -0,0 +1,102 @@
+# tests/test_changes.py
+"""Deteksi perubahan record (src/changes.py): ringkasan new / updated (+ field) / unchanged / removed
+tepat, duplikat halaman bergeser dibuang, snapshot inkremental identik dengan rebuild (termasuk
+first_seen/last_seen), dan indeks tidak dipakai ulang bila kode/skills berubah."""
+import json, random, shutil
+
+import pandas as pd
+import pytest
+
+from benchmarks.bench_changes import N_DUP, RUN_A, RUN_B, change_entry, make_root, mutate, snapshot, write_run
+from src.changes import ChangeTracker
+from src.prepare import COUNT_COLS, TRACKED_FIELDS, flatten_vacancy
+
+N_ITEMS = 5000
+TS_A = pd.Timestamp("2025-12-01T00:00:00", tz="UTC")
+TS_B = pd.Timestamp("2025-12-02T00:00:00", tz="UTC")
+
+@pytest.fixture(scope="module")
+def runs(sample_items) -> tuple:
+    items = json.loads(json.dumps(sample_items[:N_ITEMS]))
+    items_b, expected = mutate(items, random.Random(25))
+    return items, items_b, expected
+
+@pytest.fixture(scope="module")
+def prepared(tmp_path_factory, runs, run_prepare) -> tuple:
+    """(inkremental, rebuild): run A lalu run B; rebuild = run B tanpa indeks record."""
+    items, items_b, _ = runs
+    tmp = tmp_path_factory.mktemp("changes")
+    inc = make_root(tmp / "inkremental", items)
+    run_prepare(inc)
+    full = tmp / "rebuild"
+    shutil.copytree(inc, full)
+    (full / "data" / "state" / "records.parquet").unlink()
+    for root in (inc, full):
+        write_run(root, RUN_B, items_b, str(TS_B))
+        run_prepare(root)
+    return inc, full
+
+def tracker(tmp_path, snapshot=None) -> ChangeTracker:
+    return ChangeTracker(tmp_path / "records.parquet", TRACKED_FIELDS, flatten_vacancy, "build", snapshot)
+
+def test_summary_matches_known_changes(prepared, runs):
+    expected = runs[2]
+    got = change_entry(prepared[0], RUN_B)
+    assert got["reuse"] is True
+    assert {k: got[k] for k in expected if k != "updated_fields"} == \
+        {k: v for k, v in expected.items() if k != "updated_fields"}
+    assert got["updated_fields"] == expected["updated_fields"]
+    assert got["skipped"] == 0
+
+def test_incremental_snapshot_equals_rebuild(prepared, runs):
+    a, b = snapshot(prepared[0]), snapshot(prepared[1])
+    assert not a["id_posisi"].duplicated().any()
+    assert set(a["id_posisi"]) == {x["id_posisi"] for x in runs[1]}
+    assert list(a.columns) == list(b.columns)
+    for c in a.columns:
+        assert a[c].astype(str).equals(b[c].astype(str)), c
+
+    # posting run A: first_seen tetap dari run A; posting baru: run B; semua terlihat di run B
+    fresh = a["id_posisi"].str.startswith("baru-")
+    assert (a.loc[~fresh, "first_seen"] == TS_A).all()
+    assert (a.loc[fresh, "first_seen"] == TS_B).all()
+    assert (a["last_seen"] == TS_B).all()
+
+def test_shifted_page_duplicates_are_dropped(tmp_path, runs):
+    items = runs[0][:300]
+    t = tracker(tmp_path)
+    unique = {x["id_posisi"] for x in items}
+    todo = t.classify(items + items[100:100 + N_DUP])  # halaman bergeser: item yang sama muncul lagi
+    assert len(todo) == len(unique) == len(t.new)
+    assert t.duplicates == len(items) + N_DUP - len(unique)
+
+def test_counts_fields_report_unknown_ids_as_skipped(tmp_path, runs):
+    items = runs[0][:300]
+    t = tracker(tmp_path)
+    t.classify(items)
+    t.save("run_a", {x["id_posisi"] for x in items})
+
+    t = tracker(tmp_path, "run_a")
+    slim = [{k: x.get(k) for k in ("id_posisi", *COUNT_COLS)} for x in items]
+    slim[5]["jumlah_terdaftar"] = (slim[5]["jumlah_terdaftar"] or 0) + 1
+    slim.append({"id_posisi": "tak-dikenal", "jumlah_kuota": 1, "jumlah_terdaftar": 0})
+    todo = t.classify(slim, COUNT_COLS)
+    summary = t.summary(complete_sweep=True)
+    assert (summary["new"], summary["skipped"]) == (0, 1)
+    assert t.updated == {slim[5]["id_posisi"]: ["jumlah_terdaftar"]}
+    assert "tak-dikenal" not in {x["id_posisi"] for x in todo}
+    assert summary["removed"] == 0
+
+def test_build_change_disables_reuse(tmp_path, prepared, runs, run_prepare):
+    items, items_b, _ = runs
+    root = make_root(tmp_path / "build", items)
+    run_prepare(root)
+    with open(root / "config" / "skills.yaml", "a", encoding="utf-8") as f:
+        f.write("\n# skills.yaml berubah → fingerprint build berubah\n")
+    write_run(root, RUN_B, items_b, str(TS_B))
+    run_prepare(root)
+
+    assert change_entry(root, RUN_B)["reuse"] is False
+    a, b = snapshot(root), snapshot(prepared[1])
+    for c in a.columns:
+        assert a[c].astype(str).equals(b[c].astype(str)), c
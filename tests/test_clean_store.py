@@ -0,0 +1,92 @@
+# tests/test_clean_store.py
+"""Dataset clean terpartisi per snapshot (src/clean_store.py) lewat prepare: upsert delta by id_posisi,
+partisi sebelumnya hanya menyimpan baris riwayat, first_seen dipertahankan / last_seen diperbarui,
+dan read_latest hanya membaca partisi terbaru."""
+import json
+
+import pandas as pd
+import pytest
+
+from benchmarks.bench_changes import write_run
+from src.clean_store import first_seen_index, latest_snapshot, read_latest, snapshot_dirs
+
+RUNS = ["run_20251201_000000_store0", "run_20251202_000000_store1", "run_20251203_000000_store2"]
+TS = [pd.Timestamp(f"2025-12-0{k}T00:00:00", tz="UTC") for k in (1, 2, 3)]
+
+def add_run(root, k: int, items: list, mode: str) -> None:
+    write_run(root, RUNS[k], items, TS[k].isoformat())
+    meta_path = root / "data" / "raw" / RUNS[k] / "run_meta.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta_path.write_text(json.dumps({**meta, "mode": mode}), encoding="utf-8")
+
+def partition(root, k: int) -> pd.DataFrame:
+    return pd.read_parquet(root / "data" / "clean" / "vacancies" / f"snapshot={RUNS[k]}")
+
+@pytest.fixture(scope="module")
+def postings(sample_items) -> list:
+    """300 posting unik dari run sampel."""
+    unique = {x["id_posisi"]: x for x in sample_items}
+    return json.loads(json.dumps(list(unique.values())[:300]))
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory, postings, copy_repo, run_prepare):
+    """full (A) → delta (B: 20 baru, 10 berubah, 5 tetap) → full (C: 250 posting pertama A)."""
+    root = copy_repo(tmp_path_factory.mktemp("store") / "repo")
+    dataset = root / "data" / "clean" / "vacancies"
+    fresh = [{**postings[0], "id_posisi": f"baru-{k:02d}"} for k in range(20)]
+    changed = [{**x, "jumlah_terdaftar": (x.get("jumlah_terdaftar") or 0) + 1} for x in postings[:10]]
+
+    add_run(root, 0, postings, "full")
+    run_prepare(root)
+    add_run(root, 1, fresh + changed + postings[10:15], "delta")
+    run_prepare(root)
+    after_b = read_latest(dataset, legacy_file=None)
+    parts_b = [p.name for p in snapshot_dirs(dataset)]
+    add_run(root, 2, postings[:250], "full")
+    run_prepare(root)
+    return {"root": root, "dataset": dataset, "fresh": fresh, "changed": changed,
+            "after_b": after_b, "parts_b": parts_b}
+
+def test_delta_upserts_by_id(store, postings):
+    b = store["after_b"]
+    assert not b["id_posisi"].duplicated().any()
+    assert set(b["id_posisi"]) == {x["id_posisi"] for x in postings + store["fresh"]}
+    counts = b.set_index("id_posisi")["jumlah_terdaftar"]
+    for x in store["changed"]:
+        assert counts[x["id_posisi"]] == x["jumlah_terdaftar"]
+    # semua baris A dibawa ke B → partisi A tidak menyimpan riwayat dan dihapus
+    assert store["parts_b"] == [f"snapshot={RUNS[1]}"]
+
+def test_first_seen_kept_and_last_seen_bumped(store, postings):
+    b = store["after_b"].set_index("id_posisi")
+    fresh = {x["id_posisi"] for x in store["fresh"]}
+    seen_b = {x["id_posisi"] for x in store["changed"] + postings[10:15]}
+    old = b.index.difference(list(fresh))
+    assert (b.loc[old, "first_seen"] == TS[0]).all()
+    assert (b.loc[list(fresh), "first_seen"] == TS[1]).all()
+    assert (b.loc[list(fresh | seen_b), "last_seen"] == TS[1]).all()
+    assert (b.loc[old.difference(list(seen_b)), "last_seen"] == TS[0]).all()  # tidak terlihat di delta
+
+def test_previous_partition_keeps_only_history_rows(store, postings):
+    c_ids = {x["id_posisi"] for x in postings[:250]}
+    hist = partition(store["root"], 1)
+    assert set(hist["id_posisi"]) == {x["id_posisi"] for x in postings[250:] + store["fresh"]}
+    assert not set(hist["id_posisi"]) & c_ids
+    latest = partition(store["root"], 2)
+    assert set(latest["id_posisi"]) == c_ids
+    assert (latest.set_index("id_posisi").loc[[x["id_posisi"] for x in postings[:10]], "first_seen"] == TS[0]).all()
+    assert first_seen_index(store["dataset"])["baru-00"] == TS[1]
+
+def test_read_latest_reads_only_newest_partition(store, postings):
+    assert latest_snapshot(store["dataset"]) == RUNS[2]
+    df = read_latest(store["dataset"], legacy_file=None)
+    assert set(df["id_posisi"]) == {x["id_posisi"] for x in postings[:250]}
+    assert len(df) == 250
+    assert "snapshot" not in df.columns
+    assert "deskripsi_posisi" not in df.columns
+    assert "deskripsi_posisi" in read_latest(store["dataset"], legacy_file=None, with_text=True).columns
+
+def test_rerun_replaces_partition(store, postings, run_prepare):
+    run_prepare(store["root"])
+    assert [p.name for p in snapshot_dirs(store["dataset"])] == [f"snapshot={r}" for r in RUNS[1:]]
+    assert len(read_latest(store["dataset"], legacy_file=None)) == 250
@@ -0,0 +1,75 @@
+# tests/test_fetch.py
+"""Fetcher terhadap server lokal src/mock_api.py: laju naik dengan concurrency, rate limit tetap terjaga,
+retry dan --resume menghasilkan run lengkap."""
+import os, time
+
+import pytest
+
+from benchmarks.bench_fetch import make_cfg, peak_rps
+from src.fetch import RunManifest, run_fetch
+from src.mock_api import MockAPI, ReplayData
+from src.raw_store import iter_raw_pages
+
+PAGES = 20
+LIMIT = 10
+MAX_RPS = 15
+
+@pytest.fixture(scope="module")
+def server(sample_run):
+    srv = MockAPI(ReplayData(sample_run, max_items=PAGES * LIMIT), latency_s=0.2, rps=20).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+def fetch(server: MockAPI, tmp_path, concurrency: int) -> tuple[float, list]:
+    server.stats.reset()
+    t0 = time.monotonic()
+    run_dir = run_fetch(make_cfg(server.url, tmp_path / f"c{concurrency}", concurrency, max_rps=MAX_RPS))
+    elapsed = time.monotonic() - t0
+    assert RunManifest.load(run_dir).meta["status"] == "complete"
+    return elapsed, sorted(p for p, _ in iter_raw_pages(run_dir))
+
+def test_pages_per_second_scale_within_rate_limit(server, tmp_path):
+    t_serial, pages_serial = fetch(server, tmp_path, 1)
+    t_pool, pages_pool = fetch(server, tmp_path, 4)
+    stats = server.stats.snapshot()
+
+    assert pages_serial == pages_pool == list(range(1, PAGES + 1))
+    assert t_serial / t_pool >= 2, f"concurrency 4 tidak lebih cepat: {t_serial:.2f}s vs {t_pool:.2f}s"
+    assert peak_rps(stats["hits"]) <= MAX_RPS + 1  # +1: satu token burst di awal jendela
+    assert stats["status"].get(429, 0) == 0
+
+def test_retry_recovers_injected_errors(sample_run, tmp_path):
+    # tanpa seed: urutan acak ber-seed bisa memberi satu halaman deret error lebih panjang dari max_retries
+    srv = MockAPI(ReplayData(sample_run, max_items=PAGES * LIMIT), error_rate=0.2, retry_after_s=0).start()
+    try:
+        run_dir = run_fetch(make_cfg(srv.url, tmp_path, 4, max_rps=100, retry_backoff_s=0, max_retries=10))
+    finally:
+        srv.shutdown()
+        srv.server_close()
+    assert sum(n for code, n in srv.stats.status.items() if code != 200) > 0
+    assert RunManifest.load(run_dir).meta["status"] == "complete"
+    assert sorted(p for p, _ in iter_raw_pages(run_dir)) == list(range(1, PAGES + 1))
+
+@pytest.mark.parametrize("fmt", ["jsonl.zst", "jsonl.gz"])
+@pytest.mark.parametrize("keep", [0.0, 0.5])
+def test_resume_refetches_pages_missing_from_raw(sample_run, tmp_path, fmt, keep):
+    srv = MockAPI(ReplayData(sample_run, max_items=PAGES * LIMIT)).start()
+    try:
+        cfg = make_cfg(srv.url, tmp_path, 1, max_rps=1000)
+        cfg["output"]["raw_format"] = fmt
+        run_dir = run_fetch(cfg)
+        # proses mati: RAW terpotong di tengah frame, checkpoint tetap mencatat semua halaman "ok"
+        path = run_dir / f"pages.{fmt}"
+        os.truncate(path, int(path.stat().st_size * keep))
+        assert len({p for p, _ in iter_raw_pages(run_dir)}) < PAGES
+        assert RunManifest.load(run_dir).pages_with("ok") == list(range(1, PAGES + 1))
+        run_fetch(cfg, resume=run_dir.name)
+    finally:
+        srv.shutdown()
+        srv.server_close()
+    assert sorted(p for p, _ in iter_raw_pages(run_dir)) == list(range(1, PAGES + 1))  # tanpa duplikat
+    assert RunManifest.load(run_dir).meta["status"] == "complete"
+
+def test_replay_data_without_max_items_keeps_all(sample_run, sample_items):
+    assert len(ReplayData(sample_run).items) == len(sample_items)
@@ -0,0 +1,144 @@
+# tests/test_fetch_modes.py
+"""Mode delta / counts terhadap src/mock_api.py: delta berhenti di halaman pertama yang seluruhnya
+dikenal, watermark disimpan dan digabung, counts hanya menyimpan id + kuota + pendaftar, prepare
+memangkas snapshot hanya bila sweep lengkap, dan posting terbit telat tetap masuk snapshot."""
+import json, itertools
+
+import pytest
+
+import src.fetch
+from benchmarks.bench_changes import change_entry
+from benchmarks.bench_fetch import make_cfg
+from src.clean_store import read_latest
+from src.fetch import COUNT_FIELDS, RunManifest, load_watermark, page_is_known, run_fetch
+from src.mock_api import MockAPI, ReplayData
+from src.raw_store import iter_raw_pages
+
+PAGES = 20
+LIMIT = 10
+OLD = "2020-01-01 00:00:00"  # lebih tua dari semua posting sampel
+
+class FlakyAPI(MockAPI):
+    """MockAPI yang selalu menjawab 503 untuk halaman di `fail`."""
+    fail: set = set()
+
+    def decide(self, page: int):
+        if page in self.fail:
+            return 503, None
+        return super().decide(page)
+
+@pytest.fixture
+def api(sample_run):
+    srv = FlakyAPI(ReplayData(sample_run, max_items=PAGES * LIMIT), retry_after_s=0).start()
+    srv.data.items = json.loads(json.dumps(srv.data.items))  # item diubah per tes
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    # run_id diawali timestamp per detik → run berurutan dalam satu detik tetap urut nama
+    stamps = (f"20251201_{k:06d}" for k in itertools.count())
+    monkeypatch.setattr(src.fetch, "now_ts", lambda tzname="Asia/Jakarta": next(stamps))
+
+def cfg_for(api: MockAPI, root) -> dict:
+    cfg = make_cfg(api.url, root, 1, max_rps=1000, retry_backoff_s=0, max_retries=0)
+    cfg["output"].update(raw_dir=str(root / "data" / "raw"), state_dir=str(root / "data" / "state"),
+                         logs_dir=str(root / "logs"))
+    return cfg
+
+def posting(template: dict, rid: str, created_at: str) -> dict:
+    return {**json.loads(json.dumps(template)), "id_posisi": rid, "created_at": created_at}
+
+def raw_items(run_dir) -> list:
+    return [x for _, payload in sorted(iter_raw_pages(run_dir)) for x in payload["data"]]
+
+def snapshot(root):
+    df = read_latest(root / "data" / "clean" / "vacancies",
+                     columns=["id_posisi", "jumlah_terdaftar"], legacy_file=None)
+    assert not df["id_posisi"].duplicated().any()
+    return df.set_index("id_posisi")["jumlah_terdaftar"]
+
+def test_page_is_known_by_id_only():
+    wm = {"ids": {"a", "b"}, "newest_created_at": "2025-11-11 00:00:00"}
+    assert page_is_known([{"id_posisi": "a"}, {"id_posisi": "b", "created_at": "2099-01-01 00:00:00"}], wm)
+    assert not page_is_known([{"id_posisi": "a"}, {"id_posisi": "LATE", "created_at": "2025-11-10 00:00:00"}], wm)
+    # item tanpa id: created_at jadi penentu
+    assert page_is_known([{"id_posisi": "a"}, {"created_at": "2025-11-10 00:00:00"}], wm)
+    assert not page_is_known([{"id_posisi": "a"}, {"created_at": "2025-11-12 00:00:00"}], wm)
+
+def test_delta_stops_at_first_fully_known_page(api, tmp_path):
+    cfg = cfg_for(api, tmp_path)
+    base = list(api.data.items)
+    run_fetch(cfg)
+    fresh = [posting(base[0], f"baru-{k:02d}", f"2099-01-01 00:00:{k:02d}") for k in range(25)]
+    api.data.items = fresh + base  # halaman 1-2 baru, halaman 3 campuran, halaman 4 dikenal
+
+    run_dir = run_fetch(cfg, mode="delta")
+    meta = RunManifest.load(run_dir).meta
+    assert meta["status"] == "complete"
+    assert meta["stopped_at_page"] == 4
+    assert sorted(p for p, _ in iter_raw_pages(run_dir)) == [1, 2, 3, 4]
+    assert RunManifest.load(run_dir).pages_with("skipped") == list(range(5, PAGES + 4))
+    assert meta["new_items"] == 25
+
+    wm = load_watermark(tmp_path / "data" / "state")
+    assert wm["run_id"] == run_dir.name
+    assert wm["ids"] == {x["id_posisi"] for x in base + fresh}  # digabung, bukan diganti
+    assert wm["newest_created_at"] == "2099-01-01 00:00:24"
+
+def test_delta_does_not_stop_at_late_posting_older_than_watermark(api, tmp_path):
+    cfg = cfg_for(api, tmp_path)
+    base = list(api.data.items)
+    run_fetch(cfg)
+    api.data.items = base[:5] + [posting(base[0], "LATE", OLD)] + base[5:]
+
+    run_dir = run_fetch(cfg, mode="delta")
+    assert RunManifest.load(run_dir).meta["stopped_at_page"] == 2
+    assert "LATE" in {x["id_posisi"] for x in raw_items(run_dir)}
+
+def test_counts_sweep_refreshes_counts_prunes_and_adds_late_posting(api, repo_copy, run_prepare):
+    cfg = cfg_for(api, repo_copy)
+    base = list(api.data.items)
+    run_fetch(cfg)
+    run_prepare(repo_copy)
+
+    # posting terbit telat jauh di belakang: delta berhenti di halaman 1 dan melewatkannya
+    bumped = {**base[3], "jumlah_terdaftar": (base[3].get("jumlah_terdaftar") or 0) + 7}
+    late = posting(base[0], "LATE", OLD)
+    api.data.items = base[:3] + [bumped] + base[4:150] + [late] + base[150:190]  # 190.. tidak aktif lagi
+    run_dir = run_fetch(cfg, mode="delta")
+    assert "LATE" not in {x["id_posisi"] for x in raw_items(run_dir)}
+    run_prepare(repo_copy)
+
+    run_dir = run_fetch(cfg, mode="counts")
+    items = raw_items(run_dir)
+    assert [x for x in items if x["id_posisi"] != "LATE" and set(x) != set(COUNT_FIELDS)] == []
+    assert [x for x in items if x["id_posisi"] == "LATE"] == [late]  # belum dikenal → disimpan utuh
+    run_prepare(repo_copy)
+
+    counts = snapshot(repo_copy)
+    assert set(counts.index) == {x["id_posisi"] for x in api.data.items}
+    assert counts[bumped["id_posisi"]] == bumped["jumlah_terdaftar"]
+    entry = change_entry(repo_copy, run_dir.name)
+    gone = {x["id_posisi"] for x in base} - set(counts.index)
+    assert (entry["new"], entry["removed"]) == (1, len(gone))
+
+def test_counts_prunes_only_when_no_page_failed(api, repo_copy, run_prepare):
+    cfg = cfg_for(api, repo_copy)
+    base = list(api.data.items)
+    run_fetch(cfg)
+    run_prepare(repo_copy)
+    before = set(snapshot(repo_copy).index)
+    wm_before = load_watermark(repo_copy / "data" / "state")["ids"]
+
+    api.data.items = base[:190]  # posting 190.. tidak aktif lagi, halaman 10 gagal
+    api.fail = {10}
+    run_dir = run_fetch(cfg, mode="counts")
+    meta = RunManifest.load(run_dir).meta
+    assert (meta["status"], meta["failed_pages"]) == ("incomplete", [10])
+    # id di halaman gagal tetap dikenal watermark
+    assert load_watermark(repo_copy / "data" / "state")["ids"] >= wm_before
+
+    run_prepare(repo_copy, "--allow-incomplete")
+    assert set(snapshot(repo_copy).index) == before  # sweep tidak lengkap → tidak ada yang dibuang
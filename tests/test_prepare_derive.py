@@ -0,0 +1,44 @@
+# tests/test_prepare_derive.py
+"""Versi per kolom tahap turunan prepare harus identik dengan versi per baris (NaN dianggap sama)."""
+import math
+
+import pandas as pd
+import pytest
+
+from src.prepare import (compute_competition_ratio, compute_days_to_deadline, competition_ratio_col,
+                         days_to_deadline_col, flatten_vacancy, parse_json_column, safe_parse_json_field)
+
+TODAY = pd.Timestamp("2025-11-11", tz="Asia/Jakarta")
+
+DEADLINES = [None, "", "2025-11-11", "2025-12-31 23:59:59", "2025-12-31T23:59:59+07:00",
+             "2025-10-01T00:00:00.000Z", "31 December 2025", "bukan tanggal"]
+COUNTS = [(10, 4), (0, 3), (7, 0), (5, None), (None, 2), (None, None), (1, 3), (2, 3), (8.0, 3)]
+JSON_VALUES = [None, "", "[]", '["S1","D3"]', '{"a": 1}', "bukan json", '["S1","D3"]', ["S1"], {"a": 1}]
+
+@pytest.fixture(scope="module")
+def frame(sample_items) -> pd.DataFrame:
+    return pd.DataFrame([flatten_vacancy(x) for x in sample_items])
+
+def same_floats(got: pd.Series, want: list) -> bool:
+    return len(got) == len(want) and all(
+        (math.isnan(a) and math.isnan(b)) or a == b for a, b in zip(got.tolist(), map(float, want))
+    )
+
+def test_days_to_deadline_col(frame):
+    s = pd.concat([frame["tanggal_pendaftaran_akhir"], pd.Series(DEADLINES, dtype=object)], ignore_index=True)
+    for part in (s, pd.Series(DEADLINES, dtype=object)):
+        want = [compute_days_to_deadline(v, TODAY) for v in part]
+        assert same_floats(days_to_deadline_col(part, TODAY), want)
+
+def test_competition_ratio_col(frame):
+    terdaftar = pd.concat([frame["jumlah_terdaftar"], pd.Series([a for a, _ in COUNTS])], ignore_index=True)
+    kuota = pd.concat([frame["jumlah_kuota"], pd.Series([b for _, b in COUNTS])], ignore_index=True)
+    want = [compute_competition_ratio(a, b) for a, b in zip(terdaftar.tolist(), kuota.tolist())]
+    assert same_floats(competition_ratio_col(terdaftar, kuota), want)
+
+@pytest.mark.parametrize("col", ["program_studi_raw", "jenjang_raw"])
+def test_parse_json_column(frame, col):
+    s = pd.concat([frame[col], pd.Series(JSON_VALUES, dtype=object)], ignore_index=True)
+    got = parse_json_column(s)
+    assert got.index.equals(s.index)
+    assert got.tolist() == [safe_parse_json_field(v) for v in s]
@@ -0,0 +1,53 @@
+# tests/test_query.py
+"""VacancyQuery (src/query.py) harus sama dengan rantai filter pandas lama (benchmarks/bench_query.py
+old_path) pada data sintetis: mask, urutan top-N, KPI dan data grafik, untuk beberapa kombinasi filter."""
+import numpy as np
+import pytest
+
+from benchmarks.bench_query import COMBOS, new_path, old_path, same, synthetic
+from src.query import VacancyQuery
+from src.skill_index import SkillIndex
+
+N_ROWS = 5000
+
+CASES = {
+    **COMBOS,
+    "hanya rasio ≤3": dict(max_ratio=3.0),
+    "keyword 1 huruf 'a'": dict(keyword="a", max_ratio=10.0, limit=200),
+    "keyword 2 huruf ' It '": dict(keyword=" It ", limit=50),
+    "want_skills + limit kecil": dict(want_skills=["python", "sql", "excel"], max_ratio=10.0, limit=25),
+    "want_skills + limit > hasil": dict(province="prov5", want_skills=["canva", "seo"], limit=10_000),
+    "want_skills tanpa limit": dict(category="kat2", want_skills=["komunikasi"]),
+    "urut priority + keyword": dict(keyword="staff", sort="priority", limit=40),
+}
+
+@pytest.fixture(scope="module")
+def data():
+    df = synthetic(N_ROWS, seed=15)
+    ix = SkillIndex.from_lists(df["skills_extracted"])
+    orderings = {"ratio": np.argsort(df["ratio_order"].to_numpy()),
+                 "priority": np.argsort(df["priority_rank"].to_numpy())}
+    base = df.copy()  # jalur lama memakai salinan object-dtype (engine mengubah kolom ke category)
+    return base, ix, df, VacancyQuery(df, orderings, ix)
+
+@pytest.mark.parametrize("kw", CASES.values(), ids=list(CASES))
+def test_query_matches_pandas_path(data, kw):
+    base, ix, df, engine = data
+    a, b = old_path(base, ix, **kw), new_path(df, engine, **kw)
+    assert same(a, b, kw.get("sort", "ratio"))
+    assert len(b["top"]) == min(kw.get("limit") or len(base), int(a["mask"].sum()))
+    if kw.get("want_skills") and kw.get("sort", "ratio") == "ratio":
+        assert b["top"]["match_count"].is_monotonic_decreasing  # kecocokan skill urutan pertama
+
+def test_nan_titles(data):
+    base, ix, df, engine = data
+    nan_title = base["posisi"].isna().to_numpy()
+    assert nan_title.any()
+    # tanpa keyword: posting berjudul NaN tetap ikut, sama dengan jalur lama
+    kw = dict(max_ratio=10.0, limit=100)
+    a, b = old_path(base, ix, **kw), new_path(df, engine, **kw)
+    assert same(a, b, "ratio")
+    assert (b["mask"] & nan_title).any()
+    # dengan keyword: judul NaN tidak pernah cocok (jalur lama mencocokkan teks "None" hasil astype(str))
+    for keyword in ("non", "None", "nan"):
+        assert not (engine.run(keyword=keyword).mask & nan_title).any()
@@ -0,0 +1,61 @@
+# tests/test_raw_store.py
+"""RawSink: halaman yang sudah ditandai "ok" harus bisa dibaca ulang walau proses writer mati."""
+import sys, json, subprocess, threading
+
+import pytest
+
+from src.raw_store import RawSink, iter_raw_pages
+from tests.conftest import ROOT
+
+# writer tulis halaman 1, 2, 4 (halaman 3 tidak pernah datang), catat checkpoint, lalu mati
+# tanpa close()
+WRITER = r"""
+import os, sys, json
+from pathlib import Path
+from src.raw_store import RawSink
+run_dir, fmt = Path(sys.argv[1]), sys.argv[2]
+ok = []
+def written(p):
+    ok.append(p)
+    (run_dir / "ok.json").write_text(json.dumps(ok))
+sink = RawSink(run_dir, fmt, on_written=written)
+for p in (1, 2, 4):
+    sink.write_page(p, {"data": [{"id_posisi": f"{p}-{k}"} for k in range(50)]})
+os._exit(0)
+"""
+
+@pytest.mark.parametrize("fmt", ["jsonl.zst", "jsonl.gz"])
+def test_pages_marked_ok_survive_killed_writer(tmp_path, fmt):
+    subprocess.run([sys.executable, "-c", WRITER, str(tmp_path), fmt], cwd=ROOT, check=True)
+    ok = json.loads((tmp_path / "ok.json").read_text())
+    pages = [p for p, _ in iter_raw_pages(tmp_path)]
+    assert ok == [1, 2, 4]  # halaman 4 tidak menunggu halaman 3
+    assert pages == ok
+
+@pytest.mark.parametrize("fmt", ["jsonl.zst", "jsonl.gz"])
+def test_truncated_tail_keeps_earlier_pages(tmp_path, fmt):
+    subprocess.run([sys.executable, "-c", WRITER, str(tmp_path), fmt], cwd=ROOT, check=True)
+    path = tmp_path / f"pages.{fmt}"
+    good = path.read_bytes()
+    path.write_bytes(good + good[: len(good) // 6])  # frame berikutnya (±1/3 file) terpotong di tengah tulis
+    assert [p for p, _ in iter_raw_pages(tmp_path)] == [1, 2, 4]
+
+@pytest.mark.parametrize("fmt", ["jsonl.zst", "jsonl.gz"])
+def test_concurrent_pages_written_once_and_marked_after_write(tmp_path, fmt):
+    ok, on_disk = [], []
+    def written(p):
+        on_disk.append({q for q, _ in iter_raw_pages(tmp_path)} >= {p})
+        ok.append(p)
+    pages = list(range(1, 41))
+    with RawSink(tmp_path, fmt, on_written=written) as sink:
+        threads = [threading.Thread(target=lambda ps: [sink.write_page(p, {"data": [{"id_posisi": p}]}) for p in ps],
+                                    args=(pages[k::4],)) for k in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sink._queue == []  # tidak ada halaman yang tertahan di RAM
+    got = dict(iter_raw_pages(tmp_path))
+    assert sorted(got) == sorted(ok) == pages
+    assert all(got[p]["data"] == [{"id_posisi": p}] for p in pages)
+    assert all(on_disk)  # "ok" hanya setelah halaman terbaca dari disk
@@ -0,0 +1,17 @@
+# tests/test_skill_workers.py
+"""SkillExtractor(workers=2) harus identik dengan workers=1 (skills, skor, urutan baris) pada chunk
+kecil; chunk cukup besar supaya benar-benar di-shard ke pool, plus sisa chunk yang jatuh ke serial."""
+from benchmarks.bench_skill_workers import run
+from src.enrich_skills import SkillExtractor
+
+CHUNK_ROWS = 2 * SkillExtractor.MIN_SHARD_ROWS + 100  # > ambang shard → 2 shard
+
+def test_two_workers_match_serial(sample_items):
+    # 1 chunk penuh (di-shard) + 1 chunk sisa di bawah ambang (serial di proses utama)
+    posts = [(x.get("posisi"), x.get("deskripsi_posisi")) for x in sample_items[:CHUNK_ROWS + 120]]
+    posts[7] = (None, None)
+    _, skills_1, scores_1 = run(posts, 1, CHUNK_ROWS)
+    _, skills_2, scores_2 = run(posts, 2, CHUNK_ROWS)
+    assert len(skills_2) == len(posts)
+    assert skills_2 == skills_1
+    assert scores_2 == scores_1
@@ -0,0 +1,70 @@
+# tests/test_skills.py
+"""extract_skills (SkillMatcher terkompilasi) harus identik dengan output yang dibekukan di
+tests/data/skills_expected.json: posting sampel (tiap STEP posting) + kasus sulit simbol/alias.
+Urutan key dict (by_category, counts) ikut dibandingkan.
+
+File dibuat dari jalur ekstraksi sebelum matcher dikompilasi; bila skills.yaml sengaja diubah:
+  python -m tests.test_skills --freeze
+"""
+import sys, json, hashlib
+from pathlib import Path
+
+from src.enrich_skills import compute_skills_score, extract_skills, load_skills_config
+from src.prepare import SKILLS_PATH
+
+EXPECTED_PATH = Path(__file__).parent / "data" / "skills_expected.json"
+STEP = 100
+
+# alias bertumpuk, prefiks term, tanda baca, token gabungan, huruf besar, spasi ganda
+EDGE_CASES = [
+    ("PowerBI/MS Excel", "python/sql, t-sql; R & r-studio; power bi.powerbi"),
+    ("Data Warehouse", "data warehouse-nya; kualitas data.kualitas data; ETL/ELT"),
+    ("", "SNI-TKDN: mapping+segmentasi #reporting ... problem  solving"),
+    (None, None),
+    ("C++/C# Developer", "Node.js, ms  excel; MS-Excel + POWERBI\tdashboard\nSQL-Server (T-SQL) & R&D"),
+    ("Analis Data—Python", "kualitas   data; Kurasi/Validasi; SNI, TKDN; etl; ELT; Power-BI; power  bi"),
+    ("Excel", "excel excel EXCEL excel-nya excel's r r. R,"),
+    ("ms excelent", "powerbix; msexcel; sqlite; pythonic; mapping-segmentasi"),
+    ("   ", ""),
+]
+
+def skills_sha() -> str:
+    return hashlib.sha256(SKILLS_PATH.read_bytes()).hexdigest()[:16]
+
+def extract(title, desc, cfg: dict) -> dict:
+    res = extract_skills(" ".join([title or "", desc or ""]), cfg)
+    return {**res, "skills_score": compute_skills_score(res["by_category"], cfg)}
+
+def freeze(items: list) -> dict:
+    cfg = load_skills_config(SKILLS_PATH)
+    cases = [{"id_posisi": x["id_posisi"], "expected": extract(x.get("posisi"), x.get("deskripsi_posisi"), cfg)}
+             for x in items[::STEP]]
+    cases += [{"title": t, "desc": d, "expected": extract(t, d, cfg)} for t, d in EDGE_CASES]
+    return {"skills_yaml": skills_sha(), "step": STEP, "cases": cases}
+
+def test_extract_skills_matches_frozen_output(sample_items):
+    frozen = json.loads(EXPECTED_PATH.read_text(encoding="utf-8"))
+    assert frozen["skills_yaml"] == skills_sha(), \
+        "config/skills.yaml berubah → bekukan ulang: python -m tests.test_skills --freeze"
+    cfg = load_skills_config(SKILLS_PATH)
+    by_id = {x["id_posisi"]: x for x in sample_items}
+    assert len(frozen["cases"]) == len(sample_items[::STEP]) + len(EDGE_CASES)
+    for case in frozen["cases"]:
+        if "id_posisi" in case:
+            x = by_id[case["id_posisi"]]
+            title, desc = x.get("posisi"), x.get("deskripsi_posisi")
+        else:
+            title, desc = case["title"], case["desc"]
+        got = extract(title, desc, cfg)
+        # json.dumps tanpa sort_keys → urutan key dict ikut dibandingkan
+        assert json.dumps(got, ensure_ascii=False) == json.dumps(case["expected"], ensure_ascii=False), title
+
+if __name__ == "__main__":
+    if "--freeze" not in sys.argv[1:]:
+        sys.exit("python -m tests.test_skills --freeze  → tulis ulang tests/data/skills_expected.json")
+    from tests.conftest import SAMPLE_RUN
+    from src.prepare import iter_raw_items
+    out = freeze(list(iter_raw_items(SAMPLE_RUN)))
+    EXPECTED_PATH.parent.mkdir(parents=True, exist_ok=True)
+    EXPECTED_PATH.write_text(json.dumps(out, ensure_ascii=False, indent=1), encoding="utf-8")
+    print(f"[DONE] {len(out['cases'])} kasus → {EXPECTED_PATH}")
@@ -1,87 +1,46 @@
 import pandas as pd
 import json
 import os
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from src.category import BUNDLE_PATH, write_bundle
+from src.clean_store import latest_snapshot, read_latest
+from src.web_bundle import export_frame, write_data_bundle
+
 def convert_data():
     # Paths
     base_dir = Path(__file__).parent.parent.parent
-    parquet_path = base_dir / "data" / "clean" / "vacancies.parquet"
-    output_path = base_dir / "web" / "public" / "data.json"
+    dataset_dir = base_dir / "data" / "clean" / "vacancies"
+    legacy_path = base_dir / "data" / "clean" / "vacancies.parquet"
+    output_dir = base_dir / "web" / "public" / "data"
 
-    print(f"Reading from: {parquet_path}")
+    snapshot = latest_snapshot(dataset_dir)
+    print(f"Reading from: {dataset_dir} (snapshot={snapshot})" if snapshot else f"Reading from: {legacy_path}")
     
-    if not parquet_path.exists():
-        print(f"Error: File not found at {parquet_path}")
+    if snapshot is None and not legacy_path.exists():
+        print(f"Error: Dataset not found at {dataset_dir}")
         return
 
     try:
-        df = pd.read_parquet(parquet_path)
-        
-        # Ensure columns exist (logic borrowed from app.py)
-        for col in ["posisi", "nama_perusahaan", "nama_provinsi"]:
-            if col not in df.columns:
-                df[col] = None
-
-        for col in ["jumlah_kuota", "jumlah_terdaftar"]:
-            if col not in df.columns:
-                df[col] = 0
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-        # Calculate ratio if missing
-        if "competition_ratio" not in df.columns:
-            df["competition_ratio"] = df.apply(
-                lambda x: x["jumlah_terdaftar"] / x["jumlah_kuota"] if x["jumlah_kuota"] > 0 else 0, 
-                axis=1
-            )
-        
-        # Simplify role (logic borrowed from app.py)
-        def simplify_role(title):
-            if not isinstance(title, str): return "Other"
-            t = title.lower()
-            if any(x in t for x in ["data", "analyst", "analytics"]): return "Data & Analytics"
-            if any(x in t for x in ["admin", "operator", "pengadministrasi"]): return "Administration"
-            if any(x in t for x in ["marketing", "brand", "customer", "sales"]): return "Marketing & Sales"
-            if any(x in t for x in ["design", "video", "creative", "grafis"]): return "Creative"
-            if any(x in t for x in ["perawat", "ners", "kesehatan"]): return "Health"
-            if any(x in t for x in ["bkkbn", "kementerian", "direktorat"]): return "Public Sector"
-            return "Other"
-
-        if "kategori_posisi" not in df.columns:
-            df["kategori_posisi"] = df["posisi"].apply(simplify_role)
-
-        # Clean up for JSON
-        # Fill NaNs with empty string or 0
-        df = df.fillna("")
-        
-        # Explicitly convert numeric columns to float/int to avoid numpy types
-        for col in df.select_dtypes(include=['float', 'float32', 'float64']).columns:
-            df[col] = df[col].astype(float)
-        for col in df.select_dtypes(include=['int', 'int32', 'int64']).columns:
-            df[col] = df[col].astype(int)
-            
-        # Convert to records
-        data = df.to_dict(orient="records")
-        
-        import numpy as np
-        def convert_numpy(obj):
-            if isinstance(obj, dict):
-                return {k: convert_numpy(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_numpy(i) for i in obj]
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif hasattr(obj, 'item'):
-                return obj.item()
-            return obj
-
-        data = convert_numpy(data)
-
-        # Save to JSON
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            
-        print(f"Successfully converted {len(data)} records to {output_path}")
+        # Only the latest snapshot partition is read (history is pruned);
+        # the heavy text column group is included for the JSON export
+        df = read_latest(dataset_dir, legacy_file=legacy_path, with_text=True)
+
+        # Compact schema -> plain JSON values (lookups decoded, categories enriched
+        # with the rules shared with app.py / score.py, dates as UTC ISO strings)
+        df = export_frame(df)
+        if write_bundle():
+            print(f"Category rules bundle updated: {BUNDLE_PATH}")
+
+        # Slim list + facets + detail shards (compact JSON, .gz/.br variants)
+        manifest = write_data_bundle(df, output_dir, source=snapshot or legacy_path.name)
+        print(f"Successfully converted {manifest['rows']} records to {output_dir} (version {manifest['version']})")
+        for name in ("list.json", "facets.json"):
+            s = manifest["sizes"][name]
+            print(f"  {name:<12} {s['json'] / 1e3:9.1f} kB | gz {s['gz'] / 1e3:8.1f} kB | br {s['br'] / 1e3:8.1f} kB")
+        print(f"  detail/      {manifest['detail_bytes'] / 1e3:9.1f} kB in {manifest['shards']} shards")
 
     except Exception:
         import traceback
@@ -4,97 +4,35 @@ import { useState, useEffect, useMemo } from "react";
 import Link from "next/link";
 import { ArrowLeft, TrendingUp, Building2, MapPin, Users, Briefcase, ArrowUpDown, ChevronDown, ChevronUp } from "lucide-react";
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, PieChart, Pie, Cell } from "recharts";
-import { enrichCategory } from "@/utils/category";
-
-interface Vacancy {
-    posisi: string;
-    nama_perusahaan: string;
-    nama_provinsi: string;
-    nama_kabupaten_kota?: string;
-    jumlah_kuota: number;
-    jumlah_terdaftar: number;
-    competition_ratio: number;
-    kategori_posisi: string;
-}
+import { fetchFacets, fetchManifest, Facets } from "@/utils/data";
 
 type SortColumn = 'province' | 'companies' | 'positions' | 'quota' | 'applicants' | null;
 type SortDirection = 'asc' | 'desc';
 
 export default function LaporanPage() {
-    const [data, setData] = useState<Vacancy[]>([]);
+    const [facets, setFacets] = useState<Facets | null>(null);
     const [loading, setLoading] = useState(true);
     const [sortColumn, setSortColumn] = useState<SortColumn>('applicants');
     const [sortDirection, setSortDirection] = useState<SortDirection>('desc');
 
+    // Aggregates are precomputed by web/scripts/convert_data.py (facets.json, a few kB)
+    // instead of downloading and reducing every vacancy in the browser.
     useEffect(() => {
-        fetch("/data.json")
-            .then((res) => res.json())
-            .then((json) => {
-                const enrichedData = json.map((item: any) => ({
-                    ...item,
-                    kategori_posisi: enrichCategory(item.posisi, item.kategori_posisi)
-                }));
-                setData(enrichedData);
-                setLoading(false);
-            })
-            .catch((err) => {
-                console.error("Failed to load data:", err);
-                setLoading(false);
-            });
+        fetchManifest()
+            .then(fetchFacets)
+            .then(setFacets)
+            .catch((err) => console.error("Failed to load data:", err))
+            .finally(() => setLoading(false));
     }, []);
 
-    // National Statistics
-    const nationalStats = useMemo(() => {
-        const totalPositions = data.length;
-        const totalCompanies = new Set(data.map(v => v.nama_perusahaan)).size;
-        const totalQuota = data.reduce((sum, v) => sum + v.jumlah_kuota, 0);
-        const totalApplicants = data.reduce((sum, v) => sum + v.jumlah_terdaftar, 0);
-        const avgCompetition = totalApplicants / totalQuota || 0;
-
-        return {
-            totalPositions,
-            totalCompanies,
-            totalQuota,
-            totalApplicants,
-            avgCompetition,
-        };
-    }, [data]);
-
-    // Province Statistics
-    const provinceStats = useMemo(() => {
-        const stats = new Map<string, {
-            companies: Set<string>;
-            positions: number;
-            quota: number;
-            applicants: number;
-        }>();
-
-        data.forEach(vacancy => {
-            const province = vacancy.nama_provinsi;
-            if (!stats.has(province)) {
-                stats.set(province, {
-                    companies: new Set(),
-                    positions: 0,
-                    quota: 0,
-                    applicants: 0,
-                });
-            }
-            const stat = stats.get(province)!;
-            stat.companies.add(vacancy.nama_perusahaan);
-            stat.positions += 1;
-            stat.quota += vacancy.jumlah_kuota;
-            stat.applicants += vacancy.jumlah_terdaftar;
-        });
-
-        return Array.from(stats.entries()).map(([province, stat]) => ({
-            province,
-            companies: stat.companies.size,
-            positions: stat.positions,
-            quota: stat.quota,
-            applicants: stat.applicants,
-            competition: stat.applicants / stat.quota || 0,
-        }));
-    }, [data]);
+    const nationalStats = facets?.national ?? {
+        totalPositions: 0,
+        totalCompanies: 0,
+        totalQuota: 0,
+        totalApplicants: 0,
+        avgCompetition: 0,
+    };
+    const provinceStats = useMemo(() => facets?.provinces ?? [], [facets]);
 
     // Sort province stats
     const sortedProvinceStats = useMemo(() => {
@@ -133,48 +71,8 @@ export default function LaporanPage() {
         });
     }, [provinceStats, sortColumn, sortDirection]);
 
-    // Top Companies
-    const topCompanies = useMemo(() => {
-        const companyStats = new Map<string, {
-            positions: number;
-            quota: number;
-            applicants: number;
-        }>();
-
-        data.forEach(vacancy => {
-            const company = vacancy.nama_perusahaan;
-            if (!companyStats.has(company)) {
-                companyStats.set(company, { positions: 0, quota: 0, applicants: 0 });
-            }
-            const stat = companyStats.get(company)!;
-            stat.positions += 1;
-            stat.quota += vacancy.jumlah_kuota;
-            stat.applicants += vacancy.jumlah_terdaftar;
-        });
-
-        return Array.from(companyStats.entries())
-            .map(([company, stat]) => ({
-                company,
-                ...stat,
-                competition: stat.applicants / stat.quota || 0,
-            }))
-            .sort((a, b) => b.positions - a.positions)
-            .slice(0, 10);
-    }, [data]);
-
-    // Category Distribution
-    const categoryStats = useMemo(() => {
-        const categories = new Map<string, number>();
-        data.forEach(vacancy => {
-            const cat = vacancy.kategori_posisi || 'Lainnya';
-            categories.set(cat, (categories.get(cat) || 0) + 1);
-        });
-
-        return Array.from(categories.entries())
-            .map(([name, value]) => ({ name, value }))
-            .sort((a, b) => b.value - a.value)
-            .slice(0, 8);
-    }, [data]);
+    const topCompanies = facets?.topCompanies ?? [];
+    const categoryStats = useMemo(() => (facets?.categories ?? []).slice(0, 8), [facets]);
 
     const handleSort = (column: SortColumn) => {
         if (sortColumn === column) {
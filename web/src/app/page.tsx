@@ -6,6 +6,7 @@ import { motion } from 'framer-motion';
 import { Filters } from '@/components/Filters';
 import { Stats } from '@/components/Stats';
 import { enrichCategory } from "@/utils/category";
+import { fetchList, fetchManifest } from "@/utils/data";
 import { Charts } from '@/components/Charts';
 import { Github, X, Filter as FilterIcon, Search, BarChart3 } from "lucide-react";
 import MagangHubInfo from '@/components/MagangHubInfo';
@@ -40,24 +41,28 @@ export default function Home() {
   });
 
   useEffect(() => {
+    let version = "";
+
     const fetchData = () => {
-      fetch('/data.json')
-        .then(res => res.json())
-        .then(data => {
+      fetchManifest()
+        .then(async manifest => {
+          // Only the small manifest is polled; list.json is reloaded when the dataset version changes
+          if (manifest.version === version) return;
+          const list = await fetchList(manifest);
+          version = manifest.version;
+
           // --- ENRICH CATEGORIES START ---
-          const enrichedData = data.map((item: any) => ({
+          const enrichedData = list.map(item => ({
             ...item,
-            kategori_posisi: enrichCategory(item.posisi, item.kategori_posisi)
+            kategori_posisi: enrichCategory(item.posisi, item.kategori_posisi),
+            match_count: 0
           }));
 
-          setData(enrichedData);
-          setLoading(false);
+          setData(enrichedData as Vacancy[]);
           // --- ENRICH CATEGORIES END ---
         })
-        .catch(err => {
-          console.error("Failed to load data", err);
-          setLoading(false);
-        });
+        .catch(err => console.error("Failed to load data", err))
+        .finally(() => setLoading(false));
     };
 
     fetchData(); // Initial fetch
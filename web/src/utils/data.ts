@@ -0,0 +1,84 @@
+// Static data bundle written by web/scripts/convert_data.py (src/web_bundle.py):
+//   /data/manifest.json      version + row/shard counts (small, safe to poll)
+//   /data/list.json          list-view fields only (table, filters, charts)
+//   /data/facets.json        precomputed aggregates for /laporan
+//   /data/detail/<nnn>.json  remaining columns keyed by id_posisi, fetched on demand
+// Files are versioned with ?v=<manifest.version> so browser caches stay valid until the data changes.
+
+export interface Manifest {
+    version: string;
+    source: string | null;
+    rows: number;
+    shards: number;
+    files: Record<string, number>;
+    detail_bytes: number;
+}
+
+export interface ListItem {
+    id_posisi: string;
+    posisi: string;
+    nama_perusahaan: string;
+    nama_provinsi: string;
+    kategori_posisi: string;
+    jumlah_kuota: number;
+    jumlah_terdaftar: number;
+    competition_ratio: number | null;
+    skills_norm: string[];
+}
+
+export interface Facets {
+    national: {
+        totalPositions: number;
+        totalCompanies: number;
+        totalQuota: number;
+        totalApplicants: number;
+        avgCompetition: number;
+    };
+    provinces: { province: string; companies: number; positions: number; quota: number; applicants: number; competition: number }[];
+    topCompanies: { company: string; positions: number; quota: number; applicants: number; competition: number }[];
+    categories: { name: string; value: number }[];
+}
+
+export type Detail = Record<string, unknown>;
+
+const BASE = '/data';
+
+const getJson = async <T,>(path: string): Promise<T> => {
+    const res = await fetch(path);
+    if (!res.ok) throw new Error(`${path}: HTTP ${res.status}`);
+    return res.json();
+};
+
+// Manifest is never cached by the browser: it is how a new dataset is detected.
+export const fetchManifest = (): Promise<Manifest> =>
+    getJson<Manifest>(`${BASE}/manifest.json?t=${Date.now()}`);
+
+export const fetchList = (m: Manifest): Promise<ListItem[]> =>
+    getJson<ListItem[]>(`${BASE}/list.json?v=${m.version}`);
+
+export const fetchFacets = (m: Manifest): Promise<Facets> =>
+    getJson<Facets>(`${BASE}/facets.json?v=${m.version}`);
+
+/** FNV-1a 32-bit over UTF-8 bytes; must match shard_of() in src/web_bundle.py. */
+export const shardOf = (id: string, shards: number): number => {
+    let h = 0x811c9dc5;
+    for (const b of new TextEncoder().encode(id)) {
+        h = Math.imul(h ^ b, 0x01000193) >>> 0;
+    }
+    return h % shards;
+};
+
+const shardCache = new Map<string, Promise<Record<string, Detail>>>();
+
+/** Detail columns for one vacancy; each shard is downloaded once per version. */
+export const fetchDetail = async (m: Manifest, id: string): Promise<Detail | null> => {
+    const name = String(shardOf(id, m.shards)).padStart(3, '0');
+    const key = `${m.version}/${name}`;
+    let shard = shardCache.get(key);
+    if (!shard) {
+        shard = getJson<Record<string, Detail>>(`${BASE}/detail/${name}.json?v=${m.version}`);
+        shard.catch(() => shardCache.delete(key));
+        shardCache.set(key, shard);
+    }
+    return (await shard)[id] ?? null;
+};